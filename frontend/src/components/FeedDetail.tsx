@@ -1,7 +1,13 @@
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { useState, useEffect, useRef, useMemo } from 'react';
 import { toast } from 'react-hot-toast';
-import type { Feed, Episode, PagedResult, ConfigResponse } from '../types';
+import type {
+  BoundaryRefinementStrategy,
+  Feed,
+  Episode,
+  PagedResult,
+  ConfigResponse,
+} from '../types';
 import { feedsApi, configApi } from '../services/api';
 import DownloadButton from './DownloadButton';
 import PlayButton from './PlayButton';
@@ -292,10 +298,8 @@ export default function FeedDetail({ feed, onClose, onFeedDeleted }: FeedDetailP
   });
 
   const updateFeedSettingsMutation = useMutation({
-    mutationFn: (override: boolean | null) =>
-      feedsApi.updateFeedSettings(currentFeed.id, {
-        auto_whitelist_new_episodes_override: override,
-      }),
+    mutationFn: (settings: Parameters<typeof feedsApi.updateFeedSettings>[1]) =>
+      feedsApi.updateFeedSettings(currentFeed.id, settings),
     onSuccess: (data) => {
       setCurrentFeed(data);
       queryClient.invalidateQueries({ queryKey: ['feeds'] });
@@ -494,7 +498,16 @@ export default function FeedDetail({ feed, onClose, onFeedDeleted }: FeedDetailP
   const handleAutoWhitelistOverrideChange = (value: string) => {
     const override =
       value === 'inherit' ? null : value === 'on';
-    updateFeedSettingsMutation.mutate(override);
+    updateFeedSettingsMutation.mutate({
+      auto_whitelist_new_episodes_override: override,
+    });
+  };
+
+  const handleBoundaryRefinementStrategyChange = (value: string) => {
+    updateFeedSettingsMutation.mutate({
+      boundary_refinement_strategy:
+        value === 'inherit' ? null : (value as BoundaryRefinementStrategy),
+    });
   };
 
   const isMember = Boolean(currentFeed.is_member);
@@ -937,6 +950,30 @@ export default function FeedDetail({ feed, onClose, onFeedDeleted }: FeedDetailP
                     <option value="off">Off</option>
                   </select>
                 </div>
+                <div className="flex flex-col gap-2 mt-4">
+                  <div>
+                    <label className="text-sm font-medium text-gray-900 dark:text-gray-100">
+                      Ad boundary refinement
+                    </label>
+                    <p className="text-xs text-gray-600 dark:text-gray-400">
+                      Cue snaps ad edges to silences and sponsor cues without extra LLM calls. Hybrid only asks the LLM when cue snapping is unsure.
+                    </p>
+                  </div>
+                  <select
+                    value={currentFeed.boundary_refinement_strategy ?? 'inherit'}
+                    onChange={(e) => handleBoundaryRefinementStrategyChange(e.target.value)}
+                    disabled={updateFeedSettingsMutation.isPending}
+                    className={`text-sm border border-gray-300 dark:border-gray-600 rounded-md px-3 py-2 bg-white dark:bg-gray-700 text-gray-900 dark:text-gray-100 ${updateFeedSettingsMutation.isPending
+                      ? 'opacity-60 cursor-not-allowed'
+                      : ''
+                      }`}
+                  >
+                    <option value="inherit">Use global setting</option>
+                    <option value="llm">LLM</option>
+                    <option value="cue">Cue (no LLM)</option>
+                    <option value="hybrid">Hybrid</option>
+                  </select>
+                </div>
               </div>
             )}
           </div>
@@ -1,6 +1,7 @@
 import axios from 'axios';
 import { diagnostics } from '../utils/diagnostics';
 import type {
+  BoundaryRefinementStrategy,
   Feed,
   Episode,
   Job,
@@ -142,7 +143,10 @@ export const feedsApi = {
 
   updateFeedSettings: async (
     feedId: number,
-    settings: { auto_whitelist_new_episodes_override: boolean | null }
+    settings: {
+      auto_whitelist_new_episodes_override?: boolean | null;
+      boundary_refinement_strategy?: BoundaryRefinementStrategy | null;
+    }
   ): Promise<Feed> => {
     const response = await api.patch(`/api/feeds/${feedId}/settings`, settings);
     return response.data;
@@ -278,6 +282,8 @@ export const feedsApi = {
       }>;
       model_call_statuses: Record<string, number>;
       model_types: Record<string, number>;
+      cached_prompt_tokens?: number;
+      llm_usage?: LlmUsageSummary;
     };
     model_calls: Array<{
       id: number;
@@ -288,6 +294,12 @@ export const feedsApi = {
       last_segment_sequence_num: number;
       timestamp: string | null;
       retry_attempts: number;
+      provider?: string | null;
+      latency_ms?: number | null;
+      queue_wait_ms?: number | null;
+      prompt_tokens?: number | null;
+      completion_tokens?: number | null;
+      cached_prompt_tokens?: number | null;
       error_message: string | null;
       prompt: string | null;
       response: string | null;
@@ -392,6 +404,8 @@ export const feedsApi = {
       estimated_ad_time_seconds: number;
       model_call_statuses: Record<string, number>;
       model_types: Record<string, number>;
+      cached_prompt_tokens?: number;
+      llm_usage?: LlmUsageSummary;
     };
     model_calls: Array<{
       id: number;
@@ -402,6 +416,12 @@ export const feedsApi = {
       last_segment_sequence_num: number;
       timestamp: string | null;
       retry_attempts: number;
+      provider?: string | null;
+      latency_ms?: number | null;
+      queue_wait_ms?: number | null;
+      prompt_tokens?: number | null;
+      completion_tokens?: number | null;
+      cached_prompt_tokens?: number | null;
       error_message: string | null;
       prompt: string | null;
       response: string | null;
@@ -637,6 +657,30 @@ export const versionApi = {
   }
 };
 
+export interface LlmUsageTotals {
+  calls: number;
+  avg_latency_ms: number | null;
+  max_latency_ms: number | null;
+  total_latency_ms: number;
+  avg_queue_wait_ms: number | null;
+  total_queue_wait_ms: number;
+  prompt_tokens: number;
+  completion_tokens: number;
+  cached_prompt_tokens: number;
+}
+
+export interface LlmUsageSummary extends LlmUsageTotals {
+  by_provider: Record<string, LlmUsageTotals>;
+}
+
+export interface LlmOutputQuality {
+  calls: number;
+  parse_failures: number;
+  parse_failure_rate: number | null;
+  retried_calls: number;
+  retry_rate: number | null;
+}
+
 export interface StatsResponse {
   feeds: { total: number };
   episodes: { total: number; processed: number; unprocessed: number };
@@ -645,6 +689,9 @@ export interface StatsResponse {
     total: number;
     by_model: Record<string, number>;
     by_status: Record<string, number>;
+    usage?: LlmUsageSummary;
+    // model name -> response format ("json_schema" | "text") -> rates
+    output_quality?: Record<string, Record<string, LlmOutputQuality>>;
   };
   ad_detection: {
     total_identifications: number;
@@ -10,8 +10,11 @@ export interface Feed {
   is_member?: boolean;
   is_active_subscription?: boolean;
   auto_whitelist_new_episodes_override?: boolean | null;
+  boundary_refinement_strategy?: BoundaryRefinementStrategy | null;
 }
 
+export type BoundaryRefinementStrategy = 'llm' | 'cue' | 'hybrid';
+
 export interface Episode {
   id: number;
   guid: string;
@@ -0,0 +1,198 @@
+"""Benchmark ad removal with fades on synthetic multi-hour audio.
+
+Compares the faded clip graph built from one ``ffmpeg.input`` per piece (3N+1
+for N ads), the re-encoding graph that fans a single input out with
+``asplit``, the concat demuxer reading ``inpoint``/``outpoint`` spans of the
+source, and copying MP3 frames with only the fades re-encoded. Reports
+wall time and peak RSS (the larger of the Python process and its ffmpeg
+children).
+
+    python scripts/benchmark_clip_segments.py --hours 3 --ads-per-hour 4
+
+Each variant runs in its own child process, so its peak RSS is not mixed up
+with the other's.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC))
+
+import ffmpeg  # type: ignore[import-untyped]  # noqa: E402
+
+from podcast_processor.audio import (  # noqa: E402
+    _clip_segments_complex,
+    _clip_segments_single_pass,
+    _fade_clip_pieces,
+    get_audio_duration_ms,
+)
+from podcast_processor.mp3_splice import splice_mp3  # noqa: E402
+
+FADE_MS = 3_000
+AD_MS = 90_000
+
+
+def make_episode(path: Path, hours: float) -> None:
+    """A tone over noise, mono 44.1 kHz MP3, like a typical feed episode."""
+    seconds = hours * 3600
+    tone = ffmpeg.input(f"sine=frequency=220:sample_rate=44100:d={seconds}", f="lavfi")
+    noise = ffmpeg.input(
+        f"anoisesrc=color=pink:amplitude=0.05:sample_rate=44100:d={seconds}",
+        f="lavfi",
+    )
+    (
+        ffmpeg.filter([tone, noise], "amix", inputs=2)
+        .output(str(path), acodec="libmp3lame", ac=1, audio_bitrate="64k")
+        .overwrite_output()
+        .run(quiet=True)
+    )
+
+
+def ad_layout(duration_ms: int, ads_per_hour: int) -> list[tuple[int, int]]:
+    spacing_ms = 3_600_000 // ads_per_hour
+    return [
+        (start, start + AD_MS)
+        for start in range(spacing_ms // 2, duration_ms - AD_MS, spacing_ms)
+    ]
+
+
+def clip_per_piece_inputs(
+    ad_segments_ms: list[tuple[int, int]],
+    fade_ms: int,
+    in_path: str,
+    out_path: str,
+    audio_duration_ms: int,
+) -> None:
+    """The previous graph, one ``ffmpeg.input`` per piece.
+
+    ffmpeg-python merges identical input nodes, so this also compiles to a
+    single ``-i`` whose decoded stream feeds every piece.
+    """
+    trimmed_list = []
+    last_end = 0
+    for start_ms, end_ms in ad_segments_ms:
+        trimmed_list.extend(
+            [
+                ffmpeg.input(in_path).filter(
+                    "atrim", start=last_end / 1000.0, end=start_ms / 1000.0
+                ),
+                ffmpeg.input(in_path)
+                .filter(
+                    "atrim", start=start_ms / 1000.0, end=(start_ms + fade_ms) / 1000.0
+                )
+                .filter("afade", t="out", ss=0, d=fade_ms / 1000.0),
+                ffmpeg.input(in_path)
+                .filter("atrim", start=(end_ms - fade_ms) / 1000.0, end=end_ms / 1000.0)
+                .filter("afade", t="in", ss=0, d=fade_ms / 1000.0),
+            ]
+        )
+        last_end = end_ms
+    if last_end != audio_duration_ms:
+        trimmed_list.append(
+            ffmpeg.input(in_path).filter(
+                "atrim", start=last_end / 1000.0, end=audio_duration_ms / 1000.0
+            )
+        )
+    ffmpeg.concat(*trimmed_list, v=0, a=1).output(out_path).overwrite_output().run(
+        quiet=True
+    )
+
+
+def clip_frame_copy(
+    ad_segments_ms: list[tuple[int, int]],
+    fade_ms: int,
+    in_path: str,
+    out_path: str,
+    audio_duration_ms: int,
+) -> None:
+    splice_mp3(
+        _fade_clip_pieces(ad_segments_ms, fade_ms, audio_duration_ms),
+        in_path,
+        out_path,
+    )
+
+
+VARIANTS = {
+    "per-piece inputs": clip_per_piece_inputs,
+    "single input": _clip_segments_complex,
+    "concat demuxer": _clip_segments_single_pass,
+    "frame copy": clip_frame_copy,
+}
+
+
+def run_variant(name: str, in_path: str, ads_per_hour: int) -> dict[str, float]:
+    duration_ms = get_audio_duration_ms(in_path)
+    assert duration_ms is not None
+    ads = ad_layout(duration_ms, ads_per_hour)
+    with tempfile.TemporaryDirectory() as out_dir:
+        out_path = str(Path(out_dir) / "out.mp3")
+        started = time.perf_counter()
+        VARIANTS[name](ads, FADE_MS, in_path, out_path, duration_ms)
+        wall = time.perf_counter() - started
+        out_ms = get_audio_duration_ms(out_path) or 0
+    # ru_maxrss is in KiB on Linux.
+    peak_kib = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return {
+        "ads": len(ads),
+        "wall_seconds": wall,
+        "peak_rss_mib": peak_kib / 1024,
+        "output_seconds": out_ms / 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--ads-per-hour", type=int, default=4)
+    parser.add_argument(
+        "--audio", help="Benchmark this file instead of a synthetic one"
+    )
+    parser.add_argument("--variant", choices=VARIANTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(run_variant(args.variant, args.audio, args.ads_per_hour)))
+        return
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        audio = args.audio
+        if audio is None:
+            audio = str(Path(work_dir) / "episode.mp3")
+            print(f"Generating {args.hours:g}h of synthetic audio...")
+            make_episode(Path(audio), args.hours)
+        for name in VARIANTS:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--variant",
+                    name,
+                    "--audio",
+                    audio,
+                    "--ads-per-hour",
+                    str(args.ads_per_hour),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{name:>17}: {stats['ads']} ads, {stats['wall_seconds']:.1f}s wall, "
+                f"{stats['peak_rss_mib']:.0f} MiB peak RSS, "
+                f"{stats['output_seconds']:.1f}s output"
+            )
+
+
+if __name__ == "__main__":
+    main()
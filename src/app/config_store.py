@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import logging
 import os
 from typing import Any
@@ -51,6 +52,88 @@ def _parse_bool(val: Any) -> bool | None:
     return None
 
 
+# Settings without a Settings page field are read from these environment
+# variables only. The Config model parses and validates the raw values.
+_ENV_ONLY_SETTINGS: dict[str, str] = {
+    "ENABLE_SPONSOR_INDEX": "enable_sponsor_index",
+    "SPONSOR_INDEX_MATCH_THRESHOLD": "sponsor_index_match_threshold",
+    "SPONSOR_INDEX_MIN_AD_CONFIDENCE": "sponsor_index_min_ad_confidence",
+    "SPONSOR_INDEX_SKIP_COVERAGE": "sponsor_index_skip_coverage",
+    "SPONSOR_INDEX_MAX_ENTRIES_PER_FEED": "sponsor_index_max_entries_per_feed",
+    "SPONSOR_INDEX_MAX_AGE_DAYS": "sponsor_index_max_age_days",
+    "ENABLE_LOCAL_CLASSIFIER": "enable_local_classifier",
+    "LOCAL_CLASSIFIER_MIN_TRAINING_EPISODES": "local_classifier_min_training_episodes",
+    "LOCAL_CLASSIFIER_SKIP_THRESHOLD": "local_classifier_skip_threshold",
+    "LOCAL_CLASSIFIER_FALLBACK_THRESHOLD": "local_classifier_fallback_threshold",
+    "LLM_ENDPOINTS": "llm_endpoints",
+    "LLM_HEDGE_PERCENTILE": "llm_hedge_percentile",
+    "LLM_HEDGE_MIN_SAMPLES": "llm_hedge_min_samples",
+    "LLM_SHARED_LIMITER_PATH": "llm_shared_limiter_path",
+    "LLM_CIRCUIT_BREAKER_FAILURE_THRESHOLD": "llm_circuit_breaker_failure_threshold",
+    "LLM_CIRCUIT_BREAKER_RESET_SECONDS": "llm_circuit_breaker_reset_seconds",
+    "LLM_CIRCUIT_BREAKER_MAX_OPEN_SECONDS": "llm_circuit_breaker_max_open_seconds",
+    "BOUNDARY_REFINEMENT_STRATEGY": "boundary_refinement_strategy",
+    "BOUNDARY_REFINEMENT_HYBRID_MIN_CONFIDENCE": "boundary_refinement_hybrid_min_confidence",
+    "TRAFFIC_CASSETTE_PATH": "traffic_cassette_path",
+    "TRAFFIC_CASSETTE_MODE": "traffic_cassette_mode",
+    "TRAFFIC_CASSETTE_REPLAY_LATENCY": "traffic_cassette_replay_latency",
+    "ENABLE_VOICE_ACTIVITY_TRIMMING": "enable_voice_activity_trimming",
+    "VAD_MIN_SILENCE_SECONDS": "vad_min_silence_seconds",
+    "VAD_PADDING_SECONDS": "vad_padding_seconds",
+    "VAD_THRESHOLD_DB": "vad_threshold_db",
+    "TRANSCRIPTION_TEMPO": "transcription_tempo",
+    "ENABLE_AUDIO_FINGERPRINTING": "enable_audio_fingerprinting",
+    "AUDIO_FINGERPRINT_MIN_SPAN_SECONDS": "audio_fingerprint_min_span_seconds",
+    "AUDIO_FINGERPRINT_MAX_SPAN_SECONDS": "audio_fingerprint_max_span_seconds",
+    "AUDIO_FINGERPRINT_MAX_ENTRIES": "audio_fingerprint_max_entries",
+    "ENABLE_TWO_PASS_CLASSIFICATION": "enable_two_pass_classification",
+    "COARSE_PASS_SEGMENTS_PER_PROMPT": "coarse_pass_segments_per_prompt",
+    "COARSE_PASS_SEGMENT_STRIDE": "coarse_pass_segment_stride",
+    "COARSE_PASS_MAX_CHARS_PER_SEGMENT": "coarse_pass_max_chars_per_segment",
+    "COARSE_PASS_PADDING_SEGMENTS": "coarse_pass_padding_segments",
+    "LLM_ENABLE_STREAMING": "llm_enable_streaming",
+    "LLM_ENABLE_STRUCTURED_OUTPUT": "llm_enable_structured_output",
+    "LLM_COMPACT_PROMPTS": "llm_compact_prompts",
+    "LLM_COMPACT_MIN_LINE_WORDS": "llm_compact_min_line_words",
+    "ENABLE_PUBLISHER_CHAPTERS": "enable_publisher_chapters",
+}
+
+# Env-only settings of the remote Whisper config
+_WHISPER_ENV_ONLY_SETTINGS: dict[str, str] = {
+    "WHISPER_SECONDARY_ENDPOINTS": "secondary_endpoints",
+    "WHISPER_HEDGE_PERCENTILE": "hedge_percentile",
+    "WHISPER_HEDGE_MIN_SAMPLES": "hedge_min_samples",
+    "WHISPER_ADAPTIVE_CHUNKING": "adaptive_chunking",
+    "WHISPER_MIN_CHUNK_SECONDS": "min_chunk_seconds",
+    "WHISPER_MAX_CHUNK_SECONDS": "max_chunk_seconds",
+}
+
+# Env-only settings whose values are JSON, such as lists of endpoints
+_JSON_ENV_ONLY_SETTINGS = {"LLM_ENDPOINTS", "WHISPER_SECONDARY_ENDPOINTS"}
+
+
+def _env_only_settings(env_names: dict[str, str]) -> dict[str, Any]:
+    """Raw values of the env-only settings that are set, keyed by field name.
+
+    ``none`` (any case) unsets an optional setting; JSON settings are decoded.
+    """
+    settings: dict[str, Any] = {}
+    for env_name, field_name in env_names.items():
+        raw = (os.environ.get(env_name) or "").strip()
+        if not raw:
+            continue
+        if raw.lower() == "none":
+            settings[field_name] = None
+        elif env_name in _JSON_ENV_ONLY_SETTINGS:
+            try:
+                settings[field_name] = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{env_name} is not valid JSON: {exc}") from exc
+        else:
+            settings[field_name] = raw
+    return settings
+
+
 def _ensure_row(model: type, defaults: dict[str, Any]) -> Any:
     row = db.session.get(model, 1)
     if row is None:
@@ -578,6 +661,7 @@ def to_pydantic_config() -> PydanticConfig:
             language=w.get("language", "en"),
             timeout_sec=w.get("timeout_sec", 600),
             chunksize_mb=w.get("chunksize_mb", 24),
+            **_env_only_settings(_WHISPER_ENV_ONLY_SETTINGS),
         )
     elif wtype == "test":
         whisper_obj = TestWhisperConfig()
@@ -686,6 +770,7 @@ def to_pydantic_config() -> PydanticConfig:
             )
             or DEFAULTS.APP_DB_BACKUP_RETENTION_COUNT
         ),
+        **_env_only_settings(_ENV_ONLY_SETTINGS),
     )
 
 
@@ -831,6 +916,7 @@ def _configure_remote_whisper(cfg: PydanticConfig) -> None:
         language=lang,
         timeout_sec=timeout_sec,
         chunksize_mb=chunksize_mb,
+        **_env_only_settings(_WHISPER_ENV_ONLY_SETTINGS),
     )
 
 
@@ -14,7 +14,9 @@ from app.extensions import db
 from app.models import Feed, Post, User, UserFeed
 from app.runtime_config import config
 from app.writer.client import writer_client
+from podcast_processor.audio import cached_probe
 from podcast_processor.podcast_downloader import find_audio_link
+from podcast_processor.publisher_chapters import find_chapters_url
 
 logger = logging.getLogger("global_logger")
 
@@ -173,6 +175,7 @@ number_of_episodes_to_whitelist_from_archive_of_new_feed setting: {entry.title}"
                 "release_date": p.release_date.isoformat() if p.release_date else None,
                 "duration": p.duration,
                 "image_url": p.image_url,
+                "chapters_url": p.chapters_url,
                 "whitelisted": p.whitelisted,
                 "feed_id": feed.id,
             }
@@ -240,6 +243,7 @@ def add_feed(feed_data: feedparser.FeedParserDict) -> Feed:
                 "release_date": p.release_date.isoformat() if p.release_date else None,
                 "duration": p.duration,
                 "image_url": p.image_url,
+                "chapters_url": p.chapters_url,
                 "whitelisted": p.whitelisted,
             }
             posts_data.append(post_data)
@@ -275,9 +279,11 @@ class ItunesRSSItem(PyRSS2Gen.RSSItem):  # type: ignore[misc]
         guid: str,
         pubDate: str | None,
         image_url: str | None = None,
+        duration_seconds: int | None = None,
         **kwargs: Any,
     ) -> None:
         self.image_url = image_url
+        self.duration_seconds = duration_seconds
         super().__init__(
             title=title,
             enclosure=enclosure,
@@ -291,6 +297,10 @@ class ItunesRSSItem(PyRSS2Gen.RSSItem):  # type: ignore[misc]
         if self.image_url:
             handler.startElement("itunes:image", {"href": self.image_url})
             handler.endElement("itunes:image")
+        if self.duration_seconds is not None:
+            handler.startElement("itunes:duration", {})
+            handler.characters(str(self.duration_seconds))
+            handler.endElement("itunes:duration")
         super().publish_extensions(handler)
 
 
@@ -314,6 +324,9 @@ def feed_item(post: Post, prepend_feed_title: bool = False) -> PyRSS2Gen.RSSItem
     if prepend_feed_title and post.feed:
         title = f"[{post.feed.title}] {title}"
 
+    # Only what was probed when the audio was cut; never probe while serving
+    probe = cached_probe(post.processed_audio_path, post.audio_probes)
+
     item = ItunesRSSItem(
         title=title,
         enclosure=PyRSS2Gen.Enclosure(
@@ -325,6 +338,7 @@ def feed_item(post: Post, prepend_feed_title: bool = False) -> PyRSS2Gen.RSSItem
         guid=post.guid,
         pubDate=_format_pub_date(post.release_date),
         image_url=post.image_url,
+        duration_seconds=round(probe.duration_ms / 1000) if probe else None,
     )
 
     return item
@@ -514,6 +528,7 @@ def make_post(feed: Feed, entry: feedparser.FeedParserDict) -> Post:
         release_date=_parse_release_date(entry),
         duration=get_duration(entry),
         image_url=episode_image_url,
+        chapters_url=find_chapters_url(entry),
     )
 
 
@@ -417,8 +417,11 @@ class JobsManager:
         """
         cutoff = datetime.utcnow() - timedelta(minutes=stuck_threshold_minutes)
         with scheduler.app.app_context():
+            # Jobs parked during a provider outage are waiting on purpose.
             stuck_jobs = ProcessingJob.query.filter(
-                ProcessingJob.status == "pending", ProcessingJob.created_at < cutoff
+                ProcessingJob.status == "pending",
+                ProcessingJob.created_at < cutoff,
+                ProcessingJob.resume_after.is_(None),
             ).all()
 
             count = len(stuck_jobs)
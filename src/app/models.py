@@ -31,6 +31,8 @@ class Feed(db.Model):  # type: ignore[name-defined, misc]
     rss_url = db.Column(db.Text, unique=True, nullable=False)
     image_url = db.Column(db.Text)
     auto_whitelist_new_episodes_override = db.Column(db.Boolean, nullable=True)
+    # "llm", "cue" or "hybrid"; NULL follows the global boundary refinement strategy
+    boundary_refinement_strategy = db.Column(db.String(16), nullable=True)
 
     posts = db.relationship(
         "Post", backref="feed", lazy=True, order_by="Post.release_date.desc()"
@@ -45,6 +47,86 @@ class Feed(db.Model):  # type: ignore[name-defined, misc]
         return f"<Feed {self.title}>"
 
 
+class SponsorSignature(db.Model):  # type: ignore[name-defined, misc]
+    """A recurring sponsor read of a feed, indexed by hashed word shingles."""
+
+    __tablename__ = "sponsor_signature"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    feed_id = db.Column(
+        db.Integer, db.ForeignKey("feed.id"), nullable=False, index=True
+    )
+    # MinHash signature, used to merge re-occurrences into one entry
+    minhash = db.Column(db.JSON, nullable=False)
+    # Hashed word shingles, used for segment matching
+    shingles = db.Column(db.JSON, nullable=False)
+    word_count = db.Column(db.Integer, nullable=False, default=0)
+    sample_text = db.Column(db.Text, nullable=True)
+    hit_count = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_seen_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    feed = db.relationship(
+        "Feed", backref=db.backref("sponsor_signatures", lazy="dynamic")
+    )
+
+    def __repr__(self) -> str:
+        return f"<SponsorSignature {self.id} F:{self.feed_id} hits={self.hit_count}>"
+
+
+class FeedAdClassifier(db.Model):  # type: ignore[name-defined, misc]
+    """A feed's local ad pre-screen model, trained from past identifications."""
+
+    __tablename__ = "feed_ad_classifier"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    feed_id = db.Column(
+        db.Integer, db.ForeignKey("feed.id"), nullable=False, unique=True, index=True
+    )
+    # Serialized LocalAdClassifier (numpy .npz)
+    model_blob = db.Column(db.LargeBinary, nullable=False)
+    episodes_trained = db.Column(db.Integer, nullable=False, default=0)
+    segments_trained = db.Column(db.Integer, nullable=False, default=0)
+    # Loss on the latest episode before training on it (a held-out estimate)
+    last_episode_loss = db.Column(db.Float, nullable=True)
+    # Posts already trained on; reprocessing one does not train on it again
+    trained_post_ids = db.Column(db.JSON, nullable=True)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    feed = db.relationship(
+        "Feed", backref=db.backref("ad_classifier", uselist=False, lazy=True)
+    )
+
+    def __repr__(self) -> str:
+        return f"<FeedAdClassifier F:{self.feed_id} episodes={self.episodes_trained}>"
+
+
+class AudioFingerprint(db.Model):  # type: ignore[name-defined, misc]
+    """Landmark fingerprint of a confirmed ad span, shared across all feeds."""
+
+    __tablename__ = "audio_fingerprint"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    # Post the ad was first cut from; kept for provenance only, the
+    # fingerprint outlives the post.
+    source_post_id = db.Column(db.Integer, nullable=True)
+    duration_seconds = db.Column(db.Float, nullable=False)
+    # Packed little-endian int32 arrays of landmark hashes and anchor frames
+    landmarks = db.Column(db.LargeBinary, nullable=False)
+    landmark_count = db.Column(db.Integer, nullable=False, default=0)
+    hit_count = db.Column(db.Integer, nullable=False, default=1)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_matched_at = db.Column(
+        db.DateTime, nullable=False, default=datetime.utcnow, index=True
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<AudioFingerprint {self.id} {self.duration_seconds:.1f}s "
+            f"hits={self.hit_count}>"
+        )
+
+
 class FeedAccessToken(db.Model):  # type: ignore[name-defined, misc]
     __tablename__ = "feed_access_token"
 
@@ -86,6 +168,18 @@ class Post(db.Model):  # type: ignore[name-defined, misc]
     whitelisted = db.Column(db.Boolean, default=False, nullable=False)
     image_url = db.Column(db.Text)  # Episode thumbnail URL
     download_count = db.Column(db.Integer, nullable=True, default=0)
+    # Podcasting 2.0 chapters file linked from the feed entry
+    chapters_url = db.Column(db.Text, nullable=True)
+    # Chapters captured at download (JSON file or embedded); null until then
+    publisher_chapters = db.Column(db.JSON, nullable=True)
+    # Hash of the cut list (and fade) the processed audio was rendered from
+    cut_list_hash = db.Column(db.String(64), nullable=True)
+    # ffprobe results for the post's audio files, by path, with the size and
+    # mtime they were taken at
+    audio_probes = db.Column(db.JSON, nullable=True)
+    # Silences ([start, end] seconds) ffmpeg found in the original audio,
+    # kept by cue and hybrid boundary refinement after the audio is deleted
+    audio_silences = db.Column(db.JSON, nullable=True)
 
     # Latest (most recent) refined ad cut windows for this post.
     # This is written by the ad classifier boundary refinement step and read by the
@@ -188,11 +282,27 @@ class ModelCall(db.Model):  # type: ignore[name-defined, misc]
 
     model_name = db.Column(db.String, nullable=False)
     prompt = db.Column(db.Text, nullable=False)
+    # sha256 of the system and user prompts; a changed hash invalidates the response
+    prompt_hash = db.Column(db.String(64), nullable=True)
     response = db.Column(db.Text, nullable=True)
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     status = db.Column(db.String, nullable=False, default="pending")
     error_message = db.Column(db.Text, nullable=True)
     retry_attempts = db.Column(db.Integer, nullable=False, default=0)
+    # Prompt tokens the provider served from its prompt-prefix cache
+    cached_prompt_tokens = db.Column(db.Integer, nullable=True)
+    prompt_tokens = db.Column(db.Integer, nullable=True)
+    completion_tokens = db.Column(db.Integer, nullable=True)
+    # Wall-clock time of the provider call itself
+    latency_ms = db.Column(db.Integer, nullable=True)
+    # Time spent waiting on the rate limiter and for a concurrency slot
+    queue_wait_ms = db.Column(db.Integer, nullable=True)
+    provider = db.Column(db.String(64), nullable=True)
+    # "json_schema" when the provider constrained output to the prediction
+    # schema, "text" otherwise
+    response_format = db.Column(db.String(16), nullable=True)
+    # Set once the response has been parsed; None until then
+    parse_failed = db.Column(db.Boolean, nullable=True)
 
     identifications = db.relationship(
         "Identification", backref="model_call", lazy="dynamic"
@@ -295,6 +405,8 @@ class ProcessingJob(db.Model):  # type: ignore[name-defined, misc]
     completed_at = db.Column(db.DateTime)
     error_message = db.Column(db.Text)
     scheduler_job_id = db.Column(db.String(255))  # APScheduler job ID
+    # Pending jobs parked during an LLM provider outage are not dequeued before this
+    resume_after = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     requested_by_user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     billing_user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
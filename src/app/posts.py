@@ -8,6 +8,7 @@ from typing import Any
 from app.models import Identification, ModelCall, Post, ProcessingJob, TranscriptSegment
 from app.writer.client import writer_client
 from podcast_processor.podcast_downloader import get_and_make_download_path
+from shared.processing_paths import reprocess_archive_tag
 
 logger = logging.getLogger("global_logger")
 
@@ -166,12 +167,17 @@ def clear_post_processing_data(post: Post) -> None:
         raise PostException(f"Failed to clear processing data: {e!s}") from e
 
 
-def clear_post_identifications_only(post: Post) -> None:
+def clear_post_identifications_only(
+    post: Post, *, reuse_llm_responses: bool = False
+) -> None:
     """
     Clear only identifications and LLM model calls, preserving transcript segments.
 
     Useful for reprocessing with a different ad detection strategy while reusing
     the existing transcription (saves Whisper API costs and time).
+
+    With ``reuse_llm_responses``, successful LLM calls are kept so only windows
+    whose prompt or model changed are sent to the LLM again.
     """
     try:
         logger.info(
@@ -181,7 +187,9 @@ def clear_post_identifications_only(post: Post) -> None:
         archived_processed_audio = _archive_processed_audio_for_reprocess(post)
 
         result = writer_client.action(
-            "clear_post_identifications_only", {"post_id": post.id}, wait=True
+            "clear_post_identifications_only",
+            {"post_id": post.id, "reuse_llm_responses": reuse_llm_responses},
+            wait=True,
         )
 
         if result and result.success:
@@ -265,13 +273,16 @@ def _archive_processed_audio_for_reprocess(post: Post) -> Path | None:
         return None
 
     timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+    # Tag the archive with the cut list it was rendered from so an unchanged
+    # reprocess can restore it instead of cutting the audio again.
+    cut_tag = reprocess_archive_tag(post.cut_list_hash)
     backup_path = processed_audio_path.with_name(
-        f"{processed_audio_path.name}.reprocess-{timestamp}.bak"
+        f"{processed_audio_path.name}.reprocess-{timestamp}{cut_tag}.bak"
     )
     collision_index = 1
     while backup_path.exists():
         backup_path = processed_audio_path.with_name(
-            f"{processed_audio_path.name}.reprocess-{timestamp}-{collision_index}.bak"
+            f"{processed_audio_path.name}.reprocess-{timestamp}-{collision_index}{cut_tag}.bak"
         )
         collision_index += 1
 
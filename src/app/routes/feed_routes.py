@@ -45,6 +45,7 @@ from app.models import (
 )
 from app.writer.client import writer_client
 from podcast_processor.podcast_downloader import sanitize_title
+from shared.config import BOUNDARY_REFINEMENT_STRATEGIES
 from shared.processing_paths import get_in_root, get_srv_root
 
 from .auth_routes import _require_authenticated_user as _auth_get_user
@@ -458,23 +459,41 @@ def update_feed_settings_endpoint(feed_id: int) -> ResponseReturnValue:
         return error_response
 
     payload = request.get_json(silent=True) or {}
-    if "auto_whitelist_new_episodes_override" not in payload:
-        return jsonify({"error": "No settings provided."}), 400
+    settings: dict[str, Any] = {}
 
-    override = payload.get("auto_whitelist_new_episodes_override")
-    if override is not None and not isinstance(override, bool):
-        return (
-            jsonify(
-                {
-                    "error": "auto_whitelist_new_episodes_override must be a boolean or null."
-                }
-            ),
-            400,
-        )
+    if "auto_whitelist_new_episodes_override" in payload:
+        override = payload.get("auto_whitelist_new_episodes_override")
+        if override is not None and not isinstance(override, bool):
+            return (
+                jsonify(
+                    {
+                        "error": "auto_whitelist_new_episodes_override must be a boolean or null."
+                    }
+                ),
+                400,
+            )
+        settings["auto_whitelist_new_episodes_override"] = override
+
+    if "boundary_refinement_strategy" in payload:
+        strategy = payload.get("boundary_refinement_strategy")
+        if strategy is not None and strategy not in BOUNDARY_REFINEMENT_STRATEGIES:
+            return (
+                jsonify(
+                    {
+                        "error": "boundary_refinement_strategy must be one of "
+                        f"{', '.join(BOUNDARY_REFINEMENT_STRATEGIES)} or null."
+                    }
+                ),
+                400,
+            )
+        settings["boundary_refinement_strategy"] = strategy
+
+    if not settings:
+        return jsonify({"error": "No settings provided."}), 400
 
     result = writer_client.action(
         "update_feed_settings",
-        {"feed_id": feed_id, "auto_whitelist_new_episodes_override": override},
+        {"feed_id": feed_id, **settings},
         wait=True,
     )
     if result is None or not result.success:
@@ -938,6 +957,9 @@ def _serialize_feed(
         "auto_whitelist_new_episodes_override": getattr(
             feed, "auto_whitelist_new_episodes_override", None
         ),
+        "boundary_refinement_strategy": getattr(
+            feed, "boundary_refinement_strategy", None
+        ),
         "posts_count": posts_count,
         "member_count": len(member_ids),
         "is_member": is_member,
@@ -25,12 +25,14 @@ from app.posts import (
     snapshot_post_processing_data,
 )
 from app.routes.post_stats_utils import (
+    accumulate_model_call_usage,
     count_model_calls,
     count_primary_labels,
     group_identifications_by_segment,
     is_mixed_segment,
     merge_time_windows,
     parse_refined_windows,
+    summarize_usage_totals,
 )
 from app.runtime_config import config as runtime_config
 from app.writer.client import writer_client
@@ -412,6 +414,12 @@ def api_post_stats(p_guid: str) -> flask.Response:
                 "last_segment_sequence_num": call.last_segment_sequence_num,
                 "timestamp": call.timestamp.isoformat() if call.timestamp else None,
                 "retry_attempts": call.retry_attempts,
+                "provider": call.provider,
+                "latency_ms": call.latency_ms,
+                "queue_wait_ms": call.queue_wait_ms,
+                "prompt_tokens": call.prompt_tokens,
+                "completion_tokens": call.completion_tokens,
+                "cached_prompt_tokens": call.cached_prompt_tokens,
                 "error_message": call.error_message,
                 "prompt": call.prompt,
                 "response": call.response,
@@ -524,6 +532,12 @@ def api_post_stats(p_guid: str) -> flask.Response:
             ],
             "model_call_statuses": model_call_statuses,
             "model_types": model_types,
+            "cached_prompt_tokens": sum(
+                call.cached_prompt_tokens or 0 for call in model_calls
+            ),
+            "llm_usage": summarize_usage_totals(
+                accumulate_model_call_usage(model_calls)
+            ),
         },
         "model_calls": model_call_details,
         "transcript_segments": transcript_segments_data,
@@ -751,9 +765,13 @@ def api_reprocess_post(p_guid: str) -> ResponseReturnValue:
         force_retranscribe: bool - If true, clears transcript and re-transcribes.
                                    If false (default), keeps existing transcript
                                    and only clears identifications.
+        force_reclassify: bool - If true, discards stored LLM responses too.
+                                 If false (default), only windows whose prompt
+                                 or model changed are sent to the LLM again.
     """
     data = request.get_json(silent=True) or {}
     force_retranscribe = data.get("force_retranscribe", False)
+    force_reclassify = data.get("force_reclassify", False)
 
     logger.info(
         "[API] Reprocess requested for post_guid=%s force_retranscribe=%s",
@@ -869,7 +887,9 @@ def api_reprocess_post(p_guid: str) -> ResponseReturnValue:
                 "Post fully cleared (including transcript) and reprocessing started"
             )
         else:
-            clear_post_identifications_only(post)
+            clear_post_identifications_only(
+                post, reuse_llm_responses=not force_reclassify
+            )
             clear_message = "Post identifications cleared (transcript preserved) and reprocessing started"
 
         logger.info(
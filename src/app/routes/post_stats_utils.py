@@ -22,6 +22,107 @@ def count_model_calls(
     return model_call_statuses, model_types
 
 
+_USAGE_TOKEN_FIELDS = ("prompt_tokens", "completion_tokens", "cached_prompt_tokens")
+
+
+def new_usage_totals() -> dict[str, int]:
+    """Empty running totals consumed by ``summarize_usage_totals``."""
+    return {
+        "calls": 0,
+        "latency_sum_ms": 0,
+        "latency_count": 0,
+        "latency_max_ms": 0,
+        "queue_wait_sum_ms": 0,
+        "queue_wait_count": 0,
+        **{field: 0 for field in _USAGE_TOKEN_FIELDS},
+    }
+
+
+def accumulate_model_call_usage(
+    model_calls: Iterable[Any],
+) -> dict[str, dict[str, int]]:
+    """Per-provider usage totals for ModelCall-like objects."""
+    totals: dict[str, dict[str, int]] = {}
+    for call in model_calls:
+        provider = getattr(call, "provider", None) or "unknown"
+        bucket = totals.setdefault(provider, new_usage_totals())
+        bucket["calls"] += 1
+        latency = getattr(call, "latency_ms", None)
+        if latency is not None:
+            bucket["latency_sum_ms"] += int(latency)
+            bucket["latency_count"] += 1
+            bucket["latency_max_ms"] = max(bucket["latency_max_ms"], int(latency))
+        queue_wait = getattr(call, "queue_wait_ms", None)
+        if queue_wait is not None:
+            bucket["queue_wait_sum_ms"] += int(queue_wait)
+            bucket["queue_wait_count"] += 1
+        for field in _USAGE_TOKEN_FIELDS:
+            bucket[field] += int(getattr(call, field, None) or 0)
+    return totals
+
+
+def _usage_summary(totals: dict[str, int]) -> dict[str, Any]:
+    def _avg(total_key: str, count_key: str) -> float | None:
+        count = totals[count_key]
+        return round(totals[total_key] / count, 1) if count else None
+
+    return {
+        "calls": totals["calls"],
+        "avg_latency_ms": _avg("latency_sum_ms", "latency_count"),
+        "max_latency_ms": totals["latency_max_ms"] if totals["latency_count"] else None,
+        "total_latency_ms": totals["latency_sum_ms"],
+        "avg_queue_wait_ms": _avg("queue_wait_sum_ms", "queue_wait_count"),
+        "total_queue_wait_ms": totals["queue_wait_sum_ms"],
+        **{field: totals[field] for field in _USAGE_TOKEN_FIELDS},
+    }
+
+
+def summarize_usage_totals(
+    totals_by_provider: dict[str, dict[str, int]],
+) -> dict[str, Any]:
+    """Overall and per-provider latency/token summary for the stats endpoints."""
+    overall = new_usage_totals()
+    for totals in totals_by_provider.values():
+        for key, value in totals.items():
+            if key == "latency_max_ms":
+                overall[key] = max(overall[key], value)
+            else:
+                overall[key] += value
+
+    return {
+        **_usage_summary(overall),
+        "by_provider": {
+            provider: _usage_summary(totals)
+            for provider, totals in sorted(totals_by_provider.items())
+        },
+    }
+
+
+def summarize_output_quality(
+    rows: Iterable[tuple[Any, ...]],
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """Parse failure and retry rates per model and response format.
+
+    Rows are ``(model_name, response_format, calls, parsed, parse_failures,
+    retried_calls)``; ``parsed`` counts calls whose response was parsed.
+    """
+
+    def _rate(count: int, total: int) -> float | None:
+        return round(count / total, 4) if total else None
+
+    summary: dict[str, dict[str, dict[str, Any]]] = {}
+    for model_name, response_format, *raw_counts in rows:
+        calls, parsed, failures, retried = (int(value or 0) for value in raw_counts)
+        summary.setdefault(model_name, {})[response_format] = {
+            "calls": calls,
+            "parse_failures": failures,
+            "parse_failure_rate": _rate(failures, parsed),
+            "retried_calls": retried,
+            "retry_rate": _rate(retried, calls),
+        }
+    return summary
+
+
 def group_identifications_by_segment(
     identifications: Iterable[Any],
 ) -> dict[int, list[Any]]:
@@ -1,9 +1,10 @@
 import logging
+from typing import Any
 
 import flask
 from flask import Blueprint
 from flask.typing import ResponseReturnValue
-from sqlalchemy import func
+from sqlalchemy import case, func
 
 from app.auth.guards import require_admin
 from app.extensions import db
@@ -16,7 +17,18 @@ from app.models import (
     TranscriptSegment,
 )
 from app.post_cleanup import get_reclaimable_storage_bytes, get_storage_bytes_used
+from app.routes.post_stats_utils import (
+    new_usage_totals,
+    summarize_output_quality,
+    summarize_usage_totals,
+)
 from app.runtime_config import config as runtime_config
+from podcast_processor.cue_boundary_refiner import (
+    CueBoundaryRefiner,
+    compare_with_stored_refinements,
+    summarize_refinement_comparison,
+)
+from podcast_processor.segment_view import SegmentView
 from shared import defaults as DEFAULTS
 
 logger = logging.getLogger("global_logger")
@@ -72,6 +84,62 @@ def api_get_stats() -> ResponseReturnValue:
         row[0]: row[1] for row in model_call_status_rows
     }
 
+    usage_rows = (
+        db.session.query(
+            ModelCall.provider,
+            func.count(ModelCall.id),
+            func.sum(ModelCall.latency_ms),
+            func.count(ModelCall.latency_ms),
+            func.max(ModelCall.latency_ms),
+            func.sum(ModelCall.queue_wait_ms),
+            func.count(ModelCall.queue_wait_ms),
+            func.sum(ModelCall.prompt_tokens),
+            func.sum(ModelCall.completion_tokens),
+            func.sum(ModelCall.cached_prompt_tokens),
+        )
+        .group_by(ModelCall.provider)
+        .all()
+    )
+    usage_by_provider: dict[str, dict[str, int]] = {}
+    for (
+        provider,
+        calls,
+        latency_sum,
+        latency_count,
+        latency_max,
+        queue_wait_sum,
+        queue_wait_count,
+        prompt_tokens,
+        completion_tokens,
+        cached_prompt_tokens,
+    ) in usage_rows:
+        # Rows written before accounting existed have no provider.
+        totals = usage_by_provider.setdefault(provider or "unknown", new_usage_totals())
+        totals["calls"] += int(calls or 0)
+        totals["latency_sum_ms"] += int(latency_sum or 0)
+        totals["latency_count"] += int(latency_count or 0)
+        totals["latency_max_ms"] = max(totals["latency_max_ms"], int(latency_max or 0))
+        totals["queue_wait_sum_ms"] += int(queue_wait_sum or 0)
+        totals["queue_wait_count"] += int(queue_wait_count or 0)
+        totals["prompt_tokens"] += int(prompt_tokens or 0)
+        totals["completion_tokens"] += int(completion_tokens or 0)
+        totals["cached_prompt_tokens"] += int(cached_prompt_tokens or 0)
+
+    # Only classification calls record a response format.
+    output_quality_rows = (
+        db.session.query(
+            ModelCall.model_name,
+            ModelCall.response_format,
+            func.count(ModelCall.id),
+            func.count(ModelCall.parse_failed),
+            func.sum(case((ModelCall.parse_failed.is_(True), 1), else_=0)),
+            func.sum(case((ModelCall.retry_attempts > 1, 1), else_=0)),
+        )
+        .filter(ModelCall.response_format.isnot(None))
+        .group_by(ModelCall.model_name, ModelCall.response_format)
+        .all()
+    )
+
     # ---- Identifications / Ad Detection ----
     total_identifications: int = (
         db.session.query(func.count(Identification.id)).scalar() or 0
@@ -144,6 +212,10 @@ def api_get_stats() -> ResponseReturnValue:
                 "total": total_model_calls,
                 "by_model": model_calls_by_model,
                 "by_status": model_calls_by_status,
+                "usage": summarize_usage_totals(usage_by_provider),
+                "output_quality": summarize_output_quality(
+                    tuple(row) for row in output_quality_rows
+                ),
             },
             "ad_detection": {
                 "total_identifications": total_identifications,
@@ -162,3 +234,77 @@ def api_get_stats() -> ResponseReturnValue:
             },
         }
     )
+
+
+@stats_bp.route("/api/stats/boundary-refinement-comparison", methods=["GET"])
+def api_boundary_refinement_comparison() -> ResponseReturnValue:
+    """Compare the LLM-free cue refiner against stored LLM refinements.
+
+    Query params: ``feed_id`` (optional), ``limit`` (posts, default 50, max 500)
+    and ``tolerance`` (seconds, default 2.0).
+    """
+    _, error = require_admin("view stats")
+    if error:
+        return error
+
+    args = flask.request.args
+    feed_id = args.get("feed_id", type=int)
+    limit = max(1, min(args.get("limit", default=50, type=int) or 50, 500))
+    tolerance = args.get("tolerance", default=2.0, type=float) or 2.0
+
+    query = Post.query.filter(Post.refined_ad_boundaries.isnot(None))
+    if feed_id is not None:
+        query = query.filter(Post.feed_id == feed_id)
+    posts = (
+        query.order_by(Post.refined_ad_boundaries_updated_at.desc()).limit(limit).all()
+    )
+
+    refiner = CueBoundaryRefiner(runtime_config, logger)
+    rows: list[dict[str, Any]] = []
+    per_post: list[dict[str, Any]] = []
+    for post in posts:
+        stored = post.refined_ad_boundaries
+        if not isinstance(stored, list) or not stored:
+            continue
+        segments = (
+            TranscriptSegment.query.filter_by(post_id=post.id)
+            .order_by(TranscriptSegment.sequence_num)
+            .all()
+        )
+        # Cue and hybrid refinement keep the episode's ffmpeg silences on the
+        # post; other posts are compared against transcript gaps, and each
+        # post reports which signal its comparison used.
+        silences = [
+            (float(start), float(end)) for start, end in post.audio_silences or []
+        ] or None
+        post_rows = compare_with_stored_refinements(
+            refiner,
+            SegmentView.from_transcript_segments(segments),
+            stored,
+            silences=silences,
+        )
+        if not post_rows:
+            continue
+        rows.extend(post_rows)
+        per_post.append(
+            {
+                "post_guid": post.guid,
+                "title": post.title,
+                "silence_source": "audio" if silences else "transcript_gaps",
+                **summarize_refinement_comparison(
+                    post_rows, tolerance_seconds=tolerance
+                ),
+                "blocks": post_rows,
+            }
+        )
+
+    return flask.jsonify(
+        {
+            "posts_compared": len(per_post),
+            "posts_with_audio_silences": sum(
+                1 for post in per_post if post["silence_source"] == "audio"
+            ),
+            **summarize_refinement_comparison(rows, tolerance_seconds=tolerance),
+            "posts": per_post,
+        }
+    )
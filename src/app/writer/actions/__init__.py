@@ -30,11 +30,13 @@ from .feeds import refresh_feed_action as refresh_feed_action
 from .feeds import (
     remove_user_feed_membership_action as remove_user_feed_membership_action,
 )
+from .feeds import save_feed_ad_classifier_action as save_feed_ad_classifier_action
 from .feeds import (
     toggle_whitelist_all_for_feed_action as toggle_whitelist_all_for_feed_action,
 )
 from .feeds import touch_feed_access_token_action as touch_feed_access_token_action
 from .feeds import update_feed_settings_action as update_feed_settings_action
+from .feeds import update_sponsor_index_action as update_sponsor_index_action
 from .feeds import (
     whitelist_latest_post_for_feed_action as whitelist_latest_post_for_feed_action,
 )
@@ -45,12 +47,16 @@ from .jobs import clear_all_jobs_action as clear_all_jobs_action
 from .jobs import create_job_action as create_job_action
 from .jobs import dequeue_job_action as dequeue_job_action
 from .jobs import mark_cancelled_action as mark_cancelled_action
+from .jobs import park_job_action as park_job_action
 from .jobs import reassign_pending_jobs_action as reassign_pending_jobs_action
 from .jobs import update_job_status_action as update_job_status_action
 from .processor import insert_identifications_action as insert_identifications_action
 from .processor import mark_model_call_failed_action as mark_model_call_failed_action
 from .processor import replace_identifications_action as replace_identifications_action
 from .processor import replace_transcription_action as replace_transcription_action
+from .processor import (
+    update_audio_fingerprints_action as update_audio_fingerprints_action,
+)
 from .processor import upsert_model_call_action as upsert_model_call_action
 from .processor import (
     upsert_whisper_model_call_action as upsert_whisper_model_call_action,
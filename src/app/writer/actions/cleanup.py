@@ -99,6 +99,7 @@ def clear_post_processing_data_action(params: dict[str, Any]) -> dict[str, Any]:
     post.unprocessed_audio_path = None
     post.processed_audio_path = None
     post.duration = None
+    post.cut_list_hash = None
 
     logger.info(
         "[WRITER] clear_post_processing_data_action: completed post_id=%s", post_id
@@ -183,8 +184,13 @@ def clear_post_identifications_only_action(params: dict[str, Any]) -> dict[str,
                post unprocessed_audio_path and duration.
     Deletes:   Identification records, non-Whisper ModelCall records,
                ProcessingJob records, refined ad boundaries.
+
+    With ``reuse_llm_responses``, successful LLM calls are kept as well. The
+    classifier then re-derives their identifications from the stored responses
+    and only calls the LLM for windows whose prompt or model changed.
     """
     post_id = params.get("post_id")
+    reuse_llm_responses = bool(params.get("reuse_llm_responses"))
     post = db.session.get(Post, post_id)
     if not post:
         raise ValueError(f"Post {post_id} not found")
@@ -213,19 +219,20 @@ def clear_post_identifications_only_action(params: dict[str, Any]) -> dict[str,
 
     # Delete non-Whisper model calls (keep transcription records).
     # Preserve Whisper transcription calls by canonical prompt and model-name patterns.
-    deleted_calls = (
-        db.session.query(ModelCall)
-        .filter(
-            ModelCall.post_id == post.id,
-            ~(ModelCall.prompt == "Whisper transcription job"),
-            ~ModelCall.model_name.like("whisper%"),
-            ~ModelCall.model_name.like("groq:whisper%"),
-            ~ModelCall.model_name.like("groq_whisper%"),
-            ~ModelCall.model_name.like("local_%"),
-            ModelCall.model_name != "test_whisper",
-        )
-        .delete(synchronize_session=False)
+    calls_query = db.session.query(ModelCall).filter(
+        ModelCall.post_id == post.id,
+        ~(ModelCall.prompt == "Whisper transcription job"),
+        ~ModelCall.model_name.like("whisper%"),
+        ~ModelCall.model_name.like("groq:whisper%"),
+        ~ModelCall.model_name.like("groq_whisper%"),
+        ~ModelCall.model_name.like("local_%"),
+        ModelCall.model_name != "test_whisper",
     )
+    if reuse_llm_responses:
+        calls_query = calls_query.filter(
+            ~((ModelCall.status == "success") & ModelCall.response.isnot(None))
+        )
+    deleted_calls = calls_query.delete(synchronize_session=False)
     logger.debug(
         "[WRITER] clear_post_identifications_only_action: deleted %d model calls",
         deleted_calls,
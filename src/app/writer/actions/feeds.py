@@ -1,7 +1,7 @@
 import hashlib
 import secrets
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
 from sqlalchemy import func
@@ -11,13 +11,21 @@ from app.jobs_manager_run_service import recalculate_run_counts
 from app.models import (
     Feed,
     FeedAccessToken,
+    FeedAdClassifier,
     Identification,
     ModelCall,
     Post,
     ProcessingJob,
+    SponsorSignature,
     TranscriptSegment,
     UserFeed,
 )
+from podcast_processor.sponsor_index import (
+    MAX_SHINGLES_PER_ENTRY,
+    MERGE_SIMILARITY,
+    estimate_jaccard,
+    merge_minhash,
+)
 
 
 def refresh_feed_action(params: dict[str, Any]) -> dict[str, Any]:
@@ -119,6 +127,8 @@ def update_feed_settings_action(params: dict[str, Any]) -> dict[str, Any]:
         feed.auto_whitelist_new_episodes_override = params.get(
             "auto_whitelist_new_episodes_override"
         )
+    if "boundary_refinement_strategy" in params:
+        feed.boundary_refinement_strategy = params.get("boundary_refinement_strategy")
 
     db.session.flush()
     return {"feed_id": feed.id}
@@ -333,6 +343,12 @@ def delete_feed_cascade_action(params: dict[str, Any]) -> dict[str, Any]:
     FeedAccessToken.query.filter(FeedAccessToken.feed_id == feed_id_i).delete(
         synchronize_session=False
     )
+    SponsorSignature.query.filter(SponsorSignature.feed_id == feed_id_i).delete(
+        synchronize_session=False
+    )
+    FeedAdClassifier.query.filter(FeedAdClassifier.feed_id == feed_id_i).delete(
+        synchronize_session=False
+    )
     UserFeed.query.filter(UserFeed.feed_id == feed_id_i).delete(
         synchronize_session=False
     )
@@ -340,6 +356,98 @@ def delete_feed_cascade_action(params: dict[str, Any]) -> dict[str, Any]:
     return {"deleted": True, "feed_id": feed_id_i}
 
 
+def update_sponsor_index_action(params: dict[str, Any]) -> dict[str, Any]:
+    """Merge confirmed sponsor blocks into a feed's index, then evict stale entries.
+
+    A block whose MinHash is close to an existing entry refreshes that entry
+    instead of adding a new one. Entries matched during classification
+    (``matched_signature_ids``) are marked as seen.
+    """
+    feed_id = params.get("feed_id")
+    if not feed_id:
+        raise ValueError("feed_id is required")
+    feed_id_i = int(feed_id)
+    blocks = params.get("blocks") or []
+    if not isinstance(blocks, list):
+        raise ValueError("blocks must be a list")
+    matched_ids = {int(i) for i in params.get("matched_signature_ids") or []}
+    max_entries = params.get("max_entries")
+    max_age_days = params.get("max_age_days")
+
+    now = datetime.utcnow()
+    entries = SponsorSignature.query.filter_by(feed_id=feed_id_i).all()
+    for entry in entries:
+        if entry.id in matched_ids:
+            entry.hit_count = int(entry.hit_count or 0) + 1
+            entry.last_seen_at = now
+
+    inserted = 0
+    merged = 0
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+        block_minhash = [int(v) for v in block["minhash"]]
+        best: SponsorSignature | None = None
+        best_similarity = 0.0
+        for entry in entries:
+            similarity = estimate_jaccard(entry.minhash or [], block_minhash)
+            if similarity > best_similarity:
+                best, best_similarity = entry, similarity
+
+        if best is not None and best_similarity >= MERGE_SIMILARITY:
+            best.minhash = merge_minhash(best.minhash, block_minhash)
+            shingles = set(best.shingles or []) | {int(v) for v in block["shingles"]}
+            best.shingles = sorted(shingles)[:MAX_SHINGLES_PER_ENTRY]
+            best.word_count = max(
+                int(best.word_count or 0), int(block.get("word_count") or 0)
+            )
+            if best.id not in matched_ids:
+                best.hit_count = int(best.hit_count or 0) + 1
+            best.last_seen_at = now
+            merged += 1
+            continue
+
+        entry = SponsorSignature(
+            feed_id=feed_id_i,
+            minhash=block_minhash,
+            shingles=[int(v) for v in block["shingles"]][:MAX_SHINGLES_PER_ENTRY],
+            word_count=int(block.get("word_count") or 0),
+            sample_text=block.get("sample_text"),
+            hit_count=1,
+            created_at=now,
+            last_seen_at=now,
+        )
+        db.session.add(entry)
+        entries.append(entry)
+        inserted += 1
+
+    db.session.flush()
+
+    evicted = 0
+    if max_age_days is not None:
+        cutoff = now - timedelta(days=int(max_age_days))
+        evicted += SponsorSignature.query.filter(
+            SponsorSignature.feed_id == feed_id_i,
+            SponsorSignature.last_seen_at < cutoff,
+        ).delete(synchronize_session=False)
+    if max_entries is not None:
+        stale_ids = [
+            row_id
+            for (row_id,) in db.session.query(SponsorSignature.id)
+            .filter(SponsorSignature.feed_id == feed_id_i)
+            .order_by(SponsorSignature.last_seen_at.desc(), SponsorSignature.id.desc())
+            .offset(int(max_entries))
+            .all()
+        ]
+        if stale_ids:
+            evicted += SponsorSignature.query.filter(
+                SponsorSignature.id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+
+    db.session.flush()
+    return {"inserted": inserted, "merged": merged, "evicted": int(evicted)}
+
+
 def _hash_token(secret_value: str) -> str:
     return hashlib.sha256(secret_value.encode("utf-8")).hexdigest()
 
@@ -401,3 +509,29 @@ def touch_feed_access_token_action(params: dict[str, Any]) -> dict[str, Any]:
         token.token_secret = str(secret_value)
     db.session.flush()
     return {"updated": True}
+
+
+def save_feed_ad_classifier_action(params: dict[str, Any]) -> dict[str, Any]:
+    """Store a feed's retrained local ad classifier, replacing the previous one."""
+    feed_id = params.get("feed_id")
+    if not feed_id:
+        raise ValueError("feed_id is required")
+    model_blob = params.get("model_blob")
+    if not isinstance(model_blob, bytes | bytearray) or not model_blob:
+        raise ValueError("model_blob is required")
+
+    feed_id_i = int(feed_id)
+    entry = FeedAdClassifier.query.filter_by(feed_id=feed_id_i).first()
+    if entry is None:
+        entry = FeedAdClassifier(feed_id=feed_id_i)
+        db.session.add(entry)
+    entry.model_blob = bytes(model_blob)
+    entry.episodes_trained = int(params.get("episodes_trained") or 0)
+    entry.segments_trained = int(params.get("segments_trained") or 0)
+    loss = params.get("last_episode_loss")
+    entry.last_episode_loss = float(loss) if loss is not None else None
+    if "trained_post_ids" in params:
+        entry.trained_post_ids = [int(pid) for pid in params["trained_post_ids"]]
+    entry.updated_at = datetime.utcnow()
+    db.session.flush()
+    return {"feed_ad_classifier_id": int(entry.id)}
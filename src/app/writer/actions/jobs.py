@@ -1,6 +1,8 @@
 from datetime import datetime, timedelta
 from typing import Any
 
+from sqlalchemy import or_
+
 from app.extensions import db
 from app.jobs_manager_run_service import recalculate_run_counts
 from app.models import ProcessingJob
@@ -18,8 +20,15 @@ def dequeue_job_action(params: dict[str, Any]) -> dict[str, Any] | None:
     if running_job:
         return None
 
+    now = datetime.utcnow()
     job = (
-        ProcessingJob.query.filter(ProcessingJob.status == "pending")
+        ProcessingJob.query.filter(
+            ProcessingJob.status == "pending",
+            or_(
+                ProcessingJob.resume_after.is_(None),
+                ProcessingJob.resume_after <= now,
+            ),
+        )
         .order_by(ProcessingJob.created_at.asc())
         .first()
     )
@@ -27,7 +36,8 @@ def dequeue_job_action(params: dict[str, Any]) -> dict[str, Any] | None:
         return None
 
     job.status = "running"
-    job.started_at = datetime.utcnow()
+    job.started_at = now
+    job.resume_after = None
 
     if run_id and job.jobs_manager_run_id != run_id:
         job.jobs_manager_run_id = run_id
@@ -133,6 +143,27 @@ def update_job_status_action(params: dict[str, Any]) -> dict[str, Any]:
     return {"job_id": job.id, "status": job.status}
 
 
+def park_job_action(params: dict[str, Any]) -> dict[str, Any]:
+    """Return a running job to the queue until ``delay_seconds`` have passed."""
+    job_id = params.get("job_id")
+    job = db.session.get(ProcessingJob, job_id)
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+
+    job.status = "pending"
+    job.step_name = params.get("step_name") or "Waiting to resume"
+    if params.get("error_message"):
+        job.error_message = params["error_message"]
+    job.resume_after = datetime.utcnow() + timedelta(
+        seconds=float(params.get("delay_seconds") or 0.0)
+    )
+
+    if job.jobs_manager_run_id:
+        recalculate_run_counts(db.session)
+
+    return {"job_id": job.id, "resume_after": job.resume_after.isoformat()}
+
+
 def mark_cancelled_action(params: dict[str, Any]) -> dict[str, Any]:
     job_id = params.get("job_id")
     reason = params.get("reason")
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+import logging
 from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
@@ -8,7 +10,9 @@ from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 
 from app.extensions import db
-from app.models import Identification, ModelCall, TranscriptSegment
+from app.models import AudioFingerprint, Identification, ModelCall, TranscriptSegment
+
+logger = logging.getLogger("writer")
 
 
 def upsert_model_call_action(params: dict[str, Any]) -> dict[str, Any]:
@@ -17,6 +21,9 @@ def upsert_model_call_action(params: dict[str, Any]) -> dict[str, Any]:
     first_seq = params.get("first_segment_sequence_num")
     last_seq = params.get("last_segment_sequence_num")
     prompt = params.get("prompt")
+    # Optional; callers that reuse stored responses pass it so a changed
+    # prompt invalidates the old response.
+    prompt_hash = params.get("prompt_hash")
 
     if post_id is None or model_name is None or first_seq is None or last_seq is None:
         raise ValueError(
@@ -46,6 +53,7 @@ def upsert_model_call_action(params: dict[str, Any]) -> dict[str, Any]:
             last_segment_sequence_num=int(last_seq),
             model_name=str(model_name),
             prompt=str(prompt),
+            prompt_hash=prompt_hash,
             status="pending",
             timestamp=datetime.utcnow(),
             retry_attempts=0,
@@ -61,13 +69,33 @@ def upsert_model_call_action(params: dict[str, Any]) -> dict[str, Any]:
             if model_call is None:
                 raise
 
+    if prompt_hash is None:
+        prompt_changed = False
+    elif model_call.prompt_hash is None:
+        # Calls stored before prompt hashes were recorded: compare the text.
+        prompt_changed = model_call.prompt != prompt
+    else:
+        prompt_changed = model_call.prompt_hash != prompt_hash
+    if prompt_changed and model_call.status not in ["pending", "failed_retries"]:
+        # The stored answer was for a different prompt; drop it and its labels.
+        db.session.query(Identification).filter_by(model_call_id=model_call.id).delete(
+            synchronize_session=False
+        )
+        logger.info(
+            "[WRITER] upsert_model_call: prompt changed for model_call_id=%s; "
+            "discarding stored response",
+            model_call.id,
+        )
+
     # Match prior behavior: reset only when pending/failed_retries.
-    if model_call.status in ["pending", "failed_retries"]:
+    if prompt_changed or model_call.status in ["pending", "failed_retries"]:
         model_call.status = "pending"
         model_call.prompt = str(prompt)
         model_call.retry_attempts = 0
         model_call.error_message = None
         model_call.response = None
+        if prompt_hash is not None:
+            model_call.prompt_hash = prompt_hash
 
     db.session.flush()
     return {"model_call_id": int(model_call.id)}
@@ -204,6 +232,10 @@ def replace_transcription_action(params: dict[str, Any]) -> dict[str, Any]:
             mc.first_segment_sequence_num = 0
             mc.last_segment_sequence_num = len(payload) - 1
             mc.response = f"{len(payload)} segments transcribed."
+            # Adaptive chunking: what was sent, with which timeout, and how it went
+            chunk_report = params.get("chunk_report")
+            if chunk_report:
+                mc.response += f"\nChunks: {json.dumps(chunk_report)}"
             mc.status = "success"
             mc.error_message = None
 
@@ -274,3 +306,65 @@ def replace_identifications_action(params: dict[str, Any]) -> dict[str, Any]:
 
     db.session.flush()
     return {"deleted": len(delete_ids), "inserted": int(inserted)}
+
+
+def update_audio_fingerprints_action(params: dict[str, Any]) -> dict[str, Any]:
+    """Add ad fingerprints, refresh matched ones, then evict beyond max_entries.
+
+    Eviction drops the least recently matched fingerprints first.
+    """
+    fingerprints = params.get("fingerprints") or []
+    if not isinstance(fingerprints, list):
+        raise ValueError("fingerprints must be a list")
+    matched_ids = {int(i) for i in params.get("matched_fingerprint_ids") or []}
+    max_entries = params.get("max_entries")
+
+    now = datetime.utcnow()
+    touched = 0
+    if matched_ids:
+        for entry in AudioFingerprint.query.filter(
+            AudioFingerprint.id.in_(matched_ids)
+        ):
+            entry.hit_count = int(entry.hit_count or 0) + 1
+            entry.last_matched_at = now
+            touched += 1
+
+    inserted = 0
+    for fingerprint in fingerprints:
+        if not isinstance(fingerprint, dict):
+            continue
+        source_post_id = fingerprint.get("source_post_id")
+        db.session.add(
+            AudioFingerprint(
+                source_post_id=(
+                    int(source_post_id) if source_post_id is not None else None
+                ),
+                duration_seconds=float(fingerprint["duration_seconds"]),
+                landmarks=bytes(fingerprint["landmarks"]),
+                landmark_count=int(fingerprint.get("landmark_count") or 0),
+                hit_count=1,
+                created_at=now,
+                last_matched_at=now,
+            )
+        )
+        inserted += 1
+    db.session.flush()
+
+    evicted = 0
+    if max_entries is not None:
+        stale_ids = [
+            row_id
+            for (row_id,) in db.session.query(AudioFingerprint.id)
+            .order_by(
+                AudioFingerprint.last_matched_at.desc(), AudioFingerprint.id.desc()
+            )
+            .offset(int(max_entries))
+            .all()
+        ]
+        if stale_ids:
+            evicted = AudioFingerprint.query.filter(
+                AudioFingerprint.id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+        db.session.flush()
+
+    return {"inserted": inserted, "touched": touched, "evicted": int(evicted)}
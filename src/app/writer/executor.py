@@ -41,6 +41,7 @@ class CommandExecutor:
             "update_job_status", writer_actions.update_job_status_action
         )
         self.register_action("mark_cancelled", writer_actions.mark_cancelled_action)
+        self.register_action("park_job", writer_actions.park_job_action)
         self.register_action(
             "reassign_pending_jobs", writer_actions.reassign_pending_jobs_action
         )
@@ -49,6 +50,12 @@ class CommandExecutor:
         self.register_action(
             "update_feed_settings", writer_actions.update_feed_settings_action
         )
+        self.register_action(
+            "update_sponsor_index", writer_actions.update_sponsor_index_action
+        )
+        self.register_action(
+            "save_feed_ad_classifier", writer_actions.save_feed_ad_classifier_action
+        )
         self.register_action(
             "clear_post_processing_data",
             writer_actions.clear_post_processing_data_action,
@@ -135,6 +142,10 @@ class CommandExecutor:
         self.register_action(
             "insert_identifications", writer_actions.insert_identifications_action
         )
+        self.register_action(
+            "update_audio_fingerprints",
+            writer_actions.update_audio_fingerprints_action,
+        )
         self.register_action(
             "replace_identifications", writer_actions.replace_identifications_action
         )
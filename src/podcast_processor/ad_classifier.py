@@ -1,41 +1,155 @@
+import json
 import logging
 import math
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # pylint: disable=too-many-lines
 from datetime import datetime
-from typing import Any
+from typing import Any, cast
 
 import litellm
+from flask import current_app, has_app_context
 from jinja2 import Template
-from litellm.exceptions import InternalServerError
+from litellm.exceptions import (
+    BadRequestError,
+    ContentPolicyViolationError,
+    ContextWindowExceededError,
+    InternalServerError,
+    UnsupportedParamsError,
+)
 from litellm.types.utils import Choices
 from pydantic import ValidationError
 from sqlalchemy import and_
 
 from app.extensions import db
-from app.models import Identification, ModelCall, Post, TranscriptSegment
+from app.models import (
+    FeedAdClassifier,
+    Identification,
+    ModelCall,
+    Post,
+    SponsorSignature,
+    TranscriptSegment,
+)
 from app.writer.client import writer_client
+from podcast_processor.audio import episode_silences
+from podcast_processor.audio_fingerprint import (
+    AUDIO_FINGERPRINT_MODEL_NAME,
+    KNOWN_AD_PLACEHOLDER_TEXT,
+)
 from podcast_processor.boundary_refiner import BoundaryRefiner
+from podcast_processor.cue_boundary_refiner import (
+    CueBoundaryRefinement,
+    CueBoundaryRefiner,
+)
 from podcast_processor.cue_detector import CueDetector
+from podcast_processor.llm_circuit_breaker import (
+    CircuitBreaker,
+    ProviderUnavailableError,
+    backoff_delay,
+    get_circuit_breaker,
+    retry_after_seconds,
+)
 from podcast_processor.llm_concurrency_limiter import (
     ConcurrencyContext,
     LLMConcurrencyLimiter,
     get_concurrency_limiter,
 )
+from podcast_processor.llm_model_call_utils import (
+    COPILOT_PROVIDER,
+    build_model_call_metrics,
+    combine_token_usage,
+    elapsed_ms,
+    extract_litellm_content,
+)
+from podcast_processor.llm_router import (
+    LLMRouter,
+    RouterBudgetTimeoutError,
+    get_llm_router,
+)
+from podcast_processor.local_classifier import (
+    LOCAL_CLASSIFIER_MODEL_NAME,
+    LocalAdClassifier,
+    log_loss,
+)
 from podcast_processor.model_output import (
     AdSegmentPredictionList,
+    StreamingPredictionParser,
     clean_and_parse_model_output,
+    prediction_response_format,
+)
+from podcast_processor.prompt import (
+    COMPACT_EXCERPT_NOTE,
+    compact_line_groups,
+    compact_transcript_excerpt_for_prompt,
+    prompt_hash,
+    transcript_excerpt_for_prompt,
+)
+from podcast_processor.publisher_chapters import (
+    PUBLISHER_CHAPTERS_MODEL_NAME,
+    SPONSOR_CHAPTER_CONFIDENCE,
+    chapters_cover_runtime,
+    chapters_from_json,
+    sponsor_spans,
+)
+from podcast_processor.segment_view import SegmentView
+from podcast_processor.shared_llm_limiter import (
+    get_shared_concurrency_limiter,
+    get_shared_rate_limiter,
+    limiter_scope,
+)
+from podcast_processor.sponsor_index import (
+    SPONSOR_INDEX_MODEL_NAME,
+    SponsorIndex,
+    SponsorMatch,
+    build_sponsor_block,
 )
-from podcast_processor.prompt import transcript_excerpt_for_prompt
 from podcast_processor.token_rate_limiter import (
     TokenRateLimiter,
     configure_rate_limiter_for_model,
+    tokens_per_minute_for_model,
 )
+from podcast_processor.traffic_cassette import Cassette, get_cassette
 from podcast_processor.transcribe import Segment
 from podcast_processor.word_boundary_refiner import WordBoundaryRefiner
-from shared.config import Config, TestWhisperConfig
-from shared.llm_utils import model_uses_max_completion_tokens
+from shared.config import BOUNDARY_REFINEMENT_STRATEGIES, Config, TestWhisperConfig
+from shared.llm_utils import (
+    build_cacheable_messages,
+    close_stream,
+    llm_provider_for_model,
+    model_uses_max_completion_tokens,
+)
+
+STREAM_CONTINUATION_PROMPT = (
+    "Your previous response was cut off. Continue it: respond with the same "
+    "JSON format, listing only ad_segments entries with segment_offset "
+    "greater than {last_offset}."
+)
+
+# Appended to the model_name of coarse-pass calls, keeping them (and their
+# stored responses) apart from fine-pass calls over the same segment range.
+COARSE_PASS_MODEL_SUFFIX = "#coarse"
+
+
+def llm_model_name(model_call_name: str) -> str:
+    """The LLM model a classification ModelCall's ``model_name`` refers to."""
+    return model_call_name.removesuffix(COARSE_PASS_MODEL_SUFFIX)
+
+
+# Models whose provider rejected a JSON-schema response_format in this process.
+_STRUCTURED_OUTPUT_REJECTED: set[str] = set()
+_STRUCTURED_OUTPUT_ERROR_MARKERS = ("response_format", "json_schema", "response schema")
+
+
+def _rejects_structured_output(error: Exception) -> bool:
+    """Whether a 400 is the provider refusing the JSON-schema response_format,
+    rather than a problem with the request itself (size, content, key)."""
+    if isinstance(error, (ContextWindowExceededError, ContentPolicyViolationError)):
+        return False
+    if not isinstance(error, (UnsupportedParamsError, BadRequestError)):
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in _STRUCTURED_OUTPUT_ERROR_MARKERS)
 
 
 class ClassifyParams:
@@ -52,6 +166,10 @@ class ClassifyParams:
         self.post = post
         self.num_segments_per_prompt = num_segments_per_prompt
         self.max_overlap_segments = max_overlap_segments
+        # Sequence numbers already labelled from the feed's sponsor index
+        self.sponsor_matched_seqs: set[int] = set()
+        # Ad probability per sequence number from the feed's local model
+        self.local_scores: dict[int, float] = {}
 
 
 class ClassifyException(Exception):
@@ -75,11 +193,28 @@ class AdClassifier:
         self.identification_query = identification_query or Identification.query
         self.db_session = db_session or db.session
 
+        # Budgets shared with other processes using the same API key, if set
+        shared_limiter_path = self.config.llm_shared_limiter_path
+        shared_scope = limiter_scope(
+            self.config.llm_api_key, self.config.openai_base_url
+        )
+
         # Initialize rate limiter for the configured model
         self.rate_limiter: TokenRateLimiter | None
         if self.config.llm_enable_token_rate_limiting:
             tokens_per_minute = self.config.llm_max_input_tokens_per_minute
-            if tokens_per_minute is None:
+            if shared_limiter_path:
+                self.rate_limiter = get_shared_rate_limiter(
+                    shared_limiter_path,
+                    shared_scope,
+                    tokens_per_minute
+                    or tokens_per_minute_for_model(self.config.llm_model),
+                )
+                self.logger.info(
+                    f"Using shared token rate limit from {shared_limiter_path}: "
+                    f"{self.rate_limiter.tokens_per_minute}/min"
+                )
+            elif tokens_per_minute is None:
                 # Use model-specific defaults
                 self.rate_limiter = configure_rate_limiter_for_model(
                     self.config.llm_model
@@ -99,7 +234,19 @@ class AdClassifier:
         # Initialize concurrency limiter for LLM API calls
         self.concurrency_limiter: LLMConcurrencyLimiter | None
         max_concurrent = getattr(self.config, "llm_max_concurrent_calls", 3)
-        if max_concurrent > 0:
+        if max_concurrent > 0 and shared_limiter_path:
+            self.concurrency_limiter = get_shared_concurrency_limiter(
+                shared_limiter_path,
+                shared_scope,
+                max_concurrent,
+                # Slots of a hung call are reclaimed well after its timeout.
+                lease_seconds=2.0 * self.config.openai_timeout + 60.0,
+            )
+            self.logger.info(
+                f"Shared LLM concurrency limiting enabled: max {max_concurrent} "
+                f"concurrent calls across processes"
+            )
+        elif max_concurrent > 0:
             self.concurrency_limiter = get_concurrency_limiter(max_concurrent)
             self.logger.info(
                 f"LLM concurrency limiting enabled: max {max_concurrent} concurrent calls"
@@ -108,6 +255,21 @@ class AdClassifier:
             self.concurrency_limiter = None
             self.logger.info("LLM concurrency limiting disabled")
 
+        # Route litellm calls over a pool of endpoints when one is configured
+        self.llm_router: LLMRouter | None = None
+        if self.config.llm_endpoints:
+            self.llm_router = get_llm_router(
+                self.config.llm_endpoints,
+                hedge_percentile=self.config.llm_hedge_percentile,
+                hedge_min_samples=self.config.llm_hedge_min_samples,
+            )
+            self.logger.info(
+                f"LLM router enabled over {len(self.config.llm_endpoints)} endpoints"
+            )
+
+        # Record or replay LLM traffic when a cassette is configured
+        self.cassette: Cassette | None = get_cassette(self.config)
+
         # Initialize cue detector for neighbor expansion
         self.cue_detector = CueDetector()
 
@@ -122,6 +284,9 @@ class AdClassifier:
                 self.logger.info("Boundary refinement enabled")
         else:
             self.logger.info("Boundary refinement disabled via config")
+        self.cue_boundary_refiner = CueBoundaryRefiner(config, self.logger)
+        # Transcript tokens of this episode's LLM calls: [timestamped, compact]
+        self._compaction_tokens = [0, 0]
 
     def classify(
         self,
@@ -150,6 +315,7 @@ class AdClassifier:
             )
             return
 
+        self._compaction_tokens = [0, 0]
         classify_params = ClassifyParams(
             system_prompt=system_prompt,
             user_prompt_template=user_prompt_template,
@@ -158,30 +324,47 @@ class AdClassifier:
             max_overlap_segments=self.config.processing.max_overlap_segments,
         )
 
-        total_segments = len(transcript_segments)
-
         try:
-            current_index = 0
-            next_overlap_segments: list[TranscriptSegment] = []
-            max_iterations = (
-                total_segments + 10
-            )  # Safety limit to prevent infinite loops
-            iteration_count = 0
-            while current_index < total_segments and iteration_count < max_iterations:
-                consumed_segments, next_overlap_segments = self._step(
-                    classify_params,
-                    next_overlap_segments,
-                    current_index,
-                    transcript_segments,
+            # Known-ad placeholders (audio fingerprint matches) are labelled
+            # directly and never sent to the LLM.
+            known_ad_seqs = self._record_known_ad_placeholders(
+                transcript_segments, post
+            )
+            llm_segments = [
+                seg
+                for seg in transcript_segments
+                if seg.sequence_num not in known_ad_seqs
+            ]
+            # Segments inside publisher sponsor chapters are labelled from the
+            # chapters; if the chapters cover the episode and mark at least one
+            # sponsor break, the LLM is skipped.
+            chapter_ad_seqs, chapters_cover_episode = self._apply_publisher_chapters(
+                llm_segments, post
+            )
+            llm_segments = [
+                seg for seg in llm_segments if seg.sequence_num not in chapter_ad_seqs
+            ]
+
+            sponsor_matches = self._match_sponsor_index(llm_segments, post)
+            classify_params.sponsor_matched_seqs = set(sponsor_matches)
+            classify_params.local_scores = self._score_local_classifier(
+                llm_segments, post
+            )
+
+            if chapters_cover_episode:
+                self.logger.info(
+                    "Publisher chapters cover post %s; skipping LLM classification.",
+                    post.id,
                 )
-                current_index += consumed_segments
-                iteration_count += 1
-                if consumed_segments == 0:
-                    self.logger.error(
-                        f"No progress made in iteration {iteration_count} for post {post.id}. "
-                        "Breaking to avoid infinite loop."
-                    )
-                    break
+            elif self.config.enable_two_pass_classification:
+                # Pass 1 (coarse) narrows the fine pass to candidate ad regions
+                for region in self._coarse_candidate_regions(
+                    classify_params, llm_segments
+                ):
+                    self._classify_windows(classify_params, region, llm_segments)
+            else:
+                self._classify_windows(classify_params, llm_segments, llm_segments)
+            self._log_prompt_compaction(post)
 
             # Expand neighbors using bulk operations
             # NOTE: Use self.db_session.query() instead of self.identification_query
@@ -216,16 +399,161 @@ class AdClassifier:
             if self.boundary_refiner:
                 self._refine_boundaries(transcript_segments, post)
 
+            self._update_sponsor_index(post, sponsor_matches)
+            self._update_local_classifier(post, llm_segments)
+
         except ClassifyException as e:
             self.logger.error(f"Classification failed for post {post.id}: {e}")
             return
 
+    def _classify_windows(
+        self,
+        classify_params: ClassifyParams,
+        segments: list[TranscriptSegment],
+        all_segments: list[TranscriptSegment],
+    ) -> None:
+        """Classify ``segments`` (a run of ``all_segments``) window by window."""
+        total_segments = len(segments)
+        current_index = 0
+        next_overlap_segments: list[TranscriptSegment] = []
+        max_iterations = total_segments + 10  # Safety limit to prevent infinite loops
+        iteration_count = 0
+        while current_index < total_segments and iteration_count < max_iterations:
+            consumed_segments, next_overlap_segments = self._step(
+                classify_params,
+                next_overlap_segments,
+                current_index,
+                segments,
+                all_segments=all_segments,
+            )
+            current_index += consumed_segments
+            iteration_count += 1
+            if consumed_segments == 0:
+                self.logger.error(
+                    f"No progress made in iteration {iteration_count} for post {classify_params.post.id}. "
+                    "Breaking to avoid infinite loop."
+                )
+                break
+
+    def _coarse_candidate_regions(
+        self,
+        classify_params: ClassifyParams,
+        segments: list[TranscriptSegment],
+    ) -> list[list[TranscriptSegment]]:
+        """Coarse pass: find candidate ad regions from downsampled excerpts.
+
+        Each coarse window shows the LLM every ``coarse_pass_segment_stride``-th
+        segment with truncated text. A flagged sample marks the segments it
+        stands for, padded by ``coarse_pass_padding_segments`` on both sides,
+        as a candidate region. Windows whose coarse call fails are kept whole
+        so a failure never hides an ad.
+        """
+        stride = self.config.coarse_pass_segment_stride
+        span = self.config.coarse_pass_segments_per_prompt * stride
+        padding = self.config.coarse_pass_padding_segments
+        flagged: list[tuple[int, int]] = []
+        for lo in range(0, len(segments), span):
+            window_segments = segments[lo : lo + span]
+            hits = self._coarse_window_hits(
+                classify_params,
+                window_segments,
+                includes_start=lo == 0,
+                includes_end=lo + span >= len(segments),
+            )
+            if hits is None:
+                flagged.append((lo, lo + len(window_segments) - 1))
+                continue
+            for sample_idx in hits:
+                start = lo + sample_idx * stride
+                flagged.append((start - padding, start + stride - 1 + padding))
+
+        regions: list[list[TranscriptSegment]] = []
+        last_end = -1
+        for flag_start, flag_end in sorted(flagged):
+            start = max(flag_start, last_end + 1, 0)
+            end = min(flag_end, len(segments) - 1)
+            if end < start:
+                continue
+            if regions and start == last_end + 1:
+                regions[-1].extend(segments[start : end + 1])
+            else:
+                regions.append(segments[start : end + 1])
+            last_end = end
+
+        candidate_count = sum(len(region) for region in regions)
+        self.logger.info(
+            "Coarse pass for post %s: %s candidate regions covering %s of %s segments.",
+            classify_params.post.id,
+            len(regions),
+            candidate_count,
+            len(segments),
+        )
+        return regions
+
+    def _coarse_window_hits(
+        self,
+        classify_params: ClassifyParams,
+        window_segments: list[TranscriptSegment],
+        *,
+        includes_start: bool,
+        includes_end: bool,
+    ) -> set[int] | None:
+        """Indices of the window's samples flagged as ads, or None on failure."""
+        samples = window_segments[:: self.config.coarse_pass_segment_stride]
+        user_prompt_str = self._generate_user_prompt(
+            current_chunk_db_segments=samples,
+            post=classify_params.post,
+            user_prompt_template=classify_params.user_prompt_template,
+            includes_start=includes_start,
+            includes_end=includes_end,
+            max_chars_per_segment=self.config.coarse_pass_max_chars_per_segment,
+        )
+        # A fine-pass window can cover the same segments (short episodes), so
+        # coarse calls are stored under their own model_name.
+        model_call = self._get_or_create_model_call(
+            post=classify_params.post,
+            first_seq_num=window_segments[0].sequence_num,
+            last_seq_num=window_segments[-1].sequence_num,
+            user_prompt_str=user_prompt_str,
+            system_prompt=classify_params.system_prompt,
+            model_name=self.config.active_llm_model + COARSE_PASS_MODEL_SUFFIX,
+        )
+        if model_call is None:
+            return None
+        if self._should_call_llm(model_call):
+            self._record_prompt_compaction(
+                samples, self.config.coarse_pass_max_chars_per_segment
+            )
+            self._perform_llm_call(
+                model_call=model_call, system_prompt=classify_params.system_prompt
+            )
+        if model_call.status != "success" or not model_call.response:
+            return None
+
+        prediction_list = self._parse_model_response(model_call)
+        if prediction_list is None:
+            return None
+
+        sample_index = {seg.id: idx for idx, seg in enumerate(samples)}
+        hits: set[int] = set()
+        for pred in prediction_list.ad_segments:
+            for matched in self._segments_for_offset(
+                segment_offset=pred.segment_offset,
+                current_chunk_db_segments=samples,
+                model_call=model_call,
+                max_chars_per_segment=self.config.coarse_pass_max_chars_per_segment,
+            ):
+                hits.add(sample_index[matched.id])
+        return hits
+
     def _step(
         self,
         classify_params: ClassifyParams,
         prev_overlap_segments: list[TranscriptSegment],
         current_index: int,
         transcript_segments: list[TranscriptSegment],
+        *,
+        all_segments: list[TranscriptSegment] | None = None,
     ) -> tuple[int, list[TranscriptSegment]]:
         overlap_segments = self._apply_overlap_cap(prev_overlap_segments)
         remaining_segments = transcript_segments[current_index:]
@@ -238,7 +566,7 @@ class AdClassifier:
         ) = self._build_chunk_payload(
             overlap_segments=overlap_segments,
             remaining_segments=remaining_segments,
-            total_segments=transcript_segments,
+            total_segments=all_segments or transcript_segments,
             post=classify_params.post,
             system_prompt=classify_params.system_prompt,
             user_prompt_template=classify_params.user_prompt_template,
@@ -265,12 +593,46 @@ class AdClassifier:
                 len(chunk_segments),
             )
 
-        identified_segments = self._process_chunk(
-            chunk_segments=chunk_segments,
-            system_prompt=classify_params.system_prompt,
-            user_prompt_str=user_prompt_str,
-            post=classify_params.post,
+        new_segments = remaining_segments[:consumed_segments]
+        matched_seqs = classify_params.sponsor_matched_seqs
+        sponsor_coverage = (
+            sum(seg.sequence_num in matched_seqs for seg in new_segments)
+            / len(new_segments)
+            if matched_seqs and new_segments
+            else 0.0
         )
+        if sponsor_coverage and (
+            sponsor_coverage >= self.config.sponsor_index_skip_coverage
+        ):
+            self.logger.info(
+                "Skipping LLM classification of segments %s-%s for post %s: "
+                "%.0f%% already matched the sponsor index.",
+                new_segments[0].sequence_num,
+                new_segments[-1].sequence_num,
+                classify_params.post.id,
+                sponsor_coverage * 100,
+            )
+            identified_segments = [
+                seg for seg in chunk_segments if seg.sequence_num in matched_seqs
+            ]
+        elif self._locally_clean(new_segments, classify_params.local_scores):
+            self.logger.info(
+                "Skipping LLM classification of segments %s-%s for post %s: "
+                "the feed's local model scores them all below %.2f.",
+                new_segments[0].sequence_num,
+                new_segments[-1].sequence_num,
+                classify_params.post.id,
+                self.config.local_classifier_skip_threshold,
+            )
+            identified_segments = []
+        else:
+            identified_segments = self._process_chunk(
+                chunk_segments=chunk_segments,
+                system_prompt=classify_params.system_prompt,
+                user_prompt_str=user_prompt_str,
+                post=classify_params.post,
+                local_scores=classify_params.local_scores,
+            )
 
         next_overlap_segments = self._compute_next_overlap_segments(
             chunk_segments=chunk_segments,
@@ -288,6 +650,491 @@ class AdClassifier:
 
         return consumed_segments, next_overlap_segments
 
+    def _match_sponsor_index(
+        self, transcript_segments: list[TranscriptSegment], post: Post
+    ) -> dict[int, SponsorMatch]:
+        """Label segments that repeat a sponsor read already indexed for the feed."""
+        if not self.config.enable_sponsor_index or post.feed_id is None:
+            return {}
+
+        index = SponsorIndex(
+            (int(entry_id), shingles or [])
+            for entry_id, shingles in self.db_session.query(
+                SponsorSignature.id, SponsorSignature.shingles
+            ).filter(SponsorSignature.feed_id == post.feed_id)
+        )
+        if not index:
+            return {}
+
+        matches = index.match_segments(
+            transcript_segments, threshold=self.config.sponsor_index_match_threshold
+        )
+        self.logger.info(
+            "Sponsor index for feed %s (%s entries) matched %s segments of post %s.",
+            post.feed_id,
+            index.entry_count,
+            len(matches),
+            post.id,
+        )
+        if matches:
+            self._record_precomputed_ads(
+                post,
+                transcript_segments,
+                model_name=SPONSOR_INDEX_MODEL_NAME,
+                prompt=f"Sponsor index match for feed {post.feed_id}",
+                confidences={seq: match.containment for seq, match in matches.items()},
+                response=json.dumps(
+                    [
+                        {
+                            "sequence_num": match.sequence_num,
+                            "signature_id": match.signature_id,
+                            "containment": match.containment,
+                        }
+                        for match in sorted(
+                            matches.values(), key=lambda m: m.sequence_num
+                        )
+                    ]
+                ),
+            )
+        return matches
+
+    def _apply_publisher_chapters(
+        self, transcript_segments: list[TranscriptSegment], post: Post
+    ) -> tuple[set[int], bool]:
+        """Label segments inside the publisher's sponsor chapters.
+
+        Returns the labelled sequence numbers, and whether the chapters cover
+        the whole episode with at least one sponsor chapter (so every ad is
+        already marked). Chapters without a sponsor chapter may just not mark
+        ads, so they never skip classification.
+        """
+        if not self.config.enable_publisher_chapters or not transcript_segments:
+            return set(), False
+        chapters = chapters_from_json(post.publisher_chapters)
+        if not chapters:
+            return set(), False
+
+        runtime = max(seg.end_time for seg in transcript_segments)
+        spans = sponsor_spans(chapters, runtime)
+        # A segment belongs to the chapter its midpoint falls in
+        labelled = [
+            (
+                span,
+                [
+                    seg
+                    for seg in transcript_segments
+                    if span.start
+                    <= (seg.start_time + seg.end_time) / 2
+                    < (span.end if span.end is not None else runtime)
+                ],
+            )
+            for span in spans
+        ]
+        ad_segments = [seg for _, segs in labelled for seg in segs]
+        covered = chapters_cover_runtime(chapters, runtime)
+        skip_llm = covered and bool(spans)
+        self.logger.info(
+            "Post %s has %s publisher chapters (%s sponsor) covering %s; "
+            "%s segments fall in sponsor chapters.",
+            post.id,
+            len(chapters),
+            len(spans),
+            "the whole episode" if covered else "part of the episode",
+            len(ad_segments),
+        )
+        if ad_segments:
+            self._record_precomputed_ads(
+                post,
+                ad_segments,
+                model_name=PUBLISHER_CHAPTERS_MODEL_NAME,
+                prompt=f"Publisher chapters ({chapters[0].source}) for post {post.id}",
+                confidences={
+                    seg.sequence_num: SPONSOR_CHAPTER_CONFIDENCE for seg in ad_segments
+                },
+                response=json.dumps(
+                    [
+                        {
+                            "title": span.title,
+                            "start": span.start,
+                            "end": span.end,
+                            "source": span.source,
+                            "sequence_nums": [seg.sequence_num for seg in segs],
+                        }
+                        for span, segs in labelled
+                    ]
+                ),
+            )
+        return {seg.sequence_num for seg in ad_segments}, skip_llm
+
+    def _record_known_ad_placeholders(
+        self, transcript_segments: list[TranscriptSegment], post: Post
+    ) -> set[int]:
+        """Label the placeholder segments left for audio-fingerprinted ads."""
+        placeholders = [
+            seg for seg in transcript_segments if seg.text == KNOWN_AD_PLACEHOLDER_TEXT
+        ]
+        if not placeholders:
+            return set()
+
+        self.logger.info(
+            "Post %s has %s known-ad placeholder segments from audio fingerprints.",
+            post.id,
+            len(placeholders),
+        )
+        self._record_precomputed_ads(
+            post,
+            placeholders,
+            model_name=AUDIO_FINGERPRINT_MODEL_NAME,
+            prompt="Audio fingerprint match",
+            confidences={seg.sequence_num: 1.0 for seg in placeholders},
+            response=json.dumps(
+                [
+                    {
+                        "sequence_num": seg.sequence_num,
+                        "start_time": seg.start_time,
+                        "end_time": seg.end_time,
+                    }
+                    for seg in placeholders
+                ]
+            ),
+        )
+        return {seg.sequence_num for seg in placeholders}
+
+    def _record_precomputed_ads(
+        self,
+        post: Post,
+        transcript_segments: list[TranscriptSegment],
+        *,
+        model_name: str,
+        prompt: str,
+        confidences: dict[int, float],
+        response: str,
+    ) -> None:
+        """Persist ads found without the LLM as ad identifications.
+
+        ``confidences`` maps sequence numbers to confidence. The
+        identifications hang off a ModelCall with ``model_name`` as a pseudo
+        model so they show up (and can be cleared) like any other
+        classification.
+        """
+        result = writer_client.action(
+            "upsert_model_call",
+            {
+                "post_id": post.id,
+                "model_name": model_name,
+                "first_segment_sequence_num": min(confidences),
+                "last_segment_sequence_num": max(confidences),
+                "prompt": prompt,
+            },
+            wait=True,
+        )
+        if not result or not result.success:
+            raise RuntimeError(getattr(result, "error", "Failed to upsert ModelCall"))
+        model_call_id = int((result.data or {})["model_call_id"])
+
+        res = writer_client.update(
+            "ModelCall",
+            model_call_id,
+            {
+                "response": response,
+                "status": "success",
+                "error_message": None,
+                "retry_attempts": 0,
+                "provider": model_name,
+            },
+            wait=True,
+        )
+        if not res or not res.success:
+            raise RuntimeError(getattr(res, "error", "Failed to update ModelCall"))
+
+        to_insert = [
+            {
+                "transcript_segment_id": segment.id,
+                "model_call_id": model_call_id,
+                "label": "ad",
+                "confidence": confidences[segment.sequence_num],
+            }
+            for segment in transcript_segments
+            if segment.sequence_num in confidences
+        ]
+        res = writer_client.action(
+            "insert_identifications", {"identifications": to_insert}, wait=True
+        )
+        if not res or not res.success:
+            raise RuntimeError(
+                getattr(res, "error", "Failed to insert identifications")
+            )
+
+    def _update_sponsor_index(
+        self, post: Post, sponsor_matches: dict[int, SponsorMatch]
+    ) -> None:
+        """Add this post's confirmed ad blocks to the feed's sponsor index."""
+        if not self.config.enable_sponsor_index or post.feed_id is None:
+            return
+
+        rows = (
+            self.db_session.query(
+                TranscriptSegment.sequence_num, TranscriptSegment.text
+            )
+            .join(
+                Identification,
+                Identification.transcript_segment_id == TranscriptSegment.id,
+            )
+            .join(ModelCall, Identification.model_call_id == ModelCall.id)
+            .filter(
+                TranscriptSegment.post_id == post.id,
+                Identification.label == "ad",
+                Identification.confidence
+                >= self.config.sponsor_index_min_ad_confidence,
+                ModelCall.model_name.notin_(
+                    [
+                        SPONSOR_INDEX_MODEL_NAME,
+                        AUDIO_FINGERPRINT_MODEL_NAME,
+                        LOCAL_CLASSIFIER_MODEL_NAME,
+                    ]
+                ),
+            )
+            .distinct()
+            .order_by(TranscriptSegment.sequence_num)
+            .all()
+        )
+
+        blocks: list[dict[str, Any]] = []
+        run_texts: list[str] = []
+        prev_seq: int | None = None
+        for seq, text in [*rows, (None, None)]:
+            if seq is not None and prev_seq is not None and seq == prev_seq + 1:
+                run_texts.append(text or "")
+            else:
+                block = build_sponsor_block(run_texts) if run_texts else None
+                if block is not None:
+                    blocks.append(block)
+                run_texts = [text or ""] if seq is not None else []
+            prev_seq = seq
+
+        matched_ids = sorted({m.signature_id for m in sponsor_matches.values()})
+        if not blocks and not matched_ids:
+            return
+
+        try:
+            res = writer_client.action(
+                "update_sponsor_index",
+                {
+                    "feed_id": post.feed_id,
+                    "blocks": blocks,
+                    "matched_signature_ids": matched_ids,
+                    "max_entries": self.config.sponsor_index_max_entries_per_feed,
+                    "max_age_days": self.config.sponsor_index_max_age_days,
+                },
+                wait=True,
+            )
+            if not res or not res.success:
+                raise RuntimeError(
+                    getattr(res, "error", "Failed to update sponsor index")
+                )
+            self.logger.info(
+                "Sponsor index for feed %s updated from post %s: %s",
+                post.feed_id,
+                post.id,
+                res.data,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            # The index is an optimization; never fail classification over it.
+            self.logger.warning(
+                "Failed to update sponsor index for feed %s: %s", post.feed_id, exc
+            )
+
+    def _load_local_classifier(
+        self, post: Post
+    ) -> tuple[LocalAdClassifier, FeedAdClassifier] | None:
+        if not self.config.enable_local_classifier or post.feed_id is None:
+            return None
+        entry = (
+            self.db_session.query(FeedAdClassifier)
+            .filter(FeedAdClassifier.feed_id == post.feed_id)
+            .first()
+        )
+        if entry is None:
+            return None
+        return LocalAdClassifier.from_bytes(entry.model_blob), entry
+
+    def _score_local_classifier(
+        self, transcript_segments: list[TranscriptSegment], post: Post
+    ) -> dict[int, float]:
+        """Ad probabilities from the feed's local model, once it is trained
+        on enough episodes; empty otherwise."""
+        try:
+            loaded = self._load_local_classifier(post)
+            if loaded is None:
+                return {}
+            model, entry = loaded
+            if (
+                entry.episodes_trained
+                < self.config.local_classifier_min_training_episodes
+            ):
+                return {}
+            scores = model.predict_proba([seg.text for seg in transcript_segments])
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.warning(
+                "Local classifier scoring failed for post %s: %s", post.id, exc
+            )
+            return {}
+        return {
+            seg.sequence_num: score
+            for seg, score in zip(transcript_segments, scores, strict=True)
+        }
+
+    def _locally_clean(
+        self, new_segments: list[TranscriptSegment], local_scores: dict[int, float]
+    ) -> bool:
+        threshold = self.config.local_classifier_skip_threshold
+        if not local_scores or threshold <= 0 or not new_segments:
+            return False
+        return all(
+            local_scores.get(seg.sequence_num, 1.0) < threshold for seg in new_segments
+        )
+
+    def _local_classifier_fallback(
+        self,
+        post: Post,
+        chunk_segments: list[TranscriptSegment],
+        local_scores: dict[int, float],
+    ) -> list[TranscriptSegment]:
+        """Label a chunk from local scores after its LLM call failed."""
+        threshold = self.config.local_classifier_fallback_threshold
+        flagged = [
+            seg
+            for seg in chunk_segments
+            if local_scores.get(seg.sequence_num, 0.0) >= threshold
+        ]
+        self.logger.warning(
+            "LLM unavailable for segments %s-%s of post %s; local classifier "
+            "labelled %s segments as ads.",
+            chunk_segments[0].sequence_num,
+            chunk_segments[-1].sequence_num,
+            post.id,
+            len(flagged),
+        )
+        if not flagged:
+            return []
+        confidences = {
+            seg.sequence_num: round(local_scores[seg.sequence_num], 3)
+            for seg in flagged
+        }
+        self._record_precomputed_ads(
+            post,
+            flagged,
+            model_name=LOCAL_CLASSIFIER_MODEL_NAME,
+            prompt=f"Local classifier fallback for feed {post.feed_id}",
+            confidences=confidences,
+            response=json.dumps(
+                [
+                    {"sequence_num": seq, "score": score}
+                    for seq, score in confidences.items()
+                ]
+            ),
+        )
+        return flagged
+
+    def _update_local_classifier(
+        self, post: Post, transcript_segments: list[TranscriptSegment]
+    ) -> None:
+        """Continue training the feed's local model on this post's LLM labels.
+
+        Only segments inside successful LLM windows are used, so windows that
+        were skipped (or labelled by the local model itself) never feed back
+        into training. A post the model was already trained on is skipped, so
+        reprocessing an episode does not count it twice.
+        """
+        if not self.config.enable_local_classifier or post.feed_id is None:
+            return
+        try:
+            loaded = self._load_local_classifier(post)
+            model, entry = loaded if loaded else (LocalAdClassifier(), None)
+            trained_post_ids = list(entry.trained_post_ids or []) if entry else []
+            if post.id in trained_post_ids:
+                self.logger.info(
+                    "Local classifier for feed %s already trained on post %s; "
+                    "skipping.",
+                    post.feed_id,
+                    post.id,
+                )
+                return
+
+            windows = (
+                self.db_session.query(
+                    ModelCall.first_segment_sequence_num,
+                    ModelCall.last_segment_sequence_num,
+                )
+                .filter(
+                    ModelCall.post_id == post.id,
+                    ModelCall.model_name == self.config.active_llm_model,
+                    ModelCall.status == "success",
+                )
+                .all()
+            )
+            if not windows:
+                return
+            ad_seqs = {
+                seq
+                for (seq,) in self.db_session.query(TranscriptSegment.sequence_num)
+                .join(
+                    Identification,
+                    Identification.transcript_segment_id == TranscriptSegment.id,
+                )
+                .join(ModelCall, Identification.model_call_id == ModelCall.id)
+                .filter(
+                    TranscriptSegment.post_id == post.id,
+                    Identification.label == "ad",
+                    Identification.confidence >= self.config.output.min_confidence,
+                    ModelCall.model_name != LOCAL_CLASSIFIER_MODEL_NAME,
+                )
+            }
+            training = [
+                seg
+                for seg in transcript_segments
+                if any(first <= seg.sequence_num <= last for first, last in windows)
+            ]
+            if not training:
+                return
+
+            texts = [seg.text for seg in training]
+            labels = [seg.sequence_num in ad_seqs for seg in training]
+            episode_loss = log_loss(model.predict_proba(texts), labels)
+            model.partial_fit(texts, labels)
+
+            res = writer_client.action(
+                "save_feed_ad_classifier",
+                {
+                    "feed_id": post.feed_id,
+                    "model_blob": model.to_bytes(),
+                    "episodes_trained": (entry.episodes_trained if entry else 0) + 1,
+                    "segments_trained": (entry.segments_trained if entry else 0)
+                    + len(training),
+                    "last_episode_loss": round(episode_loss, 4),
+                    "trained_post_ids": [*trained_post_ids, post.id],
+                },
+                wait=True,
+            )
+            if not res or not res.success:
+                raise RuntimeError(
+                    getattr(res, "error", "Failed to save local classifier")
+                )
+            self.logger.info(
+                "Local classifier for feed %s trained on %s segments of post %s "
+                "(%s ads, pre-training loss %.3f).",
+                post.feed_id,
+                len(training),
+                post.id,
+                sum(labels),
+                episode_loss,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            # The local model is an optimization; never fail classification over it.
+            self.logger.warning(
+                "Failed to update local classifier for feed %s: %s", post.feed_id, exc
+            )
+
     def _process_chunk(
         self,
         *,
@@ -295,8 +1142,13 @@ class AdClassifier:
         system_prompt: str,
         post: Post,
         user_prompt_str: str,
+        local_scores: dict[int, float] | None = None,
     ) -> list[TranscriptSegment]:
-        """Process a chunk of transcript segments for classification."""
+        """Process a chunk of transcript segments for classification.
+
+        If the LLM call fails, ``local_scores`` (from the feed's local model)
+        label the chunk instead.
+        """
         if not chunk_segments:
             return []
 
@@ -312,6 +1164,7 @@ class AdClassifier:
             first_seq_num=first_seq_num,
             last_seq_num=last_seq_num,
             user_prompt_str=user_prompt_str,
+            system_prompt=system_prompt,
         )
 
         if not model_call:
@@ -319,6 +1172,7 @@ class AdClassifier:
             return []
 
         if self._should_call_llm(model_call):
+            self._record_prompt_compaction(chunk_segments)
             self._perform_llm_call(
                 model_call=model_call,
                 system_prompt=system_prompt,
@@ -330,6 +1184,10 @@ class AdClassifier:
                 current_chunk_db_segments=chunk_segments,
             )
         if model_call.status != "success":
+            if local_scores:
+                return self._local_classifier_fallback(
+                    post, chunk_segments, local_scores
+                )
             self.logger.info(
                 f"LLM call for ModelCall {model_call.id} was not successful (status: {model_call.status}). No identifications to process."
             )
@@ -590,6 +1448,7 @@ class AdClassifier:
         self, model_call_obj: ModelCall, system_prompt: str
     ) -> dict[str, Any] | None:
         """Prepare API call arguments and validate token limits."""
+        model = llm_model_name(model_call_obj.model_name)
         # Prepare messages for the API call
         messages = [
             {"role": "system", "content": system_prompt},
@@ -598,7 +1457,7 @@ class AdClassifier:
 
         # Use rate limiter to wait if necessary and track token usage
         if self.rate_limiter:
-            self.rate_limiter.wait_if_needed(messages, model_call_obj.model_name)
+            self.rate_limiter.wait_if_needed(messages, model)
 
             # Get usage stats for logging
             usage_stats = self.rate_limiter.get_usage_stats()
@@ -632,10 +1491,13 @@ class AdClassifier:
                     model_call_obj.error_message = error_msg
                 return None
 
-        # Prepare completion arguments
+        # Prepare completion arguments. The static system prompt leads the
+        # message list so providers can serve it from their prompt cache.
         completion_args = {
-            "model": model_call_obj.model_name,
-            "messages": messages,
+            "model": model,
+            "messages": build_cacheable_messages(
+                system_prompt, model_call_obj.prompt, model
+            ),
             "timeout": self.config.openai_timeout,
         }
 
@@ -643,13 +1505,11 @@ class AdClassifier:
         # OpenAI deprecated max_tokens for these models in favor of max_completion_tokens
         # Check if this is a model that requires max_completion_tokens
         # This includes: gpt-5, gpt-4o variants, o1 series, and latest chatgpt models
-        uses_max_completion_tokens = model_uses_max_completion_tokens(
-            model_call_obj.model_name
-        )
+        uses_max_completion_tokens = model_uses_max_completion_tokens(model)
 
         # Debug logging to help diagnose model parameter issues
         self.logger.info(
-            f"Model: '{model_call_obj.model_name}', using max_completion_tokens: {uses_max_completion_tokens}"
+            f"Model: '{model}', using max_completion_tokens: {uses_max_completion_tokens}"
         )
 
         if uses_max_completion_tokens:
@@ -658,8 +1518,39 @@ class AdClassifier:
             # For older models and non-OpenAI models, use max_tokens
             completion_args["max_tokens"] = self.config.openai_max_tokens
 
+        if self._use_structured_output(model):
+            completion_args["response_format"] = prediction_response_format()
+
         return completion_args
 
+    def _circuit_breaker(self, model_name: str) -> CircuitBreaker | None:
+        """Shared breaker for the provider serving ``model_name``."""
+        threshold = self.config.llm_circuit_breaker_failure_threshold
+        if threshold <= 0:
+            return None
+        provider = (
+            COPILOT_PROVIDER
+            if self.config.is_copilot_configured
+            else llm_provider_for_model(model_name)
+        )
+        return get_circuit_breaker(
+            provider,
+            failure_threshold=threshold,
+            reset_timeout=self.config.llm_circuit_breaker_reset_seconds,
+            max_open_seconds=self.config.llm_circuit_breaker_max_open_seconds,
+        )
+
+    def _use_structured_output(self, model_name: str) -> bool:
+        if (
+            not self.config.llm_enable_structured_output
+            or model_name in _STRUCTURED_OUTPUT_REJECTED
+        ):
+            return False
+        try:
+            return bool(litellm.supports_response_schema(model=model_name))
+        except Exception:  # pylint: disable=broad-except
+            return False
+
     def _call_copilot_model(self, model_call_obj: ModelCall, system_prompt: str) -> str:
         """Call GitHub Copilot SDK using a user-provided PAT.
 
@@ -676,8 +1567,8 @@ class AdClassifier:
             raise RuntimeError(
                 "No GitHub PAT configured for Copilot model calls; set llm_github_pat in settings"
             )
-        github_model = (
-            getattr(self.config, "llm_github_model", None) or model_call_obj.model_name
+        github_model = getattr(self.config, "llm_github_model", None) or llm_model_name(
+            model_call_obj.model_name
         )
 
         # Combine system prompt and user prompt into a single message
@@ -743,7 +1634,14 @@ class AdClassifier:
                     pass  # Ignore cleanup errors
 
         try:
-            content = asyncio.run(_perform_copilot_chat())
+            if self.cassette is not None:
+                content = self.cassette.copilot_chat(
+                    github_model,
+                    combined_prompt,
+                    lambda: asyncio.run(_perform_copilot_chat()),
+                )
+            else:
+                content = asyncio.run(_perform_copilot_chat())
             if not content:
                 raise RuntimeError("Empty response from Copilot SDK")
             return content
@@ -759,21 +1657,87 @@ class AdClassifier:
         user_prompt_template: Template,
         includes_start: bool,
         includes_end: bool,
+        max_chars_per_segment: int | None = None,
     ) -> str:
         """Generate the user prompt string for the LLM."""
-        temp_pydantic_segments_for_prompt = [
-            Segment(start=db_seg.start_time, end=db_seg.end_time, text=db_seg.text)
-            for db_seg in current_chunk_db_segments
-        ]
+        temp_pydantic_segments_for_prompt = self._prompt_segments(
+            current_chunk_db_segments, max_chars_per_segment
+        )
+        if self.config.llm_compact_prompts:
+            transcript = compact_transcript_excerpt_for_prompt(
+                temp_pydantic_segments_for_prompt,
+                includes_start=includes_start,
+                includes_end=includes_end,
+                min_line_words=self.config.llm_compact_min_line_words,
+            )
+        else:
+            transcript = transcript_excerpt_for_prompt(
+                segments=temp_pydantic_segments_for_prompt,
+                includes_start=includes_start,
+                includes_end=includes_end,
+            )
 
         return user_prompt_template.render(
             podcast_title=post.title,
             podcast_topic=post.description if post.description else "",
-            transcript=transcript_excerpt_for_prompt(
-                segments=temp_pydantic_segments_for_prompt,
-                includes_start=includes_start,
-                includes_end=includes_end,
-            ),
+            transcript=transcript,
+        )
+
+    @staticmethod
+    def _prompt_segments(
+        db_segments: list[TranscriptSegment], max_chars_per_segment: int | None
+    ) -> list[Segment]:
+        return [
+            Segment(
+                start=db_seg.start_time,
+                end=db_seg.end_time,
+                text=(
+                    db_seg.text[:max_chars_per_segment]
+                    if max_chars_per_segment
+                    else db_seg.text
+                ),
+            )
+            for db_seg in db_segments
+        ]
+
+    def _record_prompt_compaction(
+        self,
+        db_segments: list[TranscriptSegment],
+        max_chars_per_segment: int | None = None,
+    ) -> None:
+        """Add one call's transcript tokens, in the timestamped and compact
+        formats, to the episode's compaction report."""
+        if not self.config.llm_compact_prompts:
+            return
+        segments = self._prompt_segments(db_segments, max_chars_per_segment)
+        legacy = transcript_excerpt_for_prompt(segments, False, False)
+        compact = compact_transcript_excerpt_for_prompt(
+            segments,
+            False,
+            False,
+            min_line_words=self.config.llm_compact_min_line_words,
+        )
+        self._compaction_tokens[0] += self._count_text_tokens(legacy)
+        self._compaction_tokens[1] += self._count_text_tokens(compact)
+
+    def _count_text_tokens(self, text: str) -> int:
+        try:
+            return int(litellm.token_counter(model=self.config.llm_model, text=text))
+        except Exception:  # pylint: disable=broad-except
+            return len(text) // 4
+
+    def _log_prompt_compaction(self, post: Post) -> None:
+        legacy, compact = self._compaction_tokens
+        if not legacy:
+            return
+        self.logger.info(
+            "Prompt compaction for post %s: transcript tokens %s -> %s "
+            "(saved %s, %.1f%%).",
+            post.id,
+            legacy,
+            compact,
+            legacy - compact,
+            100.0 * (legacy - compact) / legacy,
         )
 
     def _get_or_create_model_call(
@@ -783,9 +1747,15 @@ class AdClassifier:
         first_seq_num: int,
         last_seq_num: int,
         user_prompt_str: str,
+        system_prompt: str,
+        model_name: str | None = None,
     ) -> ModelCall | None:
-        """Get an existing ModelCall or create a new one via writer."""
-        model = self.config.active_llm_model
+        """Get an existing ModelCall or create a new one via writer.
+
+        A stored response is reused (e.g. on reprocess) only if the window's
+        prompts hash the same; otherwise the writer resets the call.
+        """
+        model = model_name or self.config.active_llm_model
         result = writer_client.action(
             "upsert_model_call",
             {
@@ -794,6 +1764,7 @@ class AdClassifier:
                 "first_segment_sequence_num": first_seq_num,
                 "last_segment_sequence_num": last_seq_num,
                 "prompt": user_prompt_str,
+                "prompt_hash": prompt_hash(system_prompt, user_prompt_str),
             },
             wait=True,
         )
@@ -823,6 +1794,9 @@ class AdClassifier:
                 self._handle_test_mode_call(model_call)
             else:
                 self._call_model(model_call_obj=model_call, system_prompt=system_prompt)
+        except ProviderUnavailableError:
+            # Park the job rather than classify the rest without the LLM.
+            raise
         except Exception as e:  # pylint: disable=broad-exception-caught
             self.logger.error(
                 f"LLM interaction via _call_model for ModelCall {model_call.id} resulted in an exception: {e}",
@@ -861,8 +1835,10 @@ class AdClassifier:
         self.logger.info(
             f"LLM call for ModelCall {model_call.id} was successful. Parsing response."
         )
+        prediction_list = self._parse_model_response(model_call)
+        if prediction_list is None:
+            return []
         try:
-            prediction_list = clean_and_parse_model_output(model_call.response)
             created_identification_count, matched_segments = (
                 self._create_identifications(
                     prediction_list=prediction_list,
@@ -883,6 +1859,32 @@ class AdClassifier:
             )
         return []
 
+    def _parse_model_response(
+        self, model_call: ModelCall
+    ) -> AdSegmentPredictionList | None:
+        """Parse a model call's response, recording whether parsing failed."""
+        prediction_list: AdSegmentPredictionList | None = None
+        try:
+            prediction_list = clean_and_parse_model_output(model_call.response)
+        except (ValidationError, AssertionError, ValueError) as e:
+            self.logger.error(
+                f"Error parsing LLM response for ModelCall {model_call.id}: {e}",
+                exc_info=True,
+            )
+        parse_failed = prediction_list is None
+        if model_call.id is not None and model_call.parse_failed is not parse_failed:
+            res = writer_client.update(
+                "ModelCall", model_call.id, {"parse_failed": parse_failed}, wait=True
+            )
+            if not res or not res.success:
+                # Bookkeeping only; the parsed result is still usable.
+                self.logger.warning(
+                    f"Failed to record parse outcome for ModelCall {model_call.id}: "
+                    f"{getattr(res, 'error', None)}"
+                )
+            model_call.parse_failed = parse_failed
+        return prediction_list
+
     def _create_identifications(
         self,
         *,
@@ -908,49 +1910,51 @@ class AdClassifier:
                 )
                 continue
 
-            matched_segment = self._find_matching_segment(
+            pred_segments = self._segments_for_offset(
                 segment_offset=pred.segment_offset,
                 current_chunk_db_segments=current_chunk_db_segments,
+                model_call=model_call,
             )
 
-            if not matched_segment:
+            if not pred_segments:
                 self.logger.warning(
                     f"Could not find matching TranscriptSegment for ad prediction offset {pred.segment_offset:.2f} in post {model_call.post_id}, chunk {model_call.first_segment_sequence_num}-{model_call.last_segment_sequence_num}. Confidence: {pred.confidence:.2f}"
                 )
                 continue
 
-            if matched_segment.id in processed_segment_ids:
-                continue
+            for matched_segment in pred_segments:
+                if matched_segment.id in processed_segment_ids:
+                    continue
 
-            processed_segment_ids.add(matched_segment.id)
-            matched_segments.append(matched_segment)
+                processed_segment_ids.add(matched_segment.id)
+                matched_segments.append(matched_segment)
 
-            if self._segment_has_ad_identification(matched_segment.id):
-                self.logger.debug(
-                    "Segment %s for post %s already has an ad identification; skipping new record.",
-                    matched_segment.id,
-                    model_call.post_id,
-                )
-                continue
+                if self._segment_has_ad_identification(matched_segment.id):
+                    self.logger.debug(
+                        "Segment %s for post %s already has an ad identification; skipping new record.",
+                        matched_segment.id,
+                        model_call.post_id,
+                    )
+                    continue
 
-            to_insert.append(
-                {
-                    "transcript_segment_id": matched_segment.id,
-                    "model_call_id": model_call.id,
-                    "label": "ad",
-                    "confidence": adjusted_confidence,
-                }
-            )
+                to_insert.append(
+                    {
+                        "transcript_segment_id": matched_segment.id,
+                        "model_call_id": model_call.id,
+                        "label": "ad",
+                        "confidence": adjusted_confidence,
+                    }
+                )
 
-            self._maybe_add_preroll_context(
-                matched_segment=matched_segment,
-                current_chunk_db_segments=current_chunk_db_segments,
-                model_call=model_call,
-                processed_segment_ids=processed_segment_ids,
-                matched_segments=matched_segments,
-                base_confidence=adjusted_confidence,
-                to_insert=to_insert,
-            )
+                self._maybe_add_preroll_context(
+                    matched_segment=matched_segment,
+                    current_chunk_db_segments=current_chunk_db_segments,
+                    model_call=model_call,
+                    processed_segment_ids=processed_segment_ids,
+                    matched_segments=matched_segments,
+                    base_confidence=adjusted_confidence,
+                    to_insert=to_insert,
+                )
 
         if not to_insert:
             return 0, matched_segments
@@ -1028,6 +2032,35 @@ class AdClassifier:
             )
         return created
 
+    def _segments_for_offset(
+        self,
+        *,
+        segment_offset: float,
+        current_chunk_db_segments: list[TranscriptSegment],
+        model_call: ModelCall,
+        max_chars_per_segment: int | None = None,
+    ) -> list[TranscriptSegment]:
+        """The segments a predicted ``segment_offset`` refers to.
+
+        Compact prompts number their lines, and a line may stand for several
+        merged segments; timestamped prompts name one segment by start time.
+        A compact answer that is not a line number is matched as a start time,
+        in case the model answered with a timestamp anyway.
+        """
+        if COMPACT_EXCERPT_NOTE in (model_call.prompt or ""):
+            line = round(segment_offset)
+            groups = compact_line_groups(
+                self._prompt_segments(current_chunk_db_segments, max_chars_per_segment),
+                self.config.llm_compact_min_line_words,
+            )
+            if abs(segment_offset - line) <= 1e-6 and 0 <= line < len(groups):
+                return [current_chunk_db_segments[idx] for idx in groups[line]]
+        matched = self._find_matching_segment(
+            segment_offset=segment_offset,
+            current_chunk_db_segments=current_chunk_db_segments,
+        )
+        return [matched] if matched is not None else []
+
     def _find_matching_segment(
         self,
         *,
@@ -1061,7 +2094,7 @@ class AdClassifier:
 
     def _is_retryable_error(self, error: Exception) -> bool:
         """Determine if an error should be retried."""
-        if isinstance(error, InternalServerError):
+        if isinstance(error, InternalServerError | RouterBudgetTimeoutError):
             return True
 
         # Check for retryable HTTP errors in other exception types
@@ -1097,14 +2130,18 @@ class AdClassifier:
             else model_call_obj.retry_attempts
         )
 
+        breaker = self._circuit_breaker(llm_model_name(model_call_obj.model_name))
         for attempt in range(retry_count):
             retry_attempts_value = original_retry_attempts + attempt + 1
             current_attempt_num = attempt + 1
+            # Fails fast while the provider's circuit is open.
+            probe = breaker.before_call() if breaker is not None else False
 
             self.logger.info(
                 f"Calling model {model_call_obj.model_name} for ModelCall {model_call_obj.id} (attempt {current_attempt_num}/{retry_count})"
             )
 
+            call_metrics: dict[str, Any] = {}
             try:
                 # Persist retry attempt + pending status via writer
                 if model_call_obj.id is not None:
@@ -1119,19 +2156,31 @@ class AdClassifier:
                             getattr(pending_res, "error", "Failed to update ModelCall")
                         )
 
-                # Prepare API call and validate token limits
+                # Prepare API call and validate token limits. Time spent here is
+                # dominated by the rate limiter and counts as queue wait.
+                queue_started = time.perf_counter()
                 completion_args = self._prepare_api_call(model_call_obj, system_prompt)
                 if completion_args is None:
                     return None  # Token limit exceeded
+                queue_wait_ms = elapsed_ms(queue_started)
 
                 # If GitHub Copilot is fully configured (both PAT and github_model set),
                 # route to the Copilot SDK. Otherwise fall through to litellm.
                 is_copilot_model = self.config.is_copilot_configured
 
                 if is_copilot_model:
+                    call_started = time.perf_counter()
                     raw_response_content = self._call_copilot_model(
                         model_call_obj, system_prompt
                     )
+                    call_metrics = build_model_call_metrics(
+                        provider=COPILOT_PROVIDER,
+                        latency_ms=elapsed_ms(call_started),
+                        queue_wait_ms=queue_wait_ms,
+                    )
+                    call_metrics["response_format"] = "text"
+                    if breaker is not None:
+                        breaker.record_success()
                     # Persist success via writer and return
                     success_res = writer_client.update(
                         "ModelCall",
@@ -1141,6 +2190,7 @@ class AdClassifier:
                             "status": "success",
                             "error_message": None,
                             "retry_attempts": retry_attempts_value,
+                            **call_metrics,
                         },
                         wait=True,
                     )
@@ -1151,23 +2201,54 @@ class AdClassifier:
                     model_call_obj.status = "success"
                     model_call_obj.response = raw_response_content
                     model_call_obj.error_message = None
+                    self._apply_call_metrics(model_call_obj, call_metrics)
                     self.logger.info(
                         f"Model call {model_call_obj.id} (copilot) successful on attempt {current_attempt_num}."
                     )
                     return raw_response_content
 
+                provider = llm_provider_for_model(
+                    llm_model_name(model_call_obj.model_name)
+                )
                 # Use concurrency limiter if available for litellm provider
                 if self.concurrency_limiter:
+                    slot_started = time.perf_counter()
                     with ConcurrencyContext(self.concurrency_limiter, timeout=30.0):
-                        response = litellm.completion(**completion_args)
+                        queue_wait_ms += elapsed_ms(slot_started)
+                        # Failed calls still record provider and queue wait.
+                        call_metrics = build_model_call_metrics(
+                            provider=provider,
+                            latency_ms=None,
+                            queue_wait_ms=queue_wait_ms,
+                        )
+                        call_started = time.perf_counter()
+                        raw_response_content, response = self._run_completion(
+                            model_call_obj, completion_args
+                        )
                 else:
-                    response = litellm.completion(**completion_args)
-
-                response_first_choice = response.choices[0]
-                assert isinstance(response_first_choice, Choices)
-                content = response_first_choice.message.content
-                assert content is not None
-                raw_response_content = content
+                    call_metrics = build_model_call_metrics(
+                        provider=provider, latency_ms=None, queue_wait_ms=queue_wait_ms
+                    )
+                    call_started = time.perf_counter()
+                    raw_response_content, response = self._run_completion(
+                        model_call_obj, completion_args
+                    )
+                call_metrics = build_model_call_metrics(
+                    provider=provider,
+                    latency_ms=elapsed_ms(call_started),
+                    queue_wait_ms=queue_wait_ms,
+                    response=response,
+                )
+                call_metrics["response_format"] = (
+                    "json_schema" if "response_format" in completion_args else "text"
+                )
+                if breaker is not None:
+                    breaker.record_success()
+                cached_prompt_tokens = call_metrics["cached_prompt_tokens"]
+                if cached_prompt_tokens:
+                    self.logger.info(
+                        f"ModelCall {model_call_obj.id} reused {cached_prompt_tokens} cached prompt tokens."
+                    )
 
                 success_res = writer_client.update(
                     "ModelCall",
@@ -1177,6 +2258,7 @@ class AdClassifier:
                         "status": "success",
                         "error_message": None,
                         "retry_attempts": retry_attempts_value,
+                        **call_metrics,
                     },
                     wait=True,
                 )
@@ -1188,6 +2270,7 @@ class AdClassifier:
                 model_call_obj.status = "success"
                 model_call_obj.response = raw_response_content
                 model_call_obj.error_message = None
+                self._apply_call_metrics(model_call_obj, call_metrics)
                 self.logger.info(
                     f"Model call {model_call_obj.id} successful on attempt {current_attempt_num}."
                 )
@@ -1201,6 +2284,7 @@ class AdClassifier:
                         error=e,
                         attempt=attempt,
                         current_attempt_num=current_attempt_num,
+                        breaker=breaker,
                     )
                     # Continue to next retry
                 else:
@@ -1211,7 +2295,11 @@ class AdClassifier:
                     fail_res = writer_client.update(
                         "ModelCall",
                         model_call_obj.id,
-                        {"status": "failed_permanent", "error_message": str(e)},
+                        {
+                            "status": "failed_permanent",
+                            "error_message": str(e),
+                            **call_metrics,
+                        },
                         wait=True,
                     )
                     if not fail_res or not fail_res.success:
@@ -1222,6 +2310,11 @@ class AdClassifier:
                     model_call_obj.status = "failed_permanent"
                     model_call_obj.error_message = str(e)
                     raise  # Re-raise non-retryable exceptions immediately
+            finally:
+                # Token-limit skips and non-retryable errors say nothing about
+                # the provider; recorded outcomes have released it already.
+                if probe and breaker is not None:
+                    breaker.release_probe()
 
         # If we get here, all retries were exhausted
         self._handle_retry_exhausted(model_call_obj, retry_count, last_error)
@@ -1232,6 +2325,178 @@ class AdClassifier:
             f"Maximum retries ({retry_count}) exceeded for ModelCall {model_call_obj.id}."
         )
 
+    def _run_completion(
+        self, model_call_obj: ModelCall, completion_args: dict[str, Any]
+    ) -> tuple[str, Any]:
+        """Run one litellm completion; returns its text and a usage source.
+
+        If the provider rejects the JSON-schema ``response_format``, it is
+        dropped from ``completion_args`` (so callers can tell which format was
+        used) and the call is repeated as free text.
+        """
+        try:
+            return self._run_completion_once(model_call_obj, completion_args)
+        except (UnsupportedParamsError, BadRequestError) as e:
+            requested_schema = "response_format" in completion_args
+            if not (requested_schema and _rejects_structured_output(e)):
+                raise
+            self.logger.warning(
+                f"Model {model_call_obj.model_name} rejected structured output "
+                f"({e}); falling back to free-text responses."
+            )
+            _STRUCTURED_OUTPUT_REJECTED.add(llm_model_name(model_call_obj.model_name))
+            del completion_args["response_format"]
+            return self._run_completion_once(model_call_obj, completion_args)
+
+    def _run_completion_once(
+        self, model_call_obj: ModelCall, completion_args: dict[str, Any]
+    ) -> tuple[str, Any]:
+        if self.config.llm_enable_streaming:
+            return self._stream_completion(model_call_obj, completion_args)
+        response = self._litellm_completion(completion_args)
+        response_first_choice = response.choices[0]
+        assert isinstance(response_first_choice, Choices)
+        content = response_first_choice.message.content
+        assert content is not None
+        return content, response
+
+    def _stream_completion(
+        self, model_call_obj: ModelCall, completion_args: dict[str, Any]
+    ) -> tuple[str, Any]:
+        """Stream a completion, parsing ``ad_segments`` entries as they arrive.
+
+        The stream is abandoned as soon as the model reports no ads. If it is
+        cut off after some complete entries, the parsed prefix is kept and
+        only the remaining tail is requested in a follow-up call.
+        """
+        parser = StreamingPredictionParser()
+        usage_source: Any = None
+        finish_reason: str | None = None
+        stream_error: Exception | None = None
+        stream = self._litellm_completion(
+            {
+                **completion_args,
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            },
+            hedge=False,
+        )
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage_source = chunk
+                choices = getattr(chunk, "choices", None) or []
+                if not choices:
+                    continue
+                delta = getattr(choices[0], "delta", None)
+                content = getattr(delta, "content", None)
+                if content:
+                    parser.feed(content)
+                finish_reason = getattr(choices[0], "finish_reason", None) or (
+                    finish_reason
+                )
+                if parser.no_ads:
+                    self.logger.info(
+                        f"ModelCall {model_call_obj.id} reported no ads; "
+                        "stopping the stream early."
+                    )
+                    return parser.prediction_list().model_dump_json(), usage_source
+        except Exception as e:  # pylint: disable=broad-except
+            if not parser.predictions:
+                raise
+            stream_error = e
+        finally:
+            # Abandoning a stream must also stop the provider generating it.
+            close_stream(stream)
+
+        truncated = stream_error is not None or finish_reason == "length"
+        if not parser.finished or truncated:
+            if not parser.predictions:
+                # Nothing usable was streamed; let normal parsing/repair decide.
+                return parser.text, usage_source
+            self.logger.warning(
+                f"Streamed response for ModelCall {model_call_obj.id} was cut off "
+                f"after {len(parser.predictions)} entries "
+                f"({stream_error or finish_reason or 'incomplete JSON'}); "
+                "requesting the remaining tail."
+            )
+            return self._complete_stream_tail(completion_args, parser, usage_source)
+        return parser.text, usage_source
+
+    def _complete_stream_tail(
+        self,
+        completion_args: dict[str, Any],
+        parser: StreamingPredictionParser,
+        usage_source: Any,
+    ) -> tuple[str, Any]:
+        """Request entries after the last streamed one and merge them in."""
+        last_offset = parser.predictions[-1].segment_offset
+        response = self._litellm_completion(
+            {
+                **completion_args,
+                "messages": [
+                    *completion_args["messages"],
+                    {"role": "assistant", "content": parser.text},
+                    {
+                        "role": "user",
+                        "content": STREAM_CONTINUATION_PROMPT.format(
+                            last_offset=last_offset
+                        ),
+                    },
+                ],
+            }
+        )
+        tail = clean_and_parse_model_output(extract_litellm_content(response))
+        merged = AdSegmentPredictionList(
+            ad_segments=[
+                *parser.predictions,
+                *(p for p in tail.ad_segments if p.segment_offset > last_offset),
+            ],
+            content_type=tail.content_type,
+            confidence=tail.confidence,
+        )
+        return merged.model_dump_json(), combine_token_usage(usage_source, response)
+
+    def _litellm_completion(
+        self, completion_args: dict[str, Any], *, hedge: bool = True
+    ) -> Any:
+        """``litellm.completion``, routed over the endpoint pool if configured.
+
+        Streams are never hedged; their endpoint latency is the time until
+        the stream opens.
+        """
+        if self.cassette is not None:
+            return self.cassette.litellm_completion(
+                lambda **args: self._live_completion(args, hedge=hedge),
+                completion_args,
+            )
+        return self._live_completion(completion_args, hedge=hedge)
+
+    def _live_completion(self, completion_args: dict[str, Any], *, hedge: bool) -> Any:
+        if self.llm_router is None:
+            return litellm.completion(**completion_args)
+        input_tokens = 0
+        if any(e.max_input_tokens_per_minute for e in self.config.llm_endpoints):
+            input_tokens = litellm.token_counter(
+                model=completion_args["model"], messages=completion_args["messages"]
+            )
+        response, endpoint_name = self.llm_router.completion(
+            completion_args,
+            input_tokens=input_tokens,
+            hedge=hedge,
+            timeout=float(self.config.openai_timeout),
+        )
+        self.logger.info(f"LLM call served by endpoint {endpoint_name}")
+        return response
+
+    @staticmethod
+    def _apply_call_metrics(
+        model_call_obj: ModelCall, call_metrics: dict[str, Any]
+    ) -> None:
+        """Mirror persisted latency/usage columns onto the local ModelCall."""
+        for key, value in call_metrics.items():
+            setattr(model_call_obj, key, value)
+
     def _handle_retryable_error(
         self,
         *,
@@ -1239,8 +2504,14 @@ class AdClassifier:
         error: InternalServerError | Exception,
         attempt: int,
         current_attempt_num: int,
+        breaker: CircuitBreaker | None = None,
     ) -> None:
-        """Handle a retryable error during LLM call."""
+        """Handle a retryable error during LLM call.
+
+        Counts the failure against the provider's circuit breaker and raises
+        ``ProviderUnavailableError`` if that opened it; otherwise sleeps for a
+        jittered backoff that honours the provider's Retry-After hint.
+        """
         self.logger.error(
             f"LLM retryable error for ModelCall {model_call_obj.id} (attempt {current_attempt_num}): {error}"
         )
@@ -1255,22 +2526,32 @@ class AdClassifier:
         # Update local object to reflect database state
         model_call_obj.error_message = str(error)
 
+        retry_after = retry_after_seconds(error)
+        if breaker is not None and breaker.record_failure(retry_after):
+            raise ProviderUnavailableError(
+                breaker.provider, breaker.retry_in()
+            ) from error
+
         # Use longer backoff for rate limiting errors
         error_str = str(error).lower()
         if any(
             term in error_str
             for term in ["rate_limit_error", "ratelimiterror", "429", "rate limit"]
         ):
-            # For rate limiting, use longer backoff: 60, 120, 240 seconds
-            wait_time = 60 * (2**attempt)
+            # For rate limiting, use longer backoff: up to 60, 120, 240 seconds
+            wait_time = backoff_delay(
+                attempt, base=60.0, cap=math.inf, retry_after=retry_after
+            )
             self.logger.info(
-                f"Rate limit detected. Waiting {wait_time}s before retry for ModelCall {model_call_obj.id}."
+                f"Rate limit detected. Waiting {wait_time:.1f}s before retry for ModelCall {model_call_obj.id}."
             )
         else:
-            # For other errors, use shorter exponential backoff: 1, 2, 4 seconds
-            wait_time = (2**attempt) * 1
+            # For other errors, use shorter exponential backoff: up to 1, 2, 4 seconds
+            wait_time = backoff_delay(
+                attempt, base=1.0, cap=math.inf, retry_after=retry_after
+            )
             self.logger.info(
-                f"Waiting {wait_time}s before next retry for ModelCall {model_call_obj.id}."
+                f"Waiting {wait_time:.1f}s before next retry for ModelCall {model_call_obj.id}."
             )
 
         time.sleep(wait_time)
@@ -1503,38 +2784,20 @@ class AdClassifier:
             .all()
         )
 
-        # Group into ad blocks
-        ad_blocks = self._group_into_blocks(identifications)
-
-        for block in ad_blocks:
-            # Skip low confidence or very short blocks
-            if block["confidence"] < 0.6 or (block["end"] - block["start"]) < 15.0:
-                continue
+        # Group into ad blocks, skipping low confidence or very short ones
+        ad_blocks = [
+            block
+            for block in self._group_into_blocks(identifications)
+            if block["confidence"] >= 0.6 and (block["end"] - block["start"]) >= 15.0
+        ]
 
-            # Refine
-            seq_nums = [
-                ident.transcript_segment.sequence_num
-                for ident in block["identifications"]
-                if ident.transcript_segment is not None
-            ]
+        # Build the segment view once; every block's context lookup reuses it.
+        segment_view = SegmentView.from_transcript_segments(transcript_segments)
+        refinements = self._refine_blocks(ad_blocks, segment_view, post)
 
-            refinement = self.boundary_refiner.refine(
-                ad_start=block["start"],
-                ad_end=block["end"],
-                confidence=block["confidence"],
-                all_segments=[
-                    {
-                        "sequence_num": s.sequence_num,
-                        "start_time": s.start_time,
-                        "text": s.text,
-                        "end_time": s.end_time,
-                    }
-                    for s in transcript_segments
-                ],
-                post_id=post.id,
-                first_seq_num=min(seq_nums) if seq_nums else None,
-                last_seq_num=max(seq_nums) if seq_nums else None,
-            )
+        for block, refinement in zip(ad_blocks, refinements, strict=True):
+            if refinement is None:
+                continue
 
             # Apply refinement: delete old identifications, create new ones
             # Note: Get model_call from block identifications
@@ -1555,6 +2818,11 @@ class AdClassifier:
                         "refined_start": float(refinement.refined_start),
                         "refined_end": float(refinement.refined_end),
                         "confidence": float(block.get("confidence", 0.0) or 0.0),
+                        "source": (
+                            "cue"
+                            if isinstance(refinement, CueBoundaryRefinement)
+                            else "llm"
+                        ),
                     }
                 )
 
@@ -1584,6 +2852,185 @@ class AdClassifier:
                 exc,
             )
 
+    def _refine_blocks(
+        self,
+        ad_blocks: list[dict[str, Any]],
+        segment_view: SegmentView,
+        post: Post,
+    ) -> list[Any | None]:
+        """Refine ad blocks with the feed's strategy (llm, cue or hybrid).
+
+        Returns one refinement (or None on failure) per block, in block order.
+        """
+        requests = self._build_refine_requests(ad_blocks)
+        strategy = self._boundary_refinement_strategy(post)
+        if strategy == "llm" or not requests:
+            return self._refine_blocks_concurrently(requests, segment_view, post)
+
+        silences = self._detect_silences(post)
+        refinements: list[Any | None] = [
+            self.cue_boundary_refiner.refine(
+                all_segments=segment_view,
+                post_id=post.id,
+                silences=silences,
+                **request,
+            )
+            for request in requests
+        ]
+        if strategy == "cue":
+            return refinements
+
+        threshold = self.config.boundary_refinement_hybrid_min_confidence
+        low_confidence = [
+            idx
+            for idx, refinement in enumerate(refinements)
+            if isinstance(refinement, CueBoundaryRefinement)
+            and refinement.confidence < threshold
+        ]
+        self.logger.info(
+            "Hybrid boundary refinement for post %s: %s/%s blocks need the LLM",
+            post.id,
+            len(low_confidence),
+            len(requests),
+        )
+        llm_refinements = self._refine_blocks_concurrently(
+            [requests[idx] for idx in low_confidence], segment_view, post
+        )
+        for idx, llm_refinement in zip(low_confidence, llm_refinements, strict=True):
+            # Keep the cue-based result when the LLM refinement failed.
+            if llm_refinement is not None:
+                refinements[idx] = llm_refinement
+        return refinements
+
+    def _boundary_refinement_strategy(self, post: Post) -> str:
+        """Per-feed strategy override, falling back to the global config."""
+        feed = getattr(post, "feed", None)
+        override = getattr(feed, "boundary_refinement_strategy", None)
+        if override in BOUNDARY_REFINEMENT_STRATEGIES:
+            return str(override)
+        return self.config.boundary_refinement_strategy
+
+    def _detect_silences(self, post: Post) -> list[tuple[float, float]] | None:
+        """Silences in the episode audio, or None to fall back to transcript gaps.
+
+        Found silences are kept on the post, so refinements can be compared
+        against them after the original audio is deleted.
+        """
+        silences = episode_silences(getattr(post, "unprocessed_audio_path", None))
+        if silences and post.id is not None:
+            try:
+                res = writer_client.update(
+                    "Post",
+                    post.id,
+                    {"audio_silences": [[start, end] for start, end in silences]},
+                    wait=True,
+                )
+                if not res or not res.success:
+                    raise RuntimeError(
+                        getattr(res, "error", "Failed to update audio silences")
+                    )
+            except Exception as exc:  # pylint: disable=broad-except
+                self.logger.warning(
+                    "Failed to persist audio silences for post %s: %s", post.id, exc
+                )
+        return silences
+
+    def _build_refine_requests(
+        self, ad_blocks: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Resolve ORM attributes up front so refiners never touch the session."""
+        requests: list[dict[str, Any]] = []
+        for block in ad_blocks:
+            seq_nums = [
+                ident.transcript_segment.sequence_num
+                for ident in block["identifications"]
+                if ident.transcript_segment is not None
+            ]
+            requests.append(
+                {
+                    "ad_start": float(block["start"]),
+                    "ad_end": float(block["end"]),
+                    "confidence": float(block["confidence"]),
+                    "first_seq_num": min(seq_nums) if seq_nums else None,
+                    "last_seq_num": max(seq_nums) if seq_nums else None,
+                }
+            )
+        return requests
+
+    def _refine_blocks_concurrently(
+        self,
+        requests: list[dict[str, Any]],
+        segment_view: SegmentView,
+        post: Post,
+    ) -> list[Any | None]:
+        """Run the LLM refiner for independent blocks in parallel.
+
+        Parallelism is bounded by the LLM concurrency limiter. Returns one
+        refinement (or None on failure) per request, in request order.
+        """
+        if not self.boundary_refiner or not requests:
+            return [None] * len(requests)
+
+        app = (
+            cast(Any, current_app)._get_current_object() if has_app_context() else None
+        )
+
+        def _run(request: dict[str, Any]) -> Any | None:
+            if app is None:
+                return self._refine_block(request, segment_view, post.id)
+            with app.app_context():
+                return self._refine_block(request, segment_view, post.id)
+
+        max_workers = (
+            self.concurrency_limiter.max_concurrent_calls
+            if self.concurrency_limiter
+            else 1
+        )
+        max_workers = max(1, min(max_workers, len(requests)))
+        if max_workers == 1:
+            return [_run(request) for request in requests]
+
+        self.logger.info(
+            "Refining %s ad blocks for post %s with %s workers",
+            len(requests),
+            post.id,
+            max_workers,
+        )
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="boundary-refine"
+        ) as executor:
+            return list(executor.map(_run, requests))
+
+    def _refine_block(
+        self, request: dict[str, Any], segment_view: SegmentView, post_id: int
+    ) -> Any | None:
+        """Refine a single ad block while holding an LLM concurrency slot."""
+        assert self.boundary_refiner is not None
+        try:
+            if self.concurrency_limiter:
+                slot_started = time.perf_counter()
+                with ConcurrencyContext(
+                    self.concurrency_limiter, timeout=float(self.config.openai_timeout)
+                ):
+                    return self.boundary_refiner.refine(
+                        all_segments=segment_view,
+                        post_id=post_id,
+                        queue_wait_ms=elapsed_ms(slot_started),
+                        **request,
+                    )
+            return self.boundary_refiner.refine(
+                all_segments=segment_view, post_id=post_id, queue_wait_ms=0, **request
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.warning(
+                "Boundary refinement failed for post %s block %.1f-%.1f: %s",
+                post_id,
+                request["ad_start"],
+                request["ad_end"],
+                exc,
+            )
+            return None
+
     def _group_into_blocks(
         self, identifications: list[Identification]
     ) -> list[dict[str, Any]]:
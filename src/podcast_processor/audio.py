@@ -1,23 +1,82 @@
 import logging
 import math
 import os
+import re
 import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
 from pathlib import Path
+from typing import Any
 
 import ffmpeg  # type: ignore[import-untyped]
 
+from podcast_processor.mp3_splice import Mp3SpliceError, splice_mp3
+
 logger = logging.getLogger("global_logger")
 
 
-def get_audio_duration_ms(file_path: str) -> int | None:
+@dataclass(frozen=True)
+class AudioProbe:
+    """What ffprobe reports about an audio file."""
+
+    duration_ms: int
+    codec: str | None
+    bit_rate: int | None
+    sample_rate: int | None
+    channels: int | None
+
+
+# Probes by real path, valid while the file's (size, mtime_ns) is unchanged.
+# Least recently used probes are dropped past _PROBE_CACHE_MAX_ENTRIES, so
+# temporary files (chunks, splices) probed once do not pile up.
+_PROBE_CACHE: OrderedDict[str, tuple[tuple[int, int], AudioProbe]] = OrderedDict()
+_PROBE_CACHE_LOCK = threading.Lock()
+_PROBE_CACHE_MAX_ENTRIES = 512
+
+
+def _cached(key: tuple[str, tuple[int, int]]) -> AudioProbe | None:
+    with _PROBE_CACHE_LOCK:
+        cached = _PROBE_CACHE.get(key[0])
+        if cached is None or cached[0] != key[1]:
+            return None
+        _PROBE_CACHE.move_to_end(key[0])
+        return cached[1]
+
+
+def _remember(key: tuple[str, tuple[int, int]], probe: AudioProbe) -> None:
+    with _PROBE_CACHE_LOCK:
+        _PROBE_CACHE[key[0]] = (key[1], probe)
+        _PROBE_CACHE.move_to_end(key[0])
+        while len(_PROBE_CACHE) > _PROBE_CACHE_MAX_ENTRIES:
+            _PROBE_CACHE.popitem(last=False)
+
+
+def _file_key(file_path: str) -> tuple[str, tuple[int, int]] | None:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return os.path.realpath(file_path), (stat.st_size, stat.st_mtime_ns)
+
+
+def _optional_int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def probe_audio(file_path: str) -> AudioProbe | None:
+    """Probe ``file_path``, or reuse the probe of the same unchanged file."""
+    key = _file_key(file_path)
+    if key is not None:
+        cached = _cached(key)
+        if cached is not None:
+            return cached
     try:
         logger.debug("[FFMPEG_PROBE] Probing audio file: %s", file_path)
         probe = ffmpeg.probe(file_path)
-        format_info = probe["format"]
-        duration_seconds = float(format_info["duration"])
-        duration_milliseconds = duration_seconds * 1000
-        logger.debug("[FFMPEG_PROBE] Duration: %.2f seconds", duration_seconds)
-        return int(duration_milliseconds)
     except ffmpeg.Error as e:
         logger.error(
             "[FFMPEG_PROBE] Error probing file %s: %s",
@@ -25,6 +84,87 @@ def get_audio_duration_ms(file_path: str) -> int | None:
             e.stderr.decode() if e.stderr else str(e),
         )
         return None
+    format_info = probe["format"]
+    stream = next(
+        (s for s in probe.get("streams", []) if s.get("codec_type") == "audio"), {}
+    )
+    duration_seconds = float(format_info["duration"])
+    logger.debug("[FFMPEG_PROBE] Duration: %.2f seconds", duration_seconds)
+    result = AudioProbe(
+        duration_ms=int(duration_seconds * 1000),
+        codec=stream.get("codec_name"),
+        bit_rate=_optional_int(stream.get("bit_rate") or format_info.get("bit_rate")),
+        sample_rate=_optional_int(stream.get("sample_rate")),
+        channels=_optional_int(stream.get("channels")),
+    )
+    if key is not None:
+        _remember(key, result)
+    return result
+
+
+def get_audio_duration_ms(file_path: str) -> int | None:
+    probe = probe_audio(file_path)
+    return probe.duration_ms if probe is not None else None
+
+
+def stored_probes(file_paths: list[str | None]) -> dict[str, dict[str, Any]]:
+    """Probes of ``file_paths`` in the form kept on the post, probing any
+    not seen yet; paths that cannot be probed are left out."""
+    stored: dict[str, dict[str, Any]] = {}
+    for file_path in file_paths:
+        key = _file_key(file_path) if file_path else None
+        if file_path is None or key is None:
+            continue
+        probe = probe_audio(file_path)
+        if probe is not None:
+            size, mtime_ns = key[1]
+            stored[file_path] = {"size": size, "mtime_ns": mtime_ns, **asdict(probe)}
+    return stored
+
+
+def cached_probe(
+    file_path: str | None, stored: dict[str, Any] | None
+) -> AudioProbe | None:
+    """The probe kept for ``file_path`` if the file is unchanged since;
+    never runs ffprobe."""
+    if not file_path:
+        return None
+    key = _file_key(file_path)
+    if key is None:
+        return None
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+    entry = (stored or {}).get(file_path)
+    if (
+        not isinstance(entry, dict)
+        or (entry.get("size"), entry.get("mtime_ns")) != key[1]
+    ):
+        return None
+    try:
+        probe = AudioProbe(
+            duration_ms=int(entry["duration_ms"]),
+            codec=entry.get("codec"),
+            bit_rate=_optional_int(entry.get("bit_rate")),
+            sample_rate=_optional_int(entry.get("sample_rate")),
+            channels=_optional_int(entry.get("channels")),
+        )
+    except (KeyError, TypeError, ValueError):
+        return None
+    _remember(key, probe)
+    return probe
+
+
+def remember_probes(stored: dict[str, Any] | None) -> None:
+    """Seed the probe cache from probes kept on a post."""
+    for file_path in stored or {}:
+        cached_probe(file_path, stored)
+
+
+def reset_probe_cache() -> None:
+    """Forget all probes (used by tests)."""
+    with _PROBE_CACHE_LOCK:
+        _PROBE_CACHE.clear()
 
 
 def clip_segments_with_fade(
@@ -37,24 +177,68 @@ def clip_segments_with_fade(
     audio_duration_ms = get_audio_duration_ms(in_path)
     assert audio_duration_ms is not None
 
-    # Try the complex filter approach first, fall back to simple if it fails
+    # MP3 in and out: copy the kept frames and re-encode only the fades
+    if out_path.lower().endswith(".mp3"):
+        try:
+            splice_mp3(
+                _fade_clip_pieces(ad_segments_ms, fade_ms, audio_duration_ms),
+                in_path,
+                out_path,
+            )
+            return
+        except Mp3SpliceError as e:
+            logger.info(
+                "[MP3_SPLICE] Cannot copy frames of %s, re-encoding: %s", in_path, e
+            )
+
+    # Try the complex filter approach first, then a single concat demuxer run,
+    # and finally per-segment temp files, the slowest but most robust cut.
     # Catch both ffmpeg.Error (runtime) and broader exceptions (filter graph construction)
     try:
         _clip_segments_complex(
             ad_segments_ms, fade_ms, in_path, out_path, audio_duration_ms
         )
-    except ffmpeg.Error as e:
-        err_msg = e.stderr.decode() if getattr(e, "stderr", None) else str(e)
+        return
+    except Exception as e:  # pylint: disable=broad-except
         logger.warning(
-            "Complex filter failed (ffmpeg error), trying simple approach: %s", err_msg
+            "Complex filter failed, trying single-pass concat: %s", _ffmpeg_error(e)
         )
-        _clip_segments_simple(ad_segments_ms, in_path, out_path, audio_duration_ms)
+    try:
+        _clip_segments_single_pass(
+            ad_segments_ms, fade_ms, in_path, out_path, audio_duration_ms
+        )
+        return
     except Exception as e:  # pylint: disable=broad-except
-        # Catches filter graph construction errors like "multiple outgoing edges"
         logger.warning(
-            "Complex filter failed (graph error), trying simple approach: %s", e
+            "Single-pass concat failed, trying simple approach: %s", _ffmpeg_error(e)
+        )
+    _clip_segments_simple(ad_segments_ms, in_path, out_path, audio_duration_ms)
+
+
+def _ffmpeg_error(e: Exception) -> str:
+    stderr = getattr(e, "stderr", None)
+    return stderr.decode() if stderr else str(e)
+
+
+def _fade_clip_pieces(
+    ad_segments_ms: list[tuple[int, int]], fade_ms: int, audio_duration_ms: int
+) -> list[tuple[int, int, str | None]]:
+    """The (start_ms, end_ms, fade) pieces the faded output is made of: kept
+    audio, plus ``fade_ms`` fading out at each ad start and back in at its end."""
+    pieces: list[tuple[int, int, str | None]] = []
+    last_end = 0
+    for start_ms, end_ms in ad_segments_ms:
+        pieces.extend(
+            [
+                (last_end, start_ms, None),
+                (start_ms, start_ms + fade_ms, "out"),
+                (end_ms - fade_ms, end_ms, "in"),
+            ]
         )
-        _clip_segments_simple(ad_segments_ms, in_path, out_path, audio_duration_ms)
+        last_end = end_ms
+    if last_end != audio_duration_ms:
+        pieces.append((last_end, audio_duration_ms, None))
+    return pieces
 
 
 def _clip_segments_complex(
@@ -64,36 +248,27 @@ def _clip_segments_complex(
     out_path: str,
     audio_duration_ms: int,
 ) -> None:
-    """Original complex approach with fades."""
+    """Original complex approach with fades.
 
-    trimmed_list = []
+    The source is opened and decoded once and fanned out with ``asplit``;
+    pieces are cut in order, so each branch only holds the frames of its
+    own piece while the concat reaches it.
+    """
 
-    last_end = 0
-    for start_ms, end_ms in ad_segments_ms:
-        trimmed_list.extend(
-            [
-                ffmpeg.input(in_path).filter(
-                    "atrim", start=last_end / 1000.0, end=start_ms / 1000.0
-                ),
-                ffmpeg.input(in_path)
-                .filter(
-                    "atrim", start=start_ms / 1000.0, end=(start_ms + fade_ms) / 1000.0
-                )
-                .filter("afade", t="out", ss=0, d=fade_ms / 1000.0),
-                ffmpeg.input(in_path)
-                .filter("atrim", start=(end_ms - fade_ms) / 1000.0, end=end_ms / 1000.0)
-                .filter("afade", t="in", ss=0, d=fade_ms / 1000.0),
-            ]
-        )
+    pieces = _fade_clip_pieces(ad_segments_ms, fade_ms, audio_duration_ms)
+    branches = ffmpeg.input(in_path).audio.filter_multi_output("asplit", len(pieces))
 
-        last_end = end_ms
-
-    if last_end != audio_duration_ms:
-        trimmed_list.append(
-            ffmpeg.input(in_path).filter(
-                "atrim", start=last_end / 1000.0, end=audio_duration_ms / 1000.0
-            )
+    trimmed_list = []
+    for i, (start_ms, end_ms, fade) in enumerate(pieces):
+        piece = branches[i].filter(
+            "atrim", start=start_ms / 1000.0, end=end_ms / 1000.0
         )
+        if fade is not None:
+            # afade counts from timestamp zero, not from the piece's start
+            piece = piece.filter("asetpts", "PTS-STARTPTS").filter(
+                "afade", t=fade, ss=0, d=fade_ms / 1000.0
+            )
+        trimmed_list.append(piece)
 
     logger.info(
         "[FFMPEG_CONCAT] Starting audio concatenation: %s -> %s (%d segments)",
@@ -105,6 +280,84 @@ def _clip_segments_complex(
     logger.info("[FFMPEG_CONCAT] Completed audio concatenation: %s", out_path)
 
 
+def _concat_list_path(path: str) -> str:
+    # Entries resolve against the list's own URL, which is the pipe.
+    return "file:" + os.path.abspath(path).replace("'", "'\\''")
+
+
+def _clip_segments_single_pass(
+    ad_segments_ms: list[tuple[int, int]],
+    fade_ms: int,
+    in_path: str,
+    out_path: str,
+    audio_duration_ms: int,
+) -> None:
+    """Cut in a single ffmpeg run without intermediate files.
+
+    The concat demuxer reads the kept spans straight from the source through
+    ``inpoint``/``outpoint`` entries; the fades are applied at their output
+    positions in the same filter pass.
+    """
+    spans: list[list[int]] = []
+    fades: list[tuple[str, int]] = []
+    position_ms = 0
+    for start_ms, end_ms, fade in _fade_clip_pieces(
+        ad_segments_ms, fade_ms, audio_duration_ms
+    ):
+        if end_ms <= start_ms:
+            continue
+        if fade is not None:
+            fades.append((fade, position_ms))
+        if spans and spans[-1][1] == start_ms:
+            spans[-1][1] = end_ms
+        else:
+            spans.append([start_ms, end_ms])
+        position_ms += end_ms - start_ms
+
+    if not spans:
+        raise ValueError("No audio segments to keep after ad removal")
+
+    entries = ["ffconcat version 1.0"]
+    for start_ms, end_ms in spans:
+        entries.append(f"file '{_concat_list_path(in_path)}'")
+        if start_ms > 0:
+            entries.append(f"inpoint {start_ms / 1000.0:.3f}")
+        if end_ms < audio_duration_ms:
+            entries.append(f"outpoint {end_ms / 1000.0:.3f}")
+
+    logger.info(
+        "[FFMPEG_SINGLE_PASS] Starting single-pass concat with %d segments",
+        len(spans),
+    )
+
+    # Each span starts on the frame before its inpoint and ends on the frame
+    # after its outpoint; resampling by timestamp drops the overlap.
+    stream = ffmpeg.input(
+        "pipe:0", f="concat", safe=0, protocol_whitelist="file,pipe"
+    ).filter("aresample", **{"async": 1, "min_hard_comp": 0})
+    for fade, at_ms in fades:
+        # A fade silences everything past its end (or before its start), so
+        # each one is confined to its own window of the output.
+        start, duration = at_ms / 1000.0, fade_ms / 1000.0
+        stream = stream.filter(
+            "afade",
+            t=fade,
+            st=start,
+            d=duration,
+            enable=f"between(t,{start:.3f},{start + duration:.3f})",
+        )
+    (
+        stream.filter("atrim", end=position_ms / 1000.0)
+        .output(out_path, acodec="libmp3lame", q=2)
+        .overwrite_output()
+        .run(input="\n".join(entries).encode() + b"\n", quiet=True)
+    )
+
+    logger.info(
+        "[FFMPEG_SINGLE_PASS] Completed single-pass concatenation: %s", out_path
+    )
+
+
 def _clip_segments_simple(
     ad_segments_ms: list[tuple[int, int]],
     in_path: str,
@@ -186,20 +439,102 @@ def trim_file(in_path: Path, out_path: Path, start_ms: int, end_ms: int) -> None
         start_sec,
         duration_sec,
     )
+    output_kwargs: dict[str, Any] = {"t": duration_sec, "acodec": "copy", "vn": None}
+    # Seeking a stream copy, even to 0, drops the encoder delay info of the
+    # first frame and shifts the copy's timeline.
+    if start_sec > 0:
+        output_kwargs["ss"] = start_sec
     (
         ffmpeg.input(str(in_path))
+        .output(str(out_path), **output_kwargs)
+        .overwrite_output()
+        .run()
+    )
+
+
+def change_tempo(in_path: str, out_path: str, factor: float) -> None:
+    """Re-encode ``in_path`` played ``factor`` times as fast, keeping its pitch.
+
+    The output is mono 16 kHz MP3, which is all a speech recogniser needs.
+    """
+    logger.debug(
+        "[FFMPEG_TEMPO] Re-encoding %s -> %s at %.2fx", in_path, out_path, factor
+    )
+    (
+        ffmpeg.input(str(in_path))
+        .audio.filter("atempo", factor)
         .output(
             str(out_path),
-            ss=start_sec,
-            t=duration_sec,
-            acodec="copy",
-            vn=None,
+            acodec="libmp3lame",
+            ac=1,
+            ar=16000,
+            audio_bitrate="64k",
         )
         .overwrite_output()
-        .run()
+        .run(capture_stdout=True, capture_stderr=True)
     )
 
 
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?[\d.]+)")
+
+
+def detect_silences(
+    in_path: str,
+    noise_db: float = -35.0,
+    min_silence_seconds: float = 0.3,
+) -> list[tuple[float, float]]:
+    """Return (start, end) seconds of silent stretches using ffmpeg silencedetect.
+
+    Returns an empty list if ffmpeg fails; callers treat silence as an optional
+    signal.
+    """
+    logger.debug(
+        "[FFMPEG_SILENCE] Detecting silences in %s (noise=%.1fdB, d=%.2fs)",
+        in_path,
+        noise_db,
+        min_silence_seconds,
+    )
+    try:
+        _, stderr = (
+            ffmpeg.input(in_path)
+            .filter("silencedetect", noise=f"{noise_db}dB", d=min_silence_seconds)
+            .output("-", format="null")
+            .run(capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as e:
+        logger.warning(
+            "[FFMPEG_SILENCE] Silence detection failed for %s: %s",
+            in_path,
+            e.stderr.decode() if e.stderr else str(e),
+        )
+        return []
+
+    silences: list[tuple[float, float]] = []
+    pending_start: float | None = None
+    for line in stderr.decode(errors="replace").splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            pending_start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and pending_start is not None:
+            silences.append((pending_start, float(end_match.group(1))))
+            pending_start = None
+
+    logger.debug("[FFMPEG_SILENCE] Found %d silences in %s", len(silences), in_path)
+    return silences
+
+
+def episode_silences(audio_path: str | None) -> list[tuple[float, float]] | None:
+    """Silences in an episode's original audio, as boundary refinement uses
+    them; None when the audio is gone (after processing) or has no silences,
+    which makes cue refinement fall back to transcript gaps."""
+    if not audio_path or not os.path.exists(audio_path):
+        return None
+    return detect_silences(audio_path) or None
+
+
 def split_audio(
     audio_file_path: Path,
     audio_chunk_path: Path,
@@ -0,0 +1,417 @@
+"""Acoustic fingerprints of dynamically inserted ads.
+
+Dynamically inserted ads are the same audio spliced into many episodes, often
+across feeds. Ad spans confirmed by a processed episode are fingerprinted with
+spectral-peak landmarks (pairs of peaks hashed by their two frequencies and
+their time distance) and stored in a global index. Before a new episode is
+transcribed its audio is fingerprinted the same way; a run of landmarks that
+agree on one time offset against one indexed ad marks that stretch as a known
+ad, so it needs neither transcription nor classification.
+"""
+
+import itertools
+import logging
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import ffmpeg
+import numpy as np
+
+from app.extensions import db
+from app.models import AudioFingerprint, Post
+from app.writer.client import writer_client
+from shared.config import Config
+
+# Pseudo model name for ModelCall rows backing fingerprint identifications.
+AUDIO_FINGERPRINT_MODEL_NAME = "audio_fingerprint"
+# Text of the transcript segments standing in for skipped known-ad audio.
+KNOWN_AD_PLACEHOLDER_TEXT = "[known ad: audio fingerprint match]"
+
+SAMPLE_RATE = 8000
+FFT_SIZE = 1024
+HOP_SIZE = 256
+FRAMES_PER_SECOND = SAMPLE_RATE / HOP_SIZE
+# Frequency bands (FFT bins); the strongest bin of each band is a peak candidate.
+_BAND_EDGES = (4, 12, 24, 48, 96, 192, 320, 512)
+# A candidate must be the maximum of its band over this many frames either side.
+_PEAK_NEIGHBORHOOD_FRAMES = 3
+# Each peak is paired with up to this many following peaks.
+_FAN_OUT = 4
+_MAX_PAIR_FRAMES = 63
+# Frames decoded and transformed at a time, bounding memory on long episodes.
+_STFT_BLOCK_FRAMES = 4096
+
+# A match needs this many landmarks agreeing on one offset ...
+MIN_MATCH_LANDMARKS = 20
+# ... and matched spans are widened by this much around the first/last hit.
+_MATCH_EDGE_PAD_SECONDS = 0.5
+# A removed ad span this much covered by indexed ads is not indexed again.
+_KNOWN_SPAN_COVERAGE = 0.8
+
+Landmarks = tuple[np.ndarray, np.ndarray]
+
+
+def decode_pcm(
+    path: str, *, start: float | None = None, duration: float | None = None
+) -> np.ndarray:
+    """Decode (part of) an audio file to mono ``SAMPLE_RATE`` int16 samples."""
+    input_kwargs: dict[str, Any] = {}
+    if start is not None:
+        input_kwargs["ss"] = max(start, 0.0)
+    if duration is not None:
+        input_kwargs["t"] = duration
+    out, _ = (
+        ffmpeg.input(str(path), **input_kwargs)
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=SAMPLE_RATE)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return np.frombuffer(out, dtype=np.int16)
+
+
+def _band_peaks(samples: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-frame, per-band strongest bin and its log magnitude."""
+    n_frames = 1 + (len(samples) - FFT_SIZE) // HOP_SIZE
+    windows = np.lib.stride_tricks.sliding_window_view(samples, FFT_SIZE)[::HOP_SIZE]
+    window = np.hanning(FFT_SIZE).astype(np.float32)
+    n_bands = len(_BAND_EDGES) - 1
+    bins = np.empty((n_frames, n_bands), dtype=np.int32)
+    values = np.empty((n_frames, n_bands), dtype=np.float32)
+    for lo in range(0, n_frames, _STFT_BLOCK_FRAMES):
+        block = windows[lo : lo + _STFT_BLOCK_FRAMES].astype(np.float32) * window
+        spectrum = np.log1p(np.abs(np.fft.rfft(block, axis=1)))
+        for band, (f_lo, f_hi) in enumerate(itertools.pairwise(_BAND_EDGES)):
+            band_spec = spectrum[:, f_lo:f_hi]
+            arg = np.argmax(band_spec, axis=1)
+            bins[lo : lo + len(block), band] = arg + f_lo
+            values[lo : lo + len(block), band] = band_spec[np.arange(len(block)), arg]
+    return bins, values
+
+
+def compute_landmarks(samples: np.ndarray) -> Landmarks:
+    """Landmark hashes and their anchor frames for ``samples``.
+
+    A hash packs the anchor peak's bin (9 bits), the paired peak's bin (9 bits)
+    and their distance in frames (6 bits). Both arrays are int32.
+    """
+    empty = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32))
+    if len(samples) < FFT_SIZE:
+        return empty
+
+    bins, values = _band_peaks(samples)
+    radius = _PEAK_NEIGHBORHOOD_FRAMES
+    padded = np.pad(values, ((radius, radius), (0, 0)), constant_values=-np.inf)
+    local_max = np.lib.stride_tricks.sliding_window_view(
+        padded, 2 * radius + 1, axis=0
+    ).max(axis=-1)
+    # Local maxima that stand out from their band's typical level.
+    is_peak = (values >= local_max) & (values > values.mean(axis=0))
+    peak_frames, peak_bands = np.nonzero(is_peak)
+    if len(peak_frames) < 2:
+        return empty
+    peak_bins = bins[peak_frames, peak_bands]
+
+    hashes: list[Any] = []
+    anchors: list[Any] = []
+    for offset in range(1, _FAN_OUT + 1):
+        dt = peak_frames[offset:] - peak_frames[:-offset]
+        valid = (dt > 0) & (dt <= _MAX_PAIR_FRAMES)
+        f1 = peak_bins[:-offset][valid]
+        f2 = peak_bins[offset:][valid]
+        hashes.append((f1 << 15) | (f2 << 6) | dt[valid])
+        anchors.append(peak_frames[:-offset][valid])
+    return (
+        np.concatenate(hashes).astype(np.int32),
+        np.concatenate(anchors).astype(np.int32),
+    )
+
+
+def fingerprint_file(
+    path: str, *, start: float | None = None, duration: float | None = None
+) -> Landmarks:
+    return compute_landmarks(decode_pcm(path, start=start, duration=duration))
+
+
+def pack_landmarks(landmarks: Landmarks) -> bytes:
+    hashes, frames = landmarks
+    return np.stack([hashes, frames]).astype("<i4").tobytes()
+
+
+def unpack_landmarks(blob: bytes) -> Landmarks:
+    packed = np.frombuffer(blob, dtype="<i4").reshape(2, -1)
+    return packed[0], packed[1]
+
+
+@dataclass
+class FingerprintMatch:
+    fingerprint_id: int
+    start: float
+    end: float
+    landmarks: int
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class FingerprintIndex:
+    """In-memory landmark index over stored ad fingerprints.
+
+    Landmarks of all entries are kept in one array sorted by hash, so a query
+    is a vectorised binary search. Hits vote for (entry, time offset) pairs;
+    offsets within one frame of each other are pooled because the query audio
+    is rarely frame-aligned with the indexed copy.
+    """
+
+    def __init__(self, entries: Iterable[tuple[int, bytes, float]]):
+        hashes: list[Any] = []
+        frames: list[Any] = []
+        ids: list[Any] = []
+        self._durations: dict[int, float] = {}
+        for entry_id, blob, duration in entries:
+            entry_hashes, entry_frames = unpack_landmarks(blob)
+            hashes.append(entry_hashes)
+            frames.append(entry_frames)
+            ids.append(np.full(len(entry_hashes), int(entry_id), dtype=np.int64))
+            self._durations[int(entry_id)] = float(duration)
+        if hashes:
+            all_hashes = np.concatenate(hashes)
+            order = np.argsort(all_hashes, kind="stable")
+            self._hashes = all_hashes[order]
+            self._frames = np.concatenate(frames)[order]
+            self._ids = np.concatenate(ids)[order]
+        else:
+            self._hashes = self._frames = self._ids = np.empty(0, dtype=np.int64)
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._durations)
+
+    def __bool__(self) -> bool:
+        return bool(len(self._hashes))
+
+    def match(
+        self,
+        landmarks: Landmarks,
+        *,
+        min_duration: float,
+        min_landmarks: int = MIN_MATCH_LANDMARKS,
+    ) -> list[FingerprintMatch]:
+        """Spans of the query audio (seconds) that repeat an indexed ad."""
+        query_hashes, query_frames = landmarks
+        if not self or not len(query_hashes):
+            return []
+
+        lo = np.searchsorted(self._hashes, query_hashes, side="left")
+        hi = np.searchsorted(self._hashes, query_hashes, side="right")
+        counts = hi - lo
+        if not counts.sum():
+            return []
+        query_idx = np.repeat(np.arange(len(query_hashes)), counts)
+        run_starts = np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(lo, counts) + (np.arange(len(query_idx)) - run_starts)
+
+        hit_ids = self._ids[positions]
+        hit_frames = query_frames[query_idx].astype(np.int64)
+        offsets = hit_frames - self._frames[positions]
+        keys = (hit_ids << 32) | (offsets + (1 << 31))
+        unique_keys, key_counts = np.unique(keys, return_counts=True)
+        pooled = key_counts.copy()
+        for step in (-1, 1):
+            neighbour = np.searchsorted(unique_keys, unique_keys + step)
+            neighbour = np.minimum(neighbour, len(unique_keys) - 1)
+            found = unique_keys[neighbour] == unique_keys + step
+            pooled[found] += key_counts[neighbour[found]]
+
+        matches: list[FingerprintMatch] = []
+        claimed: set[int] = set()
+        candidates = np.nonzero(pooled >= min_landmarks)[0]
+        for idx in candidates[np.argsort(-pooled[candidates], kind="stable")]:
+            key = int(unique_keys[idx])
+            if key in claimed:
+                continue
+            window = (key - 1, key, key + 1)
+            claimed.update(window)
+
+            entry_id = key >> 32
+            offset = (key & 0xFFFFFFFF) - (1 << 31)
+            in_window = np.isin(keys, window)
+            first = float(hit_frames[in_window].min()) / FRAMES_PER_SECOND
+            last = (
+                float(hit_frames[in_window].max()) + _MAX_PAIR_FRAMES
+            ) / FRAMES_PER_SECOND
+            # The indexed ad starts at ``offset`` in the query; clamp the hit
+            # extent to it so the span never reaches past the ad itself.
+            ad_start = offset / FRAMES_PER_SECOND
+            ad_end = ad_start + self._durations[entry_id]
+            start = max(first - _MATCH_EDGE_PAD_SECONDS, ad_start, 0.0)
+            end = min(last + _MATCH_EDGE_PAD_SECONDS, ad_end)
+            # Weaker offsets of an entry inside one of its accepted spans are
+            # self-similar audio (a repeated jingle or phrase), not a new copy.
+            overlaps = any(
+                m.fingerprint_id == entry_id and start < m.end and m.start < end
+                for m in matches
+            )
+            if end - start >= min_duration and not overlaps:
+                matches.append(
+                    FingerprintMatch(
+                        fingerprint_id=entry_id,
+                        start=round(start, 2),
+                        end=round(end, 2),
+                        landmarks=int(pooled[idx]),
+                    )
+                )
+        return sorted(matches, key=lambda m: m.start)
+
+
+def merge_spans(spans: Iterable[tuple[float, float]]) -> list[tuple[float, float]]:
+    merged: list[tuple[float, float]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def covered_seconds(
+    span: tuple[float, float], matches: Sequence[FingerprintMatch]
+) -> float:
+    start, end = span
+    return sum(
+        (
+            max(0.0, min(end, m_end) - max(start, m_start))
+            for m_start, m_end in merge_spans((m.start, m.end) for m in matches)
+        ),
+        0.0,
+    )
+
+
+class AdFingerprinter:
+    """Matches episodes against, and grows, the global ad fingerprint index."""
+
+    def __init__(
+        self,
+        config: Config,
+        logger: logging.Logger | None = None,
+        db_session: Any | None = None,
+    ):
+        self.config = config
+        self.logger = logger or logging.getLogger("global_logger")
+        self.db_session = db_session or db.session
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enable_audio_fingerprinting
+
+    def _load_index(self) -> FingerprintIndex:
+        return FingerprintIndex(
+            (int(entry_id), bytes(blob), float(duration))
+            for entry_id, blob, duration in self.db_session.query(
+                AudioFingerprint.id,
+                AudioFingerprint.landmarks,
+                AudioFingerprint.duration_seconds,
+            )
+        )
+
+    def find_known_ads(self, post: Post) -> list[tuple[float, float]]:
+        """Spans (seconds) of the post's audio matching indexed ads.
+
+        Never raises: the index is an optimization and a failure here only
+        means the episode is transcribed and classified in full.
+        """
+        if not self.enabled or not post.unprocessed_audio_path:
+            return []
+        try:
+            index = self._load_index()
+            if not index:
+                return []
+            matches = index.match(
+                fingerprint_file(post.unprocessed_audio_path),
+                min_duration=self.config.audio_fingerprint_min_span_seconds,
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.warning(
+                "Audio fingerprint matching failed for post %s: %s", post.id, exc
+            )
+            return []
+
+        spans = merge_spans((m.start, m.end) for m in matches)
+        self.logger.info(
+            "Audio fingerprint index (%s entries) matched %s known ad spans "
+            "(%.1fs) in post %s.",
+            index.entry_count,
+            len(spans),
+            sum(end - start for start, end in spans),
+            post.id,
+        )
+        return spans
+
+    def index_ad_spans(
+        self, post: Post, audio_path: str, ad_segments_ms: Sequence[tuple[int, int]]
+    ) -> None:
+        """Fingerprint the post's removed ad spans and add them to the index.
+
+        Spans already covered by an indexed ad refresh that entry instead of
+        adding a duplicate. Never raises.
+        """
+        if not self.enabled:
+            return
+        min_seconds = self.config.audio_fingerprint_min_span_seconds
+        max_seconds = self.config.audio_fingerprint_max_span_seconds
+        spans = [
+            (start_ms / 1000.0, end_ms / 1000.0)
+            for start_ms, end_ms in ad_segments_ms
+            if min_seconds <= (end_ms - start_ms) / 1000.0 <= max_seconds
+        ]
+        if not spans:
+            return
+
+        try:
+            index = self._load_index()
+            new_entries: list[dict[str, Any]] = []
+            matched_ids: set[int] = set()
+            for start, end in spans:
+                landmarks = fingerprint_file(
+                    audio_path, start=start, duration=end - start
+                )
+                if len(landmarks[0]) < MIN_MATCH_LANDMARKS:
+                    continue
+                matches = index.match(landmarks, min_duration=min_seconds)
+                covered = covered_seconds((0.0, end - start), matches)
+                if covered >= _KNOWN_SPAN_COVERAGE * (end - start):
+                    matched_ids.update(m.fingerprint_id for m in matches)
+                    continue
+                new_entries.append(
+                    {
+                        "source_post_id": post.id,
+                        "duration_seconds": round(end - start, 3),
+                        "landmarks": pack_landmarks(landmarks),
+                        "landmark_count": len(landmarks[0]),
+                    }
+                )
+
+            if not new_entries and not matched_ids:
+                return
+            res = writer_client.action(
+                "update_audio_fingerprints",
+                {
+                    "fingerprints": new_entries,
+                    "matched_fingerprint_ids": sorted(matched_ids),
+                    "max_entries": self.config.audio_fingerprint_max_entries,
+                },
+                wait=True,
+            )
+            if not res or not res.success:
+                raise RuntimeError(
+                    getattr(res, "error", "Failed to update audio fingerprints")
+                )
+            self.logger.info(
+                "Audio fingerprint index updated from post %s: %s", post.id, res.data
+            )
+        except Exception as exc:  # pylint: disable=broad-except
+            self.logger.warning(
+                "Failed to update audio fingerprint index from post %s: %s",
+                post.id,
+                exc,
+            )
@@ -1,12 +1,38 @@
+import hashlib
+import json
 import logging
+import os
+from pathlib import Path
 from typing import Any
 
 from app.extensions import db
 from app.models import Identification, ModelCall, Post, TranscriptSegment
 from app.writer.client import writer_client
 from podcast_processor.ad_merger import AdMerger
-from podcast_processor.audio import clip_segments_with_fade, get_audio_duration_ms
+from podcast_processor.audio import (
+    clip_segments_with_fade,
+    get_audio_duration_ms,
+    remember_probes,
+    stored_probes,
+)
+from podcast_processor.audio_fingerprint import AdFingerprinter
 from shared.config import Config
+from shared.processing_paths import find_reprocess_archive
+
+
+def cut_list_hash(
+    ad_segments_ms: list[tuple[int, int]], *, fade_ms: int, duration_ms: int
+) -> str:
+    """Fingerprint of a cut: the same hash renders the same processed audio."""
+    payload = json.dumps(
+        {
+            "ad_segments_ms": [[int(start), int(end)] for start, end in ad_segments_ms],
+            "fade_ms": int(fade_ms),
+            "duration_ms": int(duration_ms),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class AudioProcessor:
@@ -31,6 +57,7 @@ class AudioProcessor:
         self.model_call_query = model_call_query or ModelCall.query
         self.db_session = db_session or db.session
         self.ad_merger = AdMerger()
+        self.ad_fingerprinter = AdFingerprinter(config, self.logger, self.db_session)
 
     def get_ad_segments(self, post: Post) -> list[tuple[float, float]]:
         """
@@ -327,6 +354,7 @@ class AudioProcessor:
         """
         ad_segments = self.get_ad_segments(post)
 
+        remember_probes(post.audio_probes)
         duration_ms = get_audio_duration_ms(post.unprocessed_audio_path)
         if duration_ms is None:
             raise ValueError(
@@ -347,18 +375,34 @@ class AudioProcessor:
             ),
         )
 
-        clip_segments_with_fade(
-            in_path=post.unprocessed_audio_path,
-            ad_segments_ms=merged_ad_segments,
+        cut_hash = cut_list_hash(
+            merged_ad_segments,
             fade_ms=self.config.output.fade_ms,
-            out_path=output_path,
+            duration_ms=duration_ms,
+        )
+        if not self._restore_unchanged_cut(post, output_path, cut_hash):
+            clip_segments_with_fade(
+                in_path=post.unprocessed_audio_path,
+                ad_segments_ms=merged_ad_segments,
+                fade_ms=self.config.output.fade_ms,
+                out_path=output_path,
+            )
+        self.ad_fingerprinter.index_ad_spans(
+            post, post.unprocessed_audio_path, merged_ad_segments
         )
 
         post.processed_audio_path = output_path
+        post.cut_list_hash = cut_hash
+        audio_probes = stored_probes([post.unprocessed_audio_path, output_path])
         result = writer_client.update(
             "Post",
             post.id,
-            {"processed_audio_path": output_path, "duration": post.duration},
+            {
+                "processed_audio_path": output_path,
+                "duration": post.duration,
+                "cut_list_hash": cut_hash,
+                "audio_probes": audio_probes,
+            },
             wait=True,
         )
         if not result or not result.success:
@@ -371,3 +415,19 @@ class AudioProcessor:
         self.logger.info(
             f"Audio processing complete for post {post.id}, saved to {output_path}"
         )
+
+    def _restore_unchanged_cut(
+        self, post: Post, output_path: str, cut_hash: str
+    ) -> bool:
+        """Reuse the audio archived at reprocess if it was cut the same way."""
+        if post.cut_list_hash != cut_hash or os.path.exists(output_path):
+            return False
+        archive = find_reprocess_archive(Path(output_path), cut_hash)
+        if archive is None:
+            return False
+        os.replace(archive, output_path)
+        self.logger.info(
+            f"Cut list unchanged for post {post.id}; restored {archive} "
+            "instead of cutting the audio again"
+        )
+        return True
@@ -9,6 +9,7 @@ Pylint may flag these as R0801 (duplicate-code); we ignore that for this module.
 import json
 import logging
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -17,7 +18,15 @@ import litellm
 from jinja2 import Template
 
 from app.writer.client import writer_client
+from podcast_processor.llm_model_call_utils import (
+    COPILOT_PROVIDER,
+    build_model_call_metrics,
+    elapsed_ms,
+)
+from podcast_processor.segment_view import SegmentView
+from podcast_processor.traffic_cassette import Cassette, get_cassette
 from shared.config import Config
+from shared.llm_utils import llm_provider_for_model
 
 # Internal defaults for boundary expansion; not user-configurable.
 MAX_START_EXTENSION_SECONDS = 30.0
@@ -37,6 +46,7 @@ class BoundaryRefiner:
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
         self.template = self._load_template()
+        self.cassette: Cassette | None = get_cassette(config)
 
     def _load_template(self) -> Template:
         path = (
@@ -64,8 +74,13 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
         post_id: int | None = None,
         first_seq_num: int | None = None,
         last_seq_num: int | None = None,
+        queue_wait_ms: int | None = None,
     ) -> BoundaryRefinement:
-        """Refine ad boundaries using LLM analysis and record the call in ModelCall."""
+        """Refine ad boundaries using LLM analysis and record the call in ModelCall.
+
+        ``queue_wait_ms`` is the caller's wait for a concurrency slot; it is
+        stored with the call's latency and token usage.
+        """
         self.logger.debug(
             "Refining boundaries",
             extra={
@@ -119,6 +134,16 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
                     "Boundary refine: failed to upsert ModelCall: %s", e
                 )
 
+        # Failed calls still record provider and queue wait.
+        call_metrics: dict[str, Any] = build_model_call_metrics(
+            provider=(
+                COPILOT_PROVIDER
+                if self.config.is_copilot_configured
+                else llm_provider_for_model(self.config.llm_model)
+            ),
+            latency_ms=None,
+            queue_wait_ms=queue_wait_ms,
+        )
         try:
             # Use Copilot SDK when both a PAT and a github_model are configured.
             is_copilot_model = self.config.is_copilot_configured
@@ -152,18 +177,46 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
                     finally:
                         await session.destroy()
 
-                raw_response = asyncio.run(_call_copilot())
+                call_started = time.perf_counter()
+                raw_response = (
+                    self.cassette.copilot_chat(
+                        str(self.config.llm_github_model),
+                        prompt,
+                        lambda: asyncio.run(_call_copilot()),
+                    )
+                    if self.cassette is not None
+                    else asyncio.run(_call_copilot())
+                )
+                call_metrics = build_model_call_metrics(
+                    provider=COPILOT_PROVIDER,
+                    latency_ms=elapsed_ms(call_started),
+                    queue_wait_ms=queue_wait_ms,
+                )
                 content = raw_response
             else:
                 # Use litellm
-                response = litellm.completion(
-                    model=self.config.llm_model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=4096,
-                    timeout=self.config.openai_timeout,
-                    api_key=self.config.llm_api_key,
-                    base_url=self.config.openai_base_url,
+                call_started = time.perf_counter()
+                completion_args = {
+                    "model": self.config.llm_model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.1,
+                    "max_tokens": 4096,
+                    "timeout": self.config.openai_timeout,
+                    "api_key": self.config.llm_api_key,
+                    "base_url": self.config.openai_base_url,
+                }
+                response = (
+                    self.cassette.litellm_completion(
+                        litellm.completion, completion_args
+                    )
+                    if self.cassette is not None
+                    else litellm.completion(**completion_args)
+                )
+                call_metrics = build_model_call_metrics(
+                    provider=llm_provider_for_model(self.config.llm_model),
+                    latency_ms=elapsed_ms(call_started),
+                    queue_wait_ms=queue_wait_ms,
+                    response=response,
                 )
 
                 choice = response.choices[0] if response.choices else None
@@ -210,6 +263,7 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
                 status="received_response",
                 response=raw_response,
                 error_message=None,
+                metrics=call_metrics,
             )
             # Parse JSON (strip markdown fences). Log parse diagnostics so failures are actionable.
             cleaned = re.sub(r"```json|```", "", content.strip())
@@ -289,6 +343,7 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
                 status="failed_permanent",
                 response=raw_response,
                 error_message=str(e),
+                metrics=call_metrics,
             )
             self.logger.warning(f"LLM refinement failed: {e}, using heuristic")
 
@@ -302,6 +357,7 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
         status: str,
         response: str | None,
         error_message: str | None,
+        metrics: dict[str, Any] | None = None,
     ) -> None:
         """Best-effort ModelCall updater; no-op if call creation failed."""
         if model_call_id is None:
@@ -315,6 +371,7 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
                     "response": response,
                     "error_message": error_message,
                     "retry_attempts": 1,
+                    **(metrics or {}),
                 },
                 wait=True,
             )
@@ -329,17 +386,16 @@ Return JSON: {"refined_start": {{ad_start}}, "refined_end": {{ad_end}}, "start_r
         self, ad_start: float, ad_end: float, all_segments: list[dict[str, Any]]
     ) -> list[dict[str, Any]]:
         """Get ±8 segments around ad"""
-        ad_segs = [s for s in all_segments if ad_start <= s["start_time"] <= ad_end]
-        if not ad_segs:
+        view = SegmentView.coerce(all_segments)
+        span = view.starting_between(ad_start, ad_end)
+        if span is None:
             return []
 
-        first_idx = all_segments.index(ad_segs[0])
-        last_idx = all_segments.index(ad_segs[-1])
-
+        first_idx, last_idx = span
         start_idx = max(0, first_idx - 8)
-        end_idx = min(len(all_segments), last_idx + 9)
+        end_idx = min(len(view), last_idx + 9)
 
-        return all_segments[start_idx:end_idx]
+        return view[start_idx:end_idx]
 
     def _heuristic_refine(
         self, ad_start: float, ad_end: float, context: list[dict[str, Any]]
@@ -0,0 +1,286 @@
+"""Deterministic (LLM-free) ad boundary refiner.
+
+Snaps ad block edges to nearby silences and to cue/transition markers found in
+the surrounding transcript. Each refinement carries a confidence so callers can
+decide whether an LLM refinement is still worth paying for.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from podcast_processor.boundary_refiner import (
+    MAX_END_EXTENSION_SECONDS,
+    MAX_START_EXTENSION_SECONDS,
+    BoundaryRefinement,
+)
+from podcast_processor.cue_detector import CueDetector
+from podcast_processor.segment_view import SegmentView
+from shared.config import Config
+
+# Maximum distance an edge is moved to land inside a silence.
+SILENCE_SNAP_SECONDS = 2.5
+# Transcript gaps at least this long are treated as silences when no audio
+# silence map is available.
+MIN_TRANSCRIPT_GAP_SECONDS = 0.3
+
+_BASE_EDGE_CONFIDENCE = 0.3
+_CUE_CONFIDENCE_BONUS = 0.35
+_AUDIO_SILENCE_CONFIDENCE_BONUS = 0.35
+_TRANSCRIPT_GAP_CONFIDENCE_BONUS = 0.2
+
+_RETURN_PHRASES = ("back to the show", "now back")
+
+
+@dataclass
+class CueBoundaryRefinement(BoundaryRefinement):
+    confidence: float = 0.0
+
+
+class CueBoundaryRefiner:
+    """Refine ad boundaries from silences and transcript cues, without an LLM."""
+
+    def __init__(self, config: Config, logger: logging.Logger | None = None):
+        self.config = config
+        self.logger = logger or logging.getLogger(__name__)
+        self.cue_detector = CueDetector()
+
+    def refine(  # pylint: disable=unused-argument
+        self,
+        ad_start: float,
+        ad_end: float,
+        confidence: float,
+        all_segments: list[dict[str, Any]],
+        *,
+        post_id: int | None = None,
+        first_seq_num: int | None = None,
+        last_seq_num: int | None = None,
+        silences: list[tuple[float, float]] | None = None,
+    ) -> CueBoundaryRefinement:
+        """Refine one ad block. ``silences`` are (start, end) seconds, optional."""
+        view = SegmentView.coerce(all_segments)
+        gaps = sorted(silences) if silences else view.gaps(MIN_TRANSCRIPT_GAP_SECONDS)
+        gap_bonus = (
+            _AUDIO_SILENCE_CONFIDENCE_BONUS
+            if silences
+            else _TRANSCRIPT_GAP_CONFIDENCE_BONUS
+        )
+
+        start, start_reason, start_conf = self._refine_start(view, ad_start)
+        start, snapped = self._snap_to_silence(
+            start, gaps, lower=ad_start - MAX_START_EXTENSION_SECONDS
+        )
+        if snapped:
+            start_reason = f"{start_reason}+silence" if start_reason else "silence"
+            start_conf += gap_bonus
+
+        end, end_reason, end_conf = self._refine_end(view, ad_end)
+        end, snapped = self._snap_to_silence(
+            end, gaps, upper=ad_end + MAX_END_EXTENSION_SECONDS
+        )
+        if snapped:
+            end_reason = f"{end_reason}+silence" if end_reason else "silence"
+            end_conf += gap_bonus
+
+        start = max(start, ad_start - MAX_START_EXTENSION_SECONDS)
+        end = min(end, ad_end + MAX_END_EXTENSION_SECONDS)
+        if start >= end:
+            start, end = ad_start, ad_end
+            start_reason = end_reason = "invalid_window"
+            start_conf = end_conf = 0.0
+
+        result = CueBoundaryRefinement(
+            refined_start=start,
+            refined_end=end,
+            start_adjustment_reason=start_reason or "unchanged",
+            end_adjustment_reason=end_reason or "unchanged",
+            confidence=round(min(1.0, start_conf, end_conf), 3),
+        )
+        self.logger.debug(
+            "Cue refinement for post %s block %.1f-%.1f -> %.1f-%.1f (confidence %.2f)",
+            post_id,
+            ad_start,
+            ad_end,
+            result.refined_start,
+            result.refined_end,
+            result.confidence,
+        )
+        return result
+
+    def _refine_start(
+        self, view: SegmentView, ad_start: float
+    ) -> tuple[float, str, float]:
+        """Pull the start back to the closest sponsor intro or break transition."""
+        span = view.starting_between(
+            ad_start - MAX_START_EXTENSION_SECONDS, ad_start - 1e-6
+        )
+        if span is None:
+            return ad_start, "", _BASE_EDGE_CONFIDENCE
+
+        for idx in range(span[1], span[0] - 1, -1):
+            seg = view[idx]
+            signals = self.cue_detector.analyze(str(seg.get("text") or ""))
+            if signals["sponsor_intro"] or (
+                signals["transition"] and not self._is_return(seg)
+            ):
+                return (
+                    float(seg["start_time"]),
+                    "intro_cue",
+                    _BASE_EDGE_CONFIDENCE + _CUE_CONFIDENCE_BONUS,
+                )
+        return ad_start, "", _BASE_EDGE_CONFIDENCE
+
+    def _refine_end(self, view: SegmentView, ad_end: float) -> tuple[float, str, float]:
+        """Extend over trailing call-to-action segments; stop at a return cue."""
+        span = view.starting_between(ad_end, ad_end + MAX_END_EXTENSION_SECONDS)
+        if span is None:
+            return ad_end, "", _BASE_EDGE_CONFIDENCE
+
+        end = ad_end
+        reason = ""
+        confidence = _BASE_EDGE_CONFIDENCE
+        for idx in range(span[0], span[1] + 1):
+            seg = view[idx]
+            if self._is_return(seg):
+                return (
+                    end,
+                    f"{reason}+return_cue" if reason else "return_cue",
+                    _BASE_EDGE_CONFIDENCE + _CUE_CONFIDENCE_BONUS,
+                )
+            if not self.cue_detector.has_cue(str(seg.get("text") or "")):
+                break
+            end = float(seg.get("end_time", seg["start_time"]))
+            reason = "outro_cue"
+            confidence = _BASE_EDGE_CONFIDENCE + _CUE_CONFIDENCE_BONUS
+        return end, reason, confidence
+
+    def _is_return(self, seg: dict[str, Any]) -> bool:
+        text = str(seg.get("text") or "").lower()
+        return any(phrase in text for phrase in _RETURN_PHRASES)
+
+    @staticmethod
+    def _snap_to_silence(
+        edge: float,
+        gaps: list[tuple[float, float]],
+        *,
+        lower: float | None = None,
+        upper: float | None = None,
+    ) -> tuple[float, bool]:
+        """Move ``edge`` to the midpoint of the nearest silence within reach."""
+        best: float | None = None
+        for gap_start, gap_end in gaps:
+            if gap_start > edge + SILENCE_SNAP_SECONDS:
+                break
+            if gap_end < edge - SILENCE_SNAP_SECONDS:
+                continue
+            midpoint = (gap_start + gap_end) / 2.0
+            if lower is not None and midpoint < lower:
+                continue
+            if upper is not None and midpoint > upper:
+                continue
+            if best is None or abs(midpoint - edge) < abs(best - edge):
+                best = midpoint
+        if best is None:
+            return edge, False
+        return best, True
+
+
+def compare_with_stored_refinements(
+    refiner: CueBoundaryRefiner,
+    all_segments: list[dict[str, Any]],
+    stored_boundaries: list[dict[str, Any]],
+    *,
+    silences: list[tuple[float, float]] | None = None,
+) -> list[dict[str, Any]]:
+    """Re-run cue refinement on stored LLM-refined blocks and report the deltas.
+
+    Entries written by the cue refiner itself are skipped so the comparison is
+    always against LLM output.
+    """
+    view = SegmentView.coerce(all_segments)
+    rows: list[dict[str, Any]] = []
+    for stored in stored_boundaries:
+        if stored.get("source") == "cue":
+            continue
+        try:
+            orig_start = float(stored["orig_start"])
+            orig_end = float(stored["orig_end"])
+            llm_start = float(stored["refined_start"])
+            llm_end = float(stored["refined_end"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        cue = refiner.refine(
+            ad_start=orig_start,
+            ad_end=orig_end,
+            confidence=float(stored.get("confidence") or 0.0),
+            all_segments=view,
+            silences=silences,
+        )
+        rows.append(
+            {
+                "orig_start": orig_start,
+                "orig_end": orig_end,
+                "llm_start": llm_start,
+                "llm_end": llm_end,
+                "cue_start": cue.refined_start,
+                "cue_end": cue.refined_end,
+                "cue_confidence": cue.confidence,
+                "start_delta": round(cue.refined_start - llm_start, 3),
+                "end_delta": round(cue.refined_end - llm_end, 3),
+            }
+        )
+    return rows
+
+
+def summarize_refinement_comparison(
+    rows: list[dict[str, Any]], *, tolerance_seconds: float
+) -> dict[str, Any]:
+    """Aggregate agreement between cue and LLM refinements.
+
+    ``by_min_confidence`` shows how agreement changes when only blocks at or
+    above a cue-confidence threshold are trusted, which is what the hybrid
+    strategy's threshold controls.
+    """
+
+    def _agrees(row: dict[str, Any]) -> bool:
+        return (
+            abs(row["start_delta"]) <= tolerance_seconds
+            and abs(row["end_delta"]) <= tolerance_seconds
+        )
+
+    def _rate(matching: int, total: int) -> float | None:
+        return round(matching / total, 3) if total else None
+
+    total = len(rows)
+    by_min_confidence = []
+    for threshold in (0.0, 0.5, 0.6, 0.7, 0.8):
+        trusted = [row for row in rows if row["cue_confidence"] >= threshold]
+        by_min_confidence.append(
+            {
+                "min_confidence": threshold,
+                "blocks": len(trusted),
+                "share_of_blocks": _rate(len(trusted), total),
+                "agreement_rate": _rate(sum(_agrees(r) for r in trusted), len(trusted)),
+            }
+        )
+
+    return {
+        "blocks_compared": total,
+        "tolerance_seconds": tolerance_seconds,
+        "mean_abs_start_delta": (
+            round(sum(abs(r["start_delta"]) for r in rows) / total, 3)
+            if total
+            else None
+        ),
+        "mean_abs_end_delta": (
+            round(sum(abs(r["end_delta"]) for r in rows) / total, 3) if total else None
+        ),
+        "start_agreement_rate": _rate(
+            sum(abs(r["start_delta"]) <= tolerance_seconds for r in rows), total
+        ),
+        "end_agreement_rate": _rate(
+            sum(abs(r["end_delta"]) <= tolerance_seconds for r in rows), total
+        ),
+        "agreement_rate": _rate(sum(_agrees(r) for r in rows), total),
+        "by_min_confidence": by_min_confidence,
+    }
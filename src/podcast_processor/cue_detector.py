@@ -21,6 +21,10 @@ class CueDetector:
             r"\b(back to the show|after the break|stay tuned|we'll be right back|now back)\b",
             re.I,
         )
+        self.sponsor_intro_pattern: Pattern[str] = re.compile(
+            r"\b(brought to you by|sponsored by|our sponsor|a word from|support for (?:this|the) (?:show|podcast|episode))\b",
+            re.I,
+        )
         self.self_promo_pattern: Pattern[str] = re.compile(
             r"\b(my|our)\s+(book|course|newsletter|fund|patreon|substack|community|platform)\b",
             re.I,
@@ -41,6 +45,7 @@ class CueDetector:
             "phone": bool(self.phone_pattern.search(text)),
             "cta": bool(self.cta_pattern.search(text)),
             "transition": bool(self.transition_pattern.search(text)),
+            "sponsor_intro": bool(self.sponsor_intro_pattern.search(text)),
             "self_promo": bool(self.self_promo_pattern.search(text)),
         }
 
@@ -0,0 +1,237 @@
+"""
+Per-provider circuit breaker for LLM API calls.
+
+Consecutive retryable failures against one provider open its circuit. While
+it is open, calls fail fast with ``ProviderUnavailableError`` instead of
+spending retries, so the processing job can be parked and resumed later.
+Once the open period (at least the provider's Retry-After hint) has passed,
+a single probe call is let through in the half-open state: success closes
+the circuit, failure re-opens it for twice as long.
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ProviderUnavailableError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(
+            f"LLM provider {provider} is unavailable; retry in {retry_in:.0f}s"
+        )
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """The Retry-After hint carried by a provider error, in seconds.
+
+    Looks at the HTTP response headers litellm and the provider SDKs attach
+    to their exceptions. Both delta-seconds and HTTP-date values are accepted.
+    """
+    candidates = [
+        getattr(error, "litellm_response_headers", None),
+        getattr(getattr(error, "response", None), "headers", None),
+        getattr(error, "headers", None),
+    ]
+    for headers in candidates:
+        if not headers:
+            continue
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+        except Exception:  # pylint: disable=broad-except
+            continue
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(str(value))
+        except (TypeError, ValueError):
+            continue
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=UTC)
+        return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+    return None
+
+
+def backoff_delay(
+    attempt: int,
+    *,
+    base: float,
+    cap: float,
+    retry_after: float | None = None,
+    rng: random.Random | None = None,
+) -> float:
+    """Jittered exponential backoff, never shorter than ``retry_after``.
+
+    Uses "equal jitter": half of the capped exponential delay is fixed and
+    the other half random, so concurrent retries spread out without any of
+    them retrying almost immediately.
+    """
+    ceiling = min(cap, base * (2**attempt))
+    delay = ceiling / 2 + (rng or random).uniform(0, ceiling / 2)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class CircuitBreaker:
+    """Closed/open/half-open state for one provider. Thread-safe."""
+
+    def __init__(
+        self,
+        provider: str,
+        *,
+        failure_threshold: int,
+        reset_timeout: float,
+        max_open_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_open_seconds = max_open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._consecutive_opens = 0
+        self._open_until = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() >= self._open_until:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> bool:
+        """Raise ``ProviderUnavailableError`` unless a call may go ahead.
+
+        Returns True if the call is the half-open probe; it then has to end
+        in ``record_success``, ``record_failure`` or ``release_probe``, or no
+        other call gets through.
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            now = self._clock()
+            if self._state == OPEN and now < self._open_until:
+                raise ProviderUnavailableError(self.provider, self._open_until - now)
+            if self._probe_in_flight:
+                # Only one probe at a time while half-open.
+                raise ProviderUnavailableError(self.provider, self.reset_timeout)
+            self._state = HALF_OPEN
+            self._probe_in_flight = True
+            logger.info(f"Circuit for {self.provider} half-open; sending a probe call")
+            return True
+
+    def retry_in(self) -> float:
+        """Seconds until the circuit lets a probe through."""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._open_until - self._clock())
+
+    def release_probe(self) -> None:
+        """End a call that says nothing about provider health."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit for {self.provider} closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._consecutive_opens = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, retry_after: float | None = None) -> bool:
+        """Count a retryable failure; returns True if the circuit is now open."""
+        with self._lock:
+            self._probe_in_flight = False
+            self._failures += 1
+            if self._state == OPEN:
+                # A call that started before the circuit opened.
+                if retry_after is not None:
+                    self._open_until = max(
+                        self._open_until, self._clock() + retry_after
+                    )
+                return True
+            if self._state != HALF_OPEN and self._failures < self.failure_threshold:
+                return False
+            self._consecutive_opens += 1
+            open_for = min(
+                self.max_open_seconds,
+                backoff_delay(
+                    self._consecutive_opens - 1,
+                    base=self.reset_timeout,
+                    cap=self.max_open_seconds,
+                ),
+            )
+            if retry_after is not None:
+                open_for = max(open_for, retry_after)
+            self._state = OPEN
+            self._open_until = self._clock() + open_for
+            logger.warning(
+                f"Circuit for {self.provider} opened for {open_for:.0f}s after "
+                f"{self._failures} consecutive failures"
+            )
+            return True
+
+
+# Global per-provider breakers, shared by all classifier instances
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(
+    provider: str,
+    *,
+    failure_threshold: int,
+    reset_timeout: float,
+    max_open_seconds: float,
+) -> CircuitBreaker:
+    """Get or create the shared breaker for ``provider``.
+
+    Settings changes apply to the existing breaker without resetting its
+    state.
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(provider)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                provider,
+                failure_threshold=failure_threshold,
+                reset_timeout=reset_timeout,
+                max_open_seconds=max_open_seconds,
+            )
+            _BREAKERS[provider] = breaker
+        else:
+            breaker.failure_threshold = failure_threshold
+            breaker.reset_timeout = reset_timeout
+            breaker.max_open_seconds = max_open_seconds
+        return breaker
+
+
+def reset_circuit_breakers() -> None:
+    """Forget all breaker state (used by tests)."""
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
 from app.writer.client import writer_client
+from shared.llm_utils import extract_token_usage
+
+# Provider recorded on ModelCall rows served through the GitHub Copilot SDK.
+COPILOT_PROVIDER = "github_copilot"
 
 
 def render_prompt_and_upsert_model_call(
@@ -85,8 +90,12 @@ def try_update_model_call(
     error_message: str | None,
     logger: logging.Logger,
     log_prefix: str,
+    metrics: dict[str, Any] | None = None,
 ) -> None:
-    """Best-effort ModelCall updater; no-op if call creation failed."""
+    """Best-effort ModelCall updater; no-op if call creation failed.
+
+    ``metrics`` (see ``build_model_call_metrics``) is merged into the update.
+    """
     if model_call_id is None:
         return
 
@@ -99,6 +108,7 @@ def try_update_model_call(
                 "response": response,
                 "error_message": error_message,
                 "retry_attempts": 1,
+                **(metrics or {}),
             },
             wait=True,
         )
@@ -111,6 +121,53 @@ def try_update_model_call(
         )
 
 
+def elapsed_ms(started: float) -> int:
+    """Milliseconds since ``started`` (a ``time.perf_counter()`` reading)."""
+    return round((time.perf_counter() - started) * 1000)
+
+
+def build_model_call_metrics(
+    *,
+    provider: str,
+    latency_ms: int | None,
+    queue_wait_ms: int | None,
+    response: Any = None,
+) -> dict[str, Any]:
+    """ModelCall accounting columns for one LLM call.
+
+    ``latency_ms`` covers only the provider call; time spent waiting on the
+    rate limiter or for a concurrency slot is reported as ``queue_wait_ms``.
+    Token counts are taken from the response usage block when available.
+    """
+    metrics: dict[str, Any] = {
+        "provider": provider,
+        "latency_ms": latency_ms,
+        "queue_wait_ms": queue_wait_ms,
+    }
+    if response is not None:
+        metrics.update(extract_token_usage(response))
+    return metrics
+
+
+def combine_token_usage(*responses: Any) -> dict[str, Any]:
+    """Usage block summing the token counts of several responses.
+
+    Counts no response reported stay None.
+    """
+    totals: dict[str, int | None] = {
+        "prompt_tokens": None,
+        "completion_tokens": None,
+        "cache_read_input_tokens": None,
+    }
+    for response in responses:
+        usage = extract_token_usage(response)
+        usage["cache_read_input_tokens"] = usage.pop("cached_prompt_tokens")
+        for key, value in usage.items():
+            if value is not None:
+                totals[key] = (totals[key] or 0) + value
+    return {"usage": totals}
+
+
 def extract_litellm_content(response: Any) -> str:
     """Extracts the primary text content from a litellm completion response."""
     choices = getattr(response, "choices", None) or []
@@ -0,0 +1,385 @@
+"""
+Routing of LLM calls over a pool of OpenAI-compatible endpoints.
+
+Each endpoint (base URL + API key, optionally its own model name) has its own
+request, token and concurrency budget. A call goes to the endpoint with the
+lowest observed latency among those with budget left; endpoints that just
+failed sit out a short cooldown (at least their Retry-After hint).
+
+With hedging enabled, a call that has not returned within the given latency
+percentile of its endpoint is duplicated on a second endpoint, and whichever
+answers first wins. A failed primary also falls over to a second endpoint
+straight away. The losing request is left to finish in the background; its
+latency still feeds the endpoint statistics.
+
+Calls of very different sizes (e.g. Whisper chunks of different durations)
+pass their ``size``; latencies are then tracked per unit of size and hedge
+deadlines scale with it.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import litellm
+
+from podcast_processor.llm_circuit_breaker import retry_after_seconds
+from shared.config import LLMEndpointConfig
+
+logger = logging.getLogger(__name__)
+
+_BUDGET_WINDOW_SECONDS = 60.0
+_LATENCY_WINDOW = 100
+_LATENCY_EWMA_ALPHA = 0.3
+_FAILURE_COOLDOWN_BASE_SECONDS = 2.0
+_FAILURE_COOLDOWN_MAX_SECONDS = 120.0
+# Longest single wait for budget before re-checking all endpoints.
+_BUDGET_POLL_SECONDS = 1.0
+
+
+class RouterBudgetTimeoutError(Exception):
+    """No endpoint had budget for a call within the wait timeout."""
+
+
+class RoutedEndpoint:
+    """Budget and latency bookkeeping for one endpoint. Guarded by the
+    owning router's lock."""
+
+    def __init__(self, config: LLMEndpointConfig):
+        self.config = config
+        self.in_flight = 0
+        self.latency_ewma: float | None = None
+        self.latencies: deque[float] = deque(maxlen=_LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        # (timestamp, input tokens) for calls started in the budget window
+        self._started: deque[tuple[float, int]] = deque()
+
+    @property
+    def name(self) -> str:
+        return self.config.name
+
+    def _expire(self, now: float) -> None:
+        while self._started and now - self._started[0][0] >= _BUDGET_WINDOW_SECONDS:
+            self._started.popleft()
+
+    def seconds_until_available(self, now: float, input_tokens: int) -> float:
+        """0 if a call may start now; otherwise a lower bound on the wait
+        (``math.inf`` while only a finishing call can free a slot)."""
+        self._expire(now)
+        wait_for = max(0.0, self.cooldown_until - now)
+        max_concurrent = self.config.max_concurrent_calls
+        if max_concurrent is not None and self.in_flight >= max_concurrent:
+            return math.inf
+        max_requests = self.config.max_requests_per_minute
+        if max_requests is not None and len(self._started) >= max_requests:
+            oldest = self._started[len(self._started) - max_requests][0]
+            wait_for = max(wait_for, oldest + _BUDGET_WINDOW_SECONDS - now)
+        max_tokens = self.config.max_input_tokens_per_minute
+        if max_tokens is not None:
+            used = sum(tokens for _, tokens in self._started)
+            # A single oversized call is allowed through an empty window.
+            for started_at, tokens in self._started:
+                if used + input_tokens <= max_tokens:
+                    break
+                used -= tokens
+                wait_for = max(wait_for, started_at + _BUDGET_WINDOW_SECONDS - now)
+        return wait_for
+
+    def remaining_budget(self) -> float:
+        """Smallest remaining fraction of the endpoint's per-minute budgets."""
+        fractions = [1.0]
+        if self.config.max_requests_per_minute is not None:
+            fractions.append(
+                1.0 - len(self._started) / self.config.max_requests_per_minute
+            )
+        if self.config.max_input_tokens_per_minute is not None:
+            used = sum(tokens for _, tokens in self._started)
+            fractions.append(1.0 - used / self.config.max_input_tokens_per_minute)
+        return min(fractions)
+
+    def reserve(self, now: float, input_tokens: int) -> None:
+        self.in_flight += 1
+        self._started.append((now, input_tokens))
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = max(0, math.ceil(percentile / 100.0 * len(ordered)) - 1)
+        return ordered[index]
+
+    def record_success(self, latency: float) -> None:
+        self.in_flight -= 1
+        self.consecutive_failures = 0
+        self.latencies.append(latency)
+        self.latency_ewma = (
+            latency
+            if self.latency_ewma is None
+            else _LATENCY_EWMA_ALPHA * latency
+            + (1 - _LATENCY_EWMA_ALPHA) * self.latency_ewma
+        )
+
+    def record_failure(self, now: float, retry_after: float | None) -> None:
+        self.in_flight -= 1
+        self.consecutive_failures += 1
+        cooldown = min(
+            _FAILURE_COOLDOWN_MAX_SECONDS,
+            _FAILURE_COOLDOWN_BASE_SECONDS * 2 ** (self.consecutive_failures - 1),
+        )
+        if retry_after is not None:
+            cooldown = max(cooldown, retry_after)
+        self.cooldown_until = max(self.cooldown_until, now + cooldown)
+
+
+class LLMRouter:
+    """Spreads completions over ``endpoints``. Thread-safe."""
+
+    def __init__(
+        self,
+        endpoints: Sequence[LLMEndpointConfig],
+        *,
+        hedge_percentile: float | None = None,
+        hedge_min_samples: int = 10,
+        hedge_same_endpoint: bool = False,
+        completion: Callable[..., Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not endpoints:
+            raise ValueError("LLMRouter needs at least one endpoint")
+        self.endpoints = [RoutedEndpoint(config) for config in endpoints]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        # With a single endpoint, hedge and fail over onto that endpoint again
+        self.hedge_same_endpoint = hedge_same_endpoint
+        self._completion = completion or litellm.completion
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _pick(
+        self, input_tokens: int, exclude: Sequence[RoutedEndpoint] = ()
+    ) -> tuple[RoutedEndpoint | None, float]:
+        """The best endpoint that may start a call now, or the shortest wait."""
+        now = self._clock()
+        shortest_wait = math.inf
+        available: list[RoutedEndpoint] = []
+        for endpoint in self.endpoints:
+            if endpoint in exclude:
+                continue
+            wait_for = endpoint.seconds_until_available(now, input_tokens)
+            if wait_for <= 0:
+                available.append(endpoint)
+            shortest_wait = min(shortest_wait, wait_for)
+        if not available:
+            return None, shortest_wait
+        # Unmeasured endpoints sort first so every endpoint gets sampled.
+        best = min(
+            available,
+            key=lambda e: (
+                e.latency_ewma or 0.0,
+                -e.remaining_budget(),
+                e.in_flight,
+            ),
+        )
+        best.reserve(now, input_tokens)
+        return best, 0.0
+
+    def acquire(
+        self,
+        input_tokens: int = 0,
+        *,
+        exclude: Sequence[RoutedEndpoint] = (),
+        timeout: float | None = None,
+    ) -> RoutedEndpoint | None:
+        """Reserve budget on the best endpoint, waiting for budget if needed.
+
+        Returns None if every endpoint is excluded, or (with ``timeout=0``)
+        if none has budget right now.
+        """
+        deadline = None if timeout is None else self._clock() + timeout
+        with self._released:
+            while True:
+                endpoint, wait_for = self._pick(input_tokens, exclude)
+                if endpoint is not None:
+                    return endpoint
+                if len(exclude) >= len(self.endpoints):
+                    return None
+                if deadline is not None:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        return None
+                    wait_for = min(wait_for, remaining)
+                self._released.wait(min(wait_for, _BUDGET_POLL_SECONDS))
+
+    def call(
+        self,
+        endpoint: RoutedEndpoint,
+        completion_args: dict[str, Any],
+        size: float = 1.0,
+    ) -> Any:
+        """Run one completion on a reserved endpoint and record the outcome."""
+        args = dict(completion_args)
+        if endpoint.config.model:
+            args["model"] = endpoint.config.model
+        if endpoint.config.base_url:
+            args["api_base"] = endpoint.config.base_url
+        if endpoint.config.api_key:
+            args["api_key"] = endpoint.config.api_key
+        started = self._clock()
+        try:
+            response = self._completion(**args)
+        except Exception as e:
+            with self._released:
+                endpoint.record_failure(self._clock(), retry_after_seconds(e))
+                self._released.notify_all()
+            logger.warning(f"LLM endpoint {endpoint.name} failed: {e}")
+            raise
+        with self._released:
+            endpoint.record_success((self._clock() - started) / size)
+            self._released.notify_all()
+        return response
+
+    def completion(
+        self,
+        completion_args: dict[str, Any],
+        *,
+        input_tokens: int = 0,
+        hedge: bool = True,
+        timeout: float | None = None,
+        size: float = 1.0,
+    ) -> tuple[Any, str]:
+        """Complete ``completion_args``; returns the response and the name of
+        the endpoint that produced it.
+
+        Raises ``RouterBudgetTimeoutError`` if no endpoint frees up budget
+        within ``timeout`` seconds.
+        """
+        primary = self.acquire(input_tokens, timeout=timeout)
+        if primary is None:
+            raise RouterBudgetTimeoutError(
+                f"No LLM endpoint had budget within {timeout}s"
+            )
+        single = len(self.endpoints) < 2
+        if (
+            not hedge
+            or not self.hedge_percentile
+            or (single and not self.hedge_same_endpoint)
+        ):
+            return self.call(primary, completion_args, size), primary.name
+
+        hedge_after = self._hedge_delay(primary)
+        if hedge_after is not None:
+            hedge_after *= size
+
+        executor = self._get_executor()
+        futures: dict[Future[Any], RoutedEndpoint] = {
+            executor.submit(self.call, primary, completion_args, size): primary
+        }
+        done, _ = wait(futures, timeout=hedge_after)
+        primary_failed = bool(done) and next(iter(done)).exception() is not None
+        if not done or primary_failed:
+            # Only hedge onto an endpoint with budget to spare right now.
+            secondary = self.acquire(
+                input_tokens, exclude=[] if single else [primary], timeout=0.0
+            )
+            if secondary is not None:
+                logger.info(
+                    f"{'Failing over' if primary_failed else 'Hedging'} LLM call "
+                    f"from {primary.name} to {secondary.name}"
+                )
+                futures[
+                    executor.submit(self.call, secondary, completion_args, size)
+                ] = secondary
+
+        pending = set(futures)
+        last_error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result(), futures[future].name
+                last_error = error
+        assert last_error is not None
+        raise last_error
+
+    def _hedge_delay(self, endpoint: RoutedEndpoint) -> float | None:
+        """Seconds to wait before hedging; None (no hedge, failover only)
+        until the endpoint has enough latency samples."""
+        assert self.hedge_percentile is not None
+        with self._lock:
+            if len(endpoint.latencies) < self.hedge_min_samples:
+                return None
+            return endpoint.latency_percentile(self.hedge_percentile)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=32, thread_name_prefix="llm-router"
+                )
+            return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Global routers keyed by completion function and endpoint pool, shared by
+# all classifier (or transcriber) instances
+_ROUTERS: dict[
+    tuple[Any, tuple[tuple[str, str | None, str | None], ...]], LLMRouter
+] = {}
+_ROUTERS_LOCK = threading.Lock()
+
+
+def get_llm_router(
+    endpoints: Sequence[LLMEndpointConfig],
+    *,
+    hedge_percentile: float | None,
+    hedge_min_samples: int,
+    hedge_same_endpoint: bool = False,
+    completion: Callable[..., Any] | None = None,
+) -> LLMRouter:
+    """Get or create the shared router for an endpoint pool.
+
+    Budgets and latency statistics carry over as long as the pool's names,
+    URLs and models are unchanged; limit and hedging changes apply in place.
+    """
+    key = (completion, tuple((e.name, e.base_url, e.model) for e in endpoints))
+    with _ROUTERS_LOCK:
+        router = _ROUTERS.get(key)
+        if router is None:
+            router = LLMRouter(
+                endpoints,
+                hedge_percentile=hedge_percentile,
+                hedge_min_samples=hedge_min_samples,
+                hedge_same_endpoint=hedge_same_endpoint,
+                completion=completion,
+            )
+            _ROUTERS[key] = router
+        else:
+            for routed, config in zip(router.endpoints, endpoints, strict=True):
+                routed.config = config
+            router.hedge_percentile = hedge_percentile
+            router.hedge_min_samples = hedge_min_samples
+            router.hedge_same_endpoint = hedge_same_endpoint
+        return router
+
+
+def reset_llm_routers() -> None:
+    """Forget all routers and their statistics (used by tests)."""
+    with _ROUTERS_LOCK:
+        routers = list(_ROUTERS.values())
+        _ROUTERS.clear()
+    for router in routers:
+        router.shutdown()
@@ -0,0 +1,166 @@
+"""Per-feed local ad pre-screen model.
+
+A small logistic regression over hashed TF-IDF features of segment text
+(word unigrams and bigrams), trained per feed from segments the LLM has
+already labelled. It is warm-started and updated after every processed
+episode, and trains and scores on CPU in well under a second per episode.
+
+The classifier uses its scores to skip windows that are confidently free of
+ads, and as a fallback when an LLM call fails.
+"""
+
+import io
+import itertools
+import math
+import zlib
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+from podcast_processor.sponsor_index import normalize_words
+
+# Pseudo model name for ModelCall rows backing local-classifier fallbacks.
+LOCAL_CLASSIFIER_MODEL_NAME = "local_classifier"
+
+N_FEATURES = 1 << 14
+_LEARNING_RATE = 0.5
+_L2 = 1e-4
+_EPOCHS = 60
+# Positives (ads) are rare; their loss is up-weighted, at most this much.
+_MAX_POSITIVE_WEIGHT = 10.0
+
+
+def _feature_ids(text: str) -> list[int]:
+    words = normalize_words(text)
+    tokens = words + [f"{a} {b}" for a, b in itertools.pairwise(words)]
+    return [zlib.crc32(token.encode("utf-8")) & (N_FEATURES - 1) for token in tokens]
+
+
+def _count_matrix(texts: Sequence[str]) -> tuple[Any, Any, Any]:
+    """Sparse (CSR) term counts: ``(indptr, indices, counts)``."""
+    indptr = [0]
+    indices: list[Any] = []
+    counts: list[Any] = []
+    for text in texts:
+        ids, row_counts = np.unique(
+            np.asarray(_feature_ids(text), dtype=np.int64), return_counts=True
+        )
+        indices.append(ids)
+        counts.append(row_counts)
+        indptr.append(indptr[-1] + len(ids))
+    return (
+        np.asarray(indptr, dtype=np.int64),
+        np.concatenate(indices) if indices else np.empty(0, dtype=np.int64),
+        np.concatenate(counts).astype(np.float32)
+        if counts
+        else np.empty(0, dtype=np.float32),
+    )
+
+
+class LocalAdClassifier:
+    """Hashed TF-IDF + logistic regression, trained incrementally."""
+
+    def __init__(
+        self,
+        weights: np.ndarray | None = None,
+        bias: float = 0.0,
+        doc_freq: np.ndarray | None = None,
+        doc_count: int = 0,
+    ):
+        self.weights = (
+            weights if weights is not None else np.zeros(N_FEATURES, np.float32)
+        )
+        self.bias = bias
+        self.doc_freq = (
+            doc_freq if doc_freq is not None else np.zeros(N_FEATURES, np.float32)
+        )
+        self.doc_count = doc_count
+
+    def _tfidf(self, texts: Sequence[str]) -> tuple[Any, Any, Any]:
+        indptr, indices, counts = _count_matrix(texts)
+        idf = np.log((1.0 + self.doc_count) / (1.0 + self.doc_freq[indices])) + 1.0
+        data = (1.0 + np.log(counts)) * idf
+        row_ids = np.repeat(np.arange(len(texts)), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_ids, weights=data**2, minlength=len(texts)))
+        data = data / np.maximum(norms[row_ids], 1e-12)
+        return row_ids, indices, data.astype(np.float32)
+
+    def _logits(
+        self, row_ids: np.ndarray, indices: np.ndarray, data: np.ndarray, n_rows: int
+    ) -> np.ndarray:
+        return (
+            np.bincount(row_ids, weights=data * self.weights[indices], minlength=n_rows)
+            + self.bias
+        )
+
+    def predict_proba(self, texts: Sequence[str]) -> list[float]:
+        """Probability that each text is part of an ad."""
+        if not texts:
+            return []
+        row_ids, indices, data = self._tfidf(texts)
+        logits = self._logits(row_ids, indices, data, len(texts))
+        return [float(p) for p in 1.0 / (1.0 + np.exp(-logits))]
+
+    def partial_fit(self, texts: Sequence[str], labels: Sequence[bool]) -> None:
+        """Update document frequencies, then continue training from the
+        current weights on one episode's labelled segments."""
+        if not texts:
+            return
+        _, indices, _ = _count_matrix(texts)
+        np.add.at(self.doc_freq, indices, 1.0)
+        self.doc_count += len(texts)
+
+        y = np.asarray(labels, dtype=np.float32)
+        positives = float(y.sum())
+        positive_weight = (
+            min(_MAX_POSITIVE_WEIGHT, (len(y) - positives) / positives)
+            if positives
+            else 1.0
+        )
+        sample_weight = np.where(y > 0, positive_weight, 1.0).astype(np.float32)
+        sample_weight /= sample_weight.sum()
+
+        row_ids, indices, data = self._tfidf(texts)
+        for _ in range(_EPOCHS):
+            logits = self._logits(row_ids, indices, data, len(texts))
+            error = (1.0 / (1.0 + np.exp(-logits)) - y) * sample_weight
+            gradient = np.bincount(
+                indices, weights=data * error[row_ids], minlength=N_FEATURES
+            )
+            self.weights -= (_LEARNING_RATE * (gradient + _L2 * self.weights)).astype(
+                np.float32
+            )
+            self.bias -= _LEARNING_RATE * float(error.sum())
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        np.savez_compressed(
+            buffer,
+            weights=self.weights,
+            doc_freq=self.doc_freq,
+            meta=np.asarray([self.bias, self.doc_count], dtype=np.float64),
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "LocalAdClassifier":
+        with np.load(io.BytesIO(blob), allow_pickle=False) as stored:
+            bias, doc_count = stored["meta"].tolist()
+            return cls(
+                weights=stored["weights"].astype(np.float32),
+                bias=float(bias),
+                doc_freq=stored["doc_freq"].astype(np.float32),
+                doc_count=int(doc_count),
+            )
+
+
+def log_loss(probabilities: Sequence[float], labels: Sequence[bool]) -> float:
+    """Mean binary cross-entropy; used to report training progress."""
+    if not labels:
+        return 0.0
+    total = 0.0
+    for probability, label in zip(probabilities, labels, strict=True):
+        p = min(max(probability, 1e-7), 1 - 1e-7)
+        total -= math.log(p) if label else math.log(1 - p)
+    return total / len(labels)
@@ -1,6 +1,7 @@
+import json
 import logging
 import re
-from typing import Literal
+from typing import Any, Literal
 
 from pydantic import BaseModel
 
@@ -26,6 +27,21 @@ class AdSegmentPredictionList(BaseModel):
     confidence: float | None = None
 
 
+def prediction_response_format() -> dict[str, Any]:
+    """``response_format`` constraining output to ``AdSegmentPredictionList``.
+
+    Non-strict, since strict mode requires every field to be required.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "ad_segment_predictions",
+            "schema": AdSegmentPredictionList.model_json_schema(),
+            "strict": False,
+        },
+    }
+
+
 def _attempt_json_repair(json_str: str) -> str:
     """
     Attempt to repair truncated JSON by adding missing closing brackets.
@@ -132,3 +148,110 @@ def clean_and_parse_model_output(model_output: str) -> AdSegmentPredictionList:
             )
             # Re-raise the original error with more context
             raise first_error from repair_error
+
+
+class StreamingPredictionParser:
+    """Incrementally parses a streamed classification response.
+
+    Each ``ad_segments`` entry is validated as soon as its closing brace
+    arrives, so a response that is cut off still yields its complete prefix.
+    An ``ad_segments`` array that closes without entries sets ``no_ads``, which
+    lets callers stop the stream early.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.predictions: list[AdSegmentPrediction] = []
+        self.ad_segments_closed = False
+        self.finished = False
+        self._pos = 0
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: str | None = None
+        self._last_token = ""
+        self._array_depth: int | None = None
+        self._entry_start: int | None = None
+
+    @property
+    def no_ads(self) -> bool:
+        return self.ad_segments_closed and not self.predictions
+
+    def feed(self, chunk: str) -> list[AdSegmentPrediction]:
+        """Consume streamed text; returns the entries it completed."""
+        self.text += chunk
+        completed: list[AdSegmentPrediction] = []
+        text = self.text
+        for idx in range(self._pos, len(text)):
+            char = text[idx]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start : idx]
+                    self._last_token = '"'
+                continue
+            if char.isspace():
+                continue
+            if char == '"':
+                self._in_string = True
+                self._string_start = idx + 1
+            elif char in "{[":
+                self._open(char, idx)
+            elif char in "}]":
+                prediction = self._close(char, idx)
+                if prediction is not None:
+                    completed.append(prediction)
+            self._last_token = char
+        self._pos = len(text)
+        self.predictions.extend(completed)
+        return completed
+
+    def _open(self, char: str, idx: int) -> None:
+        if (
+            char == "["
+            and self._array_depth is None
+            and len(self._stack) == 1
+            and self._last_token == ":"
+            and self._last_string == "ad_segments"
+        ):
+            self._array_depth = len(self._stack) + 1
+        elif (
+            char == "{"
+            and not self.ad_segments_closed
+            and self._array_depth is not None
+            and len(self._stack) == self._array_depth
+        ):
+            self._entry_start = idx
+        self._stack.append(char)
+
+    def _close(self, char: str, idx: int) -> AdSegmentPrediction | None:
+        if not self._stack:
+            return None
+        self._stack.pop()
+        if not self._stack:
+            self.finished = True
+        if self._array_depth is None or self.ad_segments_closed:
+            return None
+        if char == "]" and len(self._stack) == self._array_depth - 1:
+            self.ad_segments_closed = True
+        elif (
+            char == "}"
+            and self._entry_start is not None
+            and len(self._stack) == self._array_depth
+        ):
+            raw = self.text[self._entry_start : idx + 1]
+            self._entry_start = None
+            try:
+                return AdSegmentPrediction.model_validate(json.loads(raw))
+            except ValueError:
+                logger.debug(f"Skipping malformed streamed entry: {raw[:200]}")
+        return None
+
+    def prediction_list(self) -> AdSegmentPredictionList:
+        """Entries parsed so far, as a prediction list."""
+        return AdSegmentPredictionList(ad_segments=list(self.predictions))
@@ -0,0 +1,544 @@
+"""Cutting MP3 files by copying frames instead of re-encoding them.
+
+Ad removal keeps most of an episode untouched, so decoding and re-encoding
+all of it costs CPU and quality for nothing. Here the MP3 frames are parsed
+in Python and the kept audio is copied frame by frame; cuts snap to the
+frame boundary nearest each ad edge. Only the short fade regions are
+decoded, faded and re-encoded, at the source's sample rate, channels and
+bitrate, and spliced back in as frames.
+
+Two things make naive frame copying produce glitches, and both are handled:
+
+- Layer III frames borrow space from the frames before them (the bit
+  reservoir): a frame's audio data may start up to 511 bytes back. The first
+  frame after a splice is rewritten as a self-contained frame, at a higher
+  bitrate if needed, holding the borrowed bytes itself.
+- The Xing/Info tag frame records frame and byte counts, a seek table and
+  (in its LAME extension) the encoder delay and padding. It is carried over
+  with the counts updated and a linear seek table, so durations and
+  gapless playback stay right.
+
+Streams this cannot handle (not MPEG-1/2/2.5 Layer III, free format, mixed
+sample rates or channel counts, VBRI headers) raise ``Mp3SpliceError`` and
+should be cut by re-encoding instead.
+"""
+
+import logging
+import math
+import os
+import tempfile
+from dataclasses import dataclass
+
+import ffmpeg  # type: ignore[import-untyped]
+
+logger = logging.getLogger("global_logger")
+
+_BITRATES_KBPS = {
+    False: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    True: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# Keyed by the header's version bits: 3 MPEG-1, 2 MPEG-2, 0 MPEG-2.5.
+_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+# Samples a decoder emits before the first encoded one, on top of the
+# encoder delay recorded in the LAME tag.
+_DECODER_DELAY = 529
+# libmp3lame's encoder delay, checked against the tag of each encoded fade.
+_LAME_ENCODER_DELAY = 576
+_LAME_TAG_ENCODERS = (b"LAME", b"Lavf", b"Lavc")
+# The first frame must start this close to the end of the ID3v2 tag.
+_MAX_LEADING_JUNK = 4096
+# Frames decoded ahead of a fade region must cover this much reservoir.
+_WARM_UP_BYTES = 1024
+
+
+class Mp3SpliceError(Exception):
+    """The input cannot be cut by copying frames; re-encode it instead."""
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    version_bits: int
+    has_crc: bool
+    bitrate_index: int
+    sample_rate_index: int
+    padding: bool
+    mono: bool
+
+    @property
+    def lsf(self) -> bool:
+        """MPEG-2/2.5 "low sampling frequency" layout."""
+        return self.version_bits != 3
+
+    @property
+    def sample_rate(self) -> int:
+        return _SAMPLE_RATES[self.version_bits][self.sample_rate_index]
+
+    @property
+    def bitrate_kbps(self) -> int:
+        return _BITRATES_KBPS[self.lsf][self.bitrate_index]
+
+    @property
+    def samples_per_frame(self) -> int:
+        return 576 if self.lsf else 1152
+
+    @property
+    def channels(self) -> int:
+        return 1 if self.mono else 2
+
+    @property
+    def side_info_size(self) -> int:
+        if self.lsf:
+            return 9 if self.mono else 17
+        return 17 if self.mono else 32
+
+    @property
+    def data_offset(self) -> int:
+        """Offset of the main-data slot within the frame."""
+        return 4 + (2 if self.has_crc else 0) + self.side_info_size
+
+    def length_at(self, bitrate_index: int, padding: bool) -> int:
+        kbps = _BITRATES_KBPS[self.lsf][bitrate_index]
+        coefficient = 72_000 if self.lsf else 144_000
+        return coefficient * kbps // self.sample_rate + int(padding)
+
+    @property
+    def length(self) -> int:
+        return self.length_at(self.bitrate_index, self.padding)
+
+    def compatible(self, other: "FrameHeader") -> bool:
+        return (
+            self.version_bits == other.version_bits
+            and self.sample_rate_index == other.sample_rate_index
+            and self.mono == other.mono
+        )
+
+
+def parse_header(data: bytes, pos: int) -> FrameHeader | None:
+    """The Layer III frame header at ``pos``, or None if there is none."""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (data[pos + 1] >> 3) & 0x3
+    layer_bits = (data[pos + 1] >> 1) & 0x3
+    bitrate_index = data[pos + 2] >> 4
+    sample_rate_index = (data[pos + 2] >> 2) & 0x3
+    if (
+        version_bits == 1
+        or layer_bits != 1
+        or bitrate_index in (0, 15)
+        or sample_rate_index == 3
+    ):
+        return None
+    return FrameHeader(
+        version_bits=version_bits,
+        has_crc=not data[pos + 1] & 0x1,
+        bitrate_index=bitrate_index,
+        sample_rate_index=sample_rate_index,
+        padding=bool(data[pos + 2] & 0x2),
+        mono=data[pos + 3] >> 6 == 3,
+    )
+
+
+@dataclass(frozen=True)
+class InfoTag:
+    """The Xing/Info frame at the start of a stream."""
+
+    frame: bytes
+    xing_offset: int
+    flags: int
+    # Offset of the LAME extension in ``frame``, if it has one
+    lame_offset: int | None
+    encoder_delay: int
+    end_padding: int
+
+
+def _parse_info_tag(frame: bytes, header: FrameHeader) -> InfoTag | None:
+    xing_offset = header.data_offset
+    if frame[36:40] == b"VBRI":
+        raise Mp3SpliceError("VBRI headers are not supported")
+    if frame[xing_offset : xing_offset + 4] not in (b"Xing", b"Info"):
+        return None
+    flags = int.from_bytes(frame[xing_offset + 4 : xing_offset + 8], "big")
+    lame_offset: int | None = (
+        xing_offset
+        + 8
+        + (4 if flags & 1 else 0)
+        + (4 if flags & 2 else 0)
+        + (100 if flags & 4 else 0)
+        + (4 if flags & 8 else 0)
+    )
+    delay = padding = 0
+    assert lame_offset is not None
+    if (
+        lame_offset + 36 <= len(frame)
+        and frame[lame_offset : lame_offset + 4] in _LAME_TAG_ENCODERS
+    ):
+        packed = int.from_bytes(frame[lame_offset + 21 : lame_offset + 24], "big")
+        delay, padding = packed >> 12, packed & 0xFFF
+    else:
+        lame_offset = None
+    return InfoTag(frame, xing_offset, flags, lame_offset, delay, padding)
+
+
+class Mp3Stream:
+    """The frames of an MP3 file, with whatever wraps them."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        audio_start = 0
+        if data[:3] == b"ID3" and len(data) >= 10:
+            size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+            audio_start = 10 + size + (10 if data[5] & 0x10 else 0)
+        audio_end = len(data)
+        if audio_end - audio_start >= 128 and data[-128:-125] == b"TAG":
+            audio_end -= 128
+        self.prefix = data[:audio_start]
+        self.suffix = data[audio_end:]
+
+        self.offsets: list[int] = []
+        self.headers: list[FrameHeader] = []
+        junk = 0
+        pos = audio_start
+        while pos + 4 <= audio_end:
+            header = parse_header(data, pos)
+            if header is not None and self._frame_fits(header, pos, audio_end):
+                self.offsets.append(pos)
+                self.headers.append(header)
+                pos += header.length
+                continue
+            if data[pos : pos + 8] == b"APETAGEX":
+                break
+            if not self.offsets and pos - audio_start > _MAX_LEADING_JUNK:
+                raise Mp3SpliceError("no MPEG audio frames at the start of the file")
+            next_pos = data.find(b"\xff", pos + 1, audio_end)
+            next_pos = audio_end if next_pos < 0 else next_pos
+            junk += next_pos - pos
+            pos = next_pos
+        if len(self.offsets) < 2:
+            raise Mp3SpliceError("no MPEG audio frames found")
+        if junk > (audio_end - audio_start) // 100:
+            raise Mp3SpliceError(f"{junk} bytes between frames")
+
+        first = self.headers[0]
+        if not all(first.compatible(header) for header in self.headers):
+            raise Mp3SpliceError("sample rate or channels change mid-stream")
+        self.tag = _parse_info_tag(self.frame(0), first)
+        if self.tag is not None:
+            del self.offsets[0], self.headers[0]
+
+    def _frame_fits(self, header: FrameHeader, pos: int, audio_end: int) -> bool:
+        end = pos + header.length
+        if end == audio_end:
+            return True
+        following = parse_header(self.data, end)
+        return end < audio_end and following is not None
+
+    @classmethod
+    def read(cls, path: str) -> "Mp3Stream":
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def frame(self, index: int) -> bytes:
+        offset = self.offsets[index]
+        return self.data[offset : offset + self.headers[index].length]
+
+    def frames(self, start: int, end: int) -> memoryview:
+        """Frames ``start`` to ``end`` (exclusive) as stored, without copying."""
+        if start >= end:
+            return memoryview(b"")
+        last = self.offsets[end - 1] + self.headers[end - 1].length
+        return memoryview(self.data)[self.offsets[start] : last]
+
+    @property
+    def samples_per_frame(self) -> int:
+        return self.headers[0].samples_per_frame
+
+    @property
+    def sample_rate(self) -> int:
+        return self.headers[0].sample_rate
+
+    @property
+    def start_skip(self) -> int:
+        """Samples a decoder drops from the start of the stream."""
+        if self.tag is None or self.tag.lame_offset is None:
+            return 0
+        return self.tag.encoder_delay + _DECODER_DELAY
+
+    @property
+    def duration_ms(self) -> float:
+        end_padding = self.tag.end_padding if self.tag is not None else 0
+        samples = len(self) * self.samples_per_frame - self.start_skip - end_padding
+        return samples * 1000.0 / self.sample_rate
+
+    def frame_at(self, ms: int | float) -> int:
+        """The frame boundary nearest ``ms`` on the decoded timeline."""
+        if ms <= 0:
+            return 0
+        if ms >= self.duration_ms - 1:
+            return len(self)
+        raw = ms * self.sample_rate / 1000.0 + self.start_skip
+        return min(len(self), round(raw / self.samples_per_frame))
+
+    def main_data_begin(self, index: int) -> int:
+        offset = self.offsets[index] + 4 + (2 if self.headers[index].has_crc else 0)
+        if self.headers[index].lsf:
+            return self.data[offset]
+        return (self.data[offset] << 1) | (self.data[offset + 1] >> 7)
+
+    def main_data_bytes(self, index: int) -> int:
+        """Length of the frame's own audio data (the part2_3 lengths)."""
+        header = self.headers[index]
+        offset = self.offsets[index] + 4 + (2 if header.has_crc else 0)
+        side_bits = header.side_info_size * 8
+        side_info = int.from_bytes(
+            self.data[offset : offset + header.side_info_size], "big"
+        )
+        if header.lsf:
+            first, block, granules = 8 + (1 if header.mono else 2), 63, 1
+        else:
+            first = 9 + (5 if header.mono else 3) + 4 * header.channels
+            block, granules = 59, 2
+        total = 0
+        for i in range(granules * header.channels):
+            shift = side_bits - (first + i * block) - 12
+            total += (side_info >> shift) & 0xFFF
+        return math.ceil(total / 8)
+
+    def self_contained_frame(self, index: int) -> bytes:
+        """Frame ``index`` rewritten to not borrow from earlier frames.
+
+        The borrowed bytes move into the frame itself, whose bitrate is raised
+        as far as needed to fit them. Bytes after the frame's own data stay
+        at the end of the slot, where later frames borrow them from.
+        """
+        back = self.main_data_begin(index)
+        if back == 0:
+            return self.frame(index)
+        header = self.headers[index]
+        borrowed = b""
+        previous = index - 1
+        while len(borrowed) < back and previous >= 0:
+            frame = self.frame(previous)
+            borrowed = frame[self.headers[previous].data_offset :] + borrowed
+            previous -= 1
+        if len(borrowed) < back:
+            raise Mp3SpliceError(f"frame {index} borrows from before the stream")
+        frame = self.frame(index)
+        reservoir = borrowed[len(borrowed) - back :] + frame[header.data_offset :]
+        own = self.main_data_bytes(index)
+        if own > len(reservoir):
+            raise Mp3SpliceError(f"frame {index} has inconsistent side info")
+
+        for bitrate_index in range(header.bitrate_index, 15):
+            for padding in (False, True):
+                capacity = (
+                    header.length_at(bitrate_index, padding) - 4 - header.side_info_size
+                )
+                if capacity >= len(reservoir):
+                    break
+            else:
+                continue
+            break
+        else:
+            raise Mp3SpliceError(f"frame {index} does not fit any bitrate")
+
+        new_header = bytes(
+            [
+                frame[0],
+                frame[1] | 0x1,  # no CRC
+                (bitrate_index << 4) | (frame[2] & 0x0D) | (0x2 if padding else 0),
+                frame[3],
+            ]
+        )
+        side_start = 4 + (2 if header.has_crc else 0)
+        side_info = bytearray(frame[side_start : side_start + header.side_info_size])
+        side_info[0] = 0
+        if not header.lsf:
+            side_info[1] &= 0x7F
+        return (
+            new_header
+            + bytes(side_info)
+            + reservoir[:own]
+            + bytes(capacity - len(reservoir))
+            + reservoir[own:]
+        )
+
+
+def _crc16(data: bytes) -> int:
+    """The CRC-16 LAME stores for its tag."""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def _info_tag_frame(stream: Mp3Stream, frame_count: int, audio_bytes: int) -> bytes:
+    """A Xing tag frame for the output: the source's updated, or a new one."""
+    if stream.tag is not None:
+        tag = stream.tag
+        frame = bytearray(tag.frame)
+        cursor = tag.xing_offset + 8
+        # Mixing in re-encoded and rewritten frames makes the bitrate vary.
+        frame[tag.xing_offset : tag.xing_offset + 4] = b"Xing"
+        total_bytes = len(frame) + audio_bytes
+        if tag.flags & 1:
+            frame[cursor : cursor + 4] = frame_count.to_bytes(4, "big")
+            cursor += 4
+        if tag.flags & 2:
+            frame[cursor : cursor + 4] = total_bytes.to_bytes(4, "big")
+            cursor += 4
+        if tag.flags & 4:
+            frame[cursor : cursor + 100] = bytes(i * 256 // 100 for i in range(100))
+        if tag.lame_offset is not None:
+            lame = tag.lame_offset
+            frame[lame + 28 : lame + 32] = total_bytes.to_bytes(4, "big")
+            frame[lame + 34 : lame + 36] = _crc16(bytes(frame[: lame + 34])).to_bytes(
+                2, "big"
+            )
+        return bytes(frame)
+
+    first = stream.frame(0)
+    header = stream.headers[0]
+    bitrate_index = header.bitrate_index
+    while header.length_at(bitrate_index, False) < header.data_offset + 16:
+        bitrate_index += 1
+    length = header.length_at(bitrate_index, False)
+    frame = bytearray(length)
+    frame[0:4] = bytes(
+        [first[0], first[1] | 0x1, (bitrate_index << 4) | (first[2] & 0x0C), first[3]]
+    )
+    xing = 4 + header.side_info_size
+    frame[xing : xing + 16] = (
+        b"Xing"
+        + (3).to_bytes(4, "big")
+        + frame_count.to_bytes(4, "big")
+        + (length + audio_bytes).to_bytes(4, "big")
+    )
+    return bytes(frame)
+
+
+def _encode_faded(
+    stream: Mp3Stream, start: int, end: int, fade: str, work_dir: str
+) -> list[bytes]:
+    """Frames ``start`` to ``end`` decoded, faded in or out and re-encoded.
+
+    The encoder's priming delay is absorbed by encoding from a little before
+    the region, so the re-encoded frames line up one-to-one with the source
+    frames they replace.
+    """
+    spf = stream.samples_per_frame
+    frames_in_region = end - start
+    encoder_delay = _LAME_ENCODER_DELAY + _DECODER_DELAY
+    dropped = math.ceil(encoder_delay / spf)
+    pre_roll = dropped * spf - encoder_delay
+
+    # Decode from a few frames earlier so the region's frames have their
+    # reservoir and overlap; the first of them is made self-contained.
+    warm_up = start
+    warm_up_bytes = 0
+    while warm_up > 0 and (warm_up_bytes < _WARM_UP_BYTES or start - warm_up < 2):
+        warm_up -= 1
+        warm_up_bytes += stream.headers[warm_up].length
+    tail = min(len(stream), end + 2)
+    source = stream.self_contained_frame(warm_up) + bytes(
+        stream.frames(warm_up + 1, tail)
+    )
+
+    first_sample = (start - warm_up) * spf - pre_roll
+    audio = ffmpeg.input("pipe:", format="mp3").audio
+    if first_sample < 0:
+        audio = audio.filter("adelay", delays=f"{-first_sample}S", all=1)
+        first_sample = 0
+    audio = (
+        audio.filter("atrim", start_sample=first_sample)
+        .filter("asetpts", "PTS-STARTPTS")
+        .filter(
+            "afade", t=fade, start_sample=pre_roll, nb_samples=frames_in_region * spf
+        )
+        .filter("apad", pad_len=2 * spf)
+    )
+    encoded_path = os.path.join(work_dir, f"fade-{start}.mp3")
+    header = stream.headers[start]
+    try:
+        (
+            audio.output(
+                encoded_path,
+                acodec="libmp3lame",
+                audio_bitrate=f"{header.bitrate_kbps}k",
+                ar=header.sample_rate,
+                ac=header.channels,
+            )
+            .overwrite_output()
+            .run(input=source, capture_stdout=True, capture_stderr=True)
+        )
+    except ffmpeg.Error as e:
+        stderr = e.stderr.decode(errors="replace") if e.stderr else str(e)
+        raise Mp3SpliceError(f"re-encoding a fade failed: {stderr}") from e
+
+    encoded = Mp3Stream.read(encoded_path)
+    if not encoded.headers[0].compatible(stream.headers[0]):
+        raise Mp3SpliceError("re-encoded fade does not match the source format")
+    if encoded.tag is not None and encoded.start_skip not in (0, encoder_delay):
+        raise Mp3SpliceError(f"unexpected encoder delay {encoded.tag.encoder_delay}")
+    if len(encoded) < dropped + frames_in_region:
+        raise Mp3SpliceError("re-encoded fade is shorter than its region")
+    return [encoded.self_contained_frame(dropped)] + [
+        encoded.frame(i) for i in range(dropped + 1, dropped + frames_in_region)
+    ]
+
+
+def splice_mp3(
+    pieces_ms: list[tuple[int, int, str | None]], in_path: str, out_path: str
+) -> None:
+    """Write the ``(start_ms, end_ms, fade)`` pieces of ``in_path`` back to
+    back into ``out_path``; ``fade`` is ``"in"``, ``"out"`` or None.
+
+    Pieces without a fade are copied frame by frame. Raises
+    ``Mp3SpliceError`` for input that cannot be cut this way.
+    """
+    stream = Mp3Stream.read(in_path)
+    ranges = [
+        (stream.frame_at(start_ms), stream.frame_at(end_ms), fade)
+        for start_ms, end_ms, fade in pieces_ms
+    ]
+    ranges = [(start, end, fade) for start, end, fade in ranges if end > start]
+    if not ranges:
+        raise Mp3SpliceError("nothing to keep")
+
+    parts: list[bytes | memoryview] = []
+    frame_count = 0
+    previous_end: int | None = None
+    with tempfile.TemporaryDirectory() as work_dir:
+        for start, end, fade in ranges:
+            if fade is not None:
+                parts.extend(_encode_faded(stream, start, end, fade, work_dir))
+            elif start in (previous_end, 0):
+                parts.append(stream.frames(start, end))
+            else:
+                parts.append(stream.self_contained_frame(start))
+                parts.append(stream.frames(start + 1, end))
+            frame_count += end - start
+            previous_end = None if fade is not None else end
+
+    audio_bytes = sum(len(part) for part in parts)
+    with open(out_path, "wb") as f:
+        f.write(stream.prefix)
+        f.write(_info_tag_frame(stream, frame_count, audio_bytes))
+        for part in parts:
+            f.write(part)
+        f.write(stream.suffix)
+    logger.info(
+        "[MP3_SPLICE] Copied %s into %d pieces (%d frames, %d re-encoded fades)",
+        in_path,
+        len(ranges),
+        frame_count,
+        sum(1 for _, _, fade in ranges if fade is not None),
+    )
@@ -14,13 +14,20 @@ from app.extensions import db
 from app.models import Post, ProcessingJob, TranscriptSegment
 from app.writer.client import writer_client
 from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.audio_fingerprint import AdFingerprinter
 from podcast_processor.audio_processor import AudioProcessor
+from podcast_processor.llm_circuit_breaker import ProviderUnavailableError
 from podcast_processor.podcast_downloader import PodcastDownloader, sanitize_title
 from podcast_processor.processing_status_manager import ProcessingStatusManager
 from podcast_processor.prompt import (
+    COMPACT_SYSTEM_PROMPT_PATH,
     DEFAULT_SYSTEM_PROMPT_PATH,
     DEFAULT_USER_PROMPT_TEMPLATE_PATH,
 )
+from podcast_processor.publisher_chapters import (
+    chapters_to_json,
+    load_publisher_chapters,
+)
 from podcast_processor.transcription_manager import TranscriptionManager
 from shared.config import Config
 from shared.processing_paths import (
@@ -89,6 +96,7 @@ class PodcastProcessor:
         status_manager: ProcessingStatusManager | None = None,
         db_session: Any | None = None,
         downloader: PodcastDownloader | None = None,
+        ad_fingerprinter: AdFingerprinter | None = None,
     ) -> None:
         super().__init__()
         self.logger = logger or logging.getLogger("global_logger")
@@ -123,6 +131,10 @@ class PodcastProcessor:
         else:
             self.audio_processor = audio_processor
 
+        self.ad_fingerprinter = ad_fingerprinter or AdFingerprinter(
+            config, self.logger, self.db_session
+        )
+
     # pylint: disable=too-many-branches, too-many-statements
     def process(
         self,
@@ -194,6 +206,7 @@ class PodcastProcessor:
             self._handle_download_step(
                 post, job, cached_post_guid, cached_post_title, cached_job_id
             )
+            self._capture_publisher_chapters(post)
             self._raise_if_cancelled(job, 1, cancel_callback)
 
             # Get processing paths and acquire lock
@@ -242,6 +255,14 @@ class PodcastProcessor:
                     # Best-effort lock release; avoid masking original exceptions
                     pass
 
+        except ProviderUnavailableError as e:
+            # Completed windows are kept as ModelCalls, so the resumed job picks
+            # up where this one stopped instead of failing during the outage.
+            self.status_manager.park_job(
+                job, f"Waiting for LLM provider: {e}", delay_seconds=e.retry_in
+            )
+            raise ProcessorException(f"Job parked: {e}") from e
+
         except ProcessorException as e:
             error_msg = str(e)
             if "Processing job in progress" in error_msg:
@@ -340,7 +361,11 @@ class PodcastProcessor:
         self.status_manager.update_job_status(
             job, "running", 2, "Transcribing audio", 50.0
         )
-        transcript_segments = self.transcription_manager.transcribe(post)
+        # Known (fingerprinted) ads are neither transcribed nor classified
+        known_ad_spans = self.ad_fingerprinter.find_known_ads(post)
+        transcript_segments = self.transcription_manager.transcribe(
+            post, skip_spans=known_ad_spans
+        )
         self._raise_if_cancelled(job, 2, cancel_callback)
 
         # Step 3: Classify ad segments
@@ -405,7 +430,11 @@ class PodcastProcessor:
         user_prompt_template = self.get_user_prompt_template(
             DEFAULT_USER_PROMPT_TEMPLATE_PATH
         )
-        system_prompt = self.get_system_prompt(DEFAULT_SYSTEM_PROMPT_PATH)
+        system_prompt = self.get_system_prompt(
+            COMPACT_SYSTEM_PROMPT_PATH
+            if self.config.llm_compact_prompts
+            else DEFAULT_SYSTEM_PROMPT_PATH
+        )
         self.ad_classifier.classify(
             transcript_segments=transcript_segments,
             system_prompt=system_prompt,
@@ -629,6 +658,31 @@ class PodcastProcessor:
         if not result or not result.success:
             raise RuntimeError(getattr(result, "error", "Failed to update post"))
 
+    def _capture_publisher_chapters(self, post: Post) -> None:
+        """Store the episode's publisher chapters (chapters file or embedded
+        tags) on the post, once, for the classifier to use as ad markers."""
+        if not self.config.enable_publisher_chapters:
+            return
+        if post.publisher_chapters is not None:
+            return
+        try:
+            chapters = load_publisher_chapters(
+                post.unprocessed_audio_path, post.chapters_url
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            self.logger.warning(f"Could not load chapters for post {post.id}: {e}")
+            return
+        self.logger.info(f"Found {len(chapters)} publisher chapters for {post}")
+        result = writer_client.update(
+            "Post",
+            post.id,
+            {"publisher_chapters": chapters_to_json(chapters)},
+            wait=True,
+        )
+        if not result or not result.success:
+            raise RuntimeError(getattr(result, "error", "Failed to update post"))
+        post.publisher_chapters = chapters_to_json(chapters)
+
     def _remove_unprocessed_audio(self, post: Post) -> None:
         """
         Delete the downloaded source audio and clear its DB reference.
@@ -114,6 +114,28 @@ class ProcessingStatusManager:
                 progress,
             )
 
+    def park_job(
+        self, job: ProcessingJob, step_name: str, delay_seconds: float
+    ) -> None:
+        """Requeue a job so it resumes after ``delay_seconds``."""
+        job_id = job.id
+        writer_client.action(
+            "park_job",
+            {
+                "job_id": job_id,
+                "step_name": step_name,
+                "delay_seconds": delay_seconds,
+            },
+            wait=True,
+        )
+        self.db_session.expire_all()
+        self.logger.info(
+            "[JOB_PARKED] job_id=%s resume_in=%.0fs reason=%s",
+            job_id,
+            delay_seconds,
+            step_name,
+        )
+
     def mark_cancelled(self, job_id: str, error_message: str | None = None) -> None:
         writer_client.action(
             "mark_cancelled", {"job_id": job_id, "reason": error_message}, wait=True
@@ -1,8 +1,11 @@
+import hashlib
+
 from podcast_processor.cue_detector import CueDetector
 from podcast_processor.model_output import AdSegmentPrediction, AdSegmentPredictionList
 from podcast_processor.transcribe import Segment
 
 DEFAULT_SYSTEM_PROMPT_PATH = "src/system_prompt.txt"
+COMPACT_SYSTEM_PROMPT_PATH = "src/system_prompt_compact.txt"
 DEFAULT_USER_PROMPT_TEMPLATE_PATH = "src/user_prompt.jinja"
 
 _cue_detector = CueDetector()
@@ -24,18 +27,104 @@ def transcript_excerpt_for_prompt(
     return "\n".join(excerpts)
 
 
-def generate_system_prompt() -> str:
+# Tells the model how to read compact excerpts; also marks a stored prompt as
+# compact so its answers are mapped back by line number.
+COMPACT_EXCERPT_NOTE = (
+    "(Lines start with a line number [N], not a timestamp. Use N as segment_offset.)"
+)
+
+
+def compact_line_groups(
+    segments: list[Segment], min_line_words: int
+) -> list[list[int]]:
+    """Group adjacent segments into prompt lines of at least
+    ``min_line_words`` words; returns segment indices per line."""
+    groups: list[list[int]] = []
+    line_words = 0
+    for idx, segment in enumerate(segments):
+        if groups and line_words < min_line_words:
+            groups[-1].append(idx)
+        else:
+            groups.append([idx])
+            line_words = 0
+        line_words += len(segment.text.split())
+    return groups
+
+
+def compact_transcript_excerpt_for_prompt(
+    segments: list[Segment],
+    includes_start: bool,
+    includes_end: bool,
+    *,
+    min_line_words: int,
+) -> str:
+    """Like ``transcript_excerpt_for_prompt``, but merges short adjacent
+    segments into one line and labels lines with integer line numbers
+    instead of float timestamps."""
+    return "\n".join(
+        [
+            COMPACT_EXCERPT_NOTE,
+            _compact_lines(segments, includes_start, includes_end, min_line_words),
+        ]
+    )
+
+
+def _compact_lines(
+    segments: list[Segment],
+    includes_start: bool,
+    includes_end: bool,
+    min_line_words: int,
+) -> str:
+    excerpts = [
+        f"[{line}] "
+        + _cue_detector.highlight_cues(
+            " ".join(segments[idx].text.strip() for idx in group)
+        )
+        for line, group in enumerate(compact_line_groups(segments, min_line_words))
+    ]
+    if includes_start:
+        excerpts.insert(0, "[TRANSCRIPT START]")
+    if includes_end:
+        excerpts.append("[TRANSCRIPT END]")
+
+    return "\n".join(excerpts)
+
+
+def prompt_hash(system_prompt: str, user_prompt: str) -> str:
+    """Fingerprint of everything the model sees for one window; a stored
+    response is reused only while this is unchanged."""
+    digest = hashlib.sha256()
+    for part in (system_prompt, user_prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def generate_system_prompt(compact: bool = False) -> str:
+    """The classification system prompt; ``compact`` describes and
+    demonstrates the numbered-line excerpts of compact prompts."""
+
+    def excerpt(segments: list[Segment]) -> str:
+        if compact:
+            return _compact_lines(segments, False, False, min_line_words=0)
+        return transcript_excerpt_for_prompt(
+            segments, includes_start=False, includes_end=False
+        )
+
+    def offset(line: int, start: float) -> float:
+        return float(line) if compact else start
+
     valid_empty_example = AdSegmentPredictionList(ad_segments=[]).model_dump_json(
         exclude_none=True
     )
 
     output_for_one_shot_example = AdSegmentPredictionList(
         ad_segments=[
-            AdSegmentPrediction(segment_offset=59.8, confidence=0.95),
-            AdSegmentPrediction(segment_offset=64.8, confidence=0.9),
-            AdSegmentPrediction(segment_offset=73.8, confidence=0.92),
-            AdSegmentPrediction(segment_offset=77.8, confidence=0.98),
-            AdSegmentPrediction(segment_offset=79.8, confidence=0.9),
+            AdSegmentPrediction(segment_offset=offset(1, 59.8), confidence=0.95),
+            AdSegmentPrediction(segment_offset=offset(2, 64.8), confidence=0.9),
+            AdSegmentPrediction(segment_offset=offset(3, 73.8), confidence=0.92),
+            AdSegmentPrediction(segment_offset=offset(4, 77.8), confidence=0.98),
+            AdSegmentPrediction(segment_offset=offset(5, 79.8), confidence=0.9),
         ],
         content_type="promotional_external",
         confidence=0.96,
@@ -43,7 +132,7 @@ def generate_system_prompt() -> str:
 
     example_output_for_prompt = output_for_one_shot_example.strip()
 
-    one_shot_transcript_example = transcript_excerpt_for_prompt(
+    one_shot_transcript_example = excerpt(
         [
             Segment(start=53.8, end=-1, text="That's all coming after the break."),
             Segment(
@@ -79,12 +168,10 @@ def generate_system_prompt() -> str:
                 end=-1,
                 text="And welcome back to the show, today we're talking to Professor Hopkins",
             ),
-        ],
-        includes_start=False,
-        includes_end=False,
+        ]
     )
 
-    technical_example = transcript_excerpt_for_prompt(
+    technical_example = excerpt(
         [
             Segment(
                 start=4762.7,
@@ -102,11 +189,26 @@ def generate_system_prompt() -> str:
                 text="Shopify exists at a scale most programmers never touch, and it still runs on Rails.",
             ),
             Segment(start=4933.2, end=-1, text="Shopify.com has supported this show."),
-        ],
-        includes_start=False,
-        includes_end=False,
+        ]
     )
 
+    technical_output = AdSegmentPredictionList(
+        ad_segments=[
+            AdSegmentPrediction(segment_offset=offset(3, 4933.2), confidence=0.75)
+        ],
+        content_type="technical_discussion",
+        confidence=0.45,
+    ).model_dump_json(exclude_none=True)
+
+    if compact:
+        offset_format = "<line_number>"
+        excerpt_format = "numbered lines starting with a line number [N]; one line may hold several short segments. Output the line number of every line"
+    else:
+        offset_format = "<seconds.float>"
+        excerpt_format = (
+            "segments starting with a timestamp [X] (seconds). Output every segment"
+        )
+
     # pylint: disable=line-too-long
     return f"""Your job is to identify advertisements in podcast transcript excerpts with high precision, continuity awareness, and content-context sensitivity.
 
@@ -120,7 +222,7 @@ CONTENT-AWARE TAXONOMY:
 
 JSON CONTRACT (strict):
 - Always respond with: {{"ad_segments": [...], "content_type": "<taxonomy>", "confidence": <0.0-1.0>}}
-- Each ad_segments item must be: {{"segment_offset": <seconds.float>, "confidence": <0.0-1.0>}}
+- Each ad_segments item must be: {{"segment_offset": {offset_format}, "confidence": <0.0-1.0>}}
 - If there are no ads, respond with: {valid_empty_example} (no extra keys).
 
 DURATION AND CUE GUIDANCE:
@@ -135,7 +237,7 @@ DECISION RULES:
 4) Boundary bias: if later segments clearly form an ad for a sponsor, pull in the prior two intro/transition lines as ad content.
 5) Prefer labeling as content unless multiple strong ad cues appear with clear external branding.
 
-This transcript excerpt is broken into segments starting with a timestamp [X] (seconds). Output every segment that is advertisement content.
+This transcript excerpt is broken into {excerpt_format} that is advertisement content.
 
 Example (external sponsor with CTA):
 {one_shot_transcript_example}
@@ -143,5 +245,5 @@ Output: {example_output_for_prompt}
 
 Example (technical mention, not an ad):
 {technical_example}
-Output: {{"ad_segments": [{{"segment_offset": 4933.2, "confidence": 0.75}}], "content_type": "technical_discussion", "confidence": 0.45}}
+Output: {technical_output}
 \n\n"""
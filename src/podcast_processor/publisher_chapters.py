@@ -0,0 +1,213 @@
+"""Publisher-supplied chapters and the ad markers in them.
+
+Feeds may link a Podcasting 2.0 ``podcast:chapters`` JSON file per episode,
+and audio files may embed chapters (ID3 ``CHAP`` frames in MP3s, chapter
+lists in MP4/M4A). Chapters whose titles mark them as sponsor segments become
+ad identifications. When the chapters cover the whole episode, the publisher
+has already said where every ad is, and LLM classification is skipped.
+
+Only fetching the JSON file touches the network; all parsing is local.
+"""
+
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import mutagen
+import requests
+from mutagen.id3 import ID3
+
+logger = logging.getLogger(__name__)
+
+# Pseudo model name for ModelCall rows backing chapter-derived ads.
+PUBLISHER_CHAPTERS_MODEL_NAME = "publisher_chapters"
+# Confidence given to segments inside sponsor chapters.
+SPONSOR_CHAPTER_CONFIDENCE = 0.95
+# Gaps (and missing head/tail) up to this long still count as covered.
+COVERAGE_TOLERANCE_SECONDS = 5.0
+
+_SPONSOR_TITLE_RE = re.compile(
+    r"\b("
+    r"ads?(?!-free)|advert\w*|sponsor\w*|commercials?|promos?|promotions?|"
+    r"ad[ -]?breaks?|ad[ -]?reads?|(?:pre|mid|post)[ -]?rolls?|"
+    r"brought to you by|word from our|paid partnership|partner messages?"
+    r")\b",
+    re.IGNORECASE,
+)
+_FETCH_TIMEOUT_SECONDS = 15
+_MAX_CHAPTERS_BYTES = 1_000_000
+
+
+@dataclass(frozen=True)
+class Chapter:
+    start: float
+    end: float | None
+    title: str
+    # "json" (podcast:chapters file) or "embedded" (tags in the audio file)
+    source: str
+
+
+def is_sponsor_chapter(title: str) -> bool:
+    return bool(_SPONSOR_TITLE_RE.search(title or ""))
+
+
+def find_chapters_url(entry: Any) -> str | None:
+    """The ``podcast:chapters`` JSON URL of a feed entry, if any."""
+    chapters = entry.get("podcast_chapters")
+    if not isinstance(chapters, dict):
+        return None
+    url = chapters.get("url")
+    chapter_type = (chapters.get("type") or "").lower()
+    if not url or (chapter_type and "json" not in chapter_type):
+        return None
+    return str(url)
+
+
+def _sorted_with_ends(chapters: list[Chapter]) -> list[Chapter]:
+    """Sort by start; open-ended chapters end where the next one starts."""
+    ordered = sorted(chapters, key=lambda c: c.start)
+    return [
+        Chapter(
+            start=chapter.start,
+            end=(
+                chapter.end
+                if chapter.end is not None and chapter.end > chapter.start
+                else (ordered[i + 1].start if i + 1 < len(ordered) else None)
+            ),
+            title=chapter.title,
+            source=chapter.source,
+        )
+        for i, chapter in enumerate(ordered)
+    ]
+
+
+def parse_chapters_json(payload: str | bytes) -> list[Chapter]:
+    """Parse a Podcasting 2.0 JSON chapters file."""
+    try:
+        data = json.loads(payload)
+    except (TypeError, ValueError) as e:
+        logger.warning(f"Invalid chapters JSON: {e}")
+        return []
+    items = data.get("chapters") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return []
+    chapters: list[Chapter] = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            start = float(item["startTime"])
+            end = float(item["endTime"]) if item.get("endTime") is not None else None
+        except (KeyError, TypeError, ValueError):
+            continue
+        chapters.append(
+            Chapter(
+                start=start, end=end, title=str(item.get("title") or ""), source="json"
+            )
+        )
+    return _sorted_with_ends(chapters)
+
+
+def read_embedded_chapters(audio_path: str) -> list[Chapter]:
+    """Read chapters embedded in an audio file (ID3 CHAP frames or MP4)."""
+    try:
+        audio = mutagen.File(audio_path)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.warning(f"Could not read tags from {audio_path}: {e}")
+        return []
+    if audio is None:
+        return []
+
+    chapters: list[Chapter] = []
+    mp4_chapters = getattr(audio, "chapters", None)
+    if mp4_chapters:
+        chapters = [
+            Chapter(start=float(c.start), end=None, title=c.title, source="embedded")
+            for c in mp4_chapters
+        ]
+    elif isinstance(audio.tags, ID3):
+        for frame in audio.tags.getall("CHAP"):
+            title_frame = frame.sub_frames.get("TIT2")
+            chapters.append(
+                Chapter(
+                    start=frame.start_time / 1000.0,
+                    end=frame.end_time / 1000.0,
+                    title=str(title_frame.text[0]) if title_frame else "",
+                    source="embedded",
+                )
+            )
+    return _sorted_with_ends(chapters)
+
+
+def fetch_chapters_json(url: str) -> list[Chapter]:
+    """Download and parse a chapters file; network errors yield no chapters."""
+    try:
+        with requests.get(url, timeout=_FETCH_TIMEOUT_SECONDS, stream=True) as resp:
+            resp.raise_for_status()
+            payload = resp.raw.read(_MAX_CHAPTERS_BYTES + 1, decode_content=True)
+    except requests.RequestException as e:
+        logger.warning(f"Failed to fetch chapters from {url}: {e}")
+        return []
+    if len(payload) > _MAX_CHAPTERS_BYTES:
+        logger.warning(f"Chapters file at {url} is too large; ignoring it")
+        return []
+    return parse_chapters_json(payload)
+
+
+def load_publisher_chapters(
+    audio_path: str | None, chapters_url: str | None
+) -> list[Chapter]:
+    """The episode's chapters: the feed's chapters file if it has any,
+    otherwise those embedded in the audio."""
+    if chapters_url:
+        chapters = fetch_chapters_json(chapters_url)
+        if chapters:
+            return chapters
+    if audio_path:
+        return read_embedded_chapters(audio_path)
+    return []
+
+
+def chapters_to_json(chapters: list[Chapter]) -> list[dict[str, Any]]:
+    return [asdict(chapter) for chapter in chapters]
+
+
+def chapters_from_json(data: Any) -> list[Chapter]:
+    if not isinstance(data, list):
+        return []
+    return [Chapter(**item) for item in data if isinstance(item, dict)]
+
+
+def sponsor_spans(chapters: list[Chapter], runtime: float) -> list[Chapter]:
+    """Sponsor chapters, with open ends closed at ``runtime``."""
+    return [
+        Chapter(
+            start=chapter.start,
+            end=chapter.end if chapter.end is not None else runtime,
+            title=chapter.title,
+            source=chapter.source,
+        )
+        for chapter in chapters
+        if is_sponsor_chapter(chapter.title)
+    ]
+
+
+def chapters_cover_runtime(
+    chapters: list[Chapter],
+    runtime: float,
+    tolerance: float = COVERAGE_TOLERANCE_SECONDS,
+) -> bool:
+    """True if the chapters span ``runtime`` without gaps longer than
+    ``tolerance`` (an open-ended last chapter runs to the end)."""
+    if not chapters or runtime <= 0:
+        return False
+    covered_to = 0.0
+    for chapter in sorted(chapters, key=lambda c: c.start):
+        if chapter.start - covered_to > tolerance:
+            return False
+        covered_to = max(
+            covered_to, chapter.end if chapter.end is not None else runtime
+        )
+    return runtime - covered_to <= tolerance
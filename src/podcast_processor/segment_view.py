@@ -0,0 +1,108 @@
+"""Time-indexed view of transcript segments shared by the boundary refiners.
+
+Boundary refinement looks up context around many ad blocks of the same
+episode. Building the dict representation once and indexing it by start time
+and sequence number keeps each lookup at O(log n) instead of rescanning (and
+``list.index``-ing) the whole transcript per block.
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from typing import Any
+
+from app.models import TranscriptSegment
+
+
+class SegmentView(list[dict[str, Any]]):
+    """Read-only list of segment dicts, sorted by start time, with lookups.
+
+    It is a ``list`` so existing refiner helpers that iterate or slice
+    ``all_segments`` keep working unchanged. Callers must not mutate it.
+    """
+
+    def __init__(self, segments: Iterable[dict[str, Any]] = ()) -> None:
+        super().__init__(
+            sorted(segments, key=lambda seg: float(seg.get("start_time") or 0.0))
+        )
+        self.start_times: list[float] = [
+            float(seg.get("start_time") or 0.0) for seg in self
+        ]
+        self._index_by_seq: dict[int, int] = {}
+        self._gaps_cache: dict[float, list[tuple[float, float]]] = {}
+        for idx, seg in enumerate(self):
+            try:
+                self._index_by_seq.setdefault(int(seg.get("sequence_num", -1)), idx)
+            except (TypeError, ValueError):
+                continue
+
+    @classmethod
+    def from_transcript_segments(
+        cls, transcript_segments: Iterable[TranscriptSegment]
+    ) -> "SegmentView":
+        return cls(
+            {
+                "sequence_num": seg.sequence_num,
+                "start_time": seg.start_time,
+                "text": seg.text,
+                "end_time": seg.end_time,
+            }
+            for seg in transcript_segments
+        )
+
+    @classmethod
+    def coerce(cls, segments: list[dict[str, Any]]) -> "SegmentView":
+        """Return ``segments`` if it is already a view, otherwise index it."""
+        if isinstance(segments, SegmentView):
+            return segments
+        return cls(segments)
+
+    def starting_between(self, start: float, end: float) -> tuple[int, int] | None:
+        """Index range of segments whose start time lies within [start, end]."""
+        lo = bisect_left(self.start_times, start)
+        hi = bisect_right(self.start_times, end)
+        if lo >= hi:
+            return None
+        return lo, hi - 1
+
+    def overlapping(self, start: float, end: float) -> tuple[int, int] | None:
+        """Index range of segments overlapping the [start, end] window."""
+        hi = bisect_right(self.start_times, end)
+        first = bisect_left(self.start_times, start)
+        # Segments that start before the window may still run into it.
+        while first > 0 and self._end_time(first - 1) >= start:
+            first -= 1
+        while first < hi and self._end_time(first) < start:
+            first += 1
+        if first >= hi:
+            return None
+        return first, hi - 1
+
+    def index_of_seq(self, sequence_num: Any) -> int | None:
+        try:
+            return self._index_by_seq.get(int(sequence_num))
+        except (TypeError, ValueError):
+            return None
+
+    def get_by_seq(self, sequence_num: Any) -> dict[str, Any] | None:
+        idx = self.index_of_seq(sequence_num)
+        return None if idx is None else self[idx]
+
+    def gaps(self, min_gap_seconds: float) -> list[tuple[float, float]]:
+        """(start, end) of silences between consecutive segments, computed once."""
+        cached = self._gaps_cache.get(min_gap_seconds)
+        if cached is not None:
+            return cached
+        gaps: list[tuple[float, float]] = []
+        for idx in range(1, len(self)):
+            prev_end = self._end_time(idx - 1)
+            if self.start_times[idx] - prev_end >= min_gap_seconds:
+                gaps.append((prev_end, self.start_times[idx]))
+        self._gaps_cache[min_gap_seconds] = gaps
+        return gaps
+
+    def _end_time(self, idx: int) -> float:
+        seg = self[idx]
+        try:
+            return float(seg.get("end_time", self.start_times[idx]))
+        except (TypeError, ValueError):
+            return self.start_times[idx]
@@ -0,0 +1,379 @@
+"""
+Cross-process LLM token and concurrency limits backed by a SQLite file.
+
+``TokenRateLimiter`` and ``LLMConcurrencyLimiter`` keep their budgets in
+process memory, so separate worker processes (or a CLI reprocess running next
+to the server) each spend the full budget. The subclasses here keep the
+budget in a shared SQLite file instead. Every acquire is one short
+``BEGIN IMMEDIATE`` transaction on a per-thread connection, so competing
+processes are serialized by SQLite's write lock at sub-millisecond cost.
+
+Budgets are scoped by a hash of the API key and base URL: processes that
+share a key share its budget. Concurrency slots are leases; a slot held past
+its lease, or by a process on the same host that has exited, is reclaimed.
+"""
+
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from podcast_processor.llm_concurrency_limiter import LLMConcurrencyLimiter
+from podcast_processor.token_rate_limiter import TokenRateLimiter
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS llm_token_usage (
+        scope TEXT NOT NULL,
+        ts REAL NOT NULL,
+        tokens INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_llm_token_usage_scope_ts "
+    "ON llm_token_usage (scope, ts)",
+    """
+    CREATE TABLE IF NOT EXISTS llm_concurrency_slots (
+        lease_id TEXT PRIMARY KEY,
+        scope TEXT NOT NULL,
+        host TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+)
+
+# Poll interval bounds while waiting for a concurrency slot
+_MIN_POLL_SECONDS = 0.02
+_MAX_POLL_SECONDS = 0.25
+
+
+def limiter_scope(api_key: str | None, base_url: str | None) -> str:
+    """Budget scope for an API key; the key itself is never stored."""
+    digest = hashlib.sha256(f"{base_url or ''}\0{api_key or ''}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedLimiterStore:
+    """The SQLite file holding token usage and concurrency leases."""
+
+    def __init__(self, path: str, *, busy_timeout: float = 30.0):
+        self.path = path
+        self._busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._host = socket.gethostname()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self.transaction() as conn:
+            for statement in _SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.path, timeout=self._busy_timeout, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def token_usage(self, scope: str, since: float) -> tuple[int, float | None, int]:
+        """Tokens used since ``since``: ``(total, oldest timestamp, records)``."""
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM llm_token_usage WHERE scope = ? AND ts < ?",
+                (scope, since),
+            )
+            total, oldest, records = conn.execute(
+                "SELECT COALESCE(SUM(tokens), 0), MIN(ts), COUNT(*) "
+                "FROM llm_token_usage WHERE scope = ?",
+                (scope,),
+            ).fetchone()
+        return int(total), oldest, int(records)
+
+    def record_tokens(self, scope: str, tokens: int, now: float) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO llm_token_usage (scope, ts, tokens) VALUES (?, ?, ?)",
+                (scope, now, tokens),
+            )
+
+    def try_consume_tokens(
+        self, scope: str, tokens: int, *, limit: int, window: float, now: float
+    ) -> float:
+        """Record ``tokens`` if they fit the window; otherwise return the
+        seconds until the oldest usage expires (and record nothing)."""
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM llm_token_usage WHERE scope = ? AND ts < ?",
+                (scope, now - window),
+            )
+            used, oldest = conn.execute(
+                "SELECT COALESCE(SUM(tokens), 0), MIN(ts) "
+                "FROM llm_token_usage WHERE scope = ?",
+                (scope,),
+            ).fetchone()
+            if oldest is not None and used + tokens > limit:
+                return max(0.0, oldest + window - now)
+            conn.execute(
+                "INSERT INTO llm_token_usage (scope, ts, tokens) VALUES (?, ?, ?)",
+                (scope, now, tokens),
+            )
+            return 0.0
+
+    def _reclaim_slots(self, conn: sqlite3.Connection, scope: str, now: float) -> None:
+        conn.execute(
+            "DELETE FROM llm_concurrency_slots WHERE scope = ? AND expires_at < ?",
+            (scope, now),
+        )
+        # PIDs are only meaningful on this host (and in this PID namespace).
+        rows = conn.execute(
+            "SELECT lease_id, pid FROM llm_concurrency_slots "
+            "WHERE scope = ? AND host = ? AND pid != ?",
+            (scope, self._host, os.getpid()),
+        ).fetchall()
+        dead = [(lease_id,) for lease_id, pid in rows if not _pid_alive(pid)]
+        if dead:
+            logger.info(f"Reclaiming {len(dead)} LLM slots held by exited processes")
+            conn.executemany(
+                "DELETE FROM llm_concurrency_slots WHERE lease_id = ?", dead
+            )
+
+    def try_acquire_slot(
+        self, scope: str, lease_id: str, *, limit: int, lease_seconds: float
+    ) -> bool:
+        now = time.time()
+        with self.transaction() as conn:
+            self._reclaim_slots(conn, scope, now)
+            (active,) = conn.execute(
+                "SELECT COUNT(*) FROM llm_concurrency_slots WHERE scope = ?",
+                (scope,),
+            ).fetchone()
+            if active >= limit:
+                return False
+            conn.execute(
+                "INSERT INTO llm_concurrency_slots "
+                "(lease_id, scope, host, pid, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (lease_id, scope, self._host, os.getpid(), now + lease_seconds),
+            )
+            return True
+
+    def release_slot(self, lease_id: str) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM llm_concurrency_slots WHERE lease_id = ?", (lease_id,)
+            )
+
+    def active_slots(self, scope: str) -> int:
+        with self.transaction() as conn:
+            self._reclaim_slots(conn, scope, time.time())
+            (active,) = conn.execute(
+                "SELECT COUNT(*) FROM llm_concurrency_slots WHERE scope = ?",
+                (scope,),
+            ).fetchone()
+        return int(active)
+
+
+class SharedTokenRateLimiter(TokenRateLimiter):
+    """``TokenRateLimiter`` whose usage window lives in a shared store."""
+
+    def __init__(
+        self,
+        store: SharedLimiterStore,
+        scope: str,
+        tokens_per_minute: int = 30000,
+        window_minutes: int = 1,
+    ):
+        super().__init__(
+            tokens_per_minute=tokens_per_minute, window_minutes=window_minutes
+        )
+        self.store = store
+        self.scope = scope
+
+    def check_rate_limit(
+        self, messages: list[dict[str, str]], model: str
+    ) -> tuple[bool, float]:
+        token_count = self.count_tokens(messages, model)
+        current_time = time.time()
+        current_usage, oldest, _ = self.store.token_usage(
+            self.scope, current_time - self.window_seconds
+        )
+        if current_usage + token_count <= self.tokens_per_minute or oldest is None:
+            return True, 0.0
+        return False, max(0.0, oldest + self.window_seconds - current_time)
+
+    def record_usage(self, messages: list[dict[str, str]], model: str) -> None:
+        self.store.record_tokens(
+            self.scope, self.count_tokens(messages, model), time.time()
+        )
+
+    def wait_if_needed(self, messages: list[dict[str, str]], model: str) -> None:
+        """Wait until the shared window has room, recording usage atomically
+        so that processes cannot both claim the same headroom."""
+        token_count = self.count_tokens(messages, model)
+        while True:
+            wait_seconds = self.store.try_consume_tokens(
+                self.scope,
+                token_count,
+                limit=self.tokens_per_minute,
+                window=float(self.window_seconds),
+                now=time.time(),
+            )
+            if wait_seconds <= 0:
+                return
+            logger.info(
+                f"Shared rate limiting: waiting {wait_seconds:.1f}s to avoid API limits"
+            )
+            time.sleep(wait_seconds)
+
+    def get_usage_stats(self) -> dict[str, int | float]:
+        current_usage, _, records = self.store.token_usage(
+            self.scope, time.time() - self.window_seconds
+        )
+        return {
+            "current_usage": current_usage,
+            "limit": self.tokens_per_minute,
+            "usage_percentage": (current_usage / self.tokens_per_minute) * 100,
+            "window_seconds": self.window_seconds,
+            "active_records": records,
+        }
+
+
+class SharedConcurrencyLimiter(LLMConcurrencyLimiter):
+    """``LLMConcurrencyLimiter`` whose slots are leases in a shared store.
+
+    Slots are released by the thread that acquired them, as with
+    ``ConcurrencyContext``.
+    """
+
+    def __init__(
+        self,
+        store: SharedLimiterStore,
+        scope: str,
+        max_concurrent_calls: int,
+        lease_seconds: float = 900.0,
+    ):
+        super().__init__(max_concurrent_calls)
+        self.store = store
+        self.scope = scope
+        self.lease_seconds = lease_seconds
+        self._held = threading.local()
+
+    def _leases(self) -> list[str]:
+        leases: list[str] | None = getattr(self._held, "leases", None)
+        if leases is None:
+            leases = []
+            self._held.leases = leases
+        return leases
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        lease_id = uuid.uuid4().hex
+        poll = _MIN_POLL_SECONDS
+        while not self.store.try_acquire_slot(
+            self.scope,
+            lease_id,
+            limit=self.max_concurrent_calls,
+            lease_seconds=self.lease_seconds,
+        ):
+            if deadline is not None and time.monotonic() + poll > deadline:
+                logger.warning(
+                    f"Failed to acquire shared LLM concurrency slot within {timeout}s timeout"
+                )
+                return False
+            time.sleep(poll)
+            poll = min(_MAX_POLL_SECONDS, poll * 2)
+        self._leases().append(lease_id)
+        logger.debug("Acquired shared LLM concurrency slot")
+        return True
+
+    def release(self) -> None:
+        leases = self._leases()
+        if not leases:
+            logger.warning("Released a shared LLM concurrency slot that was not held")
+            return
+        self.store.release_slot(leases.pop())
+        logger.debug("Released shared LLM concurrency slot")
+
+    def get_available_slots(self) -> int:
+        return max(0, self.max_concurrent_calls - self.get_active_calls())
+
+    def get_active_calls(self) -> int:
+        return self.store.active_slots(self.scope)
+
+
+# Per-file stores and per-scope limiters, shared by all classifier instances
+_STORES: dict[str, SharedLimiterStore] = {}
+_RATE_LIMITERS: dict[tuple[str, str], SharedTokenRateLimiter] = {}
+_CONCURRENCY_LIMITERS: dict[tuple[str, str], SharedConcurrencyLimiter] = {}
+_LOCK = threading.Lock()
+
+
+def _get_store(path: str) -> SharedLimiterStore:
+    store = _STORES.get(path)
+    if store is None:
+        store = SharedLimiterStore(path)
+        _STORES[path] = store
+    return store
+
+
+def get_shared_rate_limiter(
+    path: str, scope: str, tokens_per_minute: int
+) -> SharedTokenRateLimiter:
+    """Get or create the shared token limiter for ``scope`` in ``path``."""
+    with _LOCK:
+        limiter = _RATE_LIMITERS.get((path, scope))
+        if limiter is None or limiter.tokens_per_minute != tokens_per_minute:
+            limiter = SharedTokenRateLimiter(
+                _get_store(path), scope, tokens_per_minute=tokens_per_minute
+            )
+            _RATE_LIMITERS[(path, scope)] = limiter
+        return limiter
+
+
+def get_shared_concurrency_limiter(
+    path: str, scope: str, max_concurrent_calls: int, lease_seconds: float
+) -> SharedConcurrencyLimiter:
+    """Get or create the shared concurrency limiter for ``scope`` in ``path``."""
+    with _LOCK:
+        limiter = _CONCURRENCY_LIMITERS.get((path, scope))
+        if limiter is None or limiter.max_concurrent_calls != max_concurrent_calls:
+            limiter = SharedConcurrencyLimiter(
+                _get_store(path),
+                scope,
+                max_concurrent_calls,
+                lease_seconds=lease_seconds,
+            )
+            _CONCURRENCY_LIMITERS[(path, scope)] = limiter
+        limiter.lease_seconds = lease_seconds
+        return limiter
@@ -0,0 +1,184 @@
+"""Per-feed index of recurring sponsor reads.
+
+Shows often repeat the same host-read sponsor copy across many episodes. Ad
+blocks confirmed by classification are stored per feed as hashed word
+shingles plus a MinHash signature. New transcripts are matched against the
+index before LLM classification: a segment whose shingles are mostly found in
+one indexed read is labelled an ad directly.
+
+MinHash is used to merge a re-occurring read into its existing entry (the
+signature of a union is the element-wise minimum), so the index grows with
+distinct sponsors rather than with episodes. Matching uses an inverted index
+over the exact shingle hashes, which is cheap at per-feed scale and gives a
+precise containment score for short segments.
+"""
+
+import hashlib
+import random
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+# Pseudo model name for ModelCall rows backing sponsor-index identifications.
+SPONSOR_INDEX_MODEL_NAME = "sponsor_index"
+
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 64
+# Two reads whose estimated Jaccard similarity reaches this are one sponsor.
+MERGE_SIMILARITY = 0.5
+# Ad blocks shorter than this are too generic to index.
+MIN_BLOCK_WORDS = 20
+# A run of matched segments must cover at least this many words.
+MIN_MATCH_WORDS = 12
+# Bound on stored shingles per entry so merged entries cannot grow unbounded.
+MAX_SHINGLES_PER_ENTRY = 4000
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 64) - 1
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+_rng = random.Random(0x5EED)
+_PERMUTATIONS: tuple[tuple[int, int], ...] = tuple(
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+)
+
+
+def normalize_words(text: str) -> list[str]:
+    return _WORD_RE.findall((text or "").lower())
+
+
+def _hash_shingle(words: Sequence[str]) -> int:
+    digest = hashlib.blake2b(" ".join(words).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+def shingle_hashes(words: Sequence[str]) -> list[int]:
+    """Hashes of the word ``SHINGLE_SIZE``-grams starting at each position.
+
+    Texts shorter than a shingle produce a single shingle of all their words.
+    """
+    if not words:
+        return []
+    if len(words) < SHINGLE_SIZE:
+        return [_hash_shingle(words)]
+    return [
+        _hash_shingle(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    ]
+
+
+def minhash(shingles: Iterable[int]) -> list[int]:
+    signature = [_MAX_HASH] * NUM_PERMUTATIONS
+    for shingle in set(shingles):
+        for idx, (a, b) in enumerate(_PERMUTATIONS):
+            value = (a * shingle + b) % _MERSENNE_PRIME
+            signature[idx] = min(signature[idx], value)
+    return signature
+
+
+def merge_minhash(left: Sequence[int], right: Sequence[int]) -> list[int]:
+    """Signature of the union of the two underlying shingle sets."""
+    return [min(a, b) for a, b in zip(left, right, strict=True)]
+
+
+def estimate_jaccard(left: Sequence[int], right: Sequence[int]) -> float:
+    if len(left) != len(right) or not left:
+        return 0.0
+    return sum(a == b for a, b in zip(left, right, strict=True)) / len(left)
+
+
+def build_sponsor_block(texts: Sequence[str]) -> dict[str, Any] | None:
+    """Index payload for one confirmed ad block, or None if it is too short."""
+    words = [word for text in texts for word in normalize_words(text)]
+    if len(words) < MIN_BLOCK_WORDS:
+        return None
+    shingles = sorted(set(shingle_hashes(words)))
+    return {
+        "minhash": minhash(shingles),
+        "shingles": shingles[:MAX_SHINGLES_PER_ENTRY],
+        "word_count": len(words),
+        "sample_text": " ".join(texts)[:200],
+    }
+
+
+@dataclass
+class SponsorMatch:
+    sequence_num: int
+    signature_id: int
+    containment: float
+
+
+class SponsorIndex:
+    """In-memory inverted index over one feed's sponsor signatures."""
+
+    def __init__(self, entries: Iterable[tuple[int, Iterable[int]]]):
+        self._entries_by_shingle: dict[int, set[int]] = {}
+        self.entry_count = 0
+        for entry_id, shingles in entries:
+            self.entry_count += 1
+            for shingle in shingles:
+                self._entries_by_shingle.setdefault(int(shingle), set()).add(
+                    int(entry_id)
+                )
+
+    def __bool__(self) -> bool:
+        return bool(self._entries_by_shingle)
+
+    def match_segments(
+        self, segments: Sequence[Any], *, threshold: float
+    ) -> dict[int, SponsorMatch]:
+        """Match transcript segments (ordered by time) against the index.
+
+        A segment's containment is the share of its words covered by shingles
+        of a single indexed read. Shingles are taken over the whole transcript
+        so reads that are segmented differently from the indexed copy still
+        match. Isolated matches shorter than ``MIN_MATCH_WORDS`` are dropped as
+        generic phrasing.
+        """
+        words: list[str] = []
+        bounds: list[tuple[int, int]] = []
+        for segment in segments:
+            segment_words = normalize_words(str(getattr(segment, "text", "") or ""))
+            bounds.append((len(words), len(words) + len(segment_words)))
+            words.extend(segment_words)
+        if not words or not self:
+            return {}
+
+        covered: dict[int, bytearray] = {}
+        for start, shingle in enumerate(shingle_hashes(words)):
+            end = min(start + SHINGLE_SIZE, len(words))
+            for entry_id in self._entries_by_shingle.get(shingle, ()):
+                mask = covered.setdefault(entry_id, bytearray(len(words)))
+                mask[start:end] = b"\x01" * (end - start)
+
+        candidates: dict[int, SponsorMatch] = {}
+        for idx, (lo, hi) in enumerate(bounds):
+            if hi <= lo:
+                continue
+            best_id, best_count = max(
+                ((entry_id, sum(mask[lo:hi])) for entry_id, mask in covered.items()),
+                key=lambda item: item[1],
+                default=(0, 0),
+            )
+            containment = best_count / (hi - lo)
+            if best_count and containment >= threshold:
+                candidates[idx] = SponsorMatch(
+                    sequence_num=int(segments[idx].sequence_num),
+                    signature_id=best_id,
+                    containment=round(containment, 3),
+                )
+
+        matches: dict[int, SponsorMatch] = {}
+        run: list[int] = []
+        for idx in [*sorted(candidates), None]:
+            if idx is not None and (not run or idx == run[-1] + 1):
+                run.append(idx)
+                continue
+            if run and sum(bounds[i][1] - bounds[i][0] for i in run) >= MIN_MATCH_WORDS:
+                for member in run:
+                    match = candidates[member]
+                    matches[match.sequence_num] = match
+            run = [idx] if idx is not None else []
+        return matches
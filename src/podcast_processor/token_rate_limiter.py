@@ -180,16 +180,8 @@ def get_rate_limiter(tokens_per_minute: int = 30000) -> TokenRateLimiter:
     return _RATE_LIMITER
 
 
-def configure_rate_limiter_for_model(model: str) -> TokenRateLimiter:
-    """
-    Configure rate limiter with appropriate limits for the given model.
-
-    Args:
-        model: Model name (e.g., "anthropic/claude-sonnet-4-20250514")
-
-    Returns:
-        Configured TokenRateLimiter instance
-    """
+def tokens_per_minute_for_model(model: str) -> int:
+    """Default input tokens per minute for the given model."""
     # Model-specific rate limits (tokens per minute)
     model_limits = {
         # Anthropic models
@@ -207,12 +199,23 @@ def configure_rate_limiter_for_model(model: str) -> TokenRateLimiter:
     }
 
     # Extract base model name and find limit
-    tokens_per_minute = 30000  # Conservative default
     for model_pattern, limit in model_limits.items():
         if model_pattern in model:
-            tokens_per_minute = limit
-            break
+            return limit
+    return 30000  # Conservative default
+
 
+def configure_rate_limiter_for_model(model: str) -> TokenRateLimiter:
+    """
+    Configure rate limiter with appropriate limits for the given model.
+
+    Args:
+        model: Model name (e.g., "anthropic/claude-sonnet-4-20250514")
+
+    Returns:
+        Configured TokenRateLimiter instance
+    """
+    tokens_per_minute = tokens_per_minute_for_model(model)
     logger.info(
         f"Configured rate limiter for {model}: {tokens_per_minute} tokens/minute"
     )
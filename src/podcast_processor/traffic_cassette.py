@@ -0,0 +1,314 @@
+"""Record/replay of LLM and Whisper traffic.
+
+In ``record`` mode every litellm completion, Whisper transcription and
+Copilot chat made by the pipeline is performed as usual. The pair of request
+and response, along with its latency, is written to a cassette file. In
+``replay`` mode the same calls are answered from the cassette without
+touching the network. A request with no recording raises
+``CassetteMissError``. This makes a full ``PodcastProcessor.process`` run
+reproducible offline (CI, profiling, comparing classification changes).
+
+Interactions are keyed by a hash of the normalized request. Credentials,
+endpoints, timeouts and retry settings are left out of the key, and uploaded
+files are keyed by their content hash. Identical requests are answered in the
+order they were recorded. Failed calls are not recorded.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import litellm
+from openai.types.audio.transcription_segment import TranscriptionSegment
+
+from shared.config import Config
+from shared.llm_utils import close_stream
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+CASSETTE_MODES: tuple[str, ...] = ("record", "replay")
+
+# Request fields that do not change the answer and may differ between runs.
+_VOLATILE_KEYS = frozenset(
+    {
+        "api_key",
+        "api_base",
+        "base_url",
+        "timeout",
+        "max_retries",
+        "metadata",
+        "stream_options",
+    }
+)
+
+
+class CassetteMissError(RuntimeError):
+    """Replay found no recording for a request."""
+
+
+def normalize_request(request: dict[str, Any]) -> dict[str, Any]:
+    """The parts of ``request`` that identify it, in JSON-safe form."""
+    normalized: dict[str, Any] = {}
+    for key, value in sorted(request.items()):
+        if key in _VOLATILE_KEYS or value is None:
+            continue
+        if isinstance(value, bytes):
+            normalized[key] = {"sha256": hashlib.sha256(value).hexdigest()}
+        else:
+            normalized[key] = json.loads(json.dumps(value, sort_keys=True, default=str))
+    return normalized
+
+
+def request_key(kind: str, request: dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"kind": kind, "request": normalize_request(request)}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """One cassette file, in ``record`` or ``replay`` mode."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str,
+        *,
+        replay_latency: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._interactions: list[dict[str, Any]] = []
+        self._pending: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self._last: dict[str, dict[str, Any]] = {}
+        if self.path.exists():
+            self._load()
+        elif mode == "replay":
+            raise FileNotFoundError(f"Cassette {self.path} does not exist")
+
+    def _load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(
+                f"Cassette {self.path} has version {data.get('version')}, "
+                f"expected {CASSETTE_VERSION}"
+            )
+        # Re-recording appends to the cassette rather than overwriting it.
+        self._interactions = list(data.get("interactions", []))
+        for interaction in self._interactions:
+            self._pending[interaction["key"]].append(interaction)
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"version": CASSETTE_VERSION, "interactions": self._interactions},
+                indent=1,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+    def _record(self, interaction: dict[str, Any]) -> None:
+        with self._lock:
+            self._interactions.append(interaction)
+            self._save()
+
+    def _replay(self, kind: str, key: str) -> dict[str, Any]:
+        """The next recording for ``key``; the last one repeats once all
+        recordings were used."""
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                self._last[key] = pending.popleft()
+            interaction = self._last.get(key)
+        if interaction is None:
+            raise CassetteMissError(
+                f"No {kind} interaction recorded for request {key[:12]} in {self.path}"
+            )
+        return interaction
+
+    def call(
+        self,
+        kind: str,
+        request: dict[str, Any],
+        perform: Callable[[], Any],
+        *,
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any],
+    ) -> Any:
+        """Perform and record ``request``, or replay its recorded response."""
+        key = request_key(kind, request)
+        if self.mode == "replay":
+            interaction = self._replay(kind, key)
+            if self.replay_latency:
+                self._sleep(interaction["latency_ms"] / 1000.0)
+            return decode(interaction["response"])
+
+        started = time.monotonic()
+        response = perform()
+        self._record(
+            {
+                "key": key,
+                "kind": kind,
+                "request": normalize_request(request),
+                "response": encode(response),
+                "latency_ms": round((time.monotonic() - started) * 1000),
+            }
+        )
+        return response
+
+    def call_stream(
+        self,
+        kind: str,
+        request: dict[str, Any],
+        perform: Callable[[], Iterator[Any]],
+        *,
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any],
+    ) -> Iterator[Any]:
+        """Like ``call`` for streamed responses.
+
+        Chunks are recorded with their arrival time. A stream the caller
+        abandons early is recorded up to that point, which is as far as a
+        replay of the same run reads it.
+        """
+        key = request_key(kind, request)
+        if self.mode == "replay":
+            return self._replay_stream(self._replay(kind, key), decode)
+        return self._record_stream(key, kind, request, perform, encode)
+
+    def _replay_stream(
+        self, interaction: dict[str, Any], decode: Callable[[Any], Any]
+    ) -> Iterator[Any]:
+        elapsed_ms = 0
+        for chunk in interaction["response"]:
+            if self.replay_latency:
+                self._sleep(max(0, chunk["t_ms"] - elapsed_ms) / 1000.0)
+                elapsed_ms = chunk["t_ms"]
+            yield decode(chunk["chunk"])
+
+    def _record_stream(
+        self,
+        key: str,
+        kind: str,
+        request: dict[str, Any],
+        perform: Callable[[], Iterator[Any]],
+        encode: Callable[[Any], Any],
+    ) -> Iterator[Any]:
+        started = time.monotonic()
+        chunks: list[dict[str, Any]] = []
+        completed = False
+        stream = perform()
+        try:
+            for chunk in stream:
+                chunks.append(
+                    {
+                        "t_ms": round((time.monotonic() - started) * 1000),
+                        "chunk": encode(chunk),
+                    }
+                )
+                yield chunk
+            completed = True
+        finally:
+            close_stream(stream)
+            # Streams that failed before any chunk arrived are not recorded.
+            if chunks or completed:
+                self._record(
+                    {
+                        "key": key,
+                        "kind": kind,
+                        "request": normalize_request(request),
+                        "response": chunks,
+                        "latency_ms": chunks[-1]["t_ms"] if chunks else 0,
+                    }
+                )
+
+    def litellm_completion(
+        self, completion: Callable[..., Any], completion_args: dict[str, Any]
+    ) -> Any:
+        """``completion(**completion_args)`` through the cassette."""
+        if completion_args.get("stream"):
+            return self.call_stream(
+                "litellm",
+                completion_args,
+                lambda: completion(**completion_args),
+                encode=lambda chunk: chunk.model_dump(),
+                decode=lambda data: litellm.ModelResponseStream(**data),
+            )
+        return self.call(
+            "litellm",
+            completion_args,
+            lambda: completion(**completion_args),
+            encode=lambda response: response.model_dump(),
+            decode=lambda data: litellm.ModelResponse(**data),
+        )
+
+    def whisper_transcription(
+        self,
+        request: dict[str, Any],
+        audio: bytes,
+        perform: Callable[[], list[TranscriptionSegment]],
+    ) -> list[TranscriptionSegment]:
+        """A Whisper transcription of ``audio`` through the cassette."""
+        return self.call(
+            "whisper",
+            {**request, "file": audio},
+            perform,
+            encode=lambda segments: [segment.model_dump() for segment in segments],
+            decode=lambda data: [TranscriptionSegment(**item) for item in data],
+        )
+
+    def copilot_chat(self, model: str, prompt: str, perform: Callable[[], str]) -> str:
+        """A Copilot chat through the cassette."""
+        return str(
+            self.call(
+                "copilot",
+                {"model": model, "prompt": prompt},
+                perform,
+                encode=str,
+                decode=str,
+            )
+        )
+
+
+_CASSETTES: dict[str, Cassette] = {}
+_CASSETTES_LOCK = threading.Lock()
+
+
+def get_cassette(config: Config) -> Cassette | None:
+    """The process-wide cassette configured by ``config``, if any."""
+    if not config.traffic_cassette_path:
+        return None
+    path = str(Path(config.traffic_cassette_path).resolve())
+    with _CASSETTES_LOCK:
+        cassette = _CASSETTES.get(path)
+        if cassette is None or cassette.mode != config.traffic_cassette_mode:
+            cassette = Cassette(
+                path,
+                config.traffic_cassette_mode,
+                replay_latency=config.traffic_cassette_replay_latency,
+            )
+            _CASSETTES[path] = cassette
+            logger.info(f"Using traffic cassette {path} ({cassette.mode})")
+        return cassette
+
+
+def reset_cassettes() -> None:
+    with _CASSETTES_LOCK:
+        _CASSETTES.clear()
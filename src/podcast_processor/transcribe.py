@@ -1,14 +1,56 @@
 import logging
+import math
 import shutil
+import threading
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Any
 
+import ffmpeg  # type: ignore[import-untyped]
 from openai import OpenAI
 from openai.types.audio.transcription_segment import TranscriptionSegment
 from pydantic import BaseModel
 
-from podcast_processor.audio import split_audio
-from shared.config import RemoteWhisperConfig
+from podcast_processor.audio import (
+    change_tempo,
+    get_audio_duration_ms,
+    split_audio,
+    trim_file,
+)
+from podcast_processor.llm_router import LLMRouter, get_llm_router
+from podcast_processor.traffic_cassette import Cassette
+from podcast_processor.voice_activity import (
+    SpeechMap,
+    TrimReport,
+    VoiceActivityTrimmer,
+)
+from podcast_processor.whisper_chunk_tuner import (
+    ChunkOutcome,
+    ChunkTuner,
+    get_chunk_tuner,
+)
+from shared.config import LLMEndpointConfig, RemoteWhisperConfig
+
+_CLIENTS: dict[tuple[str, str], OpenAI] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def openai_transcription(**args: Any) -> list[TranscriptionSegment]:
+    """One transcription request, routed to ``api_base`` with ``api_key``.
+
+    This is the completion function of the Whisper router pool.
+    """
+    key = (args.pop("api_base"), args.pop("api_key"))
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            # Retries are left to the router, which can pick another endpoint
+            client = OpenAI(base_url=key[0], api_key=key[1], max_retries=0)
+            _CLIENTS[key] = client
+    segments = client.audio.transcriptions.create(**args).segments
+    assert segments is not None
+    return segments
 
 
 class Segment(BaseModel):
@@ -27,6 +69,11 @@ class Transcriber(ABC):
     def transcribe(self, audio_file_path: str) -> list[Segment]:
         pass
 
+    def take_chunk_report(self) -> list[dict[str, Any]]:
+        """Sizes, timeouts and outcomes of the chunks sent since the last
+        call, for transcribers that choose them adaptively."""
+        return []
+
 
 class TestWhisperTranscriber(Transcriber):
     def __init__(self, logger: logging.Logger):
@@ -45,15 +92,63 @@ class TestWhisperTranscriber(Transcriber):
 
 
 class OpenAIWhisperTranscriber(Transcriber):
-    def __init__(self, logger: logging.Logger, config: RemoteWhisperConfig):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        config: RemoteWhisperConfig,
+        cassette: Cassette | None = None,
+        trimmer: VoiceActivityTrimmer | None = None,
+        tempo: float = 1.0,
+    ):
         self.logger = logger
         self.config = config
+        # Records or replays the API calls when set
+        self.cassette = cassette
+        # Compresses non-speech out of the audio before it is uploaded when set
+        self.trimmer = trimmer
+        self.last_trim_report: TrimReport | None = None
+        # Audio is uploaded this many times faster than recorded
+        self.tempo = tempo
 
         self.openai_client = OpenAI(
             base_url=config.base_url,
             api_key=config.api_key,
             timeout=config.timeout_sec,
         )
+        # Spreads chunks over the primary and secondary endpoints, failing
+        # over and hedging slow uploads, when either is configured
+        self.router: LLMRouter | None = None
+        if config.secondary_endpoints or config.hedge_percentile:
+            self.router = get_llm_router(
+                [
+                    LLMEndpointConfig(
+                        name="primary",
+                        base_url=config.base_url,
+                        api_key=config.api_key,
+                        model=config.model,
+                    ),
+                    *config.secondary_endpoints,
+                ],
+                hedge_percentile=config.hedge_percentile,
+                hedge_min_samples=config.hedge_min_samples,
+                hedge_same_endpoint=True,
+                completion=openai_transcription,
+            )
+        # Replays must upload the same chunks as the recording, so chunk
+        # sizes only adapt without a cassette
+        self.tuner: ChunkTuner | None = None
+        if config.adaptive_chunking and cassette is None:
+            self.tuner = get_chunk_tuner(
+                (
+                    config.base_url,
+                    config.model,
+                    tuple((e.name, e.base_url) for e in config.secondary_endpoints),
+                ),
+                min_chunk_seconds=config.min_chunk_seconds,
+                max_chunk_seconds=config.max_chunk_seconds,
+                max_timeout_seconds=float(config.timeout_sec),
+            )
+        self._chunk_report: list[dict[str, Any]] = []
 
     @property
     def model_name(self) -> str:
@@ -65,12 +160,57 @@ class OpenAIWhisperTranscriber(Transcriber):
             audio_file_path,
         )
         audio_chunk_path = audio_file_path + "_parts"
+        Path(audio_chunk_path).mkdir(parents=True, exist_ok=True)
+
+        upload_path = audio_file_path
+        speech_map: SpeechMap | None = None
+        if self.trimmer is not None:
+            trimmed_path = str(Path(audio_chunk_path) / "speech.mp3")
+            speech_map = self.trimmer.trim(audio_file_path, trimmed_path)
+            if speech_map is not None:
+                upload_path = trimmed_path
+
+        tempo = self.tempo
+        if tempo != 1.0:
+            fast_path = str(Path(audio_chunk_path) / "tempo.mp3")
+            try:
+                change_tempo(upload_path, fast_path, tempo)
+                upload_path = fast_path
+            except ffmpeg.Error as e:
+                self.logger.warning(
+                    "[WHISPER_TEMPO] Could not speed up %s, uploading at 1x: %s",
+                    audio_file_path,
+                    e.stderr.decode(errors="replace") if e.stderr else e,
+                )
+                tempo = 1.0
+
+        chunk_size_bytes = self.config.chunksize_mb * 1024 * 1024
+        duration_ms = 0
+        if self.tuner is not None:
+            duration_ms = get_audio_duration_ms(upload_path) or 0
+            chunk_seconds = self.tuner.chunk_seconds()
+            if duration_ms > 0:
+                chunk_size_bytes = min(
+                    chunk_size_bytes,
+                    math.ceil(
+                        Path(upload_path).stat().st_size
+                        * chunk_seconds
+                        * 1000
+                        / duration_ms
+                    ),
+                )
+            self.logger.info(
+                "[WHISPER_TUNING] Using chunks of up to %.0fs (%d bytes)",
+                chunk_seconds,
+                chunk_size_bytes,
+            )
 
         chunks = split_audio(
-            Path(audio_file_path),
+            Path(upload_path),
             Path(audio_chunk_path),
-            self.config.chunksize_mb * 1024 * 1024,
+            chunk_size_bytes,
         )
+        started = time.monotonic()
 
         self.logger.info("[WHISPER_REMOTE] Processing %d chunks", len(chunks))
         all_segments: list[TranscriptionSegment] = []
@@ -83,16 +223,37 @@ class OpenAIWhisperTranscriber(Transcriber):
                 len(chunks),
                 chunk_path,
             )
-            segments = self.get_segments_for_chunk(str(chunk_path))
+            if self.tuner is not None:
+                chunk_end = chunks[idx + 1][1] if idx + 1 < len(chunks) else duration_ms
+                segments = self._transcribe_adaptively(
+                    Path(chunk_path), max(chunk_end - offset, 1)
+                )
+            else:
+                segments = self.get_segments_for_chunk(str(chunk_path))
             self.logger.info(
                 "[WHISPER_REMOTE] Chunk %d/%d complete: %d segments",
                 idx + 1,
                 len(chunks),
                 len(segments),
             )
-            all_segments.extend(self.add_offset_to_segments(segments, offset))
+            all_segments.extend(
+                self.add_offset_to_segments(
+                    segments, offset, speech_map=speech_map, tempo=tempo
+                )
+            )
 
         shutil.rmtree(audio_chunk_path)
+        if speech_map is not None:
+            self.last_trim_report = TrimReport(
+                original_seconds=speech_map.original_ms / 1000.0,
+                kept_seconds=speech_map.kept_ms / 1000.0,
+                whisper_seconds=time.monotonic() - started,
+            )
+            self.logger.info(
+                "[WHISPER_VAD] %s: %s",
+                audio_file_path,
+                self.last_trim_report.summary(),
+            )
         self.logger.info(
             "[WHISPER_REMOTE] Transcription complete: %d total segments",
             len(all_segments),
@@ -112,36 +273,203 @@ class OpenAIWhisperTranscriber(Transcriber):
 
     @staticmethod
     def add_offset_to_segments(
-        segments: list[TranscriptionSegment], offset_ms: int
+        segments: list[TranscriptionSegment],
+        offset_ms: int,
+        *,
+        speech_map: SpeechMap | None = None,
+        tempo: float = 1.0,
     ) -> list[TranscriptionSegment]:
+        """Shift chunk-relative times by the chunk's offset, stretch them by
+        ``tempo`` if the audio was sped up, then map them through
+        ``speech_map`` if it was trimmed, ending on the original timeline."""
         offset_sec = float(offset_ms) / 1000.0
         for segment in segments:
-            segment.start += offset_sec
-            segment.end += offset_sec
+            segment.start = (segment.start + offset_sec) * tempo
+            segment.end = (segment.end + offset_sec) * tempo
+            if speech_map is not None:
+                segment.start = speech_map.to_original(segment.start)
+                segment.end = speech_map.to_original(segment.end, is_end=True)
+
+        return segments
+
+    def take_chunk_report(self) -> list[dict[str, Any]]:
+        report, self._chunk_report = self._chunk_report, []
+        return report
 
+    def _record_chunk(self, outcome: ChunkOutcome) -> None:
+        assert self.tuner is not None
+        self.tuner.record(outcome)
+        self._chunk_report.append(outcome.to_dict())
+
+    def _transcribe_adaptively(
+        self, chunk_path: Path, duration_ms: int
+    ) -> list[TranscriptionSegment]:
+        """Transcribe a chunk with a timeout fitted to its duration; a chunk
+        that fails is split in half and each half transcribed on its own."""
+        assert self.tuner is not None
+        audio_seconds = duration_ms / 1000.0
+        timeout = self.tuner.timeout_for(audio_seconds)
+        try:
+            return self.get_segments_for_chunk(
+                str(chunk_path), audio_seconds=audio_seconds, timeout=timeout
+            )
+        except Exception as e:
+            self._record_chunk(
+                ChunkOutcome(
+                    audio_seconds=audio_seconds,
+                    timeout_seconds=timeout,
+                    latency_seconds=None,
+                    endpoint=None,
+                    error=str(e)[:200] or type(e).__name__,
+                )
+            )
+            half_ms = duration_ms // 2
+            if half_ms < self.config.min_chunk_seconds * 1000:
+                raise
+            self.logger.warning(
+                "[WHISPER_TUNING] Splitting failed %.0fs chunk %s in half: %s",
+                audio_seconds,
+                chunk_path,
+                e,
+            )
+        first = chunk_path.with_name(f"{chunk_path.stem}a{chunk_path.suffix}")
+        second = chunk_path.with_name(f"{chunk_path.stem}b{chunk_path.suffix}")
+        trim_file(chunk_path, first, 0, half_ms)
+        trim_file(chunk_path, second, half_ms, duration_ms)
+        segments = self._transcribe_adaptively(first, half_ms)
+        segments.extend(
+            self.add_offset_to_segments(
+                self._transcribe_adaptively(second, duration_ms - half_ms), half_ms
+            )
+        )
         return segments
 
-    def get_segments_for_chunk(self, chunk_path: str) -> list[TranscriptionSegment]:
+    def get_segments_for_chunk(
+        self,
+        chunk_path: str,
+        *,
+        audio_seconds: float | None = None,
+        timeout: float | None = None,
+    ) -> list[TranscriptionSegment]:
+        """Transcribe one chunk. ``timeout`` overrides ``timeout_sec``;
+        ``audio_seconds`` (the chunk's duration) is probed when needed and
+        not given."""
         with open(chunk_path, "rb") as f:
             self.logger.info(
                 "[WHISPER_API_CALL] Sending chunk to API: %s (timeout=%ds)",
                 chunk_path,
-                self.config.timeout_sec,
+                timeout if timeout is not None else self.config.timeout_sec,
             )
 
-            transcription = self.openai_client.audio.transcriptions.create(
-                model=self.config.model,
-                file=f,
-                timestamp_granularities=["segment"],
-                language=self.config.language,
-                response_format="verbose_json",
-            )
+            request: dict[str, Any] = {
+                "model": self.config.model,
+                "timestamp_granularities": ["segment"],
+                "language": self.config.language,
+                "response_format": "verbose_json",
+            }
 
-            self.logger.debug("Got transcription")
+            def perform(file: Any) -> list[TranscriptionSegment]:
+                started = time.monotonic()
+                if self.router is not None:
+                    segments, endpoint = self._route_transcription(
+                        request, file, chunk_path, audio_seconds, timeout
+                    )
+                else:
+                    segments = self._create_transcription(request, file, timeout)
+                    endpoint = "primary"
+                if self.tuner is not None and audio_seconds is not None:
+                    self._record_chunk(
+                        ChunkOutcome(
+                            audio_seconds=audio_seconds,
+                            timeout_seconds=timeout or float(self.config.timeout_sec),
+                            latency_seconds=time.monotonic() - started,
+                            endpoint=endpoint,
+                        )
+                    )
+                return segments
 
-            segments = transcription.segments
-            assert segments is not None
+            if self.cassette is None and self.router is None:
+                segments = perform(f)
+            else:
+                audio = f.read()
+                segments = (
+                    self.cassette.whisper_transcription(
+                        request, audio, lambda: perform(audio)
+                    )
+                    if self.cassette is not None
+                    else perform(audio)
+                )
 
             self.logger.debug(f"Got {len(segments)} segments")
 
             return segments
+
+    def _route_transcription(
+        self,
+        request: dict[str, Any],
+        audio: bytes,
+        chunk_path: str,
+        audio_seconds: float | None,
+        timeout: float | None,
+    ) -> tuple[list[TranscriptionSegment], str]:
+        """Transcribe a chunk through the router.
+
+        Latency is tracked per second of audio, so hedge deadlines scale with
+        the chunk's duration. A failed chunk is sent again (once more than
+        there are endpoints); a failed endpoint sits out a cooldown.
+        """
+        assert self.router is not None
+        if audio_seconds is None:
+            duration_ms = get_audio_duration_ms(chunk_path)
+            audio_seconds = max(duration_ms or 0, 1000) / 1000.0
+        args: dict[str, Any] = {
+            **request,
+            "file": (Path(chunk_path).name, audio),
+            "api_base": self.config.base_url,
+            "api_key": self.config.api_key,
+            "timeout": timeout if timeout is not None else self.config.timeout_sec,
+        }
+        attempts = len(self.router.endpoints) + 1
+        last_error: Exception | None = None
+        for attempt in range(1, attempts + 1):
+            started = time.monotonic()
+            try:
+                segments, endpoint_name = self.router.completion(
+                    args, size=audio_seconds
+                )
+            except Exception as e:  # pylint: disable=broad-except
+                last_error = e
+                self.logger.warning(
+                    "[WHISPER_API_CALL] Chunk %s failed (attempt %d/%d): %s",
+                    chunk_path,
+                    attempt,
+                    attempts,
+                    e,
+                )
+                continue
+            elapsed = time.monotonic() - started
+            self.logger.info(
+                "[WHISPER_API_CALL] Chunk %s (%.0fs of audio) transcribed by %s "
+                "in %.1fs (%.3fs per audio second)",
+                chunk_path,
+                audio_seconds,
+                endpoint_name,
+                elapsed,
+                elapsed / audio_seconds,
+            )
+            return list(segments), endpoint_name
+        assert last_error is not None
+        raise last_error
+
+    def _create_transcription(
+        self, request: dict[str, Any], file: Any, timeout: float | None = None
+    ) -> list[TranscriptionSegment]:
+        if timeout is not None:
+            request = {**request, "timeout": timeout}
+        transcription = self.openai_client.audio.transcriptions.create(
+            file=file, **request
+        )
+        self.logger.debug("Got transcription")
+        segments = transcription.segments
+        assert segments is not None
+        return segments
@@ -1,9 +1,15 @@
 import logging
+import tempfile
+from pathlib import Path
 from typing import Any
 
 from app.extensions import db
 from app.models import ModelCall, Post, TranscriptSegment
 from app.writer.client import writer_client
+from podcast_processor.audio import get_audio_duration_ms, remember_probes, trim_file
+from podcast_processor.audio_fingerprint import KNOWN_AD_PLACEHOLDER_TEXT
+from podcast_processor.traffic_cassette import get_cassette
+from podcast_processor.voice_activity import VoiceActivityTrimmer
 from shared.config import (
     Config,
     RemoteWhisperConfig,
@@ -12,6 +18,7 @@ from shared.config import (
 
 from .transcribe import (
     OpenAIWhisperTranscriber,
+    Segment,
     TestWhisperTranscriber,
     Transcriber,
 )
@@ -48,9 +55,24 @@ class TranscriptionManager:
         if isinstance(self.config.whisper, TestWhisperConfig):
             return TestWhisperTranscriber(self.logger)
         if isinstance(self.config.whisper, RemoteWhisperConfig):
-            return OpenAIWhisperTranscriber(self.logger, self.config.whisper)
+            return OpenAIWhisperTranscriber(
+                self.logger,
+                self.config.whisper,
+                cassette=get_cassette(self.config),
+                trimmer=self._create_trimmer(),
+                tempo=self.config.transcription_tempo,
+            )
         raise ValueError(f"unhandled whisper config {self.config.whisper}")
 
+    def _create_trimmer(self) -> VoiceActivityTrimmer | None:
+        if not self.config.enable_voice_activity_trimming:
+            return None
+        return VoiceActivityTrimmer(
+            min_silence_seconds=self.config.vad_min_silence_seconds,
+            padding_seconds=self.config.vad_padding_seconds,
+            threshold_db=self.config.vad_threshold_db,
+        )
+
     def _check_existing_transcription(
         self, post: Post
     ) -> list[TranscriptSegment] | None:
@@ -135,12 +157,19 @@ class TranscriptionManager:
             raise RuntimeError(f"ModelCall {model_call_id} not found after upsert")
         return model_call
 
-    def transcribe(self, post: Post) -> list[TranscriptSegment]:
+    def transcribe(
+        self,
+        post: Post,
+        skip_spans: list[tuple[float, float]] | None = None,
+    ) -> list[TranscriptSegment]:
         """
         Transcribes a podcast audio file, or retrieves existing transcription.
 
         Args:
             post: The Post object containing the podcast audio to transcribe
+            skip_spans: (start, end) seconds of audio already known to be ads.
+                They are not sent to the transcriber; each is stored as a
+                single placeholder segment instead.
 
         Returns:
             A list of TranscriptSegment objects with the transcription results
@@ -163,10 +192,20 @@ class TranscriptionManager:
             self.logger.info(
                 f"[TRANSCRIBE_START] Calling transcriber {self.transcriber.model_name} for post {post.id}, audio: {post.unprocessed_audio_path}"
             )
+            # Chunking probes the audio; reuse what is known about the file
+            remember_probes(post.audio_probes)
             # Expire session state before long-running transcription to avoid stale locks
             self.db_session.expire_all()
+            self.transcriber.take_chunk_report()
 
-            pydantic_segments = self.transcriber.transcribe(post.unprocessed_audio_path)
+            if skip_spans:
+                pydantic_segments = self._transcribe_around(
+                    post.unprocessed_audio_path, skip_spans
+                )
+            else:
+                pydantic_segments = self.transcriber.transcribe(
+                    post.unprocessed_audio_path
+                )
             self.logger.info(
                 f"[TRANSCRIBE_COMPLETE] Transcription by {self.transcriber.model_name} for post {post.id} resulted in {len(pydantic_segments)} segments."
             )
@@ -187,6 +226,7 @@ class TranscriptionManager:
                     "post_id": post.id,
                     "segments": segments_payload,
                     "model_call_id": current_whisper_call.id,
+                    "chunk_report": self.transcriber.take_chunk_report(),
                 },
                 wait=True,
             )
@@ -233,3 +273,64 @@ class TranscriptionManager:
                 )
 
             raise
+
+    def _transcribe_around(
+        self, audio_path: str, skip_spans: list[tuple[float, float]]
+    ) -> list[Segment]:
+        """Transcribe only the audio between ``skip_spans``.
+
+        Each kept stretch is cut out (stream copy) and transcribed on its own,
+        and its timestamps are shifted back onto the episode timeline.
+        """
+        duration_ms = get_audio_duration_ms(audio_path)
+        if duration_ms is None:
+            raise ValueError(f"Could not determine duration for audio: {audio_path}")
+
+        segments: list[Segment] = []
+        cursor_ms = 0
+        kept: list[tuple[int, int]] = []
+        for start, end in sorted(skip_spans):
+            start_ms = max(int(start * 1000), cursor_ms)
+            end_ms = min(int(end * 1000), duration_ms)
+            if end_ms <= start_ms:
+                continue
+            kept.append((cursor_ms, start_ms))
+            segments.append(
+                Segment(
+                    start=start_ms / 1000.0,
+                    end=end_ms / 1000.0,
+                    text=KNOWN_AD_PLACEHOLDER_TEXT,
+                )
+            )
+            cursor_ms = end_ms
+        kept.append((cursor_ms, duration_ms))
+
+        suffix = Path(audio_path).suffix or ".mp3"
+        with tempfile.TemporaryDirectory(prefix="podly_known_ads_") as tmp_dir:
+            for idx, (start_ms, end_ms) in enumerate(kept):
+                # Stretches too short to hold speech are not worth a request.
+                if end_ms - start_ms < 1000:
+                    continue
+                part_path = Path(tmp_dir) / f"part_{idx}{suffix}"
+                trim_file(Path(audio_path), part_path, start_ms, end_ms)
+                offset = start_ms / 1000.0
+                for seg in self.transcriber.transcribe(str(part_path)):
+                    segments.append(
+                        Segment(
+                            start=seg.start + offset,
+                            end=seg.end + offset,
+                            text=seg.text,
+                        )
+                    )
+
+        skipped = sum(
+            seg.end - seg.start
+            for seg in segments
+            if seg.text == KNOWN_AD_PLACEHOLDER_TEXT
+        )
+        self.logger.info(
+            "Skipped transcription of %.1fs of known ad audio in %s.",
+            skipped,
+            audio_path,
+        )
+        return sorted(segments, key=lambda seg: seg.start)
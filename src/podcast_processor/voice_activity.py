@@ -0,0 +1,281 @@
+"""Voice-activity trimming of audio before transcription.
+
+Intros, music stings and long silences are billed as Whisper minutes and
+invite hallucinated segments. Before an episode is split into chunks its
+audio is decoded to PCM and scored frame by frame by loudness against the
+episode's own noise floor. Non-speech stretches longer than
+``min_silence_seconds`` are compressed to ``padding_seconds`` on either side,
+and what remains is rendered (sample-accurately, with ``atrim``) into a
+shorter file. A ``SpeechMap`` records where each kept piece came from, so the
+timestamps Whisper returns for the shorter file map back onto the episode
+timeline exactly.
+
+Only loudness is measured: music beds as loud as the speech are kept.
+"""
+
+import bisect
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import ffmpeg
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 8000
+FRAME_MS = 20
+_FRAME_SAMPLES = SAMPLE_RATE * FRAME_MS // 1000
+# PCM is scored this many frames at a time, bounding memory on long episodes.
+_READ_BLOCK_FRAMES = 50_000
+# Percentiles of frame loudness taken as the noise floor and the speech level.
+_NOISE_FLOOR_PERCENTILE = 10
+_SPEECH_LEVEL_PERCENTILE = 90
+# Trimming that would remove less than this is not worth a re-encode.
+MIN_REMOVED_FRACTION = 0.02
+# The trimmed file is what Whisper hears; it resamples to 16 kHz mono anyway.
+_OUTPUT_SAMPLE_RATE = 16000
+_OUTPUT_BITRATE = "64k"
+
+
+@dataclass(frozen=True)
+class SpeechPiece:
+    """A stretch of kept audio, in milliseconds."""
+
+    trimmed_start_ms: int
+    original_start_ms: int
+    duration_ms: int
+
+
+class SpeechMap:
+    """Maps times in the trimmed audio back to the original audio."""
+
+    def __init__(self, kept_spans_ms: list[tuple[int, int]], original_ms: int):
+        self.original_ms = original_ms
+        self.pieces: list[SpeechPiece] = []
+        cursor_ms = 0
+        for start_ms, end_ms in kept_spans_ms:
+            self.pieces.append(SpeechPiece(cursor_ms, start_ms, end_ms - start_ms))
+            cursor_ms += end_ms - start_ms
+        self.kept_ms = cursor_ms
+        self._trimmed_starts = [
+            piece.trimmed_start_ms / 1000.0 for piece in self.pieces
+        ]
+
+    @property
+    def removed_fraction(self) -> float:
+        if self.original_ms <= 0:
+            return 0.0
+        return 1.0 - self.kept_ms / self.original_ms
+
+    def to_original(self, seconds: float, *, is_end: bool = False) -> float:
+        """The original time of ``seconds`` in the trimmed audio.
+
+        A time on the seam between two pieces belongs to the later piece, or
+        to the earlier one when it ends a segment.
+        """
+        if not self.pieces:
+            return seconds
+        if is_end:
+            idx = bisect.bisect_left(self._trimmed_starts, seconds) - 1
+        else:
+            idx = bisect.bisect_right(self._trimmed_starts, seconds) - 1
+        piece = self.pieces[max(idx, 0)]
+        return (
+            piece.original_start_ms + (seconds * 1000.0 - piece.trimmed_start_ms)
+        ) / 1000.0
+
+
+@dataclass(frozen=True)
+class TrimReport:
+    original_seconds: float
+    kept_seconds: float
+    # Wall time spent transcribing the trimmed audio
+    whisper_seconds: float
+
+    @property
+    def removed_fraction(self) -> float:
+        if self.original_seconds <= 0:
+            return 0.0
+        return 1.0 - self.kept_seconds / self.original_seconds
+
+    @property
+    def estimated_whisper_seconds_saved(self) -> float:
+        """Whisper time the removed audio would have taken at the observed rate."""
+        if self.kept_seconds <= 0:
+            return 0.0
+        removed = self.original_seconds - self.kept_seconds
+        return self.whisper_seconds / self.kept_seconds * removed
+
+    def summary(self) -> str:
+        return (
+            f"removed {self.removed_fraction:.1%} of the audio "
+            f"({self.original_seconds - self.kept_seconds:.1f}s of "
+            f"{self.original_seconds:.1f}s); Whisper took {self.whisper_seconds:.1f}s, "
+            f"about {self.estimated_whisper_seconds_saved:.1f}s less than untrimmed"
+        )
+
+
+def frame_loudness_db(path: str) -> np.ndarray:
+    """Loudness (dBFS) of each ``FRAME_MS`` frame of the decoded audio."""
+    process = (
+        ffmpeg.input(str(path))
+        .output("pipe:", format="s16le", acodec="pcm_s16le", ac=1, ar=SAMPLE_RATE)
+        .global_args("-nostats", "-loglevel", "error")
+        .run_async(pipe_stdout=True)
+    )
+    block_bytes = _READ_BLOCK_FRAMES * _FRAME_SAMPLES * 2
+    blocks: list[Any] = []
+    try:
+        while True:
+            data = process.stdout.read(block_bytes)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype=np.int16)
+            usable = len(samples) - len(samples) % _FRAME_SAMPLES
+            if usable == 0:
+                continue
+            frames = samples[:usable].astype(np.float32).reshape(-1, _FRAME_SAMPLES)
+            power = np.mean(np.square(frames / 32768.0), axis=1)
+            blocks.append(10.0 * np.log10(power + 1e-10))
+    finally:
+        process.stdout.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg could not decode {path} (exit {returncode})")
+    if not blocks:
+        return np.empty(0, dtype=np.float32)
+    return np.concatenate(blocks)
+
+
+def speech_spans(
+    loudness_db: np.ndarray,
+    *,
+    threshold_db: float,
+    min_silence_frames: int,
+    padding_frames: int,
+) -> list[tuple[int, int]]:
+    """Frame ranges to keep: everything but non-speech runs of at least
+    ``min_silence_frames``, which shrink to ``padding_frames`` each side."""
+    n_frames = len(loudness_db)
+    if n_frames == 0:
+        return []
+    noise_floor = float(np.percentile(loudness_db, _NOISE_FLOOR_PERCENTILE))
+    speech_level = float(np.percentile(loudness_db, _SPEECH_LEVEL_PERCENTILE))
+    if speech_level - noise_floor < threshold_db:
+        # Uniform loudness: all speech or all silence, nothing to tell apart.
+        return [(0, n_frames)]
+    threshold = min(noise_floor + threshold_db, (noise_floor + speech_level) / 2)
+
+    is_speech = np.concatenate(([True], loudness_db > threshold, [True]))
+    edges = np.flatnonzero(np.diff(is_speech.astype(np.int8)))
+    # Edges alternate: speech->silence (run start), silence->speech (run end).
+    kept: list[tuple[int, int]] = []
+    cursor = 0
+    for run_start, run_end in zip(edges[::2], edges[1::2], strict=True):
+        if run_end - run_start < min_silence_frames:
+            continue
+        cut_start = run_start if run_start == 0 else run_start + padding_frames
+        cut_end = run_end if run_end == n_frames else run_end - padding_frames
+        if cut_end <= cut_start:
+            continue
+        if cut_start > cursor:
+            kept.append((cursor, int(cut_start)))
+        cursor = int(cut_end)
+    if cursor < n_frames:
+        kept.append((cursor, n_frames))
+    return kept
+
+
+def write_trimmed_audio(
+    in_path: str, out_path: str, kept_spans_ms: list[tuple[int, int]]
+) -> None:
+    """Render ``kept_spans_ms`` of ``in_path`` back to back into ``out_path``."""
+    # Zero-based timestamps line up with the PCM the spans were measured on.
+    stream = ffmpeg.input(str(in_path)).audio.filter("asetpts", "PTS-STARTPTS")
+    branches = stream.filter_multi_output("asplit", len(kept_spans_ms))
+    parts = [
+        branches[i]
+        .filter("atrim", start=start_ms / 1000.0, end=end_ms / 1000.0)
+        .filter("asetpts", "PTS-STARTPTS")
+        for i, (start_ms, end_ms) in enumerate(kept_spans_ms)
+    ]
+    (
+        ffmpeg.concat(*parts, v=0, a=1)
+        .output(
+            str(out_path),
+            acodec="libmp3lame",
+            ac=1,
+            ar=_OUTPUT_SAMPLE_RATE,
+            audio_bitrate=_OUTPUT_BITRATE,
+        )
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+
+
+class VoiceActivityTrimmer:
+    def __init__(
+        self,
+        *,
+        min_silence_seconds: float,
+        padding_seconds: float,
+        threshold_db: float,
+    ):
+        self.min_silence_seconds = min_silence_seconds
+        self.padding_seconds = padding_seconds
+        self.threshold_db = threshold_db
+
+    def trim(self, in_path: str, out_path: str) -> SpeechMap | None:
+        """Write the speech of ``in_path`` to ``out_path``.
+
+        Returns the map back to the original timeline, or None when nothing
+        worth removing was found or the audio could not be analysed; the
+        original file should then be transcribed as it is.
+        """
+        try:
+            loudness = frame_loudness_db(in_path)
+        except (RuntimeError, OSError) as e:
+            logger.warning(f"Voice-activity analysis of {in_path} failed: {e}")
+            return None
+
+        frames = speech_spans(
+            loudness,
+            threshold_db=self.threshold_db,
+            min_silence_frames=round(self.min_silence_seconds * 1000 / FRAME_MS),
+            padding_frames=round(self.padding_seconds * 1000 / FRAME_MS),
+        )
+        speech_map = SpeechMap(
+            [(start * FRAME_MS, end * FRAME_MS) for start, end in frames],
+            len(loudness) * FRAME_MS,
+        )
+        if not speech_map.pieces or speech_map.removed_fraction < MIN_REMOVED_FRACTION:
+            logger.info(
+                f"Voice-activity trimming of {in_path} skipped: "
+                f"only {speech_map.removed_fraction:.1%} is non-speech"
+            )
+            return None
+
+        try:
+            write_trimmed_audio(
+                in_path,
+                out_path,
+                [
+                    (
+                        piece.original_start_ms,
+                        piece.original_start_ms + piece.duration_ms,
+                    )
+                    for piece in speech_map.pieces
+                ],
+            )
+        except ffmpeg.Error as e:
+            logger.warning(
+                f"Writing trimmed audio for {in_path} failed: "
+                f"{e.stderr.decode(errors='replace') if e.stderr else e}"
+            )
+            return None
+        logger.info(
+            f"Trimmed {in_path} to {len(speech_map.pieces)} speech pieces, "
+            f"{speech_map.kept_ms / 1000:.1f}s of {speech_map.original_ms / 1000:.1f}s"
+        )
+        return speech_map
@@ -0,0 +1,193 @@
+"""Adaptive Whisper chunk durations and per-chunk timeouts.
+
+Small chunks pay the per-request overhead many times; large ones risk
+timeouts whose retries re-upload a lot of audio. The tuner learns, per
+endpoint, how long a transcription takes as a fixed overhead plus a time per
+second of audio (a least-squares fit over recent chunks), and from that:
+
+- the chunk duration: as long as allowed while uploads succeed, halved after
+  each failure, but never so short that the overhead dominates;
+- the per-chunk timeout: a safety multiple of the slowest endpoint's expected
+  time for that chunk, instead of the fixed ``timeout_sec`` (which stays the
+  upper bound).
+
+Every chunk's size, timeout and outcome is kept in ``history`` and logged, so
+the choices can be reviewed. Tuners are process-wide per endpoint pool.
+"""
+
+import logging
+import statistics
+import threading
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Recent successful chunks per endpoint used for the throughput fit.
+_SAMPLE_WINDOW = 50
+_MIN_FIT_SAMPLES = 3
+# Fitted per-request overhead may be at most this fraction of a chunk's time.
+_MAX_OVERHEAD_FRACTION = 0.1
+_TIMEOUT_SAFETY_FACTOR = 3.0
+_TIMEOUT_SLACK_SECONDS = 15.0
+_MIN_TIMEOUT_SECONDS = 30.0
+_GROWTH_FACTOR = 1.25
+_SHRINK_FACTOR = 0.5
+_HISTORY_SIZE = 500
+
+
+@dataclass(frozen=True)
+class ChunkOutcome:
+    audio_seconds: float
+    timeout_seconds: float
+    # None for failed chunks
+    latency_seconds: float | None
+    endpoint: str | None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Throughput:
+    overhead_seconds: float
+    seconds_per_audio_second: float
+
+    def expected_seconds(self, audio_seconds: float) -> float:
+        return self.overhead_seconds + self.seconds_per_audio_second * audio_seconds
+
+
+def fit_throughput(samples: Sequence[tuple[float, float]]) -> Throughput | None:
+    """Fit ``latency = overhead + rate * audio_seconds`` to samples.
+
+    Without enough spread in chunk durations to separate the two, the whole
+    latency is taken as rate.
+    """
+    if len(samples) < _MIN_FIT_SAMPLES:
+        return None
+    durations = [d for d, _ in samples]
+    latencies = [t for _, t in samples]
+    mean_d = statistics.fmean(durations)
+    mean_t = statistics.fmean(latencies)
+    var_d = sum((d - mean_d) ** 2 for d in durations)
+    if var_d > 1e-6 * max(mean_d, 1.0) ** 2:
+        rate = sum((d - mean_d) * (t - mean_t) for d, t in samples) / var_d
+        overhead = mean_t - rate * mean_d
+        if rate > 0 and overhead >= 0:
+            return Throughput(overhead, rate)
+    return Throughput(0.0, statistics.median(t / d for d, t in samples if d > 0))
+
+
+class ChunkTuner:
+    """Chooses chunk durations and timeouts for one endpoint pool. Thread-safe."""
+
+    def __init__(
+        self,
+        *,
+        min_chunk_seconds: float,
+        max_chunk_seconds: float,
+        max_timeout_seconds: float,
+    ):
+        self.min_chunk_seconds = min_chunk_seconds
+        self.max_chunk_seconds = max(max_chunk_seconds, min_chunk_seconds)
+        self.max_timeout_seconds = max_timeout_seconds
+        # Fraction of max_chunk_seconds to aim for; shrinks on failures
+        self.scale = 1.0
+        self.history: deque[ChunkOutcome] = deque(maxlen=_HISTORY_SIZE)
+        self._samples: dict[str, deque[tuple[float, float]]] = {}
+        self._lock = threading.Lock()
+
+    def throughput(self, endpoint: str) -> Throughput | None:
+        with self._lock:
+            return fit_throughput(list(self._samples.get(endpoint, ())))
+
+    def _throughputs(self) -> list[Throughput]:
+        fits = [fit_throughput(list(s)) for s in self._samples.values()]
+        return [fit for fit in fits if fit is not None]
+
+    def chunk_seconds(self) -> float:
+        with self._lock:
+            lower = self.min_chunk_seconds
+            for fit in self._throughputs():
+                # Keep the overhead a small share of each request.
+                worthwhile = (
+                    fit.overhead_seconds
+                    * (1 - _MAX_OVERHEAD_FRACTION)
+                    / (_MAX_OVERHEAD_FRACTION * fit.seconds_per_audio_second)
+                )
+                lower = max(lower, min(worthwhile, self.max_chunk_seconds))
+            return max(lower, self.max_chunk_seconds * self.scale)
+
+    def timeout_for(self, audio_seconds: float) -> float:
+        """Timeout for a chunk: a multiple of the slowest endpoint's expected
+        time, or ``max_timeout_seconds`` until the endpoints are measured."""
+        with self._lock:
+            fits = self._throughputs()
+        if not fits:
+            return self.max_timeout_seconds
+        expected = max(fit.expected_seconds(audio_seconds) for fit in fits)
+        timeout = expected * _TIMEOUT_SAFETY_FACTOR + _TIMEOUT_SLACK_SECONDS
+        return min(self.max_timeout_seconds, max(_MIN_TIMEOUT_SECONDS, timeout))
+
+    def record(self, outcome: ChunkOutcome) -> None:
+        with self._lock:
+            self.history.append(outcome)
+            if outcome.ok:
+                self.scale = min(1.0, self.scale * _GROWTH_FACTOR)
+                if outcome.endpoint is not None and outcome.latency_seconds:
+                    self._samples.setdefault(
+                        outcome.endpoint, deque(maxlen=_SAMPLE_WINDOW)
+                    ).append((outcome.audio_seconds, outcome.latency_seconds))
+            else:
+                self.scale *= _SHRINK_FACTOR
+        logger.info(
+            "[WHISPER_TUNING] %.0fs chunk %s (timeout %.0fs, endpoint %s%s)",
+            outcome.audio_seconds,
+            "ok" if outcome.ok else "failed",
+            outcome.timeout_seconds,
+            outcome.endpoint or "?",
+            f", {outcome.latency_seconds:.1f}s"
+            if outcome.latency_seconds is not None
+            else f": {outcome.error}",
+        )
+
+
+_TUNERS: dict[tuple[Any, ...], ChunkTuner] = {}
+_TUNERS_LOCK = threading.Lock()
+
+
+def get_chunk_tuner(
+    pool: tuple[Any, ...],
+    *,
+    min_chunk_seconds: float,
+    max_chunk_seconds: float,
+    max_timeout_seconds: float,
+) -> ChunkTuner:
+    """The shared tuner for an endpoint pool; bounds changes apply in place."""
+    with _TUNERS_LOCK:
+        tuner = _TUNERS.get(pool)
+        if tuner is None:
+            tuner = ChunkTuner(
+                min_chunk_seconds=min_chunk_seconds,
+                max_chunk_seconds=max_chunk_seconds,
+                max_timeout_seconds=max_timeout_seconds,
+            )
+            _TUNERS[pool] = tuner
+        else:
+            tuner.min_chunk_seconds = min_chunk_seconds
+            tuner.max_chunk_seconds = max(max_chunk_seconds, min_chunk_seconds)
+            tuner.max_timeout_seconds = max_timeout_seconds
+        return tuner
+
+
+def reset_chunk_tuners() -> None:
+    """Forget all tuners and their statistics (used by tests)."""
+    with _TUNERS_LOCK:
+        _TUNERS.clear()
@@ -9,6 +9,7 @@ Pylint may flag these as R0801 (duplicate-code); we ignore that for this module.
 import json
 import logging
 import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, cast
@@ -17,11 +18,17 @@ import litellm
 from jinja2 import Template
 
 from podcast_processor.llm_model_call_utils import (
+    COPILOT_PROVIDER,
+    build_model_call_metrics,
+    elapsed_ms,
     extract_litellm_content,
     render_prompt_and_upsert_model_call,
     try_update_model_call,
 )
+from podcast_processor.segment_view import SegmentView
+from podcast_processor.traffic_cassette import Cassette, get_cassette
 from shared.config import Config
+from shared.llm_utils import llm_provider_for_model
 
 # Keep the same internal bounds as the existing BoundaryRefiner.
 MAX_START_EXTENSION_SECONDS = 30.0
@@ -47,6 +54,7 @@ class WordBoundaryRefiner:
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
         self.template = self._load_template()
+        self.cassette: Cassette | None = get_cassette(config)
 
     def _load_template(self) -> Template:
         path = (
@@ -72,6 +80,7 @@ Ad: {{ad_start}}s-{{ad_end}}s
         post_id: int | None = None,
         first_seq_num: int | None = None,
         last_seq_num: int | None = None,
+        queue_wait_ms: int | None = None,
     ) -> WordBoundaryRefinement:
         context = self._get_context(
             ad_start,
@@ -97,6 +106,16 @@ Ad: {{ad_start}}s-{{ad_end}}s
 
         raw_response: str | None = None
 
+        # Failed calls still record provider and queue wait.
+        call_metrics: dict[str, Any] = build_model_call_metrics(
+            provider=(
+                COPILOT_PROVIDER
+                if self.config.is_copilot_configured
+                else llm_provider_for_model(self.config.llm_model)
+            ),
+            latency_ms=None,
+            queue_wait_ms=queue_wait_ms,
+        )
         try:
             # Use Copilot SDK when both a PAT and a github_model are configured.
             is_copilot_model = self.config.is_copilot_configured
@@ -130,18 +149,46 @@ Ad: {{ad_start}}s-{{ad_end}}s
                     finally:
                         await session.destroy()
 
-                content = asyncio.run(_call_copilot())
+                call_started = time.perf_counter()
+                content = (
+                    self.cassette.copilot_chat(
+                        str(self.config.llm_github_model),
+                        prompt,
+                        lambda: asyncio.run(_call_copilot()),
+                    )
+                    if self.cassette is not None
+                    else asyncio.run(_call_copilot())
+                )
+                call_metrics = build_model_call_metrics(
+                    provider=COPILOT_PROVIDER,
+                    latency_ms=elapsed_ms(call_started),
+                    queue_wait_ms=queue_wait_ms,
+                )
                 raw_response = content
             else:
                 # Use litellm
-                response = litellm.completion(
-                    model=self.config.llm_model,
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.1,
-                    max_tokens=2048,
-                    timeout=self.config.openai_timeout,
-                    api_key=self.config.llm_api_key,
-                    base_url=self.config.openai_base_url,
+                call_started = time.perf_counter()
+                completion_args = {
+                    "model": self.config.llm_model,
+                    "messages": [{"role": "user", "content": prompt}],
+                    "temperature": 0.1,
+                    "max_tokens": 2048,
+                    "timeout": self.config.openai_timeout,
+                    "api_key": self.config.llm_api_key,
+                    "base_url": self.config.openai_base_url,
+                }
+                response = (
+                    self.cassette.litellm_completion(
+                        litellm.completion, completion_args
+                    )
+                    if self.cassette is not None
+                    else litellm.completion(**completion_args)
+                )
+                call_metrics = build_model_call_metrics(
+                    provider=llm_provider_for_model(self.config.llm_model),
+                    latency_ms=elapsed_ms(call_started),
+                    queue_wait_ms=queue_wait_ms,
+                    response=response,
                 )
 
                 content = extract_litellm_content(response)
@@ -151,6 +198,7 @@ Ad: {{ad_start}}s-{{ad_end}}s
                 status="received_response",
                 response=raw_response,
                 error_message=None,
+                metrics=call_metrics,
             )
 
             parsed = self._parse_json(content)
@@ -233,6 +281,7 @@ Ad: {{ad_start}}s-{{ad_end}}s
                 status="failed_permanent",
                 response=raw_response,
                 error_message=str(exc),
+                metrics=call_metrics,
             )
             self.logger.warning("Word boundary refine failed: %s", exc)
             return self._fallback(ad_start, ad_end)
@@ -410,30 +459,15 @@ Ad: {{ad_start}}s-{{ad_end}}s
         if first_seq_num is None or last_seq_num is None or not all_segments:
             return []
 
-        seq_values: list[int] = []
-        for segment in all_segments:
-            try:
-                seq_values.append(int(segment.get("sequence_num", -1)))
-            except Exception:
-                continue
-        if not seq_values:
+        view = SegmentView.coerce(all_segments)
+        first_idx = view.index_of_seq(first_seq_num)
+        last_idx = view.index_of_seq(last_seq_num)
+        if first_idx is None or last_idx is None:
             return []
 
-        min_seq = min(seq_values)
-        max_seq = max(seq_values)
-        start_seq = max(min_seq, int(first_seq_num) - 2)
-        end_seq = min(max_seq, int(last_seq_num) + 2)
-
-        selected: list[dict[str, Any]] = []
-        for segment in all_segments:
-            try:
-                seq = int(segment.get("sequence_num", -1))
-            except Exception:
-                continue
-            if start_seq <= seq <= end_seq:
-                selected.append(segment)
-
-        return selected
+        start_idx = max(0, min(first_idx, last_idx) - 2)
+        end_idx = min(len(view), max(first_idx, last_idx) + 3)
+        return view[start_idx:end_idx]
 
     def _context_by_time_overlap(
         self,
@@ -441,17 +475,15 @@ Ad: {{ad_start}}s-{{ad_end}}s
         ad_end: float,
         all_segments: list[dict[str, Any]],
     ) -> list[dict[str, Any]]:
-        ad_segs = [
-            s for s in all_segments if self._segment_overlaps(s, ad_start, ad_end)
-        ]
-        if not ad_segs:
+        view = SegmentView.coerce(all_segments)
+        span = view.overlapping(ad_start, ad_end)
+        if span is None:
             return []
 
-        first_idx = all_segments.index(ad_segs[0])
-        last_idx = all_segments.index(ad_segs[-1])
+        first_idx, last_idx = span
         start_idx = max(0, first_idx - 2)
-        end_idx = min(len(all_segments), last_idx + 3)
-        return all_segments[start_idx:end_idx]
+        end_idx = min(len(view), last_idx + 3)
+        return view[start_idx:end_idx]
 
     @staticmethod
     def _segment_overlaps(
@@ -656,15 +688,7 @@ Ad: {{ad_start}}s-{{ad_end}}s
     ) -> dict[str, Any] | None:
         if segment_seq is None:
             return None
-        try:
-            seq_int = int(segment_seq)
-        except Exception:
-            return None
-
-        for seg in all_segments:
-            if int(seg.get("sequence_num", -1)) == seq_int:
-                return seg
-        return None
+        return SegmentView.coerce(all_segments).get_by_seq(segment_seq)
 
     def _split_words(self, text: str) -> list[str]:
         # Word count/indexing heuristic: split on whitespace, then normalize away
@@ -715,6 +739,7 @@ Ad: {{ad_start}}s-{{ad_end}}s
         status: str,
         response: str | None,
         error_message: str | None,
+        metrics: dict[str, Any] | None = None,
     ) -> None:
         try_update_model_call(
             model_call_id,
@@ -723,4 +748,5 @@ Ad: {{ad_start}}s-{{ad_end}}s
             error_message=error_message,
             logger=self.logger,
             log_prefix="Word boundary refine",
+            metrics=metrics,
         )
@@ -41,6 +41,24 @@ class OutputConfig(BaseModel):
 
 WhisperConfigTypes = Literal["remote", "test"]
 
+BoundaryRefinementStrategy = Literal["llm", "cue", "hybrid"]
+BOUNDARY_REFINEMENT_STRATEGIES: tuple[str, ...] = ("llm", "cue", "hybrid")
+
+TrafficCassetteMode = Literal["record", "replay"]
+
+
+class LLMEndpointConfig(BaseModel):
+    """One OpenAI-compatible endpoint in the LLM (or Whisper) router pool."""
+
+    name: str
+    base_url: str | None = None
+    api_key: str | None = None
+    # Overrides llm_model (or the Whisper model) for calls routed here
+    model: str | None = None
+    max_requests_per_minute: int | None = Field(default=None, gt=0)
+    max_input_tokens_per_minute: int | None = Field(default=None, gt=0)
+    max_concurrent_calls: int | None = Field(default=None, gt=0)
+
 
 class TestWhisperConfig(BaseModel):
     whisper_type: Literal["test"] = "test"
@@ -54,6 +72,34 @@ class RemoteWhisperConfig(BaseModel):
     model: str = DEFAULTS.WHISPER_REMOTE_MODEL
     timeout_sec: int = DEFAULTS.WHISPER_REMOTE_TIMEOUT_SEC
     chunksize_mb: int = DEFAULTS.WHISPER_REMOTE_CHUNKSIZE_MB
+    # Whisper endpoints that chunks fail over (and are hedged) to; a missing
+    # api_key or model falls back to the primary's
+    secondary_endpoints: list[LLMEndpointConfig] = Field(default_factory=list)
+    hedge_percentile: float | None = Field(
+        default=DEFAULTS.WHISPER_REMOTE_HEDGE_PERCENTILE,
+        gt=0,
+        lt=100,
+        description="Send a chunk again once its upload runs longer than this percentile of the endpoint's recent seconds per audio second. None disables hedging.",
+    )
+    hedge_min_samples: int = Field(
+        default=DEFAULTS.WHISPER_REMOTE_HEDGE_MIN_SAMPLES,
+        ge=1,
+        description="Chunks an endpoint must have transcribed before its chunks are hedged",
+    )
+    adaptive_chunking: bool = Field(
+        default=DEFAULTS.WHISPER_REMOTE_ADAPTIVE_CHUNKING,
+        description="Pick chunk durations and per-chunk timeouts from observed throughput and failures; chunksize_mb and timeout_sec become upper bounds",
+    )
+    min_chunk_seconds: float = Field(
+        default=DEFAULTS.WHISPER_REMOTE_MIN_CHUNK_SECONDS,
+        gt=0,
+        description="Shortest chunk adaptive chunking uses; failed chunks are split in half down to this",
+    )
+    max_chunk_seconds: float = Field(
+        default=DEFAULTS.WHISPER_REMOTE_MAX_CHUNK_SECONDS,
+        gt=0,
+        description="Longest chunk adaptive chunking uses",
+    )
 
 
 class Config(BaseModel):
@@ -74,6 +120,69 @@ class Config(BaseModel):
         default=DEFAULTS.LLM_DEFAULT_MAX_RETRY_ATTEMPTS,
         description="Maximum retry attempts for failed LLM calls",
     )
+    llm_enable_streaming: bool = Field(
+        default=DEFAULTS.LLM_ENABLE_STREAMING,
+        description="Stream classification responses, stopping early on 'no ads' and requesting only the missing tail of truncated responses",
+    )
+    llm_enable_structured_output: bool = Field(
+        default=DEFAULTS.LLM_ENABLE_STRUCTURED_OUTPUT,
+        description="Request JSON-schema constrained classification output from providers that support it, falling back to free text",
+    )
+    llm_compact_prompts: bool = Field(
+        default=DEFAULTS.LLM_COMPACT_PROMPTS,
+        description="Merge short adjacent transcript segments into numbered prompt lines instead of one timestamped line per segment, to save input tokens",
+    )
+    llm_compact_min_line_words: int = Field(
+        default=DEFAULTS.LLM_COMPACT_MIN_LINE_WORDS,
+        ge=1,
+        description="With compact prompts, keep merging adjacent segments into a line until it has at least this many words",
+    )
+    llm_circuit_breaker_failure_threshold: int = Field(
+        default=DEFAULTS.LLM_CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        ge=0,
+        description="Consecutive retryable failures that open a provider's circuit and park jobs. 0 disables the breaker.",
+    )
+    llm_circuit_breaker_reset_seconds: float = Field(
+        default=DEFAULTS.LLM_CIRCUIT_BREAKER_RESET_SECONDS,
+        gt=0,
+        description="How long a provider's circuit first stays open before a probe call; doubles on each failed probe",
+    )
+    llm_circuit_breaker_max_open_seconds: float = Field(
+        default=DEFAULTS.LLM_CIRCUIT_BREAKER_MAX_OPEN_SECONDS,
+        gt=0,
+        description="Upper bound on how long a provider's circuit stays open, unless Retry-After asks for longer",
+    )
+    llm_endpoints: list[LLMEndpointConfig] = Field(
+        default_factory=list,
+        description="Pool of OpenAI-compatible endpoints/keys to route LLM calls over. Empty uses llm_api_key and openai_base_url.",
+    )
+    llm_hedge_percentile: float | None = Field(
+        default=DEFAULTS.LLM_HEDGE_PERCENTILE,
+        gt=0,
+        lt=100,
+        description="Duplicate a routed call on a second endpoint once it runs longer than this latency percentile of its endpoint. None disables hedging.",
+    )
+    llm_hedge_min_samples: int = Field(
+        default=DEFAULTS.LLM_HEDGE_MIN_SAMPLES,
+        ge=1,
+        description="Latency samples an endpoint needs before its calls are hedged",
+    )
+    llm_shared_limiter_path: str | None = Field(
+        default=DEFAULTS.LLM_SHARED_LIMITER_PATH,
+        description="SQLite file through which all processes using the same API key share token and concurrency budgets. Unset keeps per-process limits.",
+    )
+    traffic_cassette_path: str | None = Field(
+        default=DEFAULTS.TRAFFIC_CASSETTE_PATH,
+        description="Cassette file of recorded LLM, Whisper and Copilot traffic. Unset makes live calls without recording.",
+    )
+    traffic_cassette_mode: TrafficCassetteMode = Field(
+        default=DEFAULTS.TRAFFIC_CASSETTE_MODE,
+        description="'record' makes live calls and appends them to the cassette; 'replay' answers calls from it without network access",
+    )
+    traffic_cassette_replay_latency: bool = Field(
+        default=DEFAULTS.TRAFFIC_CASSETTE_REPLAY_LATENCY,
+        description="Wait for each replayed response as long as the recorded call took",
+    )
     llm_max_input_tokens_per_call: int | None = Field(
         default=DEFAULTS.LLM_MAX_INPUT_TOKENS_PER_CALL,
         description="Maximum input tokens per LLM call to stay under API limits",
@@ -95,6 +204,140 @@ class Config(BaseModel):
         default=DEFAULTS.ENABLE_WORD_LEVEL_BOUNDARY_REFINDER,
         description="Enable word-level (heuristic-timed) ad boundary refinement",
     )
+    boundary_refinement_strategy: BoundaryRefinementStrategy = Field(
+        default=DEFAULTS.BOUNDARY_REFINEMENT_STRATEGY,
+        description="How ad boundaries are refined: llm, cue (silence/cue snapping, no LLM) or hybrid. Feeds can override this.",
+    )
+    boundary_refinement_hybrid_min_confidence: float = Field(
+        default=DEFAULTS.BOUNDARY_REFINEMENT_HYBRID_MIN_CONFIDENCE,
+        ge=0.0,
+        le=1.0,
+        description="In hybrid mode, blocks whose cue-based confidence is below this are sent to the LLM refiner.",
+    )
+    enable_sponsor_index: bool = Field(
+        default=DEFAULTS.ENABLE_SPONSOR_INDEX,
+        description="Match transcripts against a per-feed index of previously confirmed sponsor reads before LLM classification",
+    )
+    sponsor_index_match_threshold: float = Field(
+        default=DEFAULTS.SPONSOR_INDEX_MATCH_THRESHOLD,
+        ge=0.0,
+        le=1.0,
+        description="Minimum share of a segment's word shingles found in one indexed sponsor read for it to be labelled an ad",
+    )
+    sponsor_index_min_ad_confidence: float = Field(
+        default=DEFAULTS.SPONSOR_INDEX_MIN_AD_CONFIDENCE,
+        ge=0.0,
+        le=1.0,
+        description="Only ad identifications at or above this confidence are added to the sponsor index",
+    )
+    sponsor_index_skip_coverage: float = Field(
+        default=DEFAULTS.SPONSOR_INDEX_SKIP_COVERAGE,
+        ge=0.0,
+        le=1.0,
+        description="Classification windows whose new segments are at least this share index matches skip the LLM call",
+    )
+    sponsor_index_max_entries_per_feed: int = Field(
+        default=DEFAULTS.SPONSOR_INDEX_MAX_ENTRIES_PER_FEED,
+        ge=1,
+        description="Least recently seen sponsor reads are evicted beyond this many per feed",
+    )
+    sponsor_index_max_age_days: int | None = Field(
+        default=DEFAULTS.SPONSOR_INDEX_MAX_AGE_DAYS,
+        description="Sponsor reads not seen for this many days are evicted. None keeps them indefinitely.",
+    )
+    enable_two_pass_classification: bool = Field(
+        default=DEFAULTS.ENABLE_TWO_PASS_CLASSIFICATION,
+        description="Run a downsampled coarse classification pass first and classify only its candidate regions at full resolution",
+    )
+    coarse_pass_segments_per_prompt: int = Field(
+        default=DEFAULTS.COARSE_PASS_SEGMENTS_PER_PROMPT,
+        ge=1,
+        description="Sampled transcript segments per coarse-pass prompt",
+    )
+    coarse_pass_segment_stride: int = Field(
+        default=DEFAULTS.COARSE_PASS_SEGMENT_STRIDE,
+        ge=1,
+        description="The coarse pass shows every Nth transcript segment",
+    )
+    coarse_pass_max_chars_per_segment: int | None = Field(
+        default=DEFAULTS.COARSE_PASS_MAX_CHARS_PER_SEGMENT,
+        ge=1,
+        description="Segment text in coarse-pass prompts is truncated to this many characters. None keeps full text.",
+    )
+    coarse_pass_padding_segments: int = Field(
+        default=DEFAULTS.COARSE_PASS_PADDING_SEGMENTS,
+        ge=0,
+        description="Segments added on each side of a coarse-pass candidate before the fine pass",
+    )
+    enable_local_classifier: bool = Field(
+        default=DEFAULTS.ENABLE_LOCAL_CLASSIFIER,
+        description="Train a per-feed local ad model from past identifications and use it to skip clean windows and as an LLM fallback",
+    )
+    local_classifier_min_training_episodes: int = Field(
+        default=DEFAULTS.LOCAL_CLASSIFIER_MIN_TRAINING_EPISODES,
+        ge=1,
+        description="A feed's local model is only used after training on this many episodes",
+    )
+    local_classifier_skip_threshold: float = Field(
+        default=DEFAULTS.LOCAL_CLASSIFIER_SKIP_THRESHOLD,
+        ge=0.0,
+        le=1.0,
+        description="Classification windows whose new segments all score below this skip the LLM call. 0 disables skipping.",
+    )
+    local_classifier_fallback_threshold: float = Field(
+        default=DEFAULTS.LOCAL_CLASSIFIER_FALLBACK_THRESHOLD,
+        ge=0.0,
+        le=1.0,
+        description="When an LLM call fails, segments the local model scores at or above this are labelled ads",
+    )
+    enable_audio_fingerprinting: bool = Field(
+        default=DEFAULTS.ENABLE_AUDIO_FINGERPRINTING,
+        description="Match episode audio against fingerprints of previously removed ads and skip transcribing and classifying known ads",
+    )
+    audio_fingerprint_min_span_seconds: float = Field(
+        default=DEFAULTS.AUDIO_FINGERPRINT_MIN_SPAN_SECONDS,
+        gt=0.0,
+        description="Shortest ad span that is fingerprinted, and shortest fingerprint match that is skipped",
+    )
+    audio_fingerprint_max_span_seconds: float = Field(
+        default=DEFAULTS.AUDIO_FINGERPRINT_MAX_SPAN_SECONDS,
+        gt=0.0,
+        description="Removed ad spans longer than this are not fingerprinted",
+    )
+    audio_fingerprint_max_entries: int = Field(
+        default=DEFAULTS.AUDIO_FINGERPRINT_MAX_ENTRIES,
+        ge=1,
+        description="Least recently matched ad fingerprints are evicted beyond this many",
+    )
+    enable_publisher_chapters: bool = Field(
+        default=DEFAULTS.ENABLE_PUBLISHER_CHAPTERS,
+        description="Label publisher sponsor chapters as ads, and skip LLM classification when the chapters cover the whole episode",
+    )
+    enable_voice_activity_trimming: bool = Field(
+        default=DEFAULTS.ENABLE_VOICE_ACTIVITY_TRIMMING,
+        description="Compress long non-speech stretches (silence, quiet music) out of the audio before it is sent to Whisper",
+    )
+    vad_min_silence_seconds: float = Field(
+        default=DEFAULTS.VAD_MIN_SILENCE_SECONDS,
+        gt=0.0,
+        description="Non-speech stretches shorter than this are kept as they are",
+    )
+    vad_padding_seconds: float = Field(
+        default=DEFAULTS.VAD_PADDING_SECONDS,
+        ge=0.0,
+        description="Audio kept on each side of a compressed non-speech stretch",
+    )
+    vad_threshold_db: float = Field(
+        default=DEFAULTS.VAD_THRESHOLD_DB,
+        gt=0.0,
+        description="How far above the episode's noise floor a frame must be to count as speech",
+    )
+    transcription_tempo: float = Field(
+        default=DEFAULTS.TRANSCRIPTION_TEMPO,
+        ge=1.0,
+        le=2.0,
+        description="Speed audio up by this factor (pitch unchanged) before it is sent to Whisper; timestamps are scaled back. 1.0 disables",
+    )
     developer_mode: bool = Field(
         default=False,
         description="Enable developer mode features like test feeds",
@@ -12,8 +12,59 @@ LLM_DEFAULT_MAX_RETRY_ATTEMPTS = 5
 LLM_ENABLE_TOKEN_RATE_LIMITING = False
 LLM_MAX_INPUT_TOKENS_PER_CALL: int | None = None
 LLM_MAX_INPUT_TOKENS_PER_MINUTE: int | None = None
+LLM_ENABLE_STREAMING = False
+LLM_ENABLE_STRUCTURED_OUTPUT = True
+LLM_COMPACT_PROMPTS = False
+LLM_COMPACT_MIN_LINE_WORDS = 12
+LLM_CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+LLM_CIRCUIT_BREAKER_RESET_SECONDS = 60.0
+LLM_CIRCUIT_BREAKER_MAX_OPEN_SECONDS = 1800.0
+LLM_HEDGE_PERCENTILE: float | None = None
+LLM_HEDGE_MIN_SAMPLES = 10
+LLM_SHARED_LIMITER_PATH: str | None = None
+# Record/replay of LLM and Whisper traffic (benchmarks, offline CI runs).
+TRAFFIC_CASSETTE_PATH: str | None = None
+TRAFFIC_CASSETTE_MODE = "replay"
+TRAFFIC_CASSETTE_REPLAY_LATENCY = False
 ENABLE_BOUNDARY_REFINEMENT = True
 ENABLE_WORD_LEVEL_BOUNDARY_REFINDER = False
+# "llm" (LLM refiner only), "cue" (silence/cue snapping only) or "hybrid"
+# (cue snapping first, LLM only for low-confidence blocks).
+BOUNDARY_REFINEMENT_STRATEGY = "llm"
+BOUNDARY_REFINEMENT_HYBRID_MIN_CONFIDENCE = 0.6
+# Per-feed index of recurring sponsor reads, matched before LLM classification.
+ENABLE_SPONSOR_INDEX = False
+SPONSOR_INDEX_MATCH_THRESHOLD = 0.8
+SPONSOR_INDEX_MIN_AD_CONFIDENCE = 0.8
+SPONSOR_INDEX_SKIP_COVERAGE = 0.8
+SPONSOR_INDEX_MAX_ENTRIES_PER_FEED = 200
+SPONSOR_INDEX_MAX_AGE_DAYS = 180
+# Coarse-to-fine classification: a downsampled first pass picks candidate
+# regions; only those are classified at full resolution.
+ENABLE_TWO_PASS_CLASSIFICATION = False
+COARSE_PASS_SEGMENTS_PER_PROMPT = 120
+COARSE_PASS_SEGMENT_STRIDE = 3
+COARSE_PASS_MAX_CHARS_PER_SEGMENT = 120
+COARSE_PASS_PADDING_SEGMENTS = 6
+# Per-feed local ad pre-screen model trained from past identifications.
+ENABLE_LOCAL_CLASSIFIER = False
+LOCAL_CLASSIFIER_MIN_TRAINING_EPISODES = 3
+LOCAL_CLASSIFIER_SKIP_THRESHOLD = 0.05
+LOCAL_CLASSIFIER_FALLBACK_THRESHOLD = 0.8
+# Global acoustic fingerprint index of dynamically inserted ads.
+ENABLE_AUDIO_FINGERPRINTING = False
+AUDIO_FINGERPRINT_MIN_SPAN_SECONDS = 10.0
+AUDIO_FINGERPRINT_MAX_SPAN_SECONDS = 180.0
+AUDIO_FINGERPRINT_MAX_ENTRIES = 500
+# Publisher chapters (podcast:chapters files, embedded CHAP tags) as ad markers.
+ENABLE_PUBLISHER_CHAPTERS = False
+# Voice-activity trimming of long non-speech stretches before transcription.
+ENABLE_VOICE_ACTIVITY_TRIMMING = False
+VAD_MIN_SILENCE_SECONDS = 2.0
+VAD_PADDING_SECONDS = 0.3
+VAD_THRESHOLD_DB = 12.0
+# Audio is sped up by this factor before upload; 1.0 uploads it as recorded.
+TRANSCRIPTION_TEMPO = 1.0
 
 # Whisper defaults
 WHISPER_DEFAULT_TYPE = "remote"
@@ -22,6 +73,11 @@ WHISPER_REMOTE_MODEL = "whisper-1"
 WHISPER_REMOTE_LANGUAGE = "en"
 WHISPER_REMOTE_TIMEOUT_SEC = 600
 WHISPER_REMOTE_CHUNKSIZE_MB = 24
+WHISPER_REMOTE_HEDGE_PERCENTILE: float | None = None
+WHISPER_REMOTE_HEDGE_MIN_SAMPLES = 5
+WHISPER_REMOTE_ADAPTIVE_CHUNKING = False
+WHISPER_REMOTE_MIN_CHUNK_SECONDS = 120.0
+WHISPER_REMOTE_MAX_CHUNK_SECONDS = 1800.0
 
 # Processing defaults
 PROCESSING_NUM_SEGMENTS_TO_INPUT_TO_PROMPT = 60
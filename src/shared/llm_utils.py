@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Final
+from typing import Any, Final
 
 # Patterns for models that require the `max_completion_tokens` parameter
 # instead of the legacy `max_tokens`. OpenAI began enforcing this on the
@@ -23,3 +23,131 @@ def model_uses_max_completion_tokens(model_name: str | None) -> bool:
         return False
     model_lower = model_name.lower()
     return any(pattern in model_lower for pattern in _MAX_COMPLETION_TOKEN_MODELS)
+
+
+# Providers that only reuse a cached prompt prefix when the request marks it
+# explicitly with a `cache_control` block (Anthropic-style APIs). OpenAI-style
+# providers cache automatically as long as the prefix is byte-identical.
+_CACHE_CONTROL_MODELS: Final[tuple[str, ...]] = (
+    "anthropic/",
+    "claude",
+)
+
+
+def model_supports_cache_control(model_name: str | None) -> bool:
+    """Return True when the target model honours explicit cache-control markers."""
+    if not model_name:
+        return False
+    model_lower = model_name.lower()
+    return any(pattern in model_lower for pattern in _CACHE_CONTROL_MODELS)
+
+
+def build_cacheable_messages(
+    system_prompt: str, user_prompt: str, model_name: str | None
+) -> list[dict[str, Any]]:
+    """Build chat messages with the static system prompt as a cacheable prefix.
+
+    The system prompt is always sent first and unmodified so OpenAI-style
+    automatic prefix caching can match it across calls. For Anthropic-style
+    models the system prompt is additionally wrapped in a content block that
+    carries an ephemeral `cache_control` marker.
+    """
+    system_content: str | list[dict[str, Any]] = system_prompt
+    if model_supports_cache_control(model_name):
+        system_content = [
+            {
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+    return [
+        {"role": "system", "content": system_content},
+        {"role": "user", "content": user_prompt},
+    ]
+
+
+def _usage_value(source: Any, key: str) -> Any:
+    if source is None:
+        return None
+    if isinstance(source, dict):
+        return source.get(key)
+    return getattr(source, key, None)
+
+
+def extract_cached_prompt_tokens(response: Any) -> int | None:
+    """Return the number of prompt tokens served from the provider cache.
+
+    Understands both the OpenAI shape (`usage.prompt_tokens_details.cached_tokens`)
+    and the Anthropic shape (`usage.cache_read_input_tokens`). Returns None when
+    the response carries no usage information at all.
+    """
+    usage = _usage_value(response, "usage")
+    if usage is None:
+        return None
+
+    details = _usage_value(usage, "prompt_tokens_details")
+    cached = _usage_value(details, "cached_tokens")
+    if not isinstance(cached, int) or isinstance(cached, bool):
+        cached = _usage_value(usage, "cache_read_input_tokens")
+    if isinstance(cached, int) and not isinstance(cached, bool):
+        return cached
+    return 0
+
+
+def extract_token_usage(response: Any) -> dict[str, int | None]:
+    """Return prompt, completion and cached prompt token counts of a response.
+
+    Counts the provider did not report are None.
+    """
+    usage = _usage_value(response, "usage")
+
+    def _count(key: str) -> int | None:
+        value = _usage_value(usage, key)
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        return None
+
+    return {
+        "prompt_tokens": _count("prompt_tokens"),
+        "completion_tokens": _count("completion_tokens"),
+        "cached_prompt_tokens": extract_cached_prompt_tokens(response),
+    }
+
+
+# Bare model names (without a `provider/` prefix) that litellm routes to a
+# well-known provider.
+_BARE_MODEL_PROVIDERS: Final[tuple[tuple[str, str], ...]] = (
+    ("claude", "anthropic"),
+    ("gpt-", "openai"),
+    ("chatgpt", "openai"),
+    ("o1", "openai"),
+    ("o3", "openai"),
+    ("o4", "openai"),
+    ("gemini", "gemini"),
+)
+
+
+def llm_provider_for_model(model_name: str | None) -> str:
+    """Best-effort provider name for a litellm model string, for accounting."""
+    if not model_name:
+        return "unknown"
+    if "/" in model_name:
+        return model_name.split("/", 1)[0].lower()
+    model_lower = model_name.lower()
+    for prefix, provider in _BARE_MODEL_PROVIDERS:
+        if model_lower.startswith(prefix):
+            return provider
+    return "unknown"
+
+
+def close_stream(stream: Any) -> None:
+    """Close a streamed completion, releasing its HTTP connection.
+
+    litellm's stream wrapper has no ``close`` of its own; the provider stream
+    it wraps (an ``openai.Stream`` or a generator) does.
+    """
+    for target in (stream, getattr(stream, "completion_stream", None)):
+        close = getattr(target, "close", None)
+        if callable(close):
+            close()
@@ -38,6 +38,24 @@ def get_job_unprocessed_path(post_guid: str, job_id: str, post_title: str) -> Pa
     return get_in_root() / "jobs" / post_guid / job_id / f"{sanitized_title}.mp3"
 
 
+def reprocess_archive_tag(cut_list_hash: str | None) -> str:
+    """Archive file name part recording the cut list the audio was rendered from."""
+    return f".cut-{cut_list_hash[:16]}" if cut_list_hash else ""
+
+
+def find_reprocess_archive(processed_path: Path, cut_list_hash: str) -> Path | None:
+    """Newest copy of ``processed_path`` archived when a reprocess started
+    (``<name>.reprocess-<timestamp>.cut-<hash>.bak``) that was rendered from
+    ``cut_list_hash``, if any."""
+    pattern = (
+        f"{processed_path.name}.reprocess-*{reprocess_archive_tag(cut_list_hash)}.bak"
+    )
+    archives = [path for path in processed_path.parent.glob(pattern) if path.is_file()]
+    if not archives:
+        return None
+    return max(archives, key=lambda path: path.stat().st_mtime)
+
+
 # ---- New centralized data-root helpers ----
 
 
@@ -13,10 +13,15 @@ from flask import Flask
 from app.extensions import db
 from app.models import ProcessingJob, TranscriptSegment
 from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.audio import reset_probe_cache
 from podcast_processor.audio_processor import AudioProcessor
+from podcast_processor.llm_circuit_breaker import reset_circuit_breakers
+from podcast_processor.llm_router import reset_llm_routers
 from podcast_processor.podcast_downloader import PodcastDownloader
 from podcast_processor.processing_status_manager import ProcessingStatusManager
+from podcast_processor.traffic_cassette import reset_cassettes
 from podcast_processor.transcription_manager import TranscriptionManager
+from podcast_processor.whisper_chunk_tuner import reset_chunk_tuners
 from shared.config import Config
 from shared.test_utils import create_standard_test_config
 
@@ -34,6 +39,24 @@ def app() -> Generator[Flask, None, None]:
         yield app
 
 
+@pytest.fixture(autouse=True)
+def _reset_llm_circuit_breakers() -> Generator[None, None, None]:
+    """Circuit breakers, routers, cassettes, chunk tuners and audio probes are
+    process-wide; keep failures, latency statistics, recordings and probes
+    from leaking between tests."""
+    reset_circuit_breakers()
+    reset_llm_routers()
+    reset_cassettes()
+    reset_chunk_tuners()
+    reset_probe_cache()
+    yield
+    reset_circuit_breakers()
+    reset_llm_routers()
+    reset_cassettes()
+    reset_chunk_tuners()
+    reset_probe_cache()
+
+
 @pytest.fixture
 def test_config() -> Config:
     return create_standard_test_config()
@@ -1,19 +1,27 @@
 from collections.abc import Generator
+from types import SimpleNamespace
+from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 from flask import Flask
 from jinja2 import Template
-from litellm.exceptions import InternalServerError
+from litellm.exceptions import (
+    BadRequestError,
+    ContextWindowExceededError,
+    InternalServerError,
+)
 from litellm.types.utils import Choices
 
 from app.extensions import db
-from app.models import ModelCall, Post, TranscriptSegment
+from app.models import Feed, Identification, ModelCall, Post, TranscriptSegment
 from podcast_processor.ad_classifier import AdClassifier
 from podcast_processor.model_output import (
     AdSegmentPrediction,
     AdSegmentPredictionList,
+    clean_and_parse_model_output,
 )
+from podcast_processor.prompt import COMPACT_SYSTEM_PROMPT_PATH, generate_system_prompt
 from shared.config import Config
 from shared.test_utils import create_standard_test_config
 
@@ -415,3 +423,637 @@ def test_build_chunk_payload_trims_for_token_limit(
     assert len(chunk_segments) >= consumed
     assert mock_validator.call_count == 2
     assert user_prompt
+
+
+def test_prepare_api_call_marks_system_prompt_cacheable_for_anthropic(
+    test_classifier_with_mocks: AdClassifier,
+) -> None:
+    classifier = test_classifier_with_mocks
+    classifier.rate_limiter = None
+    model_call = ModelCall(
+        post_id=1,
+        model_name="anthropic/claude-3-5-sonnet-20240620",
+        prompt="user prompt",
+        first_segment_sequence_num=0,
+        last_segment_sequence_num=0,
+    )
+
+    completion_args = classifier._prepare_api_call(model_call, "static system")
+
+    assert completion_args is not None
+    system_message, user_message = completion_args["messages"]
+    assert system_message["role"] == "system"
+    assert system_message["content"] == [
+        {
+            "type": "text",
+            "text": "static system",
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+    assert user_message == {"role": "user", "content": "user prompt"}
+
+
+def test_prepare_api_call_keeps_plain_prefix_for_openai(
+    test_classifier_with_mocks: AdClassifier,
+) -> None:
+    classifier = test_classifier_with_mocks
+    classifier.rate_limiter = None
+    model_call = ModelCall(
+        post_id=1,
+        model_name="gpt-4o-mini",
+        prompt="user prompt",
+        first_segment_sequence_num=0,
+        last_segment_sequence_num=0,
+    )
+
+    completion_args = classifier._prepare_api_call(model_call, "static system")
+
+    assert completion_args is not None
+    assert completion_args["messages"] == [
+        {"role": "system", "content": "static system"},
+        {"role": "user", "content": "user prompt"},
+    ]
+
+
+def test_call_model_records_cached_prompt_tokens(
+    test_config: Config, app: Flask
+) -> None:
+    with app.app_context():
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+
+        model_call = ModelCall(
+            post_id=0,
+            model_name=test_config.llm_model,
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="pending",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+
+        mock_message = MagicMock()
+        mock_message.content = "test response"
+        mock_choice = MagicMock(spec=Choices)
+        mock_choice.message = mock_message
+        mock_response = MagicMock()
+        mock_response.choices = [mock_choice]
+        mock_response.usage = {
+            "prompt_tokens": 2048,
+            "prompt_tokens_details": {"cached_tokens": 1536},
+        }
+
+        with patch("litellm.completion", return_value=mock_response):
+            classifier._call_model(
+                model_call_obj=model_call, system_prompt="test system prompt"
+            )
+
+        refreshed = db.session.get(ModelCall, model_call.id)
+        assert refreshed is not None
+        assert refreshed.cached_prompt_tokens == 1536
+
+
+def test_call_model_records_latency_and_token_usage(
+    test_config: Config, app: Flask
+) -> None:
+    with app.app_context():
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+
+        model_call = ModelCall(
+            post_id=0,
+            model_name="anthropic/claude-3-5-sonnet",
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="pending",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+
+        mock_message = MagicMock()
+        mock_message.content = "test response"
+        mock_choice = MagicMock(spec=Choices)
+        mock_choice.message = mock_message
+        mock_response = MagicMock()
+        mock_response.choices = [mock_choice]
+        mock_response.usage = {
+            "prompt_tokens": 900,
+            "completion_tokens": 40,
+            "cache_read_input_tokens": 600,
+        }
+
+        with patch("litellm.completion", return_value=mock_response):
+            classifier._call_model(
+                model_call_obj=model_call, system_prompt="test system prompt"
+            )
+
+        refreshed = db.session.get(ModelCall, model_call.id)
+        assert refreshed is not None
+        assert refreshed.provider == "anthropic"
+        assert refreshed.prompt_tokens == 900
+        assert refreshed.completion_tokens == 40
+        assert refreshed.cached_prompt_tokens == 600
+        assert refreshed.latency_ms is not None and refreshed.latency_ms >= 0
+        assert refreshed.queue_wait_ms is not None and refreshed.queue_wait_ms >= 0
+
+
+def test_two_pass_classifies_only_coarse_candidates(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = False
+    config.enable_two_pass_classification = True
+    config.coarse_pass_segments_per_prompt = 10
+    config.coarse_pass_segment_stride = 3
+    config.coarse_pass_max_chars_per_segment = 8
+    config.coarse_pass_padding_segments = 1
+    config.processing.num_segments_to_input_to_prompt = 10
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-two-pass",
+            download_url="http://example.com/1.mp3",
+            title="Episode",
+        )
+        db.session.add(post)
+        db.session.commit()
+        segments = [
+            TranscriptSegment(
+                post_id=post.id,
+                sequence_num=i,
+                start_time=float(i * 5),
+                end_time=float(i * 5 + 5),
+                text=f"Segment number {i} with some longer text",
+            )
+            for i in range(60)
+        ]
+        db.session.add_all(segments)
+        db.session.commit()
+
+        coarse_prompts: list[str] = []
+
+        def _fake_llm(*, model_call: ModelCall, system_prompt: str) -> None:
+            coarse_prompts.append(model_call.prompt)
+            # Second coarse window (segments 30-59) samples 30, 33, ...; flag 33.
+            ads = [AdSegmentPrediction(segment_offset=165.0, confidence=0.9)]
+            model_call.status = "success"
+            model_call.response = AdSegmentPredictionList(
+                ad_segments=ads if model_call.first_segment_sequence_num == 30 else []
+            ).model_dump_json()
+
+        classifier = AdClassifier(config=config)
+        classifier._perform_llm_call = _fake_llm  # type: ignore[method-assign]
+        process_chunk = MagicMock(return_value=[])
+        classifier._process_chunk = process_chunk  # type: ignore[method-assign]
+
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt="system",
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        assert len(coarse_prompts) == 2
+        assert "[15.0] Segment " in coarse_prompts[0]
+        assert "[20.0]" not in coarse_prompts[0]
+        assert process_chunk.call_count == 1
+        fine_chunk = process_chunk.call_args.kwargs["chunk_segments"]
+        assert [seg.sequence_num for seg in fine_chunk] == [32, 33, 34, 35, 36]
+
+
+def test_coarse_and_fine_calls_over_same_segments_are_kept_apart(
+    app: Flask,
+) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = False
+    config.enable_two_pass_classification = True
+    config.coarse_pass_segments_per_prompt = 10
+    config.coarse_pass_segment_stride = 1
+    config.coarse_pass_padding_segments = 10
+    config.processing.num_segments_to_input_to_prompt = 10
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-short-two-pass",
+            download_url="http://example.com/short.mp3",
+            title="Short episode",
+        )
+        db.session.add(post)
+        db.session.commit()
+        segments = [
+            TranscriptSegment(
+                post_id=post.id,
+                sequence_num=i,
+                start_time=float(i * 5),
+                end_time=float(i * 5 + 5),
+                text=f"Segment number {i}",
+            )
+            for i in range(10)
+        ]
+        db.session.add_all(segments)
+        db.session.commit()
+
+        calls: list[tuple[str, int, int]] = []
+
+        def _fake_llm(*, model_call: ModelCall, system_prompt: str) -> None:
+            calls.append(
+                (
+                    model_call.model_name,
+                    model_call.first_segment_sequence_num,
+                    model_call.last_segment_sequence_num,
+                )
+            )
+            model_call.status = "success"
+            model_call.response = AdSegmentPredictionList(
+                ad_segments=[AdSegmentPrediction(segment_offset=25.0, confidence=0.9)]
+            ).model_dump_json()
+
+        classifier = AdClassifier(config=config)
+        classifier._perform_llm_call = _fake_llm  # type: ignore[method-assign]
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt="system",
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        # Both passes span segments 0-9; the fine pass makes its own call
+        # instead of reusing the coarse response.
+        model = config.active_llm_model
+        assert calls == [(f"{model}#coarse", 0, 9), (model, 0, 9)]
+        coarse_call = ModelCall.query.filter_by(model_name=f"{model}#coarse").one()
+        args = classifier._prepare_api_call(coarse_call, "system")
+        assert args is not None
+        assert args["model"] == model
+
+
+def _stream_chunks(texts: list[str], finish_reason: str | None = None) -> Any:
+    for idx, text in enumerate(texts):
+        last = idx == len(texts) - 1
+        yield SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    delta=SimpleNamespace(content=text),
+                    finish_reason=finish_reason if last else None,
+                )
+            ],
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+            if last
+            else None,
+        )
+
+
+def _streaming_model_call(test_config: Config) -> ModelCall:
+    test_config.llm_enable_streaming = True
+    model_call = ModelCall(
+        post_id=0,
+        model_name=test_config.llm_model,
+        prompt="test prompt",
+        first_segment_sequence_num=0,
+        last_segment_sequence_num=0,
+        status="pending",
+    )
+    db.session.add(model_call)
+    db.session.commit()
+    return model_call
+
+
+def test_call_model_streaming_stops_on_no_ads(test_config: Config, app: Flask) -> None:
+    with app.app_context():
+        model_call = _streaming_model_call(test_config)
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+
+        closed: list[bool] = []
+
+        def stream() -> Any:
+            try:
+                yield from _stream_chunks(['{"ad_segments": ', "[]"])
+                raise AssertionError("stream consumed past the empty ad list")
+            finally:
+                closed.append(True)
+
+        with patch("litellm.completion", return_value=stream()) as completion:
+            response = classifier._call_model(
+                model_call_obj=model_call, system_prompt="system"
+            )
+
+        assert completion.call_args.kwargs["stream"] is True
+        # The abandoned stream is closed, not left for garbage collection.
+        assert closed == [True]
+        assert clean_and_parse_model_output(response).ad_segments == []
+        assert model_call.status == "success"
+
+
+def test_call_model_streaming_requests_only_missing_tail(
+    test_config: Config, app: Flask
+) -> None:
+    with app.app_context():
+        model_call = _streaming_model_call(test_config)
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+        truncated = _stream_chunks(
+            [
+                '{"ad_segments": [{"segment_offset": 10.0, "confidence": 0.9},',
+                ' {"segment_offset": 20.0, "conf',
+            ],
+            finish_reason="length",
+        )
+        tail_message = MagicMock()
+        tail_message.content = (
+            '{"ad_segments": [{"segment_offset": 10.0, "confidence": 0.9}, '
+            '{"segment_offset": 20.0, "confidence": 0.85}], '
+            '"content_type": "promotional_external", "confidence": 0.9}'
+        )
+        tail_response = SimpleNamespace(
+            choices=[SimpleNamespace(message=tail_message)],
+            usage=SimpleNamespace(prompt_tokens=130, completion_tokens=30),
+        )
+
+        with patch(
+            "litellm.completion", side_effect=[truncated, tail_response]
+        ) as completion:
+            response = classifier._call_model(
+                model_call_obj=model_call, system_prompt="system"
+            )
+
+        followup_messages = completion.call_args_list[1].kwargs["messages"]
+        assert followup_messages[-2]["role"] == "assistant"
+        assert "greater than 10.0" in followup_messages[-1]["content"]
+        parsed = clean_and_parse_model_output(response)
+        assert [p.segment_offset for p in parsed.ad_segments] == [10.0, 20.0]
+        assert parsed.content_type == "promotional_external"
+        assert (model_call.prompt_tokens, model_call.completion_tokens) == (230, 50)
+
+
+def _text_response(content: str) -> Any:
+    message = MagicMock()
+    message.content = content
+    choice = MagicMock(spec=Choices)
+    choice.message = message
+    return SimpleNamespace(choices=[choice], usage=None)
+
+
+def test_call_model_falls_back_when_structured_output_rejected(
+    test_config: Config, app: Flask
+) -> None:
+    test_config.llm_model = "test-provider/schema-model"
+    with app.app_context():
+        model_call = ModelCall(
+            post_id=0,
+            model_name=test_config.llm_model,
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="pending",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+        rejection = BadRequestError(
+            message="response_format json_schema is not supported",
+            model=test_config.llm_model,
+            llm_provider="test-provider",
+        )
+
+        with (
+            patch("litellm.supports_response_schema", return_value=True),
+            patch(
+                "litellm.completion",
+                side_effect=[rejection, _text_response('{"ad_segments": []}')],
+            ) as completion,
+        ):
+            classifier._call_model(model_call_obj=model_call, system_prompt="system")
+
+        first, second = completion.call_args_list
+        schema = first.kwargs["response_format"]["json_schema"]["schema"]
+        assert "ad_segments" in schema["properties"]
+        assert "response_format" not in second.kwargs
+        assert model_call.status == "success"
+        assert model_call.response_format == "text"
+
+        # Later calls for the same model skip straight to free text.
+        with patch("litellm.supports_response_schema", return_value=True):
+            args = classifier._prepare_api_call(model_call, "system")
+        assert args is not None
+        assert "response_format" not in args
+
+
+def test_call_model_keeps_structured_output_for_other_bad_requests(
+    test_config: Config, app: Flask
+) -> None:
+    test_config.llm_model = "test-provider/oversize-model"
+    test_config.llm_max_retry_attempts = 1
+    with app.app_context():
+        model_call = ModelCall(
+            post_id=0,
+            model_name=test_config.llm_model,
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="pending",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+        oversize = ContextWindowExceededError(
+            message="This model's maximum context length is 8192 tokens",
+            model=test_config.llm_model,
+            llm_provider="test-provider",
+        )
+
+        with (
+            patch("litellm.supports_response_schema", return_value=True),
+            patch("litellm.completion", side_effect=[oversize]) as completion,
+            pytest.raises(ContextWindowExceededError),
+        ):
+            classifier._call_model(model_call_obj=model_call, system_prompt="system")
+
+        assert completion.call_count == 1
+        with patch("litellm.supports_response_schema", return_value=True):
+            args = classifier._prepare_api_call(model_call, "system")
+        assert args is not None
+        assert "response_format" in args
+
+
+def test_process_successful_response_records_parse_outcome(
+    test_config: Config, app: Flask
+) -> None:
+    with app.app_context():
+        model_call = ModelCall(
+            post_id=0,
+            model_name=test_config.llm_model,
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="success",
+            response="no json here",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+        classifier = AdClassifier(config=test_config, db_session=db.session)
+
+        assert (
+            classifier._process_successful_response(
+                model_call=model_call, current_chunk_db_segments=[]
+            )
+            == []
+        )
+        db.session.expire_all()
+        refreshed = db.session.get(ModelCall, model_call.id)
+        assert refreshed is not None
+        assert refreshed.parse_failed is True
+
+
+def _compact_segments() -> list[TranscriptSegment]:
+    texts = [
+        "Welcome to the show, everyone out there.",
+        "This episode is brought to you by Acme.",
+        "Use code POD.",
+        "for ten percent off.",
+        "Now back to the interview with our guest.",
+    ]
+    return [
+        TranscriptSegment(
+            id=i + 1,
+            post_id=1,
+            sequence_num=i,
+            start_time=12.34 + i * 2.5,
+            end_time=14.84 + i * 2.5,
+            text=text,
+        )
+        for i, text in enumerate(texts)
+    ]
+
+
+def test_compact_prompt_maps_line_numbers_back_to_segments(
+    test_classifier_with_mocks: AdClassifier,
+) -> None:
+    classifier = test_classifier_with_mocks
+    classifier.config.llm_compact_prompts = True
+    classifier.config.llm_compact_min_line_words = 6
+    segments = _compact_segments()
+
+    prompt = classifier._generate_user_prompt(
+        current_chunk_db_segments=segments,
+        post=Post(title="Episode"),
+        user_prompt_template=Template("{{ transcript }}"),
+        includes_start=True,
+        includes_end=False,
+    )
+    assert "\n[2] *** Use code POD ***. for ten percent off.\n[3] " in prompt
+    assert "12.34" not in prompt
+
+    model_call = ModelCall(
+        post_id=1,
+        model_name=classifier.config.llm_model,
+        prompt=prompt,
+        first_segment_sequence_num=0,
+        last_segment_sequence_num=4,
+    )
+    prediction_list = AdSegmentPredictionList(
+        ad_segments=[
+            AdSegmentPrediction(segment_offset=1, confidence=0.9),
+            AdSegmentPrediction(segment_offset=2, confidence=0.9),
+            # Neither a line number nor a line of this excerpt
+            AdSegmentPrediction(segment_offset=2.5, confidence=0.9),
+            AdSegmentPrediction(segment_offset=9, confidence=0.9),
+        ]
+    )
+
+    _, matched_segments = classifier._create_identifications(
+        prediction_list=prediction_list,
+        current_chunk_db_segments=segments,
+        model_call=model_call,
+    )
+
+    assert [seg.sequence_num for seg in matched_segments] == [1, 2, 3]
+
+
+def test_compact_system_prompt_asks_for_line_numbers() -> None:
+    compact_prompt = generate_system_prompt(compact=True)
+    assert '"segment_offset": <line_number>' in compact_prompt
+    assert "<seconds.float>" not in compact_prompt
+    assert "[1] On this week's episode of Wildcard" in compact_prompt
+
+    with open(COMPACT_SYSTEM_PROMPT_PATH, encoding="utf-8") as f:
+        assert f.read().strip() == compact_prompt.strip()
+
+
+def test_compact_answers_are_mapped_to_merged_lines(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = False
+    config.llm_compact_prompts = True
+    config.llm_compact_min_line_words = 6
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-compact",
+            download_url="http://example.com/compact.mp3",
+            title="Compact episode",
+        )
+        db.session.add(post)
+        db.session.commit()
+        segments = _compact_segments()
+        for segment in segments:
+            segment.id = None
+            segment.post_id = post.id
+            segment.start_time += 100.0
+            segment.end_time += 100.0
+        db.session.add_all(segments)
+        db.session.commit()
+
+        system_prompt = generate_system_prompt(compact=True)
+        seen_prompts: list[str] = []
+
+        def _fake_llm(*, model_call: ModelCall, system_prompt: str) -> None:
+            seen_prompts.append(system_prompt)
+            model_call.status = "success"
+            # Line 2 merges "Use code POD." with "for ten percent off."
+            model_call.response = (
+                '{"ad_segments":[{"segment_offset":1,"confidence":0.9},'
+                '{"segment_offset":2,"confidence":0.9}],'
+                '"content_type":"promotional_external","confidence":0.9}'
+            )
+
+        classifier = AdClassifier(config=config)
+        classifier._perform_llm_call = _fake_llm  # type: ignore[method-assign]
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt=system_prompt,
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        assert seen_prompts == [system_prompt]
+        labelled = sorted(
+            identification.transcript_segment.sequence_num
+            for identification in Identification.query.filter_by(label="ad")
+        )
+        assert labelled == [1, 2, 3]
+
+
+def test_compact_prompt_reports_token_savings(
+    test_classifier_with_mocks: AdClassifier, caplog: pytest.LogCaptureFixture
+) -> None:
+    classifier = test_classifier_with_mocks
+    classifier.config.llm_compact_prompts = True
+    segments = _compact_segments() * 8
+
+    classifier._record_prompt_compaction(segments)
+    with caplog.at_level("INFO"):
+        classifier._log_prompt_compaction(Post(id=7, title="Episode"))
+
+    legacy, compact = classifier._compaction_tokens
+    assert 0 < compact < legacy * 0.85
+    assert f"Prompt compaction for post 7: transcript tokens {legacy} -> {compact}" in (
+        caplog.text
+    )
@@ -157,7 +157,8 @@ class TestAdClassifierRateLimiting:
             classifier._handle_retryable_error(
                 model_call_obj=model_call, error=error, attempt=0, current_attempt_num=1
             )
-            mock_sleep.assert_called_with(60)  # 60 * (2^0) = 60 seconds
+            # Jittered within the upper half of 60 * (2^0) = 60 seconds
+            assert 30 <= mock_sleep.call_args[0][0] <= 60
 
     def test_rate_limiter_model_specific_configs(self):
         """Test that different models get appropriate rate limits."""
@@ -0,0 +1,199 @@
+import logging
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from flask import Flask
+from jinja2 import Template
+
+from app.extensions import db
+from app.models import (
+    AudioFingerprint,
+    Feed,
+    Identification,
+    ModelCall,
+    Post,
+    TranscriptSegment,
+)
+from app.writer.actions import update_audio_fingerprints_action
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.audio import get_audio_duration_ms
+from podcast_processor.audio_fingerprint import (
+    AUDIO_FINGERPRINT_MODEL_NAME,
+    KNOWN_AD_PLACEHOLDER_TEXT,
+    AdFingerprinter,
+    FingerprintIndex,
+    fingerprint_file,
+    pack_landmarks,
+)
+from podcast_processor.transcribe import Segment, Transcriber
+from podcast_processor.transcription_manager import TranscriptionManager
+from shared.test_utils import create_standard_test_config
+
+AUDIO_PATH = str(Path(__file__).parent / "data" / "count_0_99.mp3")
+
+
+class PartTranscriber(Transcriber):
+    """Returns one segment per transcribed file, covering its whole length."""
+
+    def __init__(self) -> None:
+        self.durations: list[float] = []
+
+    @property
+    def model_name(self) -> str:
+        return "part_transcriber"
+
+    def transcribe(self, audio_path: str) -> list[Segment]:
+        duration_ms = get_audio_duration_ms(audio_path)
+        assert duration_ms is not None
+        duration = duration_ms / 1000.0
+        self.durations.append(duration)
+        return [Segment(start=0.0, end=duration, text=f"part {len(self.durations)}")]
+
+
+def _post(feed_title: str = "Feed") -> Post:
+    feed = Feed(title=feed_title, rss_url="http://example.com/rss")
+    post = Post(
+        feed=feed,
+        guid="guid-fingerprint",
+        download_url="http://example.com/1.mp3",
+        title="Episode",
+        unprocessed_audio_path=AUDIO_PATH,
+    )
+    db.session.add_all([feed, post])
+    db.session.commit()
+    return post
+
+
+def test_indexed_span_is_found_in_full_episode() -> None:
+    ad = fingerprint_file(AUDIO_PATH, start=20.3, duration=15.0)
+    index = FingerprintIndex([(7, pack_landmarks(ad), 15.0)])
+
+    matches = index.match(fingerprint_file(AUDIO_PATH), min_duration=5.0)
+
+    assert [m.fingerprint_id for m in matches] == [7]
+    assert matches[0].start == pytest.approx(20.3, abs=0.5)
+    assert matches[0].end == pytest.approx(35.3, abs=0.5)
+    # Audio outside the indexed span does not match.
+    assert (
+        index.match(fingerprint_file(AUDIO_PATH, duration=18.0), min_duration=5.0) == []
+    )
+
+
+def test_fingerprinter_indexes_new_spans_and_touches_known_ones(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_audio_fingerprinting = True
+
+    with app.app_context():
+        post = _post()
+        fingerprinter = AdFingerprinter(config, db_session=db.session)
+
+        fingerprinter.index_ad_spans(post, AUDIO_PATH, [(20_000, 35_000), (0, 3_000)])
+        entry = AudioFingerprint.query.one()
+        assert entry.duration_seconds == pytest.approx(15.0)
+        assert entry.source_post_id == post.id
+
+        fingerprinter.index_ad_spans(post, AUDIO_PATH, [(20_000, 35_000)])
+        db.session.expire_all()
+        assert AudioFingerprint.query.one().hit_count == 2
+
+        spans = fingerprinter.find_known_ads(post)
+        assert len(spans) == 1
+        assert spans[0][0] == pytest.approx(20.0, abs=0.5)
+        assert spans[0][1] == pytest.approx(35.0, abs=0.5)
+
+
+def test_update_audio_fingerprints_evicts_least_recently_matched(app: Flask) -> None:
+    with app.app_context():
+        old = AudioFingerprint(
+            duration_seconds=30.0,
+            landmarks=b"",
+            last_matched_at=datetime.utcnow() - timedelta(days=30),
+        )
+        recent = AudioFingerprint(duration_seconds=30.0, landmarks=b"")
+        db.session.add_all([old, recent])
+        db.session.commit()
+        old_id, recent_id = old.id, recent.id
+
+        result = update_audio_fingerprints_action(
+            {
+                "fingerprints": [{"duration_seconds": 12.0, "landmarks": b"\x00" * 8}],
+                "matched_fingerprint_ids": [old_id],
+                "max_entries": 2,
+            }
+        )
+        db.session.commit()
+
+        assert result == {"inserted": 1, "touched": 1, "evicted": 1}
+        remaining = {fp.id for fp in AudioFingerprint.query.all()}
+        assert old_id in remaining
+        assert recent_id not in remaining
+
+
+def test_transcribe_skips_known_ad_spans(app: Flask) -> None:
+    config = create_standard_test_config()
+    with app.app_context():
+        post = _post()
+        transcriber = PartTranscriber()
+        manager = TranscriptionManager(
+            logging.getLogger("test_logger"),
+            config,
+            db_session=db.session,
+            transcriber=transcriber,
+        )
+
+        segments = manager.transcribe(post, skip_spans=[(20.0, 35.0)])
+
+        assert [seg.text for seg in segments] == [
+            "part 1",
+            KNOWN_AD_PLACEHOLDER_TEXT,
+            "part 2",
+        ]
+        assert transcriber.durations[0] == pytest.approx(20.0, abs=0.1)
+        assert (segments[1].start_time, segments[1].end_time) == (20.0, 35.0)
+        assert segments[2].start_time == pytest.approx(35.0)
+        assert segments[2].end_time == pytest.approx(66.0, abs=0.2)
+
+
+def test_classifier_labels_placeholders_without_llm(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = False
+
+    with app.app_context():
+        post = _post()
+        texts = ["Welcome to the show.", KNOWN_AD_PLACEHOLDER_TEXT, "We are back."]
+        segments = [
+            TranscriptSegment(
+                post_id=post.id,
+                sequence_num=i,
+                start_time=i * 10.0,
+                end_time=i * 10.0 + 10.0,
+                text=text,
+            )
+            for i, text in enumerate(texts)
+        ]
+        db.session.add_all(segments)
+        db.session.commit()
+
+        classifier = AdClassifier(config=config)
+        process_chunk = MagicMock(return_value=[])
+        classifier._process_chunk = process_chunk  # type: ignore[method-assign]
+
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt="system",
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        llm_chunk = process_chunk.call_args.kwargs["chunk_segments"]
+        assert [seg.sequence_num for seg in llm_chunk] == [0, 2]
+        labelled = (
+            db.session.query(TranscriptSegment.sequence_num, Identification.confidence)
+            .join(Identification)
+            .join(ModelCall)
+            .filter(ModelCall.model_name == AUDIO_FINGERPRINT_MODEL_NAME)
+            .all()
+        )
+        assert [tuple(row) for row in labelled] == [(1, 1.0)]
@@ -1,4 +1,5 @@
 import logging
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -6,7 +7,7 @@ from flask import Flask
 
 from app.extensions import db
 from app.models import Feed, Identification, Post, TranscriptSegment
-from podcast_processor.audio_processor import AudioProcessor
+from podcast_processor.audio_processor import AudioProcessor, cut_list_hash
 from shared.config import Config
 from shared.test_utils import create_standard_test_config
 
@@ -191,3 +192,68 @@ def test_process_audio(
             assert refreshed.duration == 30.0  # 30000ms / 1000 = 30s
             assert refreshed.processed_audio_path == output_path
             mock_clip.assert_called_once()
+
+
+def test_process_audio_restores_archive_when_cut_list_unchanged(
+    app: Flask,
+    test_config: Config,
+    test_logger: logging.Logger,
+    tmp_path: Path,
+) -> None:
+    """A reprocess with the same cut list reuses the archived output."""
+    output_path = tmp_path / "output.mp3"
+    merged = [(5000, 10000)]
+    test_config.output.min_ad_segment_length_seconds = 1
+    test_config.output.min_ad_segement_separation_seconds = 1
+    cut_hash = cut_list_hash(
+        merged, fade_ms=test_config.output.fade_ms, duration_ms=30000
+    )
+    archive = (
+        tmp_path / f"output.mp3.reprocess-20260101T000000Z.cut-{cut_hash[:16]}.bak"
+    )
+    archive.write_bytes(b"previous cut")
+    stale = tmp_path / "output.mp3.reprocess-20250101T000000Z.bak"
+    stale.write_bytes(b"untagged")
+
+    with app.app_context():
+        processor = AudioProcessor(
+            config=test_config, logger=test_logger, db_session=db.session
+        )
+        feed = Feed(title="Test Feed", rss_url="http://example.com/rss.xml")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            title="Test Post",
+            guid="test-restore-guid",
+            download_url="http://example.com/restore.mp3",
+            unprocessed_audio_path="path/to/audio.mp3",
+            cut_list_hash=cut_hash,
+        )
+        db.session.add(post)
+        db.session.commit()
+
+        with (
+            patch.object(processor, "get_ad_segments", return_value=[(5.0, 10.0)]),
+            patch(
+                "podcast_processor.audio_processor.get_audio_duration_ms",
+                return_value=30000,
+            ),
+            patch(
+                "podcast_processor.audio_processor.clip_segments_with_fade"
+            ) as mock_clip,
+        ):
+            processor.process_audio(post, str(output_path))
+
+            mock_clip.assert_not_called()
+            assert output_path.read_bytes() == b"previous cut"
+            assert not archive.exists()
+
+            # A different cut list is rendered again.
+            output_path.unlink()
+            with patch.object(processor, "get_ad_segments", return_value=[(5.0, 20.0)]):
+                processor.process_audio(post, str(output_path))
+            mock_clip.assert_called_once()
+            refreshed = db.session.get(Post, post.id)
+            assert refreshed is not None
+            assert refreshed.cut_list_hash != cut_hash
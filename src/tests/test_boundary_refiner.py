@@ -0,0 +1,380 @@
+import threading
+import time
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from app.extensions import db
+from app.models import Feed, Identification, ModelCall, Post, TranscriptSegment
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.boundary_refiner import BoundaryRefinement, BoundaryRefiner
+from podcast_processor.cue_boundary_refiner import (
+    CueBoundaryRefinement,
+    CueBoundaryRefiner,
+    compare_with_stored_refinements,
+    summarize_refinement_comparison,
+)
+from podcast_processor.segment_view import SegmentView
+from podcast_processor.word_boundary_refiner import WordBoundaryRefiner
+from shared.test_utils import create_standard_test_config
+
+
+def _segments(count: int, length: float = 5.0) -> list[dict[str, Any]]:
+    return [
+        {
+            "sequence_num": i,
+            "start_time": i * length,
+            "end_time": (i + 1) * length,
+            "text": f"Segment {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def _texts_to_segments(texts: list[str], length: float = 5.0) -> list[dict[str, Any]]:
+    segments = _segments(len(texts), length)
+    for seg, text in zip(segments, texts, strict=True):
+        seg["text"] = text
+    return segments
+
+
+def test_segment_view_lookups() -> None:
+    segments = _segments(10)
+    view = SegmentView(reversed(segments))
+
+    assert [seg["sequence_num"] for seg in view] == list(range(10))
+    assert view.starting_between(10.0, 20.0) == (2, 4)
+    assert view.starting_between(51.0, 60.0) is None
+    assert view.overlapping(12.0, 13.0) == (2, 2)
+    assert view.get_by_seq(7) == segments[7]
+    assert view.get_by_seq(99) is None
+    assert SegmentView.coerce(view) is view
+
+
+def test_boundary_refiner_context_uses_time_index() -> None:
+    refiner = BoundaryRefiner(create_standard_test_config())
+    segments = _segments(40)
+
+    context = refiner._get_context(100.0, 110.0, SegmentView(segments))
+
+    assert context == segments[12:31]
+    assert refiner._get_context(100.0, 110.0, segments) == context
+
+
+def test_word_boundary_refiner_context_by_seq_window() -> None:
+    refiner = WordBoundaryRefiner(create_standard_test_config())
+    segments = _segments(20)
+
+    context = refiner._get_context(
+        50.0, 60.0, SegmentView(segments), first_seq_num=10, last_seq_num=12
+    )
+
+    assert [seg["sequence_num"] for seg in context] == list(range(8, 15))
+
+
+def test_refine_boundaries_runs_blocks_concurrently(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.llm_max_concurrent_calls = 4
+    config.enable_boundary_refinement = True
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-1",
+            download_url="http://example.com/1.mp3",
+            title="Episode",
+        )
+        db.session.add(post)
+        db.session.commit()
+
+        segments = [
+            TranscriptSegment(
+                post_id=post.id,
+                sequence_num=i,
+                start_time=float(i * 10),
+                end_time=float(i * 10 + 10),
+                text=f"Segment {i}",
+            )
+            for i in range(40)
+        ]
+        db.session.add_all(segments)
+        model_call = ModelCall(
+            post_id=post.id,
+            model_name=config.llm_model,
+            prompt="prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=39,
+            status="success",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+
+        # Four separated two-segment ad blocks (20s each).
+        for block_start in (2, 12, 22, 32):
+            for seq in (block_start, block_start + 1):
+                db.session.add(
+                    Identification(
+                        transcript_segment_id=segments[seq].id,
+                        model_call_id=model_call.id,
+                        label="ad",
+                        confidence=0.9,
+                    )
+                )
+        db.session.commit()
+
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _refine(**kwargs: Any) -> BoundaryRefinement:
+            nonlocal active, peak
+            assert isinstance(kwargs["all_segments"], SegmentView)
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.2)
+            with lock:
+                active -= 1
+            return BoundaryRefinement(
+                kwargs["ad_start"], kwargs["ad_end"], "unchanged", "unchanged"
+            )
+
+        classifier = AdClassifier(config=config)
+        classifier.boundary_refiner = MagicMock()
+        classifier.boundary_refiner.refine.side_effect = _refine
+
+        started = time.monotonic()
+        classifier._refine_boundaries(segments, post)
+        elapsed = time.monotonic() - started
+
+        assert classifier.boundary_refiner.refine.call_count == 4
+        assert peak > 1
+        assert elapsed < 0.7
+        refreshed = db.session.get(Post, post.id)
+        assert refreshed is not None
+        assert [b["orig_start"] for b in refreshed.refined_ad_boundaries] == [
+            20.0,
+            120.0,
+            220.0,
+            320.0,
+        ]
+
+
+def test_cue_refiner_snaps_to_intro_cue_and_silence() -> None:
+    refiner = CueBoundaryRefiner(create_standard_test_config())
+    segments = _texts_to_segments(
+        [
+            "Welcome to the show.",
+            "This episode is brought to you by Acme.",
+            "Acme makes great widgets.",
+            "Widgets for everyone.",
+            "Go to acme.com and use code PODLY.",
+            "Now back to the show.",
+            "So anyway, as I was saying.",
+        ]
+    )
+
+    result = refiner.refine(
+        ad_start=10.0,
+        ad_end=20.0,
+        confidence=0.9,
+        all_segments=segments,
+        silences=[(4.8, 5.2), (24.7, 25.3)],
+    )
+
+    assert isinstance(result, CueBoundaryRefinement)
+    assert result.refined_start == pytest.approx(5.0)
+    assert result.start_adjustment_reason == "intro_cue+silence"
+    assert result.refined_end == pytest.approx(25.0)
+    assert result.end_adjustment_reason == "outro_cue+return_cue+silence"
+    assert result.confidence == pytest.approx(1.0)
+
+
+def test_cue_refiner_without_signals_has_low_confidence() -> None:
+    refiner = CueBoundaryRefiner(create_standard_test_config())
+    segments = _texts_to_segments(["Plain talk."] * 10)
+
+    result = refiner.refine(
+        ad_start=15.0, ad_end=30.0, confidence=0.9, all_segments=segments
+    )
+
+    assert (result.refined_start, result.refined_end) == (15.0, 30.0)
+    assert result.confidence < 0.6
+
+
+def test_refinement_comparison_report() -> None:
+    refiner = CueBoundaryRefiner(create_standard_test_config())
+    segments = _texts_to_segments(["Plain talk."] * 10)
+    stored = [
+        {
+            "orig_start": 15.0,
+            "orig_end": 30.0,
+            "refined_start": 15.5,
+            "refined_end": 30.0,
+        },
+        {
+            "orig_start": 35.0,
+            "orig_end": 45.0,
+            "refined_start": 30.0,
+            "refined_end": 45.0,
+        },
+        {
+            "orig_start": 0.0,
+            "orig_end": 5.0,
+            "refined_start": 0.0,
+            "refined_end": 5.0,
+            "source": "cue",
+        },
+    ]
+
+    rows = compare_with_stored_refinements(refiner, segments, stored)
+    summary = summarize_refinement_comparison(rows, tolerance_seconds=1.0)
+
+    assert len(rows) == 2
+    assert rows[1]["start_delta"] == pytest.approx(5.0)
+    assert summary["blocks_compared"] == 2
+    assert summary["agreement_rate"] == pytest.approx(0.5)
+    assert summary["mean_abs_start_delta"] == pytest.approx(2.75)
+
+
+def test_hybrid_strategy_only_sends_low_confidence_blocks_to_llm(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = True
+    config.boundary_refinement_strategy = "hybrid"
+
+    with app.app_context():
+        classifier = AdClassifier(config=config)
+        classifier.boundary_refiner = MagicMock()
+        classifier.boundary_refiner.refine.return_value = BoundaryRefinement(
+            1.0, 2.0, "llm", "llm"
+        )
+        confident = CueBoundaryRefinement(10.0, 20.0, "cue", "cue", confidence=0.9)
+        unsure = CueBoundaryRefinement(30.0, 40.0, "cue", "cue", confidence=0.3)
+        classifier.cue_boundary_refiner = MagicMock()
+        classifier.cue_boundary_refiner.refine.side_effect = [confident, unsure]
+
+        blocks = [
+            {"start": 10.0, "end": 20.0, "confidence": 0.9, "identifications": []},
+            {"start": 30.0, "end": 40.0, "confidence": 0.9, "identifications": []},
+        ]
+        post = Post(id=1, title="Episode", feed=Feed(boundary_refinement_strategy=None))
+
+        refinements = classifier._refine_blocks(
+            blocks, SegmentView(_segments(10)), post
+        )
+
+        assert refinements[0] is confident
+        assert isinstance(refinements[1], BoundaryRefinement)
+        assert refinements[1].start_adjustment_reason == "llm"
+        assert classifier.boundary_refiner.refine.call_count == 1
+        assert classifier.boundary_refiner.refine.call_args.kwargs["ad_start"] == 30.0
+
+
+def test_feed_strategy_override_skips_llm(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = True
+
+    with app.app_context():
+        classifier = AdClassifier(config=config)
+        classifier.boundary_refiner = MagicMock()
+        post = Post(
+            id=1, title="Episode", feed=Feed(boundary_refinement_strategy="cue")
+        )
+        blocks = [
+            {"start": 10.0, "end": 20.0, "confidence": 0.9, "identifications": []}
+        ]
+
+        refinements = classifier._refine_blocks(
+            blocks, SegmentView(_segments(10)), post
+        )
+
+        assert isinstance(refinements[0], CueBoundaryRefinement)
+        classifier.boundary_refiner.refine.assert_not_called()
+
+
+def test_cue_strategy_keeps_episode_silences_on_post(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_boundary_refinement = True
+
+    with app.app_context():
+        feed = Feed(
+            title="Feed",
+            rss_url="https://example.com/feed.xml",
+            boundary_refinement_strategy="cue",
+        )
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="silences",
+            download_url="https://example.com/silences.mp3",
+            title="Episode",
+            unprocessed_audio_path="episode.mp3",
+        )
+        db.session.add(post)
+        db.session.commit()
+
+        classifier = AdClassifier(config=config)
+        blocks = [
+            {"start": 10.0, "end": 20.0, "confidence": 0.9, "identifications": []}
+        ]
+        with patch(
+            "podcast_processor.ad_classifier.episode_silences",
+            return_value=[(9.5, 10.2), (19.8, 20.4)],
+        ):
+            classifier._refine_blocks(blocks, SegmentView(_segments(10)), post)
+
+        refreshed = db.session.get(Post, post.id)
+        assert refreshed is not None
+        assert refreshed.audio_silences == [[9.5, 10.2], [19.8, 20.4]]
+
+
+def test_boundary_refiner_records_call_metrics(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.llm_model = "groq/llama-3.1-8b"
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-metrics",
+            download_url="http://example.com/1.mp3",
+            title="Episode",
+        )
+        db.session.add(post)
+        db.session.commit()
+
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[
+            0
+        ].message.content = '{"refined_start": 10.0, "refined_end": 20.0}'
+        response.usage = {"prompt_tokens": 321, "completion_tokens": 12}
+
+        refiner = BoundaryRefiner(config)
+        with patch("litellm.completion", return_value=response):
+            refiner.refine(
+                ad_start=10.0,
+                ad_end=20.0,
+                confidence=0.9,
+                all_segments=_segments(10),
+                post_id=post.id,
+                first_seq_num=2,
+                last_seq_num=3,
+                queue_wait_ms=25,
+            )
+
+        model_call = ModelCall.query.filter_by(post_id=post.id).one()
+        assert model_call.status == "success"
+        assert model_call.provider == "groq"
+        assert model_call.queue_wait_ms == 25
+        assert model_call.latency_ms is not None
+        assert model_call.prompt_tokens == 321
+        assert model_call.completion_tokens == 12
@@ -0,0 +1,299 @@
+import pytest
+from flask import Flask
+
+from app.config_store import _configure_remote_whisper, to_pydantic_config
+from shared import defaults as DEFAULTS
+from shared.config import RemoteWhisperConfig
+
+
+@pytest.fixture
+def writer_app(app: Flask) -> Flask:
+    """Settings rows are only created by the writer process."""
+    app.config["PODLY_APP_ROLE"] = "writer"
+    return app
+
+
+def test_env_only_settings_default_when_unset(writer_app: Flask) -> None:
+    cfg = to_pydantic_config()
+
+    assert cfg.enable_sponsor_index is DEFAULTS.ENABLE_SPONSOR_INDEX
+    assert cfg.sponsor_index_max_age_days == DEFAULTS.SPONSOR_INDEX_MAX_AGE_DAYS
+
+
+def test_sponsor_index_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ENABLE_SPONSOR_INDEX", "true")
+    monkeypatch.setenv("SPONSOR_INDEX_MATCH_THRESHOLD", "0.5")
+    monkeypatch.setenv("SPONSOR_INDEX_MAX_ENTRIES_PER_FEED", "50")
+    monkeypatch.setenv("SPONSOR_INDEX_MAX_AGE_DAYS", "none")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.enable_sponsor_index is True
+    assert cfg.sponsor_index_match_threshold == 0.5
+    assert cfg.sponsor_index_max_entries_per_feed == 50
+    assert cfg.sponsor_index_max_age_days is None
+
+
+def test_local_classifier_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ENABLE_LOCAL_CLASSIFIER", "1")
+    monkeypatch.setenv("LOCAL_CLASSIFIER_MIN_TRAINING_EPISODES", "5")
+    monkeypatch.setenv("LOCAL_CLASSIFIER_SKIP_THRESHOLD", "0")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.enable_local_classifier is True
+    assert cfg.local_classifier_min_training_episodes == 5
+    assert cfg.local_classifier_skip_threshold == 0.0
+    assert (
+        cfg.local_classifier_fallback_threshold
+        == DEFAULTS.LOCAL_CLASSIFIER_FALLBACK_THRESHOLD
+    )
+
+
+def test_llm_endpoints_and_hedging_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(
+        "LLM_ENDPOINTS",
+        '[{"name": "a", "base_url": "https://a.example/v1", "api_key": "ka"},'
+        ' {"name": "b", "base_url": "https://b.example/v1", "max_concurrent_calls": 2}]',
+    )
+    monkeypatch.setenv("LLM_HEDGE_PERCENTILE", "95")
+    monkeypatch.setenv("LLM_HEDGE_MIN_SAMPLES", "4")
+
+    cfg = to_pydantic_config()
+
+    assert [endpoint.name for endpoint in cfg.llm_endpoints] == ["a", "b"]
+    assert cfg.llm_endpoints[0].api_key == "ka"
+    assert cfg.llm_endpoints[1].max_concurrent_calls == 2
+    assert cfg.llm_hedge_percentile == 95.0
+    assert cfg.llm_hedge_min_samples == 4
+
+
+def test_circuit_breaker_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LLM_CIRCUIT_BREAKER_FAILURE_THRESHOLD", "0")
+    monkeypatch.setenv("LLM_CIRCUIT_BREAKER_RESET_SECONDS", "30")
+    monkeypatch.setenv("LLM_CIRCUIT_BREAKER_MAX_OPEN_SECONDS", "600")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.llm_circuit_breaker_failure_threshold == 0
+    assert cfg.llm_circuit_breaker_reset_seconds == 30.0
+    assert cfg.llm_circuit_breaker_max_open_seconds == 600.0
+
+
+def test_boundary_refinement_strategy_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("BOUNDARY_REFINEMENT_STRATEGY", "hybrid")
+    monkeypatch.setenv("BOUNDARY_REFINEMENT_HYBRID_MIN_CONFIDENCE", "0.75")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.boundary_refinement_strategy == "hybrid"
+    assert cfg.boundary_refinement_hybrid_min_confidence == 0.75
+
+    monkeypatch.setenv("BOUNDARY_REFINEMENT_STRATEGY", "magic")
+
+    with pytest.raises(ValueError, match="boundary_refinement_strategy"):
+        to_pydantic_config()
+
+
+def test_shared_limiter_path_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert to_pydantic_config().llm_shared_limiter_path is None
+
+    monkeypatch.setenv("LLM_SHARED_LIMITER_PATH", "/tmp/llm_limits.sqlite")
+
+    assert to_pydantic_config().llm_shared_limiter_path == "/tmp/llm_limits.sqlite"
+
+
+def test_traffic_cassette_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TRAFFIC_CASSETTE_PATH", "/tmp/cassette.json")
+    monkeypatch.setenv("TRAFFIC_CASSETTE_MODE", "record")
+    monkeypatch.setenv("TRAFFIC_CASSETTE_REPLAY_LATENCY", "true")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.traffic_cassette_path == "/tmp/cassette.json"
+    assert cfg.traffic_cassette_mode == "record"
+    assert cfg.traffic_cassette_replay_latency is True
+
+
+def test_voice_activity_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ENABLE_VOICE_ACTIVITY_TRIMMING", "on")
+    monkeypatch.setenv("VAD_MIN_SILENCE_SECONDS", "1.5")
+    monkeypatch.setenv("VAD_THRESHOLD_DB", "9")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.enable_voice_activity_trimming is True
+    assert cfg.vad_min_silence_seconds == 1.5
+    assert cfg.vad_padding_seconds == DEFAULTS.VAD_PADDING_SECONDS
+    assert cfg.vad_threshold_db == 9.0
+
+
+def test_transcription_tempo_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("TRANSCRIPTION_TEMPO", "1.25")
+
+    assert to_pydantic_config().transcription_tempo == 1.25
+
+    monkeypatch.setenv("TRANSCRIPTION_TEMPO", "3")
+
+    with pytest.raises(ValueError, match="transcription_tempo"):
+        to_pydantic_config()
+
+
+def test_whisper_failover_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(
+        "WHISPER_SECONDARY_ENDPOINTS",
+        '[{"name": "backup", "base_url": "https://backup.example/v1"}]',
+    )
+    monkeypatch.setenv("WHISPER_HEDGE_PERCENTILE", "90")
+    monkeypatch.setenv("WHISPER_HEDGE_MIN_SAMPLES", "3")
+
+    for whisper in (
+        to_pydantic_config().whisper,
+        # WHISPER_TYPE=remote rebuilds the remote config from the environment
+        _rebuilt_remote_whisper(),
+    ):
+        assert isinstance(whisper, RemoteWhisperConfig)
+        assert [e.base_url for e in whisper.secondary_endpoints] == [
+            "https://backup.example/v1"
+        ]
+        assert whisper.hedge_percentile == 90.0
+        assert whisper.hedge_min_samples == 3
+
+
+def test_adaptive_chunking_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("WHISPER_ADAPTIVE_CHUNKING", "true")
+    monkeypatch.setenv("WHISPER_MIN_CHUNK_SECONDS", "60")
+    monkeypatch.setenv("WHISPER_MAX_CHUNK_SECONDS", "900")
+
+    for whisper in (to_pydantic_config().whisper, _rebuilt_remote_whisper()):
+        assert isinstance(whisper, RemoteWhisperConfig)
+        assert whisper.adaptive_chunking is True
+        assert (whisper.min_chunk_seconds, whisper.max_chunk_seconds) == (60.0, 900.0)
+
+
+def _rebuilt_remote_whisper() -> RemoteWhisperConfig:
+    cfg = to_pydantic_config()
+    _configure_remote_whisper(cfg)
+    assert isinstance(cfg.whisper, RemoteWhisperConfig)
+    return cfg.whisper
+
+
+def test_audio_fingerprint_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ENABLE_AUDIO_FINGERPRINTING", "true")
+    monkeypatch.setenv("AUDIO_FINGERPRINT_MIN_SPAN_SECONDS", "15")
+    monkeypatch.setenv("AUDIO_FINGERPRINT_MAX_SPAN_SECONDS", "120")
+    monkeypatch.setenv("AUDIO_FINGERPRINT_MAX_ENTRIES", "50")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.enable_audio_fingerprinting is True
+    assert cfg.audio_fingerprint_min_span_seconds == 15.0
+    assert cfg.audio_fingerprint_max_span_seconds == 120.0
+    assert cfg.audio_fingerprint_max_entries == 50
+
+
+def test_two_pass_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ENABLE_TWO_PASS_CLASSIFICATION", "yes")
+    monkeypatch.setenv("COARSE_PASS_SEGMENTS_PER_PROMPT", "80")
+    monkeypatch.setenv("COARSE_PASS_SEGMENT_STRIDE", "4")
+    monkeypatch.setenv("COARSE_PASS_MAX_CHARS_PER_SEGMENT", "none")
+    monkeypatch.setenv("COARSE_PASS_PADDING_SEGMENTS", "0")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.enable_two_pass_classification is True
+    assert cfg.coarse_pass_segments_per_prompt == 80
+    assert cfg.coarse_pass_segment_stride == 4
+    assert cfg.coarse_pass_max_chars_per_segment is None
+    assert cfg.coarse_pass_padding_segments == 0
+
+
+def test_streaming_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert to_pydantic_config().llm_enable_streaming is False
+
+    monkeypatch.setenv("LLM_ENABLE_STREAMING", "true")
+
+    assert to_pydantic_config().llm_enable_streaming is True
+
+
+def test_structured_output_can_be_turned_off_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert to_pydantic_config().llm_enable_structured_output is True
+
+    monkeypatch.setenv("LLM_ENABLE_STRUCTURED_OUTPUT", "false")
+
+    assert to_pydantic_config().llm_enable_structured_output is False
+
+
+def test_compact_prompt_settings_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LLM_COMPACT_PROMPTS", "on")
+    monkeypatch.setenv("LLM_COMPACT_MIN_LINE_WORDS", "20")
+
+    cfg = to_pydantic_config()
+
+    assert cfg.llm_compact_prompts is True
+    assert cfg.llm_compact_min_line_words == 20
+
+    monkeypatch.setenv("LLM_COMPACT_MIN_LINE_WORDS", "0")
+
+    with pytest.raises(ValueError, match="llm_compact_min_line_words"):
+        to_pydantic_config()
+
+
+def test_publisher_chapters_read_from_env(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    assert to_pydantic_config().enable_publisher_chapters is False
+
+    monkeypatch.setenv("ENABLE_PUBLISHER_CHAPTERS", "1")
+
+    assert to_pydantic_config().enable_publisher_chapters is True
+
+
+def test_malformed_json_env_setting_names_the_variable(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("LLM_ENDPOINTS", "[{name: a}]")
+
+    with pytest.raises(ValueError, match="LLM_ENDPOINTS is not valid JSON"):
+        to_pydantic_config()
+
+
+def test_invalid_env_only_setting_is_rejected(
+    writer_app: Flask, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SPONSOR_INDEX_SKIP_COVERAGE", "1.5")
+
+    with pytest.raises(ValueError, match="sponsor_index_skip_coverage"):
+        to_pydantic_config()
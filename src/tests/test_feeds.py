@@ -41,6 +41,7 @@ class MockPost:
         feed_id=1,
         duration=None,
         image_url=None,
+        chapters_url=None,
         whitelisted=False,
     ):
         self.id = id
@@ -52,9 +53,12 @@ class MockPost:
         self.feed_id = feed_id
         self.duration = duration
         self.image_url = image_url
+        self.chapters_url = chapters_url
         self.whitelisted = whitelisted
         self._audio_len_bytes = 1024
         self.whitelisted = False
+        self.processed_audio_path = None
+        self.audio_probes = None
 
     def audio_len_bytes(self):
         return self._audio_len_bytes
@@ -436,6 +440,36 @@ def test_feed_item(mock_post, app):
     assert result.enclosure.length == mock_post._audio_len_bytes
 
 
+def test_feed_item_publishes_probed_duration(mock_post, app, tmp_path):
+    audio = tmp_path / "processed.mp3"
+    audio.write_bytes(b"\xff" * 2048)
+    stat = audio.stat()
+    mock_post.processed_audio_path = str(audio)
+    mock_post.audio_probes = {
+        str(audio): {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "duration_ms": 1_830_600,
+            "codec": "mp3",
+            "bit_rate": 64000,
+            "sample_rate": 44100,
+            "channels": 1,
+        }
+    }
+
+    with app.test_request_context(headers={"Host": "podly.com"}):
+        with mock.patch("ffmpeg.probe") as probe:
+            xml = feed_item(mock_post).to_xml()
+        probe.assert_not_called()
+
+    assert "<itunes:duration>1831</itunes:duration>" in xml
+
+    # Audio changed since it was probed: no stale duration.
+    audio.write_bytes(b"\xff" * 1024)
+    with app.test_request_context(headers={"Host": "podly.com"}):
+        assert "itunes:duration" not in feed_item(mock_post).to_xml()
+
+
 def test_feed_item_with_reverse_proxy(mock_post, app):
     # Test with HTTP/2 pseudo-headers (modern reverse proxy)
     headers_dict = {
@@ -1,7 +1,11 @@
 """
-Shared test utilities for rate limiting tests.
+Shared test utilities.
 """
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
 from shared.config import Config
@@ -29,3 +33,86 @@ def create_test_config(**overrides: Any) -> Config:
     }
     config_data.update(overrides)
     return Config(**config_data)
+
+
+class FakeWhisperServer:
+    """A local OpenAI-compatible transcription endpoint.
+
+    Each answer is one segment whose text is ``"<label> <request number>"``.
+    Requests wait for the next entry of ``delays`` (seconds), if any, and
+    are answered with errors while ``fail`` is set or when larger than
+    ``max_upload_bytes``.
+    """
+
+    def __init__(self, label: str = "request") -> None:
+        self.label = label
+        self.requests = 0
+        self.delays: list[float] = []
+        self.fail = False
+        self.max_upload_bytes: int | None = None
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                size = int(self.headers["Content-Length"])
+                self.rfile.read(size)
+                server.requests += 1
+                if server.fail:
+                    self._send(500, {"error": {"message": "unavailable"}})
+                    return
+                if (
+                    server.max_upload_bytes is not None
+                    and size > server.max_upload_bytes
+                ):
+                    self._send(413, {"error": {"message": "upload too large"}})
+                    return
+                if server.delays:
+                    time.sleep(server.delays.pop(0))
+                segment = {
+                    "id": 0,
+                    "seek": 0,
+                    "start": 0.0,
+                    "end": 2.5,
+                    "text": f"{server.label} {server.requests}",
+                    "tokens": [],
+                    "temperature": 0.0,
+                    "avg_logprob": -0.1,
+                    "compression_ratio": 1.0,
+                    "no_speech_prob": 0.0,
+                }
+                self._send(
+                    200,
+                    {
+                        "task": "transcribe",
+                        "language": "english",
+                        "duration": 2.5,
+                        "text": segment["text"],
+                        "segments": [segment],
+                    },
+                )
+
+            def _send(self, status: int, payload: dict[str, Any]) -> None:
+                data = json.dumps(payload).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -0,0 +1,247 @@
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+from litellm.exceptions import InternalServerError
+
+from app.extensions import db
+from app.models import Feed, ModelCall, Post, ProcessingJob
+from app.writer.actions import dequeue_job_action, park_job_action
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.audio_processor import AudioProcessor
+from podcast_processor.llm_circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    ProviderUnavailableError,
+    backoff_delay,
+    retry_after_seconds,
+)
+from podcast_processor.podcast_downloader import PodcastDownloader
+from podcast_processor.podcast_processor import PodcastProcessor, ProcessorException
+from podcast_processor.processing_status_manager import ProcessingStatusManager
+from podcast_processor.transcription_manager import TranscriptionManager
+from shared.test_utils import create_standard_test_config
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        "openai",
+        failure_threshold=2,
+        reset_timeout=10.0,
+        max_open_seconds=100.0,
+        clock=clock,
+    )
+
+
+def test_breaker_opens_probes_and_closes() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+
+    assert breaker.record_failure() is False
+    assert breaker.record_failure(retry_after=30.0) is True
+    assert breaker.state == OPEN
+    with pytest.raises(ProviderUnavailableError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_in == pytest.approx(30.0)
+
+    clock.now += 30.0
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    # Only one probe goes through while half-open.
+    with pytest.raises(ProviderUnavailableError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_for_longer() -> None:
+    clock = FakeClock()
+    breaker = _breaker(clock)
+    breaker.record_failure()
+    breaker.record_failure()
+    first_open = breaker.retry_in()
+    assert 5.0 <= first_open <= 10.0
+
+    clock.now += first_open
+    breaker.before_call()
+    assert breaker.record_failure() is True
+    assert 10.0 <= breaker.retry_in() <= 20.0
+
+
+def test_backoff_delay_is_jittered_and_honours_retry_after() -> None:
+    rng = random.Random(1)
+    delays = {backoff_delay(3, base=1.0, cap=60.0, rng=rng) for _ in range(20)}
+    assert all(4.0 <= delay <= 8.0 for delay in delays)
+    assert len(delays) > 1
+    assert backoff_delay(0, base=1.0, cap=60.0, retry_after=45.0) == 45.0
+    assert backoff_delay(10, base=1.0, cap=60.0) <= 60.0
+
+
+def test_retry_after_seconds_reads_seconds_and_http_dates() -> None:
+    seconds = Exception("rate limited")
+    seconds.response = SimpleNamespace(headers={"retry-after": "12"})  # type: ignore[attr-defined]
+    assert retry_after_seconds(seconds) == 12.0
+
+    at = (datetime.utcnow() + timedelta(seconds=90)).strftime(
+        "%a, %d %b %Y %H:%M:%S GMT"
+    )
+    dated = Exception("rate limited")
+    dated.litellm_response_headers = {"Retry-After": at}  # type: ignore[attr-defined]
+    assert retry_after_seconds(dated) == pytest.approx(90.0, abs=2.0)
+    assert retry_after_seconds(Exception("no headers")) is None
+
+
+def test_open_circuit_stops_retries_without_calling_provider(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.llm_max_retry_attempts = 5
+    config.llm_circuit_breaker_failure_threshold = 2
+
+    with app.app_context():
+        model_call = ModelCall(
+            post_id=0,
+            model_name=config.llm_model,
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="pending",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+        classifier = AdClassifier(config=config, db_session=db.session)
+        outage = InternalServerError(
+            message="503 Service Unavailable", model=config.llm_model, llm_provider="x"
+        )
+
+        with (
+            patch("litellm.completion", side_effect=outage) as completion,
+            patch("time.sleep"),
+        ):
+            with pytest.raises(ProviderUnavailableError):
+                classifier._call_model(model_call_obj=model_call, system_prompt="s")
+            assert completion.call_count == 2
+
+            # Other windows fail fast while the circuit is open.
+            with pytest.raises(ProviderUnavailableError):
+                classifier._call_model(model_call_obj=model_call, system_prompt="s")
+            assert completion.call_count == 2
+
+
+def test_probe_skipped_for_token_limit_is_released(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.llm_circuit_breaker_failure_threshold = 1
+    config.llm_circuit_breaker_reset_seconds = 0.0
+
+    with app.app_context():
+        model_call = ModelCall(
+            post_id=0,
+            model_name=config.llm_model,
+            prompt="test prompt",
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            status="pending",
+        )
+        db.session.add(model_call)
+        db.session.commit()
+        classifier = AdClassifier(config=config, db_session=db.session)
+        breaker = classifier._circuit_breaker(config.llm_model)
+        assert breaker is not None
+        breaker.record_failure()
+        assert breaker.state == HALF_OPEN
+
+        # The probe is admitted, then the call is skipped before reaching
+        # the provider.
+        with patch.object(classifier, "_prepare_api_call", return_value=None):
+            assert (
+                classifier._call_model(model_call_obj=model_call, system_prompt="s")
+                is None
+            )
+
+        assert breaker.before_call() is True
+
+
+def test_parked_job_is_not_dequeued_until_resume_time(app: Flask) -> None:
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        post = Post(
+            feed=feed, guid="guid-parked", download_url="http://e/1.mp3", title="Ep"
+        )
+        job = ProcessingJob(post_guid="guid-parked", status="running")
+        db.session.add_all([feed, post, job])
+        db.session.commit()
+
+        park_job_action(
+            {"job_id": job.id, "step_name": "Waiting", "delay_seconds": 60.0}
+        )
+        db.session.commit()
+        assert job.status == "pending"
+        assert dequeue_job_action({}) is None
+
+        job.resume_after = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        assert dequeue_job_action({}) == {"job_id": job.id, "post_guid": "guid-parked"}
+        assert job.resume_after is None
+
+
+def test_processor_parks_job_on_provider_outage(app: Flask) -> None:
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        post = Post(
+            feed=feed,
+            guid="guid-outage",
+            download_url="http://e/1.mp3",
+            title="Ep",
+            whitelisted=True,
+        )
+        job = ProcessingJob(post_guid="guid-outage", status="pending")
+        db.session.add_all([feed, post, job])
+        db.session.commit()
+
+        status_manager = MagicMock(spec=ProcessingStatusManager)
+        processor = PodcastProcessor(
+            config=create_standard_test_config(),
+            transcription_manager=MagicMock(spec=TranscriptionManager),
+            ad_classifier=MagicMock(spec=AdClassifier),
+            audio_processor=MagicMock(spec=AudioProcessor),
+            status_manager=status_manager,
+            db_session=db.session,
+            downloader=MagicMock(spec=PodcastDownloader),
+        )
+        with (
+            patch.object(
+                processor, "_check_existing_processed_audio", return_value=False
+            ),
+            patch.object(
+                processor, "_simulate_developer_processing", return_value=None
+            ),
+            patch.object(processor, "_handle_download_step"),
+            patch.object(
+                processor,
+                "_acquire_processing_lock",
+                side_effect=ProviderUnavailableError("openai", 120.0),
+            ),
+        ):
+            with pytest.raises(ProcessorException, match="parked"):
+                processor.process(post, job_id=job.id)
+
+        status_manager.park_job.assert_called_once()
+        assert status_manager.park_job.call_args.kwargs["delay_seconds"] == 120.0
+        # Parking is not a failure.
+        assert all(
+            call.args[1] != "failed"
+            for call in status_manager.update_job_status.call_args_list
+        )
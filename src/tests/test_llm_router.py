@@ -0,0 +1,223 @@
+import json
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import litellm
+import pytest
+from flask import Flask
+
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.llm_router import LLMRouter
+from shared.config import LLMEndpointConfig
+from shared.test_utils import create_standard_test_config
+
+MODEL = "openai/router-test-model"
+
+
+class FakeOpenAIServer:
+    """A local OpenAI-compatible chat completions server with a
+    configurable response delay (or error status)."""
+
+    def __init__(self, name: str, delay: float = 0.0):
+        self.name = name
+        self.delay = delay
+        self.status = 200
+        self.requests: list[dict[str, Any]] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests.append(body)
+                time.sleep(server.delay)
+                if server.status != 200:
+                    payload = {"error": {"message": "unavailable", "type": "server"}}
+                else:
+                    payload = {
+                        "id": "chatcmpl-test",
+                        "object": "chat.completion",
+                        "created": 0,
+                        "model": body["model"],
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {
+                                    "role": "assistant",
+                                    "content": f"from {server.name}",
+                                },
+                                "finish_reason": "stop",
+                            }
+                        ],
+                        "usage": {
+                            "prompt_tokens": 5,
+                            "completion_tokens": 2,
+                            "total_tokens": 7,
+                        },
+                    }
+                data = json.dumps(payload).encode()
+                try:
+                    self.send_response(server.status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/v1"
+
+    def endpoint(self, **limits: Any) -> LLMEndpointConfig:
+        return LLMEndpointConfig(
+            name=self.name, base_url=self.base_url, api_key="sk-test", **limits
+        )
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def servers() -> Generator[tuple[FakeOpenAIServer, FakeOpenAIServer], None, None]:
+    fast, slow = FakeOpenAIServer("fast"), FakeOpenAIServer("slow", delay=0.3)
+    # Keep litellm's one-off client setup out of the latency measurements.
+    litellm.completion(**_args(), api_base=fast.base_url, api_key="sk-test")
+    fast.requests.clear()
+    yield fast, slow
+    fast.close()
+    slow.close()
+
+
+def _args() -> dict[str, Any]:
+    return {
+        "model": MODEL,
+        "messages": [{"role": "user", "content": "hi"}],
+        "timeout": 10,
+        "max_retries": 0,
+    }
+
+
+def test_router_prefers_lowest_latency_endpoint(
+    servers: tuple[FakeOpenAIServer, FakeOpenAIServer],
+) -> None:
+    fast, slow = servers
+    router = LLMRouter([slow.endpoint(), fast.endpoint()])
+
+    # Both endpoints are sampled once, then the faster one is preferred.
+    served = [router.completion(_args())[1] for _ in range(5)]
+
+    assert sorted(served[:2]) == ["fast", "slow"]
+    assert served[2:] == ["fast", "fast", "fast"]
+    assert len(slow.requests) == 1
+
+
+def test_router_skips_endpoints_without_budget(
+    servers: tuple[FakeOpenAIServer, FakeOpenAIServer],
+) -> None:
+    fast, slow = servers
+    router = LLMRouter(
+        [fast.endpoint(max_requests_per_minute=2), slow.endpoint()],
+    )
+
+    served = [router.completion(_args())[1] for _ in range(4)]
+
+    assert served.count("fast") == 2
+    assert served[-1] == "slow"
+
+
+def test_router_hedges_slow_calls_and_fails_over(
+    servers: tuple[FakeOpenAIServer, FakeOpenAIServer],
+) -> None:
+    fast, slow = servers
+    slow.delay = 0.05
+    fast.delay = 0.2
+    router = LLMRouter(
+        [slow.endpoint(), fast.endpoint()], hedge_percentile=90.0, hedge_min_samples=2
+    )
+    for _ in range(4):
+        router.completion(_args())
+    assert router.completion(_args())[1] == "slow"
+
+    # The usual endpoint slows down: the call is hedged to the other one.
+    slow.delay = 2.0
+    started = time.monotonic()
+    response, served = router.completion(_args())
+    assert served == "fast"
+    assert response.choices[0].message.content == "from fast"
+    assert time.monotonic() - started < 1.5
+
+    # A failing endpoint is failed over at once and then cooled down.
+    slow.delay = 0.0
+    slow.status = 500
+    fast.delay = 0.0
+    assert router.completion(_args())[1] == "fast"
+    requests_before = len(slow.requests)
+    router.completion(_args())
+    assert len(slow.requests) == requests_before
+
+
+def test_hedge_deadline_scales_with_call_size() -> None:
+    delays = [0.05, 5.0, 0.0]
+    answers = iter(["first", "stalled", "hedge"])
+    lock = threading.Lock()
+
+    def completion(**_: Any) -> str:
+        with lock:
+            delay, answer = delays.pop(0), next(answers)
+        time.sleep(delay)
+        return answer
+
+    router = LLMRouter(
+        [LLMEndpointConfig(name="only")],
+        hedge_percentile=50.0,
+        hedge_min_samples=1,
+        hedge_same_endpoint=True,
+        completion=completion,
+    )
+    try:
+        assert router.completion({}, size=10.0) == ("first", "only")
+        assert router.endpoints[0].latencies[0] == pytest.approx(0.005, abs=0.004)
+
+        # The second call, twice the size, may take about 0.1s before the
+        # same endpoint is asked again.
+        started = time.monotonic()
+        assert router.completion({}, size=20.0) == ("hedge", "only")
+        assert 0.05 < time.monotonic() - started < 1.0
+    finally:
+        router.shutdown()
+
+
+def test_classifier_routes_calls_to_endpoint_pool(
+    app: Flask, servers: tuple[FakeOpenAIServer, FakeOpenAIServer]
+) -> None:
+    fast, slow = servers
+    config = create_standard_test_config()
+    config.llm_endpoints = [
+        LLMEndpointConfig(
+            name="fast",
+            base_url=fast.base_url,
+            api_key="sk-fast",
+            model="openai/pool-model",
+        )
+    ]
+    with app.app_context():
+        classifier = AdClassifier(config=config)
+        assert classifier.llm_router is not None
+
+        response = classifier._litellm_completion(_args())
+
+    assert response.choices[0].message.content == "from fast"
+    assert fast.requests[0]["model"] == "pool-model"
+    assert slow.requests == []
@@ -0,0 +1,204 @@
+from unittest.mock import MagicMock
+
+from flask import Flask
+from jinja2 import Template
+
+from app.extensions import db
+from app.models import (
+    Feed,
+    FeedAdClassifier,
+    Identification,
+    ModelCall,
+    Post,
+    TranscriptSegment,
+)
+from app.writer.actions import save_feed_ad_classifier_action
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.local_classifier import (
+    LOCAL_CLASSIFIER_MODEL_NAME,
+    LocalAdClassifier,
+    log_loss,
+)
+from shared.test_utils import create_standard_test_config
+
+AD_TEXTS = [
+    "This episode is brought to you by Acme Widgets.",
+    "Use code PODLY at checkout for twenty percent off.",
+    "Head to acme dot com slash podly today.",
+    "Our sponsor Acme ships every order free.",
+]
+SHOW_TEXTS = [
+    "Today we are talking about growing tomatoes on a balcony.",
+    "You need a big pot, good soil and plenty of sunshine.",
+    "Water them in the morning so the leaves dry out.",
+    "Next week we look at peppers and chillies.",
+]
+
+
+def _trained_model() -> LocalAdClassifier:
+    model = LocalAdClassifier()
+    texts = AD_TEXTS + SHOW_TEXTS
+    labels = [True] * len(AD_TEXTS) + [False] * len(SHOW_TEXTS)
+    for _ in range(3):
+        model.partial_fit(texts, labels)
+    return model
+
+
+def test_model_learns_feed_ads_and_round_trips() -> None:
+    model = _trained_model()
+    labels = [True] * len(AD_TEXTS) + [False] * len(SHOW_TEXTS)
+    untrained_loss = log_loss(
+        LocalAdClassifier().predict_proba(AD_TEXTS + SHOW_TEXTS), labels
+    )
+
+    scores = model.predict_proba(AD_TEXTS + SHOW_TEXTS)
+    assert min(scores[: len(AD_TEXTS)]) > max(scores[len(AD_TEXTS) :])
+    assert log_loss(scores, labels) < untrained_loss
+
+    restored = LocalAdClassifier.from_bytes(model.to_bytes())
+    assert restored.doc_count == model.doc_count
+    assert restored.predict_proba(AD_TEXTS) == model.predict_proba(AD_TEXTS)
+
+
+def test_save_feed_ad_classifier_upserts(app: Flask) -> None:
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+
+        first = save_feed_ad_classifier_action(
+            {"feed_id": feed.id, "model_blob": b"one", "episodes_trained": 1}
+        )
+        second = save_feed_ad_classifier_action(
+            {
+                "feed_id": feed.id,
+                "model_blob": b"two",
+                "episodes_trained": 2,
+                "segments_trained": 40,
+                "last_episode_loss": 0.25,
+            }
+        )
+        db.session.commit()
+
+        assert first == second
+        entry = FeedAdClassifier.query.one()
+        assert entry.model_blob == b"two"
+        assert (entry.episodes_trained, entry.segments_trained) == (2, 40)
+        assert entry.last_episode_loss == 0.25
+
+
+def _post_with_segments(texts: list[str]) -> tuple[Post, list[TranscriptSegment]]:
+    feed = Feed(title="Feed", rss_url="http://example.com/rss")
+    db.session.add(feed)
+    db.session.commit()
+    db.session.add(
+        FeedAdClassifier(
+            feed_id=feed.id,
+            model_blob=_trained_model().to_bytes(),
+            episodes_trained=3,
+        )
+    )
+    post = Post(
+        feed_id=feed.id,
+        guid="guid-local",
+        download_url="http://example.com/1.mp3",
+        title="Episode",
+    )
+    db.session.add(post)
+    db.session.commit()
+    segments = [
+        TranscriptSegment(
+            post_id=post.id,
+            sequence_num=i,
+            start_time=i * 5.0,
+            end_time=i * 5.0 + 5.0,
+            text=text,
+        )
+        for i, text in enumerate(texts)
+    ]
+    db.session.add_all(segments)
+    db.session.commit()
+    return post, segments
+
+
+def test_classifier_skips_windows_the_local_model_finds_clean(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_local_classifier = True
+    config.enable_boundary_refinement = False
+    config.local_classifier_skip_threshold = 0.3
+    config.processing.num_segments_to_input_to_prompt = 4
+
+    with app.app_context():
+        post, segments = _post_with_segments(SHOW_TEXTS + AD_TEXTS)
+        classifier = AdClassifier(config=config)
+        process_chunk = MagicMock(return_value=[])
+        classifier._process_chunk = process_chunk  # type: ignore[method-assign]
+
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt="system",
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        # Only the window holding the sponsor read reaches the LLM.
+        assert process_chunk.call_count == 1
+        llm_chunk = process_chunk.call_args.kwargs["chunk_segments"]
+        assert [seg.sequence_num for seg in llm_chunk][-4:] == [4, 5, 6, 7]
+        assert process_chunk.call_args.kwargs["local_scores"]
+
+
+def test_local_model_labels_chunk_when_llm_fails(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_local_classifier = True
+    config.local_classifier_fallback_threshold = 0.5
+
+    with app.app_context():
+        post, segments = _post_with_segments(SHOW_TEXTS[:2] + AD_TEXTS[:2])
+        classifier = AdClassifier(config=config)
+        scores = classifier._score_local_classifier(segments, post)
+
+        flagged = classifier._local_classifier_fallback(post, segments, scores)
+
+        assert [seg.sequence_num for seg in flagged] == [2, 3]
+        labelled = (
+            db.session.query(TranscriptSegment.sequence_num)
+            .join(Identification)
+            .join(ModelCall)
+            .filter(ModelCall.model_name == LOCAL_CLASSIFIER_MODEL_NAME)
+            .all()
+        )
+        assert sorted(seq for (seq,) in labelled) == [2, 3]
+
+
+def test_reprocessed_post_is_not_trained_on_again(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_local_classifier = True
+
+    with app.app_context():
+        post, segments = _post_with_segments(SHOW_TEXTS + AD_TEXTS)
+        db.session.add(
+            ModelCall(
+                post_id=post.id,
+                model_name=config.active_llm_model,
+                prompt="prompt",
+                first_segment_sequence_num=0,
+                last_segment_sequence_num=len(segments) - 1,
+                status="success",
+            )
+        )
+        db.session.commit()
+        classifier = AdClassifier(config=config)
+
+        classifier._update_local_classifier(post, segments)
+        entry = FeedAdClassifier.query.one()
+        db.session.refresh(entry)
+        trained_blob = entry.model_blob
+        assert entry.episodes_trained == 4
+        assert entry.trained_post_ids == [post.id]
+
+        classifier._update_local_classifier(post, segments)
+        db.session.refresh(entry)
+        assert entry.episodes_trained == 4
+        assert entry.segments_trained == len(segments)
+        assert entry.model_blob == trained_blob
@@ -0,0 +1,121 @@
+import subprocess
+from pathlib import Path
+
+import ffmpeg  # type: ignore[import-untyped]
+import numpy as np
+import pytest
+
+from podcast_processor.audio import clip_segments_with_fade, get_audio_duration_ms
+from podcast_processor.mp3_splice import Mp3SpliceError, Mp3Stream
+
+SAMPLE_MP3 = Path(__file__).parent / "data" / "count_0_99.mp3"
+
+
+def _decode(path: Path) -> tuple[np.ndarray, str]:
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", str(path), "-f", "f32le", "-ac", "1", "-"],
+        capture_output=True,
+        check=True,
+    )
+    return np.frombuffer(result.stdout, dtype=np.float32), result.stderr.decode()
+
+
+@pytest.fixture(scope="module")
+def stereo_mp3(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """30s of tone and noise, MPEG-1 stereo with a LAME tag."""
+    path = tmp_path_factory.mktemp("splice") / "stereo.mp3"
+    tone = ffmpeg.input("sine=frequency=440:sample_rate=44100:d=30", f="lavfi")
+    noise = ffmpeg.input(
+        "anoisesrc=color=pink:amplitude=0.2:sample_rate=44100:d=30", f="lavfi"
+    )
+    (
+        ffmpeg.filter([tone, noise], "amerge", inputs=2)
+        .output(str(path), acodec="libmp3lame", audio_bitrate="128k")
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return path
+
+
+@pytest.mark.parametrize("source", ["stereo", "sample"])
+def test_kept_audio_is_copied_unchanged(
+    tmp_path: Path, stereo_mp3: Path, source: str
+) -> None:
+    in_path = stereo_mp3 if source == "stereo" else SAMPLE_MP3
+    out_path = tmp_path / "out.mp3"
+    stream = Mp3Stream.read(str(in_path))
+    assert (stream.tag is not None) == (source == "stereo")
+
+    clip_segments_with_fade([(8_000, 14_000)], 2_000, str(in_path), str(out_path))
+
+    original, _ = _decode(in_path)
+    output, errors = _decode(out_path)
+    assert errors == ""
+    sr = stream.sample_rate
+    spf = stream.samples_per_frame
+    # Cuts snap to frame boundaries: audio before the fade-out at 8s and
+    # after the fade-in ending at 14s is copied as it was.
+    fade_out, fade_out_end = stream.frame_at(8_000), stream.frame_at(10_000)
+    fade_in, resume = stream.frame_at(12_000), stream.frame_at(14_000)
+    before = fade_out * spf - stream.start_skip
+    np.testing.assert_array_equal(output[: before - sr], original[: before - sr])
+    after = (fade_out_end + resume - fade_in) * spf - stream.start_skip
+    kept = resume * spf - stream.start_skip
+    np.testing.assert_array_equal(
+        output[after + sr : after + 5 * sr], original[kept + sr : kept + 5 * sr]
+    )
+
+    out_stream = Mp3Stream.read(str(out_path))
+    frame_ms = stream.samples_per_frame * 1000 / sr
+    assert abs(out_stream.duration_ms - (stream.duration_ms - 2_000)) <= 2 * frame_ms
+    if stream.tag is not None:
+        assert out_stream.tag is not None
+        xing = out_stream.tag.xing_offset
+        frames = int.from_bytes(out_stream.tag.frame[xing + 8 : xing + 12], "big")
+        assert frames == len(out_stream)
+        assert out_stream.tag.encoder_delay == stream.tag.encoder_delay
+
+
+def test_fades_are_reencoded_in_place(tmp_path: Path, stereo_mp3: Path) -> None:
+    out_path = tmp_path / "out.mp3"
+    stream = Mp3Stream.read(str(stereo_mp3))
+
+    clip_segments_with_fade([(8_000, 14_000)], 2_000, str(stereo_mp3), str(out_path))
+
+    original, _ = _decode(stereo_mp3)
+    output, _ = _decode(out_path)
+    sr = stream.sample_rate
+    cut = stream.frame_at(8_000) * stream.samples_per_frame - stream.start_skip
+    n = stream.frame_at(10_000) * stream.samples_per_frame - stream.start_skip - cut
+    expected = original[cut : cut + n] * np.linspace(1.0, 0.0, n)
+
+    def error(offset: int) -> float:
+        return float(
+            np.mean(np.abs(output[cut + offset : cut + offset + n] - expected))
+        )
+
+    # Lossy, but sample-aligned with the audio it replaces.
+    assert min(range(-4, 5), key=error) == 0
+    assert error(0) < 0.15 * float(np.mean(np.abs(expected)))
+    window = sr // 10
+    levels = [
+        float(np.sqrt(np.mean(output[i : i + window] ** 2)))
+        for i in range(cut, cut + n - window, window)
+    ]
+    assert levels[0] > 5 * levels[-1]
+
+
+def test_non_mp3_input_is_reencoded(tmp_path: Path) -> None:
+    wav = tmp_path / "episode.wav"
+    ffmpeg.input(str(SAMPLE_MP3)).output(str(wav)).run(
+        capture_stdout=True, capture_stderr=True
+    )
+    with pytest.raises(Mp3SpliceError):
+        Mp3Stream.read(str(wav))
+
+    out_path = tmp_path / "out.mp3"
+    clip_segments_with_fade([(3_000, 21_000)], 5_000, str(wav), str(out_path))
+
+    duration = get_audio_duration_ms(str(out_path))
+    assert duration is not None
+    assert abs(duration - (66_048 - 18_000 + 10_000)) <= 100
@@ -4,6 +4,7 @@ from pydantic import ValidationError
 from podcast_processor.model_output import (
     AdSegmentPrediction,
     AdSegmentPredictionList,
+    StreamingPredictionParser,
     clean_and_parse_model_output,
 )
 
@@ -90,3 +91,33 @@ def test_clean_parse_output_truncated_with_content_type() -> None:
         content_type="promotional_external",
         confidence=0.92,
     )
+
+
+def test_streaming_parser_yields_entries_as_they_complete() -> None:
+    output = (
+        'Here you go: {"note": "a \\"[{\\" b", "ad_segments": ['
+        '{"segment_offset": 10.5, "confidence": 0.92}, '
+        '{"segment_offset": 12.0, "confidence": 0.8}], '
+        '"content_type": "promotional_external", "confidence": 0.9}'
+    )
+    parser = StreamingPredictionParser()
+    completed_at = [idx for idx, char in enumerate(output) if parser.feed(char)]
+
+    assert [output[idx] for idx in completed_at] == ["}", "}"]
+    assert [p.segment_offset for p in parser.predictions] == [10.5, 12.0]
+    assert parser.ad_segments_closed and parser.finished
+    assert not parser.no_ads
+
+
+def test_streaming_parser_keeps_prefix_of_truncated_output() -> None:
+    parser = StreamingPredictionParser()
+    parser.feed('{"ad_segments": [{"segment_offset": 1.0, "confidence": 0.9}, {"seg')
+
+    assert parser.prediction_list() == AdSegmentPredictionList(
+        ad_segments=[AdSegmentPrediction(segment_offset=1.0, confidence=0.9)]
+    )
+    assert not parser.finished
+
+    empty = StreamingPredictionParser()
+    empty.feed('{"ad_segments": [ ]')
+    assert empty.no_ads
@@ -486,7 +486,7 @@ def test_clear_post_identifications_only_archives_processed_audio(
 
         mock_writer_client.action.assert_called_once_with(
             "clear_post_identifications_only",
-            {"post_id": post.id},
+            {"post_id": post.id, "reuse_llm_responses": False},
             wait=True,
         )
 
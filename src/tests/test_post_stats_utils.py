@@ -6,12 +6,15 @@ from types import SimpleNamespace
 from typing import Any
 
 from app.routes.post_stats_utils import (
+    accumulate_model_call_usage,
     count_model_calls,
     count_primary_labels,
     group_identifications_by_segment,
     is_mixed_segment,
     merge_time_windows,
     parse_refined_windows,
+    summarize_output_quality,
+    summarize_usage_totals,
 )
 
 # ---------------------------------------------------------------------------
@@ -299,3 +302,78 @@ def test_is_mixed_segment_multiple_windows_one_match() -> None:
     assert (
         is_mixed_segment(seg_start=0.0, seg_end=10.0, refined_windows=windows) is True
     )
+
+
+# ---------------------------------------------------------------------------
+# accumulate_model_call_usage / summarize_usage_totals
+# ---------------------------------------------------------------------------
+
+
+def _make_usage_call(provider: str | None, latency_ms: int | None, **kw: Any) -> Any:
+    return SimpleNamespace(
+        provider=provider,
+        latency_ms=latency_ms,
+        queue_wait_ms=kw.get("queue_wait_ms"),
+        prompt_tokens=kw.get("prompt_tokens"),
+        completion_tokens=kw.get("completion_tokens"),
+        cached_prompt_tokens=kw.get("cached_prompt_tokens"),
+    )
+
+
+def test_summarize_usage_totals_by_provider() -> None:
+    calls = [
+        _make_usage_call(
+            "openai", 1000, queue_wait_ms=50, prompt_tokens=100, completion_tokens=10
+        ),
+        _make_usage_call(
+            "openai",
+            3000,
+            queue_wait_ms=150,
+            prompt_tokens=300,
+            cached_prompt_tokens=200,
+        ),
+        _make_usage_call("anthropic", 500, prompt_tokens=50),
+        # Legacy rows without accounting still count as calls.
+        _make_usage_call(None, None),
+    ]
+
+    summary = summarize_usage_totals(accumulate_model_call_usage(calls))
+
+    assert summary["calls"] == 4
+    assert summary["avg_latency_ms"] == 1500.0
+    assert summary["max_latency_ms"] == 3000
+    assert summary["avg_queue_wait_ms"] == 100.0
+    assert summary["prompt_tokens"] == 450
+    assert summary["completion_tokens"] == 10
+    assert summary["cached_prompt_tokens"] == 200
+    assert summary["by_provider"]["openai"]["avg_latency_ms"] == 2000.0
+    assert summary["by_provider"]["anthropic"]["avg_queue_wait_ms"] is None
+    assert summary["by_provider"]["unknown"]["max_latency_ms"] is None
+
+
+def test_summarize_usage_totals_empty() -> None:
+    summary = summarize_usage_totals({})
+    assert summary["calls"] == 0
+    assert summary["avg_latency_ms"] is None
+    assert summary["by_provider"] == {}
+
+
+def test_summarize_output_quality_rates_per_model_and_format() -> None:
+    summary = summarize_output_quality(
+        [
+            ("openai/gpt-4o", "json_schema", 40, 40, 0, 2),
+            ("openai/gpt-4o", "text", 10, 8, 2, None),
+            ("groq/llama", "text", 0, 0, 0, 0),
+        ]
+    )
+
+    assert summary["openai/gpt-4o"]["json_schema"] == {
+        "calls": 40,
+        "parse_failures": 0,
+        "parse_failure_rate": 0.0,
+        "retried_calls": 2,
+        "retry_rate": 0.05,
+    }
+    assert summary["openai/gpt-4o"]["text"]["parse_failure_rate"] == 0.25
+    assert summary["openai/gpt-4o"]["text"]["retried_calls"] == 0
+    assert summary["groq/llama"]["text"]["retry_rate"] is None
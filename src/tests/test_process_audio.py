@@ -1,11 +1,29 @@
+import os
+import shutil
 import tempfile
 from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import ffmpeg  # type: ignore[import-untyped]
+import pytest
 
 from podcast_processor.audio import (
+    _clip_segments_complex,
+    _clip_segments_single_pass,
+    _fade_clip_pieces,
+    cached_probe,
     clip_segments_with_fade,
+    detect_silences,
+    episode_silences,
     get_audio_duration_ms,
+    probe_audio,
+    remember_probes,
+    reset_probe_cache,
     split_audio,
+    stored_probes,
 )
+from podcast_processor.mp3_splice import Mp3SpliceError
 
 TEST_FILE_DURATION = 66_048
 TEST_FILE_PATH = "src/tests/data/count_0_99.mp3"
@@ -15,6 +33,66 @@ def test_get_duration_ms() -> None:
     assert get_audio_duration_ms(TEST_FILE_PATH) == TEST_FILE_DURATION
 
 
+def test_probe_is_reused_until_the_file_changes(tmp_path: Path) -> None:
+    audio = tmp_path / "episode.mp3"
+    shutil.copy(TEST_FILE_PATH, audio)
+
+    with patch("ffmpeg.probe", wraps=ffmpeg.probe) as probe:
+        first = probe_audio(str(audio))
+        assert get_audio_duration_ms(str(audio)) == TEST_FILE_DURATION
+        assert probe.call_count == 1
+        assert first is not None
+        assert (first.codec, first.sample_rate, first.channels) == ("mp3", 24000, 1)
+
+        stat = audio.stat()
+        os.utime(audio, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert get_audio_duration_ms(str(audio)) == TEST_FILE_DURATION
+        assert probe.call_count == 2
+
+
+def test_probe_cache_drops_least_recently_used(tmp_path: Path) -> None:
+    paths = []
+    for name in ("a", "b", "c"):
+        audio = tmp_path / f"{name}.mp3"
+        shutil.copy(TEST_FILE_PATH, audio)
+        paths.append(str(audio))
+
+    reset_probe_cache()
+    with (
+        patch("podcast_processor.audio._PROBE_CACHE_MAX_ENTRIES", 2),
+        patch("ffmpeg.probe", wraps=ffmpeg.probe) as probe,
+    ):
+        probe_audio(paths[0])
+        probe_audio(paths[1])
+        probe_audio(paths[0])
+        probe_audio(paths[2])
+        assert probe.call_count == 3
+
+        probe_audio(paths[0])
+        assert probe.call_count == 3
+        probe_audio(paths[1])
+        assert probe.call_count == 4
+
+
+def test_stored_probes_seed_the_cache(tmp_path: Path) -> None:
+    audio = tmp_path / "episode.mp3"
+    shutil.copy(TEST_FILE_PATH, audio)
+    stored = stored_probes([str(audio), str(tmp_path / "missing.mp3"), None])
+    assert list(stored) == [str(audio)]
+    assert stored[str(audio)]["duration_ms"] == TEST_FILE_DURATION
+
+    reset_probe_cache()
+    with patch("ffmpeg.probe") as probe:
+        remember_probes(stored)
+        assert get_audio_duration_ms(str(audio)) == TEST_FILE_DURATION
+        probe.assert_not_called()
+
+    # A stored probe of an older version of the file is not trusted.
+    reset_probe_cache()
+    audio.write_bytes(audio.read_bytes()[:-1024])
+    assert cached_probe(str(audio), stored) is None
+
+
 def test_clip_segment_with_fade() -> None:
     fade_len_ms = 5_000
     ad_start_offset_ms, ad_end_offset_ms = 3_000, 21_000
@@ -31,7 +109,6 @@ def test_clip_segment_with_fade() -> None:
             TEST_FILE_DURATION
             - (ad_end_offset_ms - ad_start_offset_ms)
             + 2 * fade_len_ms
-            + 56  # not sure where this fudge comes from
         )
         actual_duration = get_audio_duration_ms(temp_file.name)
         assert actual_duration is not None, "Failed to get audio duration"
@@ -57,7 +134,6 @@ def test_clip_segment_with_fade_beginning() -> None:
             TEST_FILE_DURATION
             - (ad_end_offset_ms - ad_start_offset_ms)
             + 2 * fade_len_ms
-            + 56  # not sure where this fudge comes from
         )
         actual_duration = get_audio_duration_ms(temp_file.name)
         assert actual_duration is not None, "Failed to get audio duration"
@@ -86,7 +162,6 @@ def test_clip_segment_with_fade_end() -> None:
             TEST_FILE_DURATION
             - (ad_end_offset_ms - ad_start_offset_ms)
             + 2 * fade_len_ms
-            + 56  # not sure where this fudge comes from
         )
         actual_duration = get_audio_duration_ms(temp_file.name)
         assert actual_duration is not None, "Failed to get audio duration"
@@ -129,3 +204,108 @@ def test_split_audio() -> None:
             assert abs(filesize - split.stat().st_size) <= 500, (
                 f"filesize <> 500 bytes for {split}. found {split.stat().st_size}, expected {filesize}"
             )  # pylint: disable=line-too-long
+
+
+def test_detect_silences() -> None:
+    silences = detect_silences(TEST_FILE_PATH, noise_db=-30.0, min_silence_seconds=0.1)
+
+    assert silences
+    assert all(
+        0.0 <= start < end <= TEST_FILE_DURATION / 1000 for start, end in silences
+    )
+    assert silences == sorted(silences)
+
+
+def test_episode_silences_need_the_original_audio(tmp_path: Path) -> None:
+    assert episode_silences(TEST_FILE_PATH) == (detect_silences(TEST_FILE_PATH) or None)
+    assert episode_silences(str(tmp_path / "deleted.mp3")) is None
+    assert episode_silences(None) is None
+
+
+def test_faded_reencode_decodes_source_once() -> None:
+    captured: list[list[str]] = []
+
+    def capture(stream: Any, **_: Any) -> None:
+        captured.append(stream.compile())
+
+    with patch.object(ffmpeg.nodes.OutputStream, "run", capture):
+        _clip_segments_complex(
+            [(3_000, 21_000), (30_000, 40_000)],
+            2_000,
+            TEST_FILE_PATH,
+            "out.mp3",
+            TEST_FILE_DURATION,
+        )
+
+    (args,) = captured
+    assert args.count("-i") == 1
+    graph = args[args.index("-filter_complex") + 1]
+    assert "asplit=7" in graph
+    assert "concat=a=1:n=7:v=0" in graph
+
+
+@pytest.mark.parametrize(
+    "ad_segments_ms",
+    [
+        [(3_000, 21_000)],
+        [(0, 12_000), (30_000, 40_000)],
+        [(20_000, 30_000), (55_000, TEST_FILE_DURATION)],
+    ],
+)
+def test_single_pass_cut_matches_cut_list(
+    tmp_path: Path, ad_segments_ms: list[tuple[int, int]]
+) -> None:
+    # The concat list quotes the source path.
+    source = tmp_path / "it's an episode.mp3"
+    shutil.copy(TEST_FILE_PATH, source)
+    out_path = tmp_path / "out.mp3"
+    runs: list[list[str]] = []
+    run = ffmpeg.nodes.OutputStream.run
+
+    def record(stream: Any, **kwargs: Any) -> Any:
+        runs.append(stream.compile())
+        return run(stream, **kwargs)
+
+    with patch.object(ffmpeg.nodes.OutputStream, "run", record):
+        _clip_segments_single_pass(
+            ad_segments_ms, 2_000, str(source), str(out_path), TEST_FILE_DURATION
+        )
+
+    (args,) = runs
+    assert args[args.index("-i") + 1] == "pipe:0"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [source.name, "out.mp3"]
+    expected_ms = sum(
+        end - start
+        for start, end, _ in _fade_clip_pieces(
+            ad_segments_ms, 2_000, TEST_FILE_DURATION
+        )
+    )
+    # Decoded length, which unlike the probed duration is sample-exact.
+    pcm, _ = (
+        ffmpeg.input(str(out_path))
+        .output("pipe:", format="s16le", ac=1, ar=24_000)
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    assert abs(len(pcm) // 2 / 24 - expected_ms) <= 1
+
+
+def test_failed_single_pass_cut_falls_back_to_segment_files(tmp_path: Path) -> None:
+    out_path = tmp_path / "out.mp3"
+    failure = ffmpeg.Error("ffmpeg", b"", b"failed")
+
+    with (
+        patch(
+            "podcast_processor.audio.splice_mp3",
+            side_effect=Mp3SpliceError("no frame copy"),
+        ),
+        patch("podcast_processor.audio._clip_segments_complex", side_effect=failure),
+        patch(
+            "podcast_processor.audio._clip_segments_single_pass", side_effect=failure
+        ) as single_pass,
+    ):
+        clip_segments_with_fade([(3_000, 21_000)], 2_000, TEST_FILE_PATH, str(out_path))
+
+    single_pass.assert_called_once()
+    duration_ms = get_audio_duration_ms(str(out_path))
+    assert duration_ms is not None
+    assert abs(duration_ms - (TEST_FILE_DURATION - 18_000)) < 200
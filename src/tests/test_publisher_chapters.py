@@ -0,0 +1,280 @@
+import shutil
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import feedparser
+from flask import Flask
+from jinja2 import Template
+from mutagen.id3 import CHAP, CTOC, ID3, TIT2, CTOCFlags
+
+from app.extensions import db
+from app.feeds import make_post
+from app.models import Feed, Identification, ModelCall, Post, TranscriptSegment
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.audio_processor import AudioProcessor
+from podcast_processor.podcast_downloader import PodcastDownloader
+from podcast_processor.podcast_processor import PodcastProcessor
+from podcast_processor.processing_status_manager import ProcessingStatusManager
+from podcast_processor.publisher_chapters import (
+    PUBLISHER_CHAPTERS_MODEL_NAME,
+    Chapter,
+    chapters_cover_runtime,
+    chapters_to_json,
+    is_sponsor_chapter,
+    parse_chapters_json,
+    read_embedded_chapters,
+    sponsor_spans,
+)
+from podcast_processor.transcription_manager import TranscriptionManager
+from shared.test_utils import create_standard_test_config
+
+DATA_DIR = Path(__file__).parent / "data"
+
+FEED_XML = """<?xml version="1.0"?>
+<rss version="2.0" xmlns:podcast="https://podcastindex.org/namespace/1.0">
+  <channel>
+    <title>Feed</title>
+    <item>
+      <title>Episode</title>
+      <guid>ep-1</guid>
+      <enclosure url="https://example.com/ep1.mp3" type="audio/mpeg" length="1"/>
+      <podcast:chapters url="https://example.com/ep1.json"
+                        type="application/json+chapters"/>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def _mp3_with_chapters(tmp_path: Path, chapters: list[tuple[int, int, str]]) -> Path:
+    """A copy of the sample MP3 with ID3 chapter frames (times in ms)."""
+    path = tmp_path / "chapters.mp3"
+    shutil.copy(DATA_DIR / "count_0_99.mp3", path)
+    tags = ID3(path)
+    element_ids = [f"chp{i}" for i in range(len(chapters))]
+    tags.add(
+        CTOC(
+            element_id="toc",
+            flags=CTOCFlags.TOP_LEVEL | CTOCFlags.ORDERED,
+            child_element_ids=element_ids,
+            sub_frames=[],
+        )
+    )
+    for element_id, (start, end, title) in zip(element_ids, chapters, strict=True):
+        tags.add(
+            CHAP(
+                element_id=element_id,
+                start_time=start,
+                end_time=end,
+                sub_frames=[TIT2(text=[title])],
+            )
+        )
+    tags.save(path)
+    return path
+
+
+def test_parse_chapters_json_fills_open_ends() -> None:
+    chapters = parse_chapters_json((DATA_DIR / "chapters.json").read_bytes())
+
+    assert [(c.start, c.end) for c in chapters] == [
+        (0.0, 30.0),
+        (30.0, 60.0),
+        (60.0, 240.0),
+        (240.0, 270.0),
+        (270.0, None),
+    ]
+    assert [c.title for c in sponsor_spans(chapters, 300.0)] == [
+        "Sponsor: Acme Widgets",
+        "Mid-roll ad break",
+    ]
+    assert sponsor_spans(chapters, 300.0)[-1].end == 270.0
+    assert chapters_cover_runtime(chapters, 300.0)
+    assert parse_chapters_json(b"not json") == []
+
+
+def test_sponsor_titles() -> None:
+    for title in ["Ad break", "Sponsors", "A word from our sponsors", "Pre-roll"]:
+        assert is_sponsor_chapter(title), title
+    for title in ["Ad-free bonus", "Adam's story", "Headlines", "Outro"]:
+        assert not is_sponsor_chapter(title), title
+
+
+def test_coverage_allows_small_gaps_only() -> None:
+    chapters = [
+        Chapter(start=2.0, end=20.0, title="Intro", source="json"),
+        Chapter(start=22.0, end=58.0, title="Main", source="json"),
+    ]
+
+    assert chapters_cover_runtime(chapters, 60.0)
+    assert not chapters_cover_runtime(chapters, 90.0)
+    assert not chapters_cover_runtime(chapters[1:], 60.0)
+
+
+def test_read_embedded_id3_chapters(tmp_path: Path) -> None:
+    path = _mp3_with_chapters(
+        tmp_path,
+        [(0, 20000, "Intro"), (20000, 35000, "Sponsor"), (35000, 66048, "Counting")],
+    )
+
+    chapters = read_embedded_chapters(str(path))
+
+    assert chapters == [
+        Chapter(start=0.0, end=20.0, title="Intro", source="embedded"),
+        Chapter(start=20.0, end=35.0, title="Sponsor", source="embedded"),
+        Chapter(start=35.0, end=66.048, title="Counting", source="embedded"),
+    ]
+    assert read_embedded_chapters(str(DATA_DIR / "count_0_99.mp3")) == []
+
+
+def test_make_post_captures_chapters_url() -> None:
+    entry = feedparser.parse(FEED_XML).entries[0]
+    feed = Feed(id=1, title="Feed", rss_url="https://example.com/rss")
+
+    post = make_post(feed, entry)
+
+    assert post.chapters_url == "https://example.com/ep1.json"
+
+
+def test_processor_stores_embedded_chapters(app: Flask, tmp_path: Path) -> None:
+    path = _mp3_with_chapters(tmp_path, [(0, 30000, "Ads"), (30000, 66048, "Show")])
+    config = create_standard_test_config()
+    config.enable_publisher_chapters = True
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="https://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            guid="guid-chapters",
+            title="Episode",
+            download_url="https://example.com/ep1.mp3",
+            feed_id=feed.id,
+            unprocessed_audio_path=str(path),
+        )
+        db.session.add(post)
+        db.session.commit()
+        processor = PodcastProcessor(
+            config=config,
+            transcription_manager=MagicMock(spec=TranscriptionManager),
+            ad_classifier=MagicMock(spec=AdClassifier),
+            audio_processor=MagicMock(spec=AudioProcessor),
+            status_manager=MagicMock(spec=ProcessingStatusManager),
+            db_session=db.session,
+            downloader=MagicMock(spec=PodcastDownloader),
+        )
+
+        processor._capture_publisher_chapters(post)
+
+        db.session.expire_all()
+        stored = db.session.get(Post, post.id).publisher_chapters
+        assert [c["title"] for c in stored] == ["Ads", "Show"]
+        assert stored[0]["source"] == "embedded"
+
+
+def _classify_with_chapters(
+    app: Flask, chapters: list[Chapter]
+) -> tuple[MagicMock, list[int]]:
+    """Classify 12 five-second segments of a post with ``chapters``.
+
+    Returns the mocked LLM chunk call and the chapter-labelled sequence numbers.
+    """
+    config = create_standard_test_config()
+    config.enable_publisher_chapters = True
+    config.enable_boundary_refinement = False
+    config.processing.num_segments_to_input_to_prompt = 4
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="https://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-chapter-ads",
+            download_url="https://example.com/1.mp3",
+            title="Episode",
+            publisher_chapters=chapters_to_json(chapters),
+        )
+        db.session.add(post)
+        db.session.commit()
+        segments = [
+            TranscriptSegment(
+                post_id=post.id,
+                sequence_num=i,
+                start_time=i * 5.0,
+                end_time=i * 5.0 + 5.0,
+                text=f"Segment number {i}",
+            )
+            for i in range(12)
+        ]
+        db.session.add_all(segments)
+        db.session.commit()
+
+        classifier = AdClassifier(config=config)
+        process_chunk = MagicMock(return_value=[])
+        classifier._process_chunk = process_chunk  # type: ignore[method-assign]
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt="system",
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        ad_seqs = sorted(
+            seq
+            for (seq,) in db.session.query(TranscriptSegment.sequence_num)
+            .join(Identification)
+            .join(ModelCall)
+            .filter(ModelCall.model_name == PUBLISHER_CHAPTERS_MODEL_NAME)
+            .all()
+        )
+    return process_chunk, ad_seqs
+
+
+def test_covering_chapters_skip_llm_classification(app: Flask) -> None:
+    process_chunk, ad_seqs = _classify_with_chapters(
+        app,
+        [
+            Chapter(start=0.0, end=20.0, title="Welcome", source="json"),
+            Chapter(start=20.0, end=40.0, title="Sponsor break", source="json"),
+            Chapter(start=40.0, end=None, title="Discussion", source="json"),
+        ],
+    )
+
+    process_chunk.assert_not_called()
+    assert ad_seqs == [4, 5, 6, 7]
+
+
+def test_covering_chapters_without_sponsor_still_classify(app: Flask) -> None:
+    process_chunk, ad_seqs = _classify_with_chapters(
+        app,
+        [
+            Chapter(start=0.0, end=30.0, title="Welcome", source="json"),
+            Chapter(start=30.0, end=None, title="Discussion", source="json"),
+        ],
+    )
+
+    assert ad_seqs == []
+    sent = {
+        seg.sequence_num
+        for call in process_chunk.call_args_list
+        for seg in call.kwargs["chunk_segments"]
+    }
+    assert sent == set(range(12))
+
+
+def test_partial_chapters_send_only_unlabelled_segments_to_llm(app: Flask) -> None:
+    process_chunk, ad_seqs = _classify_with_chapters(
+        app,
+        [
+            Chapter(start=0.0, end=20.0, title="Welcome", source="json"),
+            Chapter(start=20.0, end=40.0, title="Sponsor break", source="json"),
+        ],
+    )
+
+    assert ad_seqs == [4, 5, 6, 7]
+    sent = {
+        seg.sequence_num
+        for call in process_chunk.call_args_list
+        for seg in call.kwargs["chunk_segments"]
+    }
+    assert sent == {0, 1, 2, 3, 8, 9, 10, 11}
@@ -169,10 +169,10 @@ class TestRateLimitingEdgeCases:
                 current_attempt_num=3,
             )
 
-            # Check the sleep calls
-            expected_calls = [60, 120, 240]
+            # Check the sleep calls: jittered within the upper half of each step
             actual_calls = [call[0][0] for call in mock_sleep.call_args_list]
-            assert actual_calls == expected_calls
+            for actual, ceiling in zip(actual_calls, [60, 120, 240], strict=True):
+                assert ceiling / 2 <= actual <= ceiling
 
             # Reset for non-rate-limit error test
             mock_sleep.reset_mock()
@@ -199,9 +199,9 @@ class TestRateLimitingEdgeCases:
                 current_attempt_num=3,
             )
 
-            expected_calls = [1, 2, 4]
             actual_calls = [call[0][0] for call in mock_sleep.call_args_list]
-            assert actual_calls == expected_calls
+            for actual, ceiling in zip(actual_calls, [1, 2, 4], strict=True):
+                assert ceiling / 2 <= actual <= ceiling
 
     def test_rate_limiter_with_very_short_window(self) -> None:
         """Test rate limiter with very short time windows."""
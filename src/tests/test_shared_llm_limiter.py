@@ -0,0 +1,151 @@
+import itertools
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from flask import Flask
+
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.shared_llm_limiter import (
+    SharedConcurrencyLimiter,
+    SharedLimiterStore,
+    SharedTokenRateLimiter,
+    limiter_scope,
+)
+from shared.test_utils import create_standard_test_config
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+SCOPE = limiter_scope("sk-shared", None)
+
+
+def _spawn(script: str, db_path: Path) -> subprocess.Popen[str]:
+    """Run ``script`` in a separate Python process against ``db_path``."""
+    prelude = textwrap.dedent(
+        f"""
+        import json, sys, time
+        from podcast_processor.shared_llm_limiter import (
+            SharedConcurrencyLimiter, SharedLimiterStore, SharedTokenRateLimiter,
+        )
+        store = SharedLimiterStore({str(db_path)!r})
+        scope = {SCOPE!r}
+        """
+    )
+    return subprocess.Popen(
+        [sys.executable, "-c", prelude + textwrap.dedent(script)],
+        cwd=SRC_DIR,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+
+
+def _messages(tokens: int) -> list[dict[str, str]]:
+    # TokenRateLimiter estimates ~4 characters per token.
+    return [{"role": "user", "content": "x" * (tokens * 4)}]
+
+
+def test_concurrency_slots_are_shared_between_processes(tmp_path: Path) -> None:
+    db_path = tmp_path / "limits.sqlite"
+    script = """
+        limiter = SharedConcurrencyLimiter(store, scope, 1)
+        intervals = []
+        for _ in range(3):
+            assert limiter.acquire(timeout=10.0)
+            started = time.time()
+            time.sleep(0.1)
+            intervals.append((started, time.time()))
+            limiter.release()
+        print(json.dumps(intervals))
+    """
+    workers = [_spawn(script, db_path) for _ in range(2)]
+    intervals = sorted(
+        interval
+        for worker in workers
+        for interval in json.loads(worker.communicate(timeout=60)[0])
+    )
+
+    assert all(worker.returncode == 0 for worker in workers)
+    assert len(intervals) == 6
+    for (_, end), (next_start, _) in itertools.pairwise(intervals):
+        assert next_start >= end
+
+
+def test_token_budget_is_shared_between_processes(tmp_path: Path) -> None:
+    db_path = tmp_path / "limits.sqlite"
+    worker = _spawn(
+        """
+        limiter = SharedTokenRateLimiter(store, scope, tokens_per_minute=100)
+        limiter.wait_if_needed(
+            [{"role": "user", "content": "x" * 320}], "gpt-4o-mini"
+        )
+        """,
+        db_path,
+    )
+    worker.communicate(timeout=60)
+    assert worker.returncode == 0
+
+    limiter = SharedTokenRateLimiter(
+        SharedLimiterStore(str(db_path)), SCOPE, tokens_per_minute=100
+    )
+    can_proceed, wait_seconds = limiter.check_rate_limit(_messages(40), "gpt-4o-mini")
+
+    assert not can_proceed
+    assert 55.0 < wait_seconds <= 60.0
+    assert limiter.get_usage_stats()["current_usage"] == 80
+    # Other keys have their own budget.
+    other = SharedTokenRateLimiter(
+        SharedLimiterStore(str(db_path)),
+        limiter_scope("sk-other", None),
+        tokens_per_minute=100,
+    )
+    assert other.check_rate_limit(_messages(40), "gpt-4o-mini") == (True, 0.0)
+
+
+def test_slots_of_exited_processes_are_reclaimed(tmp_path: Path) -> None:
+    db_path = tmp_path / "limits.sqlite"
+    worker = _spawn(
+        """
+        assert SharedConcurrencyLimiter(store, scope, 1).acquire(timeout=1.0)
+        """,
+        db_path,
+    )
+    worker.communicate(timeout=60)
+    assert worker.returncode == 0
+
+    limiter = SharedConcurrencyLimiter(SharedLimiterStore(str(db_path)), SCOPE, 1)
+    assert limiter.acquire(timeout=1.0)
+    assert limiter.get_active_calls() == 1
+    assert not limiter.acquire(timeout=0.1)
+    limiter.release()
+    assert limiter.get_available_slots() == 1
+
+
+def test_classifier_uses_shared_limiters_when_configured(
+    app: Flask, tmp_path: Path
+) -> None:
+    config = create_standard_test_config()
+    config.llm_enable_token_rate_limiting = True
+    config.llm_max_input_tokens_per_minute = 5000
+    config.llm_shared_limiter_path = str(tmp_path / "limits.sqlite")
+
+    with app.app_context():
+        classifier = AdClassifier(config=config)
+
+    assert isinstance(classifier.rate_limiter, SharedTokenRateLimiter)
+    assert classifier.rate_limiter.tokens_per_minute == 5000
+    assert isinstance(classifier.concurrency_limiter, SharedConcurrencyLimiter)
+    assert classifier.concurrency_limiter.scope == classifier.rate_limiter.scope
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_acquire_times_out_when_slots_are_taken(tmp_path: Path, limit: int) -> None:
+    limiter = SharedConcurrencyLimiter(
+        SharedLimiterStore(str(tmp_path / "limits.sqlite")), SCOPE, limit
+    )
+    for _ in range(limit):
+        assert limiter.acquire(timeout=0.1)
+
+    assert not limiter.acquire(timeout=0.1)
+    assert limiter.get_active_calls() == limit
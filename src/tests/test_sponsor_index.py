@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock
+
+from flask import Flask
+from jinja2 import Template
+
+from app.extensions import db
+from app.models import (
+    Feed,
+    Identification,
+    ModelCall,
+    Post,
+    SponsorSignature,
+    TranscriptSegment,
+)
+from app.writer.actions import update_sponsor_index_action
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.sponsor_index import (
+    SPONSOR_INDEX_MODEL_NAME,
+    SponsorIndex,
+    build_sponsor_block,
+    estimate_jaccard,
+    merge_minhash,
+    minhash,
+)
+from shared.test_utils import create_standard_test_config
+
+SPONSOR_READ = [
+    "This episode is brought to you by Acme Widgets, the only widget",
+    "company that ships every order within a single business day.",
+    "Head to acme dot com slash podly and use code PODLY for twenty",
+    "percent off your first order of premium widgets.",
+]
+
+
+def _segments(texts: list[str]) -> list[Any]:
+    return [
+        SimpleNamespace(sequence_num=i, text=text, start_time=i * 5.0)
+        for i, text in enumerate(texts)
+    ]
+
+
+def _index_for(texts: list[str], entry_id: int = 1) -> SponsorIndex:
+    block = build_sponsor_block(texts)
+    assert block is not None
+    return SponsorIndex([(entry_id, block["shingles"])])
+
+
+def test_repeated_read_matches_with_different_segmentation() -> None:
+    index = _index_for(SPONSOR_READ)
+    resegmented = " ".join(SPONSOR_READ).split(". ")
+    texts = [
+        "Welcome back to the show, today we talk about gardening.",
+        *resegmented,
+        "Anyway, tomatoes need a lot of sun and regular watering.",
+    ]
+
+    matches = index.match_segments(_segments(texts), threshold=0.8)
+
+    assert sorted(matches) == list(range(1, 1 + len(resegmented)))
+    assert all(match.signature_id == 1 for match in matches.values())
+
+
+def test_short_generic_overlap_is_ignored() -> None:
+    index = _index_for(SPONSOR_READ)
+    texts = [
+        "We talked to a guest about widgets and tomatoes.",
+        "percent off your first",
+        "Then we went back to discussing compost for an hour.",
+    ]
+
+    assert index.match_segments(_segments(texts), threshold=0.8) == {}
+
+
+def test_minhash_merge_estimates_union() -> None:
+    left = build_sponsor_block(SPONSOR_READ)
+    right = build_sponsor_block(SPONSOR_READ[:3])
+    assert left is not None and right is not None
+
+    assert estimate_jaccard(left["minhash"], right["minhash"]) > 0.5
+    union = set(left["shingles"]) | set(right["shingles"])
+    assert merge_minhash(left["minhash"], right["minhash"]) == minhash(union)
+
+
+def test_update_sponsor_index_merges_and_evicts(app: Flask) -> None:
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        stale = SponsorSignature(
+            feed_id=feed.id,
+            minhash=[0] * 64,
+            shingles=[1, 2, 3],
+            word_count=30,
+            last_seen_at=datetime.utcnow() - timedelta(days=400),
+        )
+        db.session.add(stale)
+        db.session.commit()
+
+        block = build_sponsor_block(SPONSOR_READ)
+        first = update_sponsor_index_action(
+            {"feed_id": feed.id, "blocks": [block], "max_age_days": 180}
+        )
+        second = update_sponsor_index_action(
+            {"feed_id": feed.id, "blocks": [block], "max_age_days": 180}
+        )
+        db.session.commit()
+
+        assert first == {"inserted": 1, "merged": 0, "evicted": 1}
+        assert second == {"inserted": 0, "merged": 1, "evicted": 0}
+        entries = SponsorSignature.query.filter_by(feed_id=feed.id).all()
+        assert len(entries) == 1
+        assert entries[0].hit_count == 2
+
+        other = build_sponsor_block(
+            [
+                "Support for this show comes from Blue Mattress, where every",
+                "mattress comes with a hundred night trial and free returns,",
+                "visit bluemattress dot com today to learn more about them.",
+            ]
+        )
+        result = update_sponsor_index_action(
+            {"feed_id": feed.id, "blocks": [other], "max_entries": 1}
+        )
+        assert result == {"inserted": 1, "merged": 0, "evicted": 1}
+
+
+def test_classifier_labels_indexed_read_and_skips_llm(app: Flask) -> None:
+    config = create_standard_test_config()
+    config.enable_sponsor_index = True
+    config.enable_boundary_refinement = False
+    config.processing.num_segments_to_input_to_prompt = 4
+
+    with app.app_context():
+        feed = Feed(title="Feed", rss_url="http://example.com/rss")
+        db.session.add(feed)
+        db.session.commit()
+        block = build_sponsor_block(SPONSOR_READ)
+        update_sponsor_index_action({"feed_id": feed.id, "blocks": [block]})
+        post = Post(
+            feed_id=feed.id,
+            guid="guid-sponsor",
+            download_url="http://example.com/1.mp3",
+            title="Episode",
+        )
+        db.session.add(post)
+        db.session.commit()
+        texts = [
+            *SPONSOR_READ,
+            "Today we are talking about growing tomatoes on a balcony.",
+            "You need a big pot, good soil and plenty of sunshine.",
+        ]
+        segments = [
+            TranscriptSegment(
+                post_id=post.id,
+                sequence_num=i,
+                start_time=i * 5.0,
+                end_time=i * 5.0 + 5.0,
+                text=text,
+            )
+            for i, text in enumerate(texts)
+        ]
+        db.session.add_all(segments)
+        db.session.commit()
+
+        classifier = AdClassifier(config=config)
+        process_chunk = MagicMock(return_value=[])
+        classifier._process_chunk = process_chunk  # type: ignore[method-assign]
+
+        classifier.classify(
+            transcript_segments=segments,
+            system_prompt="system",
+            user_prompt_template=Template("{{ transcript }}"),
+            post=post,
+        )
+
+        # The first window is entirely the indexed read; only the rest hits the LLM.
+        assert process_chunk.call_count == 1
+        llm_chunk = process_chunk.call_args.kwargs["chunk_segments"]
+        assert [seg.sequence_num for seg in llm_chunk][-2:] == [4, 5]
+        ad_seqs = sorted(
+            seq
+            for (seq,) in db.session.query(TranscriptSegment.sequence_num)
+            .join(Identification)
+            .join(ModelCall)
+            .filter(ModelCall.model_name == SPONSOR_INDEX_MODEL_NAME)
+            .all()
+        )
+        assert ad_seqs == [0, 1, 2, 3]
+        entry = SponsorSignature.query.filter_by(feed_id=feed.id).one()
+        assert entry.hit_count == 2
@@ -0,0 +1,212 @@
+import logging
+import shutil
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import litellm
+import pytest
+from flask import Flask
+
+from app.extensions import db
+from app.models import Feed, Identification, Post, ProcessingJob, TranscriptSegment
+from podcast_processor.ad_classifier import AdClassifier
+from podcast_processor.audio import get_audio_duration_ms
+from podcast_processor.podcast_processor import PodcastProcessor
+from podcast_processor.traffic_cassette import (
+    Cassette,
+    CassetteMissError,
+    reset_cassettes,
+)
+from podcast_processor.transcribe import OpenAIWhisperTranscriber
+from shared.config import RemoteWhisperConfig
+from shared.test_utils import create_standard_test_config
+
+from .test_helpers import FakeWhisperServer
+
+SAMPLE_MP3 = Path(__file__).parent / "data" / "count_0_99.mp3"
+
+
+def _args(**overrides: Any) -> dict[str, Any]:
+    # mock_response makes litellm answer locally with a real ModelResponse.
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [{"role": "user", "content": "Find the ads"}],
+        "mock_response": '{"ad_segments": []}',
+        "timeout": 10,
+        "api_key": "sk-record",
+        **overrides,
+    }
+
+
+def _offline(**_: Any) -> Any:
+    raise AssertionError("replay must not call the provider")
+
+
+def test_replays_recorded_completion_without_calling_provider(
+    tmp_path: Path,
+) -> None:
+    path = str(tmp_path / "cassette.json")
+    recorded = Cassette(path, "record").litellm_completion(litellm.completion, _args())
+
+    sleeps: list[float] = []
+    replay = Cassette(path, "replay", replay_latency=True, sleep=sleeps.append)
+    # Credentials and timeouts are not part of the request key.
+    replayed = replay.litellm_completion(
+        _offline, _args(api_key="sk-other", timeout=99)
+    )
+
+    assert replayed.choices[0].message.content == '{"ad_segments": []}'
+    assert replayed.usage.total_tokens == recorded.usage.total_tokens
+    assert len(sleeps) == 1
+    with pytest.raises(CassetteMissError):
+        replay.litellm_completion(
+            _offline, _args(messages=[{"role": "user", "content": "other"}])
+        )
+    with pytest.raises(FileNotFoundError):
+        Cassette(str(tmp_path / "missing.json"), "replay")
+
+
+def test_replays_stream_up_to_where_it_was_abandoned(tmp_path: Path) -> None:
+    path = str(tmp_path / "cassette.json")
+    args = _args(stream=True, mock_response="one two three four five six")
+
+    stream = Cassette(path, "record").litellm_completion(litellm.completion, args)
+    recorded = []
+    for chunk in stream:
+        recorded.append(chunk.choices[0].delta.content)
+        if len(recorded) == 2:
+            break
+    stream.close()
+
+    replayed = [
+        chunk.choices[0].delta.content
+        for chunk in Cassette(path, "replay").litellm_completion(_offline, args)
+    ]
+    assert replayed == recorded
+
+
+@pytest.fixture
+def whisper_server() -> Generator[FakeWhisperServer, None, None]:
+    server = FakeWhisperServer()
+    yield server
+    server.close()
+
+
+def test_whisper_transcription_replays_offline(
+    tmp_path: Path, whisper_server: FakeWhisperServer
+) -> None:
+    audio = tmp_path / "episode.mp3"
+    audio.write_bytes(SAMPLE_MP3.read_bytes())
+    path = str(tmp_path / "cassette.json")
+    config = RemoteWhisperConfig(
+        api_key="sk-test", base_url=whisper_server.base_url, chunksize_mb=1
+    )
+    logger = logging.getLogger("test_logger")
+
+    recorded = OpenAIWhisperTranscriber(
+        logger, config, cassette=Cassette(path, "record")
+    ).transcribe(str(audio))
+    whisper_server.close()
+    replayed = OpenAIWhisperTranscriber(
+        logger, config, cassette=Cassette(path, "replay")
+    ).transcribe(str(audio))
+
+    assert whisper_server.requests >= 1
+    assert replayed == recorded
+    assert replayed[0].text == "request 1"
+
+
+def test_classifier_uses_configured_cassette(app: Flask, tmp_path: Path) -> None:
+    config = create_standard_test_config()
+    config.traffic_cassette_path = str(tmp_path / "cassette.json")
+    config.traffic_cassette_mode = "record"
+    with app.app_context():
+        recorded = AdClassifier(config=config)._litellm_completion(_args())
+
+        reset_cassettes()
+        config.traffic_cassette_mode = "replay"
+        with patch("litellm.completion", side_effect=_offline):
+            replayed = AdClassifier(config=config)._litellm_completion(_args())
+
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
+
+
+def _process_episode(
+    run_dir: Path, config: Any, monkeypatch: pytest.MonkeyPatch
+) -> tuple[list[tuple[str, str]], int]:
+    """Run ``PodcastProcessor.process`` on a fresh copy of the sample episode.
+
+    Returns the transcript with each segment's label, and the processed
+    audio's duration.
+    """
+    monkeypatch.setenv("PODLY_PODCAST_DATA_DIR", str(run_dir / "data"))
+    db.drop_all()
+    db.create_all()
+    reset_cassettes()
+    audio = run_dir / "in" / "episode.mp3"
+    audio.parent.mkdir(parents=True)
+    shutil.copy(SAMPLE_MP3, audio)
+
+    feed = Feed(title="Feed", rss_url="http://example.com/rss")
+    post = Post(
+        feed=feed,
+        guid="guid-cassette",
+        download_url="http://example.com/episode.mp3",
+        title="Episode",
+        whitelisted=True,
+        unprocessed_audio_path=str(audio),
+    )
+    job = ProcessingJob(post_guid="guid-cassette", status="pending")
+    db.session.add_all([feed, post, job])
+    db.session.commit()
+
+    processed_path = PodcastProcessor(config=config, db_session=db.session).process(
+        post, job_id=job.id
+    )
+
+    labels = {
+        identification.transcript_segment_id: identification.label
+        for identification in Identification.query.all()
+    }
+    transcript = [
+        (segment.text, labels.get(segment.id, "content"))
+        for segment in TranscriptSegment.query.order_by(TranscriptSegment.sequence_num)
+    ]
+    return transcript, get_audio_duration_ms(processed_path) or 0
+
+
+def test_process_replays_episode_offline(
+    app: Flask,
+    tmp_path: Path,
+    whisper_server: FakeWhisperServer,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    config = create_standard_test_config()
+    config.whisper = RemoteWhisperConfig(
+        api_key="sk-test", base_url=whisper_server.base_url, chunksize_mb=1
+    )
+    config.enable_boundary_refinement = False
+    config.output.min_ad_segment_length_seconds = 0
+    config.traffic_cassette_path = str(tmp_path / "cassette.json")
+    live_completion = litellm.completion
+
+    def _model(**args: Any) -> Any:
+        return live_completion(
+            **args,
+            mock_response='{"ad_segments": [{"segment_offset": 0.0, "confidence": 0.95}]}',
+        )
+
+    config.traffic_cassette_mode = "record"
+    with app.app_context(), patch("litellm.completion", side_effect=_model):
+        recorded = _process_episode(tmp_path / "record", config, monkeypatch)
+    whisper_server.close()
+
+    config.traffic_cassette_mode = "replay"
+    with app.app_context(), patch("litellm.completion", side_effect=_offline):
+        replayed = _process_episode(tmp_path / "replay", config, monkeypatch)
+
+    assert whisper_server.requests == 1
+    assert recorded[0] == [("request 1", "ad")]
+    assert replayed == recorded
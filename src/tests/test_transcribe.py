@@ -1,8 +1,18 @@
 import logging
+import time
+from collections.abc import Generator
+from pathlib import Path
 
 import pytest
 from openai.types.audio.transcription_segment import TranscriptionSegment
 
+from podcast_processor.transcribe import OpenAIWhisperTranscriber
+from shared.config import LLMEndpointConfig, RemoteWhisperConfig
+
+from .test_helpers import FakeWhisperServer
+
+SAMPLE_MP3 = Path(__file__).parent / "data" / "count_0_99.mp3"
+
 # from pytest_mock import MockerFixture
 
 
@@ -58,3 +68,61 @@ def test_offset() -> None:
             end=45.800999999999995,
         )
     ]
+
+
+@pytest.fixture
+def whisper_servers() -> Generator[tuple[FakeWhisperServer, FakeWhisperServer]]:
+    primary, secondary = FakeWhisperServer("primary"), FakeWhisperServer("secondary")
+    yield primary, secondary
+    primary.close()
+    secondary.close()
+
+
+def _episode(tmp_path: Path) -> str:
+    audio = tmp_path / "episode.mp3"
+    audio.write_bytes(SAMPLE_MP3.read_bytes())
+    return str(audio)
+
+
+def test_failing_primary_fails_over_to_secondary_endpoint(
+    tmp_path: Path, whisper_servers: tuple[FakeWhisperServer, FakeWhisperServer]
+) -> None:
+    primary, secondary = whisper_servers
+    primary.fail = True
+    config = RemoteWhisperConfig(
+        api_key="sk-primary",
+        base_url=primary.base_url,
+        secondary_endpoints=[
+            LLMEndpointConfig(name="backup", base_url=secondary.base_url)
+        ],
+    )
+    transcriber = OpenAIWhisperTranscriber(logging.getLogger("test_logger"), config)
+
+    segments = transcriber.transcribe(_episode(tmp_path))
+
+    assert [seg.text for seg in segments] == ["secondary 1"]
+    assert primary.requests == 1
+
+
+def test_slow_chunk_is_hedged_and_first_answer_wins(
+    tmp_path: Path, whisper_servers: tuple[FakeWhisperServer, FakeWhisperServer]
+) -> None:
+    server, _ = whisper_servers
+    config = RemoteWhisperConfig(
+        api_key="sk-test",
+        base_url=server.base_url,
+        hedge_percentile=90.0,
+        hedge_min_samples=1,
+    )
+    transcriber = OpenAIWhisperTranscriber(logging.getLogger("test_logger"), config)
+    audio = _episode(tmp_path)
+    transcriber.transcribe(audio)
+
+    # The next upload hangs; a duplicate is sent once it runs past the
+    # endpoint's usual seconds per audio second.
+    server.delays = [5.0]
+    started = time.monotonic()
+    segments = transcriber.transcribe(audio)
+
+    assert time.monotonic() - started < 3.0
+    assert [seg.text for seg in segments] == ["primary 3"]
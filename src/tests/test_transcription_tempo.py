@@ -0,0 +1,88 @@
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+from openai.types.audio.transcription_segment import TranscriptionSegment
+
+from podcast_processor.transcribe import OpenAIWhisperTranscriber
+from podcast_processor.voice_activity import FRAME_MS, frame_loudness_db
+from shared.config import RemoteWhisperConfig
+
+SAMPLE_MP3 = Path(__file__).parent / "data" / "count_0_99.mp3"
+
+
+class LoudnessTranscriber(OpenAIWhisperTranscriber):
+    """Stands in for Whisper: one segment per burst of loud audio, which in
+    the sample is one spoken number."""
+
+    def __init__(self, tempo: float):
+        super().__init__(
+            logging.getLogger("test_logger"),
+            RemoteWhisperConfig(api_key="sk-test"),
+            tempo=tempo,
+        )
+        self.uploaded_seconds = 0.0
+
+    def get_segments_for_chunk(self, chunk_path: str) -> list[TranscriptionSegment]:
+        loudness = frame_loudness_db(chunk_path)
+        self.uploaded_seconds += len(loudness) * FRAME_MS / 1000.0
+        loud = loudness > np.percentile(loudness, 10) + 15
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], loud, [0])).astype(int)))
+        return [
+            _segment(start * FRAME_MS / 1000.0, end * FRAME_MS / 1000.0)
+            for start, end in zip(edges[::2], edges[1::2], strict=True)
+        ]
+
+
+def _segment(start: float, end: float) -> TranscriptionSegment:
+    return TranscriptionSegment(
+        id=0,
+        avg_logprob=0.0,
+        seek=0,
+        temperature=0.0,
+        text="number",
+        tokens=[],
+        compression_ratio=1.0,
+        no_speech_prob=0.0,
+        start=start,
+        end=end,
+    )
+
+
+def _transcribe(tmp_path: Path, tempo: float) -> tuple[list[float], float]:
+    audio = tmp_path / f"episode-{tempo}.mp3"
+    audio.write_bytes(SAMPLE_MP3.read_bytes())
+    transcriber = LoudnessTranscriber(tempo)
+    starts = [seg.start for seg in transcriber.transcribe(str(audio))]
+    return starts, transcriber.uploaded_seconds
+
+
+@pytest.fixture(scope="module")
+def reference(tmp_path_factory: pytest.TempPathFactory) -> list[float]:
+    starts, uploaded = _transcribe(tmp_path_factory.mktemp("tempo"), 1.0)
+    assert uploaded == pytest.approx(66.0, abs=0.1)
+    return starts
+
+
+@pytest.mark.parametrize("tempo", [1.25, 1.5, 2.0])
+def test_sped_up_timestamps_land_on_the_original_timeline(
+    tmp_path: Path, reference: list[float], tempo: float
+) -> None:
+    starts, uploaded = _transcribe(tmp_path, tempo)
+
+    assert uploaded == pytest.approx(66.0 / tempo, abs=0.2)
+    assert len(starts) > 100
+    # Each number found in the fast audio starts where it does at 1x.
+    errors = np.array([np.min(np.abs(np.array(reference) - s)) for s in starts])
+    assert np.median(errors) <= 0.03
+    assert np.percentile(errors, 90) <= 0.06
+    assert starts[-1] == pytest.approx(reference[-1], abs=0.06)
+
+
+def test_tempo_is_applied_before_chunk_offsets_are_mapped() -> None:
+    segments = OpenAIWhisperTranscriber.add_offset_to_segments(
+        [_segment(1.0, 2.0)], 10_000, tempo=1.5
+    )
+
+    assert (segments[0].start, segments[0].end) == (16.5, 18.0)
@@ -0,0 +1,170 @@
+import logging
+from pathlib import Path
+from typing import Any
+
+import ffmpeg
+import numpy as np
+import pytest
+from openai.types.audio.transcription_segment import TranscriptionSegment
+
+from podcast_processor.transcribe import OpenAIWhisperTranscriber
+from podcast_processor.voice_activity import (
+    FRAME_MS,
+    SpeechMap,
+    VoiceActivityTrimmer,
+    frame_loudness_db,
+    speech_spans,
+)
+from shared.config import RemoteWhisperConfig
+
+SAMPLE_MP3 = Path(__file__).parent / "data" / "count_0_99.mp3"
+
+
+def _speech_with_gap(tmp_path: Path, gap_seconds: float) -> Path:
+    """10s of counting, ``gap_seconds`` of silence, 10 more seconds of counting."""
+    path = tmp_path / "episode.mp3"
+    first = ffmpeg.input(str(SAMPLE_MP3), ss=0, t=10).audio
+    second = ffmpeg.input(str(SAMPLE_MP3), ss=20, t=10).audio
+    silence = ffmpeg.input(f"anullsrc=r=44100:cl=mono:d={gap_seconds}", f="lavfi").audio
+    (
+        ffmpeg.concat(
+            first.filter("aresample", 44100).filter("aformat", channel_layouts="mono"),
+            silence,
+            second.filter("aresample", 44100).filter("aformat", channel_layouts="mono"),
+            v=0,
+            a=1,
+        )
+        .output(str(path), acodec="libmp3lame")
+        .overwrite_output()
+        .run(capture_stdout=True, capture_stderr=True)
+    )
+    return path
+
+
+def test_long_quiet_runs_are_compressed_to_padding() -> None:
+    loud, quiet = -20.0, -70.0
+    loudness = np.array(
+        [quiet] * 30
+        + [loud] * 50
+        + [quiet] * 5
+        + [loud] * 50
+        + [quiet] * 200
+        + [loud] * 50,
+        dtype=np.float32,
+    )
+
+    spans = speech_spans(
+        loudness, threshold_db=12.0, min_silence_frames=20, padding_frames=3
+    )
+
+    # The short pause stays; the long quiet runs keep three frames of padding
+    # next to the speech.
+    assert spans == [(27, 138), (332, 385)]
+    uniform = np.full(100, loud, dtype=np.float32)
+    assert speech_spans(
+        uniform, threshold_db=12.0, min_silence_frames=20, padding_frames=3
+    ) == [(0, 100)]
+
+
+def test_speech_map_restores_original_times() -> None:
+    speech_map = SpeechMap([(1000, 10000), (18000, 30000)], 30000)
+
+    assert speech_map.kept_ms == 21000
+    assert speech_map.removed_fraction == pytest.approx(0.3)
+    assert speech_map.to_original(0.0) == 1.0
+    assert speech_map.to_original(4.5) == 5.5
+    # The seam is the start of the second piece, or the end of the first.
+    assert speech_map.to_original(9.0) == 18.0
+    assert speech_map.to_original(9.0, is_end=True) == 10.0
+    assert speech_map.to_original(20.0) == 29.0
+
+
+def test_transcriber_uploads_trimmed_audio_and_restores_timestamps(
+    tmp_path: Path,
+) -> None:
+    audio = _speech_with_gap(tmp_path, gap_seconds=8.0)
+    trimmer = VoiceActivityTrimmer(
+        min_silence_seconds=2.0, padding_seconds=0.3, threshold_db=12.0
+    )
+    maps: list[SpeechMap] = []
+    trim = trimmer.trim
+
+    def recording_trim(in_path: str, out_path: str) -> SpeechMap | None:
+        speech_map = trim(in_path, out_path)
+        assert speech_map is not None
+        maps.append(speech_map)
+        return speech_map
+
+    trimmer.trim = recording_trim  # type: ignore[method-assign]
+    uploaded: list[Any] = []
+    transcriber = OpenAIWhisperTranscriber(
+        logging.getLogger("test_logger"),
+        RemoteWhisperConfig(api_key="sk-test"),
+        trimmer=trimmer,
+    )
+
+    def fake_segments(chunk_path: str) -> list[TranscriptionSegment]:
+        uploaded.append(frame_loudness_db(chunk_path))
+        return [_segment(0.0, 2.0, "one"), _segment(15.0, 17.0, "twenty")]
+
+    transcriber.get_segments_for_chunk = fake_segments  # type: ignore[method-assign]
+    segments = transcriber.transcribe(str(audio))
+
+    (speech_map,) = maps
+    original = frame_loudness_db(str(audio))
+    # Only the gap went (less the padding), nothing around the speech.
+    removed_seconds = (speech_map.original_ms - speech_map.kept_ms) / 1000.0
+    assert 6.5 < removed_seconds < 7.6
+    assert len(uploaded[0]) * FRAME_MS <= speech_map.kept_ms
+    seam = speech_map.pieces[-1]
+    shift = (seam.original_start_ms - seam.trimmed_start_ms) / 1000.0
+    assert [(seg.start, seg.end) for seg in segments] == [
+        (speech_map.to_original(0.0), 2.0),
+        (pytest.approx(15.0 + shift), pytest.approx(17.0 + shift)),
+    ]
+
+    # The uploaded audio lines up with the original through the map: the
+    # loudness envelope after the seam matches at the mapped position. Stream
+    # copied chunks may start a frame or two early, as for untrimmed audio.
+    trimmed_frames = uploaded[0][
+        seam.trimmed_start_ms // FRAME_MS : seam.trimmed_start_ms // FRAME_MS + 400
+    ]
+
+    def mismatch(frames: int) -> float:
+        start = seam.original_start_ms // FRAME_MS + frames
+        window = original[start : start + len(trimmed_frames)]
+        return float(
+            np.mean(np.abs(np.maximum(window, -60) - np.maximum(trimmed_frames, -60)))
+        )
+
+    best = min(range(-10, 11), key=mismatch)
+    assert abs(best) <= 2
+    assert mismatch(best) < 1.5
+
+    report = transcriber.last_trim_report
+    assert report is not None
+    assert report.removed_fraction == pytest.approx(removed_seconds / 28.0, abs=0.01)
+
+
+def test_speech_without_long_pauses_is_not_trimmed(tmp_path: Path) -> None:
+    trimmer = VoiceActivityTrimmer(
+        min_silence_seconds=2.0, padding_seconds=0.3, threshold_db=12.0
+    )
+
+    assert trimmer.trim(str(SAMPLE_MP3), str(tmp_path / "speech.mp3")) is None
+    assert not (tmp_path / "speech.mp3").exists()
+
+
+def _segment(start: float, end: float, text: str) -> TranscriptionSegment:
+    return TranscriptionSegment(
+        id=0,
+        avg_logprob=0.0,
+        seek=0,
+        temperature=0.0,
+        text=text,
+        tokens=[],
+        compression_ratio=1.0,
+        no_speech_prob=0.0,
+        start=start,
+        end=end,
+    )
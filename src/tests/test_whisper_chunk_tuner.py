@@ -0,0 +1,128 @@
+import logging
+from collections.abc import Generator
+from pathlib import Path
+
+import pytest
+
+from podcast_processor.transcribe import OpenAIWhisperTranscriber
+from podcast_processor.whisper_chunk_tuner import (
+    ChunkOutcome,
+    ChunkTuner,
+    fit_throughput,
+)
+from shared.config import RemoteWhisperConfig
+
+from .test_helpers import FakeWhisperServer
+
+SAMPLE_MP3 = Path(__file__).parent / "data" / "count_0_99.mp3"
+
+
+def _tuner() -> ChunkTuner:
+    return ChunkTuner(
+        min_chunk_seconds=60.0, max_chunk_seconds=1200.0, max_timeout_seconds=600.0
+    )
+
+
+def _ok(audio_seconds: float, latency_seconds: float) -> ChunkOutcome:
+    return ChunkOutcome(
+        audio_seconds=audio_seconds,
+        timeout_seconds=600.0,
+        latency_seconds=latency_seconds,
+        endpoint="primary",
+    )
+
+
+def _failed(audio_seconds: float) -> ChunkOutcome:
+    return ChunkOutcome(
+        audio_seconds=audio_seconds,
+        timeout_seconds=600.0,
+        latency_seconds=None,
+        endpoint=None,
+        error="timed out",
+    )
+
+
+def test_fit_separates_request_overhead_from_audio_rate() -> None:
+    fit = fit_throughput([(100.0, 7.0), (200.0, 12.0), (400.0, 22.0)])
+
+    assert fit is not None
+    assert fit.overhead_seconds == pytest.approx(2.0)
+    assert fit.seconds_per_audio_second == pytest.approx(0.05)
+    assert fit_throughput([(100.0, 7.0), (200.0, 12.0)]) is None
+    # Equal durations cannot separate the two: all of it counts as rate.
+    same = fit_throughput([(100.0, 5.0), (100.0, 6.0), (100.0, 7.0)])
+    assert same is not None
+    assert (same.overhead_seconds, same.seconds_per_audio_second) == (0.0, 0.06)
+
+
+def test_timeouts_follow_measured_throughput() -> None:
+    tuner = _tuner()
+    assert tuner.timeout_for(600.0) == 600.0
+
+    for audio_seconds, latency in [(100.0, 7.0), (200.0, 12.0), (400.0, 22.0)]:
+        tuner.record(_ok(audio_seconds, latency))
+
+    # 3x the expected 32s plus slack, rather than the configured 600s.
+    assert tuner.timeout_for(600.0) == pytest.approx(3 * 32.0 + 15.0)
+    assert tuner.timeout_for(10.0) == 30.0
+
+
+def test_failures_shrink_chunks_and_successes_grow_them_back() -> None:
+    tuner = _tuner()
+    assert tuner.chunk_seconds() == 1200.0
+
+    tuner.record(_failed(1200.0))
+    tuner.record(_failed(600.0))
+    assert tuner.chunk_seconds() == 300.0
+    tuner.record(_ok(300.0, 20.0))
+    assert tuner.chunk_seconds() == 375.0
+
+    # Never so short that a 30s per-request overhead exceeds a tenth of a
+    # request: at 0.5s per audio second that takes 540s chunks.
+    tuner = _tuner()
+    for audio_seconds in (100.0, 200.0, 400.0):
+        tuner.record(_ok(audio_seconds, 30.0 + 0.5 * audio_seconds))
+    for _ in range(6):
+        tuner.record(_failed(60.0))
+    assert tuner.chunk_seconds() == pytest.approx(540.0)
+
+
+@pytest.fixture
+def whisper_server() -> Generator[FakeWhisperServer, None, None]:
+    server = FakeWhisperServer()
+    yield server
+    server.close()
+
+
+def test_chunk_rejected_as_too_large_is_split_in_half(
+    tmp_path: Path, whisper_server: FakeWhisperServer
+) -> None:
+    audio = tmp_path / "episode.mp3"
+    audio.write_bytes(SAMPLE_MP3.read_bytes())
+    # About 33s of the 66s sample fit in one upload.
+    whisper_server.max_upload_bytes = 200_000
+    transcriber = OpenAIWhisperTranscriber(
+        logging.getLogger("test_logger"),
+        RemoteWhisperConfig(
+            api_key="sk-test",
+            base_url=whisper_server.base_url,
+            adaptive_chunking=True,
+            min_chunk_seconds=10.0,
+            max_chunk_seconds=40.0,
+        ),
+    )
+
+    segments = transcriber.transcribe(str(audio))
+    report = transcriber.take_chunk_report()
+
+    # 40s and 26s chunks; the first is rejected and sent as two 20s halves.
+    assert [seg.text for seg in segments] == ["request 2", "request 3", "request 4"]
+    assert [seg.start for seg in segments] == pytest.approx([0.0, 20.0, 40.0], abs=0.1)
+    assert [(r["audio_seconds"], r["endpoint"]) for r in report] == [
+        (pytest.approx(40.0, abs=0.1), None),
+        (pytest.approx(20.0, abs=0.1), "primary"),
+        (pytest.approx(20.0, abs=0.1), "primary"),
+        (pytest.approx(26.0, abs=0.1), "primary"),
+    ]
+    assert "upload too large" in report[0]["error"]
+    assert transcriber.take_chunk_report() == []
@@ -8,6 +8,7 @@ from app.models import (
     TranscriptSegment,
 )
 from app.writer.actions.cleanup import clear_post_identifications_only_action
+from app.writer.actions.processor import upsert_model_call_action
 
 
 def test_clear_post_identifications_only_action_clears_processed_path(app):
@@ -143,3 +144,106 @@ def test_clear_post_identifications_only_action_preserves_whisper_prompt_calls(a
             row.model_name for row in ModelCall.query.filter_by(post_id=post.id).all()
         }
         assert remaining_models == {"custom-whisper-name"}
+
+
+def _post_with_llm_calls(guid: str) -> tuple[Post, TranscriptSegment]:
+    feed = Feed(title=f"Feed {guid}", rss_url=f"https://example.com/{guid}.xml")
+    db.session.add(feed)
+    db.session.commit()
+    post = Post(
+        feed_id=feed.id,
+        guid=guid,
+        download_url=f"https://example.com/{guid}.mp3",
+        title="Episode",
+        whitelisted=True,
+    )
+    db.session.add(post)
+    db.session.commit()
+    segment = TranscriptSegment(
+        post_id=post.id, sequence_num=0, start_time=0.0, end_time=10.0, text="ad"
+    )
+    db.session.add(segment)
+    db.session.commit()
+    return post, segment
+
+
+def test_clear_post_identifications_only_action_can_keep_llm_responses(app):
+    with app.app_context():
+        post, segment = _post_with_llm_calls("reuse-guid")
+        answered = ModelCall(
+            post_id=post.id,
+            first_segment_sequence_num=0,
+            last_segment_sequence_num=0,
+            model_name="openai/gpt-4o",
+            prompt="classify",
+            response='{"ad_segments": []}',
+            status="success",
+        )
+        failed = ModelCall(
+            post_id=post.id,
+            first_segment_sequence_num=1,
+            last_segment_sequence_num=1,
+            model_name="openai/gpt-4o",
+            prompt="classify",
+            status="failed_permanent",
+        )
+        db.session.add_all([answered, failed])
+        db.session.commit()
+        db.session.add(
+            Identification(
+                transcript_segment_id=segment.id,
+                model_call_id=answered.id,
+                label="ad",
+                confidence=0.9,
+            )
+        )
+        db.session.commit()
+
+        clear_post_identifications_only_action(
+            {"post_id": post.id, "reuse_llm_responses": True}
+        )
+        db.session.flush()
+
+        assert [call.id for call in ModelCall.query.filter_by(post_id=post.id)] == [
+            answered.id
+        ]
+        assert Identification.query.count() == 0
+
+
+def test_upsert_model_call_resets_call_when_prompt_hash_changes(app):
+    with app.app_context():
+        post, segment = _post_with_llm_calls("hash-guid")
+        params = {
+            "post_id": post.id,
+            "model_name": "openai/gpt-4o",
+            "first_segment_sequence_num": 0,
+            "last_segment_sequence_num": 0,
+            "prompt": "classify",
+            "prompt_hash": "a" * 64,
+        }
+        call_id = upsert_model_call_action(params)["model_call_id"]
+        call = db.session.get(ModelCall, call_id)
+        call.status = "success"
+        call.response = '{"ad_segments": []}'
+        db.session.add(
+            Identification(
+                transcript_segment_id=segment.id,
+                model_call_id=call_id,
+                label="ad",
+                confidence=0.9,
+            )
+        )
+        db.session.commit()
+
+        # Same prompt: the stored response is reused.
+        assert upsert_model_call_action(params)["model_call_id"] == call_id
+        assert call.status == "success"
+        assert Identification.query.count() == 1
+
+        # Changed prompt: the response and its identifications are dropped.
+        upsert_model_call_action({**params, "prompt_hash": "b" * 64})
+        db.session.refresh(call)
+        assert call.status == "pending"
+        assert call.response is None
+        assert call.prompt_hash == "b" * 64
+        assert Identification.query.count() == 0